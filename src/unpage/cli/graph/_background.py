@@ -52,3 +52,8 @@ def create_pid_file(pid: int) -> None:
 
 def cleanup_pid_file() -> None:
     get_pid_file().unlink(missing_ok=True)
+
+
+def get_progress_file() -> Path:
+    """Get the progress file path for the active profile graph build"""
+    return manager.get_active_profile_directory() / "graph_build_progress.json"
@@ -0,0 +1,132 @@
+import os
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Literal
+
+import anyio
+from pydantic import BaseModel, Field, ValidationError
+
+from unpage.knowledge import Graph
+from unpage.plugins.mixins import KnowledgeGraphMixin
+
+BuildPhase = Literal["starting", "populating", "inferring_edges", "saving", "finished"]
+PluginStatus = Literal["running", "finished", "failed"]
+
+
+class BuildProgressSnapshot(BaseModel):
+    """The progress of a graph build, as published to the progress file."""
+
+    pid: int
+    phase: BuildPhase
+    started_at: float
+    phase_started_at: float
+    updated_at: float
+    plugins: dict[str, PluginStatus]
+    nodes_by_source: dict[str, int]
+    node_count: int
+    nodes_per_second: float | None
+    pending: int
+    eta_seconds: float | None
+    plugin_stats: dict[str, dict[str, Any]] = Field(default_factory=dict)
+
+
+def read_progress(path: Path) -> BuildProgressSnapshot | None:
+    """Read the last published progress of a graph build, if there is any."""
+    try:
+        return BuildProgressSnapshot.model_validate_json(path.read_bytes())
+    except (FileNotFoundError, ValidationError):
+        return None
+
+
+class BuildProgress:
+    """Publishes the progress of a running graph build to a file, for `unpage graph status`."""
+
+    def __init__(
+        self,
+        graph: Graph,
+        path: Path,
+        interval: float = 1.0,
+        plugins: Sequence[KnowledgeGraphMixin] = (),
+    ) -> None:
+        self._graph = graph
+        self._path = path
+        self._interval = interval
+        self._plugin_instances = plugins
+        self._plugins: dict[str, PluginStatus] = {}
+        self._started_at = time.time()
+        self._phase: BuildPhase = "starting"
+        self._phase_started_at = self._started_at
+        self._finished = anyio.Event()
+
+        # Use the size of the previous build's graph to estimate when populating will finish.
+        previous = read_progress(path)
+        self._expected_node_count = (
+            previous.node_count if previous and previous.phase == "finished" else None
+        )
+
+    def set_phase(self, phase: BuildPhase) -> None:
+        self._phase = phase
+        self._phase_started_at = time.time()
+        self.publish()
+        if phase == "finished":
+            self._finished.set()
+
+    def set_plugin_status(self, plugin_name: str, status: PluginStatus) -> None:
+        self._plugins[plugin_name] = status
+
+    def snapshot(self) -> BuildProgressSnapshot:
+        now = time.time()
+        nodes_by_source = self._graph.source_node_counts
+        node_count = sum(nodes_by_source.values())
+        phase_elapsed = now - self._phase_started_at
+
+        nodes_per_second = None
+        pending = 0
+        eta_seconds = None
+        if self._phase == "populating":
+            pending = sum(status == "running" for status in self._plugins.values())
+            if phase_elapsed > 0 and node_count:
+                nodes_per_second = node_count / phase_elapsed
+                if self._expected_node_count:
+                    eta_seconds = max(self._expected_node_count - node_count, 0) / nodes_per_second
+        elif self._phase == "inferring_edges":
+            pending = self._graph.pending_edge_inference
+            processed = node_count - pending
+            if phase_elapsed > 0 and processed:
+                nodes_per_second = processed / phase_elapsed
+                eta_seconds = pending / nodes_per_second
+
+        return BuildProgressSnapshot(
+            pid=os.getpid(),
+            phase=self._phase,
+            started_at=self._started_at,
+            phase_started_at=self._phase_started_at,
+            updated_at=now,
+            plugins=self._plugins,
+            nodes_by_source=dict(nodes_by_source),
+            node_count=node_count,
+            nodes_per_second=nodes_per_second,
+            pending=pending,
+            eta_seconds=eta_seconds,
+            plugin_stats={
+                plugin.name: stats
+                for plugin in self._plugin_instances
+                if (stats := plugin.get_build_stats())
+            },
+        )
+
+    def publish(self) -> None:
+        """Write the current progress to the progress file."""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial file.
+        tmp_path = self._path.with_suffix(".tmp")
+        tmp_path.write_text(self.snapshot().model_dump_json(indent=2))
+        tmp_path.replace(self._path)
+
+    async def publish_periodically(self) -> None:
+        """Publish the progress every interval until the build is finished."""
+        while not self._finished.is_set():
+            self.publish()
+            with anyio.move_on_after(self._interval):
+                await self._finished.wait()
@@ -13,7 +13,9 @@ from unpage.cli.graph._background import (
     cleanup_pid_file,
     create_pid_file,
     get_log_file,
+    get_progress_file,
 )
+from unpage.cli.graph._progress import BuildProgress
 from unpage.config import manager
 from unpage.knowledge import Graph
 from unpage.plugins import PluginManager
@@ -84,16 +86,43 @@ async def build(
         config = manager.get_active_profile_config()
         output_path = (manager.get_active_profile_directory() / "graph.json").resolve()
         plugin_manager = PluginManager(config)
-
-        async with anyio.create_task_group() as tg:
-            for plugin in plugin_manager.get_plugins_with_capability(KnowledgeGraphMixin):
-                print(f"Populating graph with the {plugin.name} plugin...")
-                tg.start_soon(plugin.populate_graph, graph)
-
-        await graph.infer_edges()
-
-        print(f"Saving graph to {output_path!s}...")
-        await graph.save(output_path)
+        plugins = plugin_manager.get_plugins_with_capability(KnowledgeGraphMixin)
+        progress = BuildProgress(graph, get_progress_file(), plugins=plugins)
+
+        async def _populate_graph(plugin: KnowledgeGraphMixin) -> None:
+            progress.set_plugin_status(plugin.name, "running")
+            try:
+                await plugin.populate_graph(graph)
+            except BaseException:
+                progress.set_plugin_status(plugin.name, "failed")
+                raise
+            progress.set_plugin_status(plugin.name, "finished")
+
+        try:
+            async with anyio.create_task_group() as progress_tg:
+                progress_tg.start_soon(progress.publish_periodically)
+
+                progress.set_phase("populating")
+                async with anyio.create_task_group() as tg:
+                    for plugin in plugins:
+                        print(f"Populating graph with the {plugin.name} plugin...")
+                        tg.start_soon(_populate_graph, plugin)
+
+                progress.set_phase("inferring_edges")
+                # Inferring edges may call the plugins' APIs, e.g. for ALB target health.
+                async for node in graph.iter_nodes():
+                    plugin_manager.bind_node(node)
+                await graph.infer_edges()
+
+                progress.set_phase("saving")
+                print(f"Saving graph to {output_path!s}...")
+                await graph.save(output_path)
+
+                progress.set_phase("finished")
+        finally:
+            # Close the plugins' pooled clients, even if populating the graph failed.
+            for plugin in plugin_manager:
+                await plugin.close()
 
         end_time = time.perf_counter()
         total_time = end_time - start_time
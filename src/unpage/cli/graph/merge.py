@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+from typing import Annotated
+
+from cyclopts import Parameter
+
+from unpage.cli.graph._app import graph_app
+from unpage.config import manager
+from unpage.knowledge import ConflictPolicy, merge_graphs
+from unpage.plugins import PluginManager
+from unpage.telemetry import client as telemetry
+from unpage.telemetry import prepare_profile_for_telemetry
+
+
+@graph_app.command
+async def merge(
+    *inputs: Path,
+    output: Annotated[Path | None, Parameter(name=["--output", "-o"])] = None,
+    on_conflict: ConflictPolicy = "keep_first",
+    skip_edge_inference: bool = False,
+) -> None:
+    """Merge graphs built separately (e.g. per region, account, or cluster) into one graph
+
+    Parameters
+    ----------
+    inputs
+        Graph files to merge, in priority order
+    output
+        Where to write the merged graph (defaults to the active profile's graph)
+    on_conflict
+        What to do when the same node appears in more than one graph
+    skip_edge_inference
+        Don't infer edges between nodes from different graphs
+    """
+    await telemetry.send_event(
+        {
+            "command": "graph merge",
+            **prepare_profile_for_telemetry(manager.get_active_profile()),
+            "input_count": len(inputs),
+            "on_conflict": on_conflict,
+            "skip_edge_inference": skip_edge_inference,
+        }
+    )
+
+    if not inputs:
+        print("No graph files given to merge")
+        sys.exit(1)
+
+    missing = [path for path in inputs if not path.exists()]
+    if missing:
+        print(f"Graph file not found: {', '.join(str(path) for path in missing)}")
+        sys.exit(1)
+
+    output_path = (output or manager.get_active_profile_directory() / "graph.json").resolve()
+
+    plugins = PluginManager(manager.get_active_profile_config())
+    try:
+        graph = await merge_graphs(
+            inputs,
+            on_conflict=on_conflict,
+            infer_edges=not skip_edge_inference,
+            plugins=plugins,
+        )
+    except ValueError as ex:
+        print(f"Unable to merge graphs: {ex}")
+        sys.exit(1)
+    finally:
+        for plugin in plugins:
+            await plugin.close()
+
+    await graph.save(output_path)
+
+    node_count = graph.digraph.number_of_nodes()
+    edge_count = graph.digraph.number_of_edges()
+    print(f"Merged {len(inputs)} graphs into {node_count} nodes and {edge_count} edges")
+    print(f"Graph saved to {output_path!s}")
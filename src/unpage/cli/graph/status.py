@@ -1,12 +1,15 @@
 import sys
+import time
 
 from unpage.cli.graph._app import graph_app
 from unpage.cli.graph._background import (
     cleanup_pid_file,
     get_log_file,
     get_pid_file,
+    get_progress_file,
     is_process_running,
 )
+from unpage.cli.graph._progress import BuildProgressSnapshot, read_progress
 from unpage.config import manager
 from unpage.telemetry import client as telemetry
 from unpage.telemetry import prepare_profile_for_telemetry
@@ -34,6 +37,10 @@ async def status() -> None:
         if is_process_running(pid):
             print(f"Graph build running (PID: {pid})")
 
+            progress = read_progress(get_progress_file())
+            if progress and progress.pid == pid:
+                _print_progress(progress)
+
             # Show log file info if it exists
             log_file = get_log_file()
             if log_file.exists():
@@ -46,3 +53,50 @@ async def status() -> None:
         cleanup_pid_file()
         print("No graph build running")
         sys.exit(1)
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes}m {seconds}s"
+    if minutes:
+        return f"{minutes}m {seconds}s"
+    return f"{seconds}s"
+
+
+def _print_progress(progress: BuildProgressSnapshot) -> None:
+    """Print the live progress published by the running graph build"""
+    now = time.time()
+    print(
+        f"Phase: {progress.phase.replace('_', ' ')} "
+        f"(for {_format_duration(now - progress.phase_started_at)}, "
+        f"build running for {_format_duration(now - progress.started_at)})"
+    )
+
+    throughput = f" ({progress.nodes_per_second:.1f} nodes/s)" if progress.nodes_per_second else ""
+    print(f"Nodes: {progress.node_count}{throughput}")
+    for plugin_name, plugin_status in progress.plugins.items():
+        node_count = progress.nodes_by_source.get(plugin_name, 0)
+        print(f"  {plugin_name}: {node_count} ({plugin_status})")
+
+    if progress.phase == "populating":
+        print(f"Pending: {progress.pending} plugins")
+    elif progress.phase == "inferring_edges":
+        print(f"Pending: {progress.pending} nodes awaiting edge inference")
+
+    if progress.eta_seconds is not None:
+        print(f"ETA: {_format_duration(progress.eta_seconds)}")
+
+    for plugin_name, stats in progress.plugin_stats.items():
+        for stat_name, value in stats.items():
+            if not isinstance(value, dict):
+                print(f"{plugin_name} {stat_name.replace('_', ' ')}: {value}")
+                continue
+            print(f"{plugin_name} {stat_name.replace('_', ' ')}:")
+            for key, item in value.items():
+                if isinstance(item, dict):
+                    item = " ".join(f"{k}={v}" for k, v in item.items())
+                print(f"  {key}: {item}")
+
+    print(f"Last updated {_format_duration(now - progress.updated_at)} ago")
@@ -73,35 +73,39 @@ async def call(
                 tool_args[k] = v
 
     client = Client(mcp)
-    async with client:
-        result = await client.call_tool(tool, tool_args)
-        try:
-            content = next(r.text for r in result.content if isinstance(r, TextContent))
-            if count_results and count_level == 0:
-                print(
-                    json.dumps(
-                        {"count": len(json.loads(content)), "content_length": len(content)},
-                        indent=2,
-                    )
+    try:
+        async with client:
+            result = await client.call_tool(tool, tool_args)
+    finally:
+        for plugin in plugins:
+            await plugin.close()
+    try:
+        content = next(r.text for r in result.content if isinstance(r, TextContent))
+        if count_results and count_level == 0:
+            print(
+                json.dumps(
+                    {"count": len(json.loads(content)), "content_length": len(content)},
+                    indent=2,
                 )
-            elif count_results and count_level == 1:
-                print(
-                    json.dumps(
-                        {
-                            k: (
-                                {
-                                    "count": len(v),
-                                    "content_length": len(json.dumps(v)),
-                                }
-                                if isinstance(v, list | dict)
-                                else v
-                            )
-                            for k, v in json.loads(content).items()
-                        },
-                        indent=2,
-                    )
+            )
+        elif count_results and count_level == 1:
+            print(
+                json.dumps(
+                    {
+                        k: (
+                            {
+                                "count": len(v),
+                                "content_length": len(json.dumps(v)),
+                            }
+                            if isinstance(v, list | dict)
+                            else v
+                        )
+                        for k, v in json.loads(content).items()
+                    },
+                    indent=2,
                 )
-            else:
-                print(content)
-        except StopIteration:
-            print(f"{tool} returned no printable results")
+            )
+        else:
+            print(content)
+    except StopIteration:
+        print(f"{tool} returned no printable results")
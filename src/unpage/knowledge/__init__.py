@@ -1,13 +1,16 @@
 from .edges import Edge
 from .graph import Graph
+from .merge import ConflictPolicy, merge_graphs
 from .nodes import NODE_REGISTRY, Node
 from .nodes.mixins import HasLogs, HasMetrics
 
 __all__ = [
     "NODE_REGISTRY",
+    "ConflictPolicy",
     "Edge",
     "Graph",
     "HasLogs",
     "HasMetrics",
     "Node",
+    "merge_graphs",
 ]
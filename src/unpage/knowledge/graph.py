@@ -1,8 +1,8 @@
-from collections import defaultdict
-from collections.abc import AsyncIterator
+from collections import Counter, defaultdict
+from collections.abc import AsyncIterator, Hashable, Mapping
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import TypeVar, cast
+from typing import Any, TypeVar, cast
 
 import anyio
 import networkx as nx
@@ -21,10 +21,14 @@ class Graph:
     _lock: Lock
     _identifier_mapping: defaultdict[str, set[str]]
     _loaded_at: datetime | None
+    _source_node_counts: Counter[str]
+    _pending_edge_inference: int
 
     def __init__(self, path: Path | str | None = None) -> None:
         self._lock = Lock()
         self._identifier_mapping = defaultdict(set)
+        self._source_node_counts = Counter()
+        self._pending_edge_inference = 0
         self._path = Path(path) if path else None
         self._loaded_at = None
 
@@ -60,20 +64,35 @@ class Graph:
 
             # Convert the nodes to the proper Node objects.
             for _nid, node in self._digraph.nodes(data=True):
-                node_data = node.pop("data")
-                node_key = ":".join([node_data["node_source"], node_data["node_type"]])
-                node["data"] = NODE_REGISTRY[node_key](
-                    **node_data,
-                    _graph=self,
-                )
+                node["data"] = self.inflate_node(node.pop("data"))
 
             self._loaded_at = datetime.now(UTC)
 
         return self._digraph
 
+    @property
+    def source_node_counts(self) -> Counter[str]:
+        """The number of nodes added to the graph, by node source."""
+        return self._source_node_counts.copy()
+
+    @property
+    def pending_edge_inference(self) -> int:
+        """The number of nodes still waiting for edge inference."""
+        return self._pending_edge_inference
+
+    def inflate_node(self, node_data: dict[str, Any]) -> Node:
+        """Convert serialized node data into the proper Node object bound to this graph."""
+        node_key = ":".join([node_data["node_source"], node_data["node_type"]])
+        return NODE_REGISTRY[node_key](
+            **node_data,
+            _graph=self,
+        )
+
     async def add_node(self, node: Node) -> None:
         """Add a node to the graph."""
         async with self._lock:
+            if node.nid not in self.digraph:
+                self._source_node_counts[node.node_source] += 1
             self.digraph.add_node(node.nid, data=node)
 
             for identifier in (node.nid, *await node.get_identifiers()):
@@ -188,50 +207,75 @@ class Graph:
                 properties=properties,
             )
 
-    async def infer_edges(self) -> None:
-        """Infer edges between nodes based on the identifier mapping."""
+    async def infer_edges(self, partitions: Mapping[str, Hashable] | None = None) -> None:
+        """Infer edges between nodes based on the identifier mapping.
+
+        If partitions (a mapping of node ID to partition key) is provided, only
+        edges between nodes in different partitions are inferred.
+        """
         edge_count = self.digraph.number_of_edges()
+        self._pending_edge_inference = self.digraph.number_of_nodes()
         limiter = anyio.CapacityLimiter(24)
         async with anyio.create_task_group() as tg:
             async for node in self.iter_nodes():
-                tg.start_soon(self._infer_edges_for_node, node, limiter)
+                tg.start_soon(self._infer_edges_for_node, node, limiter, partitions)
         print(f"Inferred {self.digraph.number_of_edges() - edge_count} edges")
 
-    async def _infer_edges_for_node(self, node: Node, limiter: anyio.CapacityLimiter) -> None:
+    async def _infer_edges_for_node(
+        self,
+        node: Node,
+        limiter: anyio.CapacityLimiter,
+        partitions: Mapping[str, Hashable] | None = None,
+    ) -> None:
         async with limiter:
-            for ref in await node.get_reference_identifiers():
-                if isinstance(ref, tuple) and len(ref) == 2:
-                    reference_identifier, relationship_type = ref
-                else:
-                    reference_identifier = ref
-                    relationship_type = "related_to"
+            try:
+                await self._infer_edges_for_node_references(node, partitions)
+            finally:
+                self._pending_edge_inference -= 1
 
-                if not reference_identifier:
-                    continue
+    async def _infer_edges_for_node_references(
+        self,
+        node: Node,
+        partitions: Mapping[str, Hashable] | None,
+    ) -> None:
+        for ref in await node.get_reference_identifiers():
+            if isinstance(ref, tuple) and len(ref) == 2:
+                reference_identifier, relationship_type = ref
+            else:
+                reference_identifier = ref
+                relationship_type = "related_to"
 
-                related_node_ids = self._identifier_mapping.get(reference_identifier, set())
+            if not reference_identifier:
+                continue
 
-                if not related_node_ids:
-                    continue
+            related_node_ids = self._identifier_mapping.get(reference_identifier, set())
 
-                if len(related_node_ids) > 1:
-                    # TODO: Handle multiple related nodes (i.e. ambiguous edges).
-                    continue
+            if not related_node_ids:
+                continue
 
-                related_node_id = next(iter(related_node_ids))
-                related_node = await self.get_node(related_node_id)
+            if len(related_node_ids) > 1:
+                # TODO: Handle multiple related nodes (i.e. ambiguous edges).
+                continue
 
-                print(f"Inferred edge: {node.nid} --[ {relationship_type} ]--> {related_node.nid}")
+            related_node_id = next(iter(related_node_ids))
+            if partitions is not None and partitions.get(related_node_id) == partitions.get(
+                node.nid
+            ):
+                continue
 
-                await self.add_edge(
-                    Edge(
-                        source_node=node,
-                        destination_node=related_node,
-                        properties={
-                            "relationship_type": relationship_type,
-                        },
-                    )
+            related_node = await self.get_node(related_node_id)
+
+            print(f"Inferred edge: {node.nid} --[ {relationship_type} ]--> {related_node.nid}")
+
+            await self.add_edge(
+                Edge(
+                    source_node=node,
+                    destination_node=related_node,
+                    properties={
+                        "relationship_type": relationship_type,
+                    },
                 )
+            )
 
     async def get_topology(self) -> "Graph":
         topology = Graph()
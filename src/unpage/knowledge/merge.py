@@ -0,0 +1,74 @@
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from pydantic_core import from_json
+
+from unpage.utils import print
+
+from .graph import Graph
+
+if TYPE_CHECKING:
+    from unpage.plugins import PluginManager
+
+ConflictPolicy = Literal["keep_first", "keep_last", "error"]
+
+
+async def merge_graphs(
+    paths: Iterable[Path | str],
+    on_conflict: ConflictPolicy = "keep_first",
+    infer_edges: bool = True,
+    plugins: "PluginManager | None" = None,
+) -> Graph:
+    """Merge graph files built separately (e.g. per region, account, or cluster) into one graph.
+
+    Shards are read one at a time, so only the merged graph and the current
+    shard are held in memory. Nodes are unioned by nid, using on_conflict to
+    decide which copy wins when the same nid appears in more than one shard.
+    Edges and identifier mappings are unioned, and edge inference is re-run
+    only for references that cross shard boundaries, since edges within a
+    shard were already inferred when it was built.
+
+    If plugins are given, nodes are bound to the plugin they came from, so
+    that edge inference can call the plugins' APIs (e.g. for ALB target health).
+    """
+    graph = Graph()
+    shard_for_nid: dict[str, int] = {}
+
+    for shard, path in enumerate(paths):
+        path = Path(path)
+        print(f"Merging graph shard {path!s}...")
+        data = from_json(path.read_bytes())
+
+        node_count = 0
+        for entry in data.get("nodes", []):
+            nid = entry["id"]
+            if nid in shard_for_nid:
+                if on_conflict == "error":
+                    raise ValueError(f"Node {nid} from {path!s} already exists in another graph")
+                if on_conflict == "keep_first":
+                    continue
+            node = graph.inflate_node(entry["data"])
+            if plugins:
+                plugins.bind_node(node)
+            graph.digraph.add_node(nid, data=node)
+            shard_for_nid[nid] = shard
+            node_count += 1
+
+        for edge in data.get("edges", []):
+            source_nid = edge.pop("source")
+            destination_nid = edge.pop("target")
+            graph.digraph.add_edge(source_nid, destination_nid, **edge)
+
+        for identifier, nids in data.get("_identifier_mapping", {}).items():
+            graph._identifier_mapping[identifier].update(nids)
+
+        print(f"Merged {node_count} nodes from {path!s}")
+
+        # Release the shard before reading the next one.
+        del data
+
+    if infer_edges:
+        await graph.infer_edges(partitions=shard_for_nid)
+
+    return graph
@@ -83,6 +83,14 @@ class Node(BaseModel):
         """
         return []
 
+    async def get_details(self) -> dict[str, Any]:
+        """Return the full details of the node.
+
+        Nodes whose details aren't all fetched while building the graph can
+        fetch the rest here, when they're first needed.
+        """
+        return self.raw_data
+
     async def iter_successors(self) -> AsyncIterator["Node"]:
         """Return a list of nodes that are successors of this node."""
         async for successor in self._graph.iter_successors(self):
@@ -1,10 +1,18 @@
+from collections.abc import AsyncIterator
+
 from pydantic import AwareDatetime
 
 from unpage.models import LogLine
 
 
 class HasLogs:
-    """A mixin for nodes that support retrieving logs."""
+    """A mixin for nodes that support retrieving logs.
+
+    Nodes implement either get_logs or iter_logs. Implementing iter_logs lets
+    callers stream the logs without loading all of them into memory first.
+    Each defaults to the other, and both raise NotImplementedError if neither
+    is implemented.
+    """
 
     async def get_logs(
         self,
@@ -12,4 +20,17 @@ class HasLogs:
         time_range_end: AwareDatetime,
     ) -> list[LogLine]:
         """Retrieve the node's logs for a given time range."""
-        raise NotImplementedError
+        if type(self).iter_logs is HasLogs.iter_logs:
+            raise NotImplementedError
+        return [line async for line in self.iter_logs(time_range_start, time_range_end)]
+
+    async def iter_logs(
+        self,
+        time_range_start: AwareDatetime,
+        time_range_end: AwareDatetime,
+    ) -> AsyncIterator[LogLine]:
+        """Stream the node's logs for a given time range."""
+        if type(self).get_logs is HasLogs.get_logs:
+            raise NotImplementedError
+        for line in await self.get_logs(time_range_start, time_range_end):
+            yield line
@@ -11,7 +11,7 @@ from pydantic import BaseModel, ConfigDict
 from pydantic_core import to_jsonable_python
 
 from unpage.config import Config, manager
-from unpage.knowledge import Graph
+from unpage.knowledge import Graph, Node
 from unpage.plugins import PluginManager
 from unpage.plugins.mixins.mcp import McpServerMixin
 from unpage.telemetry import client as telemetry
@@ -29,11 +29,20 @@ class Context(BaseModel, extra="allow"):
     mcp_server: FastMCP | None = None
     graph: Graph
 
+    async def get_node(self, nid: str) -> Node | None:
+        """Get a node from the graph, bound to the plugin it came from. Returns None if there's no such node."""
+        node = await self.graph.get_node_safe(nid)
+        if node:
+            self.plugins.bind_node(node)
+        return node
+
 
 async def build_mcp_server(context: Context) -> FastMCP:
     @asynccontextmanager
     async def lifespan(server: FastMCP) -> AsyncIterator[Context]:
         """Initialize the application context and plugins."""
+        # The lifespan runs for each client session, so the plugins are
+        # closed by whoever owns the server rather than here.
         yield context
 
     mcp = FastMCP("unpage", lifespan=lifespan)
@@ -112,10 +121,15 @@ async def start(
             port=http_port,
         )
 
-    async with anyio.create_task_group() as tg:
-        if not disable_stdio:
-            tg.start_soon(_run_stdio_server)
-        if not disable_http:
-            tg.start_soon(_run_http_server)
+    try:
+        async with anyio.create_task_group() as tg:
+            if not disable_stdio:
+                tg.start_soon(_run_stdio_server)
+            if not disable_http:
+                tg.start_soon(_run_http_server)
+    finally:
+        # Close the plugins' pooled clients once every transport has stopped.
+        for plugin in context.plugins:
+            await plugin.close()
 
     print("MCP server stopped")
@@ -0,0 +1,151 @@
+import asyncio
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any
+
+from aioboto3 import Session
+from aiobotocore.config import AioConfig
+from aiobotocore.credentials import AioDeferredRefreshableCredentials
+from aiobotocore.session import AioSession
+
+from unpage.plugins.aws.ratelimit import RateLimiters
+from unpage.plugins.aws.utils import RegionAccessCache
+
+# The most connections each client keeps open to its endpoint.
+DEFAULT_MAX_POOL_CONNECTIONS = 25
+
+# Throttled requests are retried with backoff by botocore's standard retry
+# mode, while the rate limiters slow down the requests that follow them.
+DEFAULT_MAX_ATTEMPTS = 10
+
+_ClientKey = tuple[asyncio.AbstractEventLoop, int, str, str | None, int | None]
+
+_sessions: dict[tuple[str | None, str | None, str | None], Session] = {}
+
+
+def get_session(
+    profile: str | None = None,
+    role_arn: str | None = None,
+    external_id: str | None = None,
+) -> Session:
+    """Return the shared session for an AWS profile (or the default credentials).
+
+    If a role is given, the session uses credentials from assuming the role
+    with the profile's credentials. The credentials are cached by the session,
+    and refreshed shortly before they expire.
+    """
+    key = (profile, role_arn, external_id)
+    if key not in _sessions:
+        if role_arn:
+            _sessions[key] = _assume_role_session(get_session(profile), role_arn, external_id)
+        else:
+            _sessions[key] = Session(profile_name=profile) if profile else Session()
+    return _sessions[key]
+
+
+def _assume_role_session(
+    source_session: Session, role_arn: str, external_id: str | None = None
+) -> Session:
+    params = {"RoleArn": role_arn, "RoleSessionName": "unpage"}
+    if external_id:
+        params["ExternalId"] = external_id
+
+    async def _refresh() -> dict[str, Any]:
+        # The credentials are only refreshed about once an hour, and the
+        # session is shared by every plugin, so this doesn't use a pooled client.
+        async with source_session.client("sts") as client:
+            response = await client.assume_role(**params)
+        credentials = response["Credentials"]
+        return {
+            "access_key": credentials["AccessKeyId"],
+            "secret_key": credentials["SecretAccessKey"],
+            "token": credentials["SessionToken"],
+            "expiry_time": credentials["Expiration"].isoformat(),
+        }
+
+    botocore_session = AioSession()
+    # Don't assume the role until the credentials are first needed.
+    botocore_session._credentials = AioDeferredRefreshableCredentials(  # pyright: ignore[reportAttributeAccessIssue]
+        refresh_using=_refresh, method="assume-role"
+    )
+    return Session(botocore_session=botocore_session)
+
+
+class AwsClientPool:
+    """Long-lived aioboto3 clients, reused for each set of credentials, service and region.
+
+    Creating a client loads the service model, resolves the endpoint, and
+    starts a new connection pool, so reusing clients avoids repeating that
+    work (and the TLS handshakes) on every call. Clients are bound to the
+    event loop they were created on, so each loop gets its own clients.
+
+    Every request is paced by an adaptive rate limiter for its credentials,
+    service and region. The pool also remembers which regions each set of
+    credentials can access.
+
+    Each AwsPlugin owns a pool, and closes it when the plugin is closed.
+    """
+
+    def __init__(self, max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS) -> None:
+        self._config = AioConfig(
+            max_pool_connections=max_pool_connections,
+            retries={"mode": "standard", "max_attempts": DEFAULT_MAX_ATTEMPTS},
+        )
+        self.rate_limiters = RateLimiters()
+        self.region_access = RegionAccessCache(self)
+        self._clients: dict[_ClientKey, tuple[Session, Any]] = {}
+        self._locks: defaultdict[_ClientKey, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._exit_stacks: dict[asyncio.AbstractEventLoop, AsyncExitStack] = {}
+
+    @asynccontextmanager
+    async def client(
+        self,
+        session: Session,
+        service_name: str,
+        region_name: str | None = None,
+        config: AioConfig | None = None,
+    ) -> AsyncIterator[Any]:
+        """Use a pooled client. Unlike session.client(), the client stays open afterwards.
+
+        The config is merged into the pool's config, and should be a
+        module-level constant, since clients are pooled by its identity.
+        """
+        yield await self.get_client(session, service_name, region_name, config)
+
+    async def get_client(
+        self,
+        session: Session,
+        service_name: str,
+        region_name: str | None = None,
+        config: AioConfig | None = None,
+    ) -> Any:  # noqa: ANN401
+        loop = asyncio.get_running_loop()
+        key = (loop, id(session), service_name, region_name, id(config) if config else None)
+        if key in self._clients:
+            return self._clients[key][1]
+
+        async with self._locks[key]:
+            if key not in self._clients:
+                exit_stack = self._exit_stacks.setdefault(loop, AsyncExitStack())
+                client = await exit_stack.enter_async_context(
+                    session.client(  # pyright: ignore[reportCallIssue]
+                        service_name,  # pyright: ignore[reportArgumentType]
+                        region_name=region_name,
+                        config=self._config.merge(config) if config else self._config,
+                    )
+                )
+                self.rate_limiters.register(client, session, service_name)
+                # Keep a reference to the session so its id isn't reused.
+                self._clients[key] = (session, client)
+            return self._clients[key][1]
+
+    async def close(self) -> None:
+        """Close all of the clients created on the current event loop."""
+        loop = asyncio.get_running_loop()
+        exit_stack = self._exit_stacks.pop(loop, None)
+        for key in [key for key in self._clients if key[0] is loop]:
+            del self._clients[key]
+            self._locks.pop(key, None)
+        if exit_stack:
+            await exit_stack.aclose()
@@ -0,0 +1,183 @@
+import asyncio
+import math
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from pydantic import AwareDatetime, BaseModel
+
+from unpage.models import Observation
+from unpage.plugins.aws.clients import AwsClientPool
+from unpage.plugins.aws.utils import (
+    ensure_aws_session,
+    list_accessible_regions_for_service,
+    swallow_boto_client_access_errors,
+)
+from unpage.utils import print
+
+if TYPE_CHECKING:
+    from aioboto3 import Session
+
+    from unpage.plugins.aws.nodes.base import AwsNode
+
+
+# GetMetricData accepts at most 500 queries per request.
+MAX_QUERIES_PER_REQUEST = 500
+
+# Keep each series at or under the number of datapoints GetMetricStatistics
+# would return, which also keeps the results a reasonable size for an LLM.
+MAX_DATAPOINTS_PER_SERIES = 1440
+
+MIN_PERIOD_SECONDS = 300
+
+
+class CloudWatchMetricQuery(BaseModel):
+    """A CloudWatch metric for a node, and the statistics to retrieve for it."""
+
+    namespace: str
+    metric_name: str
+    dimensions: list[dict[str, str]]
+    statistics: list[str]
+
+
+def choose_period(
+    time_range_start: AwareDatetime,
+    time_range_end: AwareDatetime,
+    now: datetime | None = None,
+) -> int:
+    """Choose a period that keeps each series under the datapoint limit.
+
+    The period also respects CloudWatch's retention, which only keeps 5 minute
+    data for 63 days and 1 hour data beyond that.
+    """
+    now = now or datetime.now(UTC)
+    range_seconds = max((time_range_end - time_range_start).total_seconds(), 0)
+    period = max(MIN_PERIOD_SECONDS, math.ceil(range_seconds / MAX_DATAPOINTS_PER_SERIES))
+
+    multiple = 3600 if now - time_range_start > timedelta(days=63) else 300
+    return math.ceil(period / multiple) * multiple
+
+
+async def get_cloudwatch_metrics(
+    clients: AwsClientPool,
+    node_queries: Sequence[tuple["AwsNode", Sequence[CloudWatchMetricQuery]]],
+    time_range_start: AwareDatetime,
+    time_range_end: AwareDatetime,
+) -> list[Observation]:
+    """Retrieve metrics for many nodes with as few GetMetricData calls as possible.
+
+    Queries are grouped by account and region, and each group is sent in
+    requests of up to 500 queries (one per metric statistic).
+    """
+    period = choose_period(time_range_start, time_range_end)
+
+    sessions: set[Session] = set()
+    groups: defaultdict[tuple[Session, str], list[tuple[AwsNode, CloudWatchMetricQuery]]] = (
+        defaultdict(list)
+    )
+    for node, queries in node_queries:
+        if not queries:
+            continue
+        if node.session not in sessions:
+            sessions.add(node.session)
+            await ensure_aws_session(clients, node.session)
+
+        if node.aws_region:
+            regions = [node.aws_region]
+        else:
+            # We don't know which region the resource is in (e.g. the graph was
+            # built before regions were recorded), so check all regions.
+            regions = await list_accessible_regions_for_service(clients, node.session, "cloudwatch")
+
+        for region in regions:
+            groups[(node.session, region)].extend((node, q) for q in queries)
+
+    results = await asyncio.gather(
+        *(
+            _get_metric_data(
+                clients, session, region, queries, period, time_range_start, time_range_end
+            )
+            for (session, region), queries in groups.items()
+        ),
+        return_exceptions=True,
+    )
+
+    observations: list[Observation] = []
+    for (_, region), result in zip(groups, results, strict=True):
+        if isinstance(result, BaseException):
+            print(f"Error retrieving CloudWatch metrics from {region}: {result!s}")
+            continue
+        observations.extend(result)
+    return observations
+
+
+async def _get_metric_data(
+    clients: AwsClientPool,
+    session: "Session",
+    region: str,
+    queries: list[tuple["AwsNode", CloudWatchMetricQuery]],
+    period: int,
+    time_range_start: AwareDatetime,
+    time_range_end: AwareDatetime,
+) -> list[Observation]:
+    # Each statistic of each metric is a separate query in GetMetricData.
+    metric_data_queries: list[dict[str, Any]] = []
+    series_for_query_id: dict[str, tuple[str, str]] = {}
+    for node, query in queries:
+        for statistic in query.statistics:
+            query_id = f"q{len(metric_data_queries)}"
+            metric_data_queries.append(
+                {
+                    "Id": query_id,
+                    "MetricStat": {
+                        "Metric": {
+                            "Namespace": query.namespace,
+                            "MetricName": query.metric_name,
+                            "Dimensions": query.dimensions,
+                        },
+                        "Period": period,
+                        "Stat": statistic,
+                    },
+                    "ReturnData": True,
+                }
+            )
+            series_for_query_id[query_id] = (node.nid, f"{statistic} {query.metric_name}")
+
+    series: defaultdict[str, dict[AwareDatetime, float]] = defaultdict(dict)
+    async with (
+        swallow_boto_client_access_errors(service_name="cloudwatch", region=region),
+        clients.client(session, "cloudwatch", region) as client,
+    ):
+        for i in range(0, len(metric_data_queries), MAX_QUERIES_PER_REQUEST):
+            params: dict[str, Any] = {
+                "MetricDataQueries": metric_data_queries[i : i + MAX_QUERIES_PER_REQUEST],
+                "StartTime": time_range_start,
+                "EndTime": time_range_end,
+            }
+            # Results for a query may be split across several pages.
+            while True:
+                response = await client.get_metric_data(**params)
+                for result in response.get("MetricDataResults", []):
+                    data = series[result["Id"]]
+                    for timestamp, value in zip(
+                        result.get("Timestamps", []), result.get("Values", []), strict=False
+                    ):
+                        data[timestamp] = float(value)
+                if not response.get("NextToken"):
+                    break
+                params["NextToken"] = response["NextToken"]
+
+    observations = []
+    for query_id, data in series.items():
+        if not data:
+            continue
+        node_id, observation_type = series_for_query_id[query_id]
+        observations.append(
+            Observation(
+                node_id=node_id,
+                observation_type=observation_type,
+                data=dict(sorted(data.items())),
+            )
+        )
+    return observations
@@ -0,0 +1,81 @@
+import json
+from collections.abc import AsyncIterator, Iterable
+from typing import Any
+
+from aioboto3 import Session
+from pydantic import BaseModel, Field
+
+from unpage.plugins.aws.clients import AwsClientPool
+
+# The most results AWS Config returns in each page of a query.
+MAX_RESULTS_PER_PAGE = 100
+
+
+class ConfigResource(BaseModel):
+    """A resource from an AWS Config aggregator, with its configuration in the format of the Describe APIs."""
+
+    account_id: str
+    region: str
+    resource_type: str
+    configuration: dict[str, Any]
+    tags: dict[str, str] = Field(default_factory=dict)
+
+
+def to_describe_format(value: Any) -> Any:  # noqa: ANN401
+    """Convert a configuration recorded by AWS Config to the format returned by the Describe APIs.
+
+    AWS Config records the same structures as the Describe APIs, but with
+    keys that start with a lowercase letter (e.g. `instanceId`, or `dBInstanceArn`
+    for `DBInstanceArn`), so the nodes can use either after converting the keys.
+    """
+    if isinstance(value, dict):
+        return {
+            (key[:1].upper() + key[1:]): to_describe_format(item) for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [to_describe_format(item) for item in value]
+    return value
+
+
+async def iter_config_aggregator_resources(
+    clients: AwsClientPool,
+    session: Session,
+    aggregator_name: str,
+    region: str,
+    resource_types: Iterable[str],
+    regions: Iterable[str] | None = None,
+) -> AsyncIterator[ConfigResource]:
+    """Yield the current resources of the given types from every account and region of an aggregator.
+
+    When regions are given, only the resources in those regions are returned.
+    """
+    resource_type_list = ", ".join(f"'{resource_type}'" for resource_type in resource_types)
+    expression = (
+        "SELECT accountId, awsRegion, resourceType, configuration, tags"
+        f" WHERE resourceType IN ({resource_type_list})"
+        " AND configurationItemStatus <> 'ResourceDeleted'"
+    )
+    if regions is not None:
+        region_list = ", ".join(f"'{region}'" for region in regions)
+        expression += f" AND awsRegion IN ({region_list})"
+    async with clients.client(session, "config", region) as client:
+        paginator = client.get_paginator("select_aggregate_resource_config")
+        async for page in paginator.paginate(
+            Expression=expression,
+            ConfigurationAggregatorName=aggregator_name,
+            PaginationConfig={"PageSize": MAX_RESULTS_PER_PAGE},
+        ):
+            for result in page["Results"]:
+                item = json.loads(result)
+                configuration = item.get("configuration")
+                if isinstance(configuration, str):
+                    configuration = json.loads(configuration)
+                if not configuration:
+                    continue
+                yield ConfigResource(
+                    account_id=item["accountId"],
+                    region=item["awsRegion"],
+                    resource_type=item["resourceType"],
+                    configuration=to_describe_format(configuration),
+                    tags={tag["key"]: tag.get("value", "") for tag in item.get("tags") or []},
+                )
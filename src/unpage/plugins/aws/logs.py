@@ -0,0 +1,76 @@
+from collections.abc import AsyncIterator, Sequence
+from datetime import UTC, datetime
+
+from aioboto3 import Session
+from botocore.exceptions import ClientError
+from pydantic import AwareDatetime
+
+from unpage.models import LogLine
+from unpage.plugins.aws.clients import AwsClientPool
+
+# Stop reading logs after this many bytes of messages, which keeps the results
+# a reasonable size for an LLM, and bounds the number of pages that are read.
+DEFAULT_MAX_LOG_BYTES = 256 * 1024
+
+# Stop reading logs after this many FilterLogEvents requests. FilterLogEvents
+# can return many empty pages with a nextToken while it searches a large log
+# group, which the byte budget alone doesn't bound.
+DEFAULT_MAX_LOG_REQUESTS = 50
+
+MAX_EVENTS_PER_PAGE = 1000
+
+
+async def iter_cloudwatch_log_events(
+    clients: AwsClientPool,
+    session: Session,
+    region: str | None,
+    log_group_names: Sequence[str],
+    time_range_start: AwareDatetime,
+    time_range_end: AwareDatetime,
+    filter_pattern: str | None = None,
+    max_bytes: int = DEFAULT_MAX_LOG_BYTES,
+    max_requests: int = DEFAULT_MAX_LOG_REQUESTS,
+) -> AsyncIterator[LogLine]:
+    """Stream the events of CloudWatch log groups with FilterLogEvents, one page at a time.
+
+    Log groups that don't exist (e.g. a log type that was never exported) are
+    skipped. Reading stops once max_bytes of messages have been yielded, or
+    after max_requests requests across all of the log groups.
+    """
+    remaining_bytes = max_bytes
+    remaining_requests = max_requests
+    async with clients.client(session, "logs", region) as client:
+        for log_group_name in log_group_names:
+            params = {
+                "logGroupName": log_group_name,
+                "startTime": int(time_range_start.timestamp() * 1000),
+                "endTime": int(time_range_end.timestamp() * 1000),
+                "limit": MAX_EVENTS_PER_PAGE,
+            }
+            if filter_pattern:
+                params["filterPattern"] = filter_pattern
+
+            while True:
+                if remaining_requests <= 0:
+                    return
+                remaining_requests -= 1
+                try:
+                    response = await client.filter_log_events(**params)
+                except ClientError as e:
+                    if e.response.get("Error", {}).get("Code") == "ResourceNotFoundException":
+                        break
+                    raise
+
+                for event in response.get("events", []):
+                    message = event["message"].rstrip("\n")
+                    remaining_bytes -= len(message.encode())
+                    if remaining_bytes < 0:
+                        return
+                    yield LogLine(
+                        time=datetime.fromtimestamp(event["timestamp"] / 1000, UTC),
+                        log=message,
+                    )
+
+                if not response.get("nextToken"):
+                    break
+                params["nextToken"] = response["nextToken"]
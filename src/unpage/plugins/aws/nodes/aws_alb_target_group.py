@@ -1,4 +1,3 @@
-from aiobotocore.config import AioConfig
 from botocore.exceptions import ClientError
 
 from unpage.plugins.aws.arn.arn import AwsArn
@@ -25,6 +24,10 @@ class AwsAlbTargetGroup(AwsNode):
         ]
 
     async def _get_targets(self) -> list[tuple[str, str]]:
+        if self._clients is None:
+            # Target health can only be described with an AWS plugin's clients,
+            # e.g. not when merging graphs without the AWS plugin enabled.
+            return []
         try:
             arn = AwsArn.parse(self.node_id)
         except ValueError as ex:
@@ -32,11 +35,9 @@ class AwsAlbTargetGroup(AwsNode):
             return []
         async with (
             swallow_boto_client_access_errors(service_name="elbv2", region=arn.region),
-            self.session.client(
-                "elbv2",
-                region_name=arn.region,
-                config=AioConfig(retries={"max_attempts": 10, "mode": "adaptive"}),
-            ) as client,
+            # Target health is described for every target group during edge
+            # inference, and the pool's clients retry throttled requests.
+            self.clients.client(self.session, "elbv2", arn.region) as client,
         ):
             try:
                 resp = await client.describe_target_health(TargetGroupArn=self.node_id)
@@ -1,12 +1,9 @@
-from pydantic import AwareDatetime
+from unpage.plugins.aws.cloudwatch import CloudWatchMetricQuery
 
-from unpage.knowledge import HasMetrics
-from unpage.models import Observation
+from .base import AwsNode, HasCloudWatchMetrics
 
-from .base import AwsNode
 
-
-class AwsApplicationLoadBalancer(AwsNode, HasMetrics):
+class AwsApplicationLoadBalancer(AwsNode, HasCloudWatchMetrics):
     async def get_identifiers(self) -> list[str | None]:
         return [
             *await super().get_identifiers(),
@@ -36,12 +33,7 @@ class AwsApplicationLoadBalancer(AwsNode, HasMetrics):
             "TargetResponseTime",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: AwareDatetime,
-        time_range_end: AwareDatetime,
-    ) -> list[Observation] | str:
+    def get_cloudwatch_metric_query(self, metric_name: str) -> CloudWatchMetricQuery:
         # Define appropriate statistics based on metric type
         if metric_name in [
             "RequestCount",
@@ -62,17 +54,14 @@ class AwsApplicationLoadBalancer(AwsNode, HasMetrics):
             # Default statistics for other metrics
             statistics = ["Sum", "Average", "Minimum", "Maximum"]
 
-        return await self._get_cloudwatch_metric_for_accessible_regions(
-            Namespace="AWS/ApplicationELB",
-            MetricName=metric_name,
-            Dimensions=[
+        return CloudWatchMetricQuery(
+            namespace="AWS/ApplicationELB",
+            metric_name=metric_name,
+            dimensions=[
                 {
                     "Name": "LoadBalancer",
                     "Value": self.raw_data["LoadBalancerArn"].split("loadbalancer/")[1],
                 }
             ],
-            StartTime=time_range_start,
-            EndTime=time_range_end,
-            Period=300,
-            Statistics=statistics,
+            statistics=statistics,
         )
@@ -1,12 +1,9 @@
-from pydantic import AwareDatetime
+from unpage.plugins.aws.cloudwatch import CloudWatchMetricQuery
 
-from unpage.knowledge import HasMetrics
-from unpage.models import Observation
+from .base import AwsNode, HasCloudWatchMetrics
 
-from .base import AwsNode
 
-
-class AwsClassicLoadBalancer(AwsNode, HasMetrics):
+class AwsClassicLoadBalancer(AwsNode, HasCloudWatchMetrics):
     async def get_identifiers(self) -> list[str | None]:
         return [
             *await super().get_identifiers(),
@@ -37,12 +34,7 @@ class AwsClassicLoadBalancer(AwsNode, HasMetrics):
             "Latency",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: AwareDatetime,
-        time_range_end: AwareDatetime,
-    ) -> list[Observation] | str:
+    def get_cloudwatch_metric_query(self, metric_name: str) -> CloudWatchMetricQuery:
         # Define appropriate statistics based on metric type
         if metric_name in [
             "RequestCount",
@@ -63,17 +55,14 @@ class AwsClassicLoadBalancer(AwsNode, HasMetrics):
             # Default statistics for other metrics
             statistics = ["Sum", "Average", "Minimum", "Maximum"]
 
-        return await self._get_cloudwatch_metric_for_accessible_regions(
-            Namespace="AWS/ELB",
-            MetricName=metric_name,
-            Dimensions=[
+        return CloudWatchMetricQuery(
+            namespace="AWS/ELB",
+            metric_name=metric_name,
+            dimensions=[
                 {
                     "Name": "LoadBalancerName",
                     "Value": self.raw_data["LoadBalancerName"],
                 }
             ],
-            StartTime=time_range_start,
-            EndTime=time_range_end,
-            Period=300,
-            Statistics=statistics,
+            statistics=statistics,
         )
@@ -1,11 +1,8 @@
-from pydantic import AwareDatetime
+from unpage.plugins.aws.cloudwatch import CloudWatchMetricQuery
+from unpage.plugins.aws.nodes.base import AwsNode, HasCloudWatchMetrics
 
-from unpage.knowledge import HasMetrics
-from unpage.models import Observation
-from unpage.plugins.aws.nodes.base import AwsNode
 
-
-class AwsEc2Instance(AwsNode, HasMetrics):
+class AwsEc2Instance(AwsNode, HasCloudWatchMetrics):
     """An EC2 instance."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -39,18 +36,10 @@ class AwsEc2Instance(AwsNode, HasMetrics):
             "EBSWriteBytes",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: AwareDatetime,
-        time_range_end: AwareDatetime,
-    ) -> list[Observation] | str:
-        return await self._get_cloudwatch_metric_for_accessible_regions(
-            Namespace="AWS/EC2",
-            MetricName=metric_name,
-            Dimensions=[{"Name": "InstanceId", "Value": self.raw_data["InstanceId"]}],
-            StartTime=time_range_start,
-            EndTime=time_range_end,
-            Period=300,
-            Statistics=["Average", "Minimum", "Maximum"],
+    def get_cloudwatch_metric_query(self, metric_name: str) -> CloudWatchMetricQuery:
+        return CloudWatchMetricQuery(
+            namespace="AWS/EC2",
+            metric_name=metric_name,
+            dimensions=[{"Name": "InstanceId", "Value": self.raw_data["InstanceId"]}],
+            statistics=["Average", "Minimum", "Maximum"],
         )
@@ -1,12 +1,9 @@
-from pydantic import AwareDatetime
+from unpage.plugins.aws.cloudwatch import CloudWatchMetricQuery
 
-from unpage.knowledge import HasMetrics
-from unpage.models import Observation
+from .base import AwsNode, HasCloudWatchLogs, HasCloudWatchMetrics
 
-from .base import AwsNode
 
-
-class AwsRdsDatabase(AwsNode, HasMetrics):
+class AwsRdsDatabase(AwsNode, HasCloudWatchMetrics, HasCloudWatchLogs):
     """An RDS database."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -47,23 +44,26 @@ class AwsRdsDatabase(AwsNode, HasMetrics):
             "WriteThroughput",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: AwareDatetime,
-        time_range_end: AwareDatetime,
-    ) -> list[Observation] | str:
-        return await self._get_cloudwatch_metric_for_accessible_regions(
-            Namespace="AWS/RDS",
-            MetricName=metric_name,
-            Dimensions=[
+    def get_cloudwatch_metric_query(self, metric_name: str) -> CloudWatchMetricQuery:
+        return CloudWatchMetricQuery(
+            namespace="AWS/RDS",
+            metric_name=metric_name,
+            dimensions=[
                 {
                     "Name": "DBInstanceIdentifier",
                     "Value": self.raw_data["DBInstanceIdentifier"],
                 }
             ],
-            StartTime=time_range_start,
-            EndTime=time_range_end,
-            Period=300,
-            Statistics=["Average", "Minimum", "Maximum"],
+            statistics=["Average", "Minimum", "Maximum"],
         )
+
+    def get_cloudwatch_log_group_names(self) -> list[str]:
+        # Aurora exports the logs of all of a cluster's instances to the cluster's log groups.
+        if cluster_identifier := self.raw_data.get("DBClusterIdentifier"):
+            prefix = f"/aws/rds/cluster/{cluster_identifier}"
+        else:
+            prefix = f"/aws/rds/instance/{self.raw_data['DBInstanceIdentifier']}"
+        return [
+            f"{prefix}/{log_type}"
+            for log_type in self.raw_data.get("EnabledCloudwatchLogsExports", [])
+        ]
@@ -1,12 +1,9 @@
-from pydantic import AwareDatetime
+from unpage.plugins.aws.cloudwatch import CloudWatchMetricQuery
 
-from unpage.knowledge import HasMetrics
-from unpage.models import Observation
+from .base import AwsNode, HasCloudWatchMetrics
 
-from .base import AwsNode
 
-
-class AwsS3Bucket(AwsNode, HasMetrics):
+class AwsS3Bucket(AwsNode, HasCloudWatchMetrics):
     """An S3 bucket."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -39,12 +36,7 @@ class AwsS3Bucket(AwsNode, HasMetrics):
             "ListRequests",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: AwareDatetime,
-        time_range_end: AwareDatetime,
-    ) -> list[Observation] | str:
+    def get_cloudwatch_metric_query(self, metric_name: str) -> CloudWatchMetricQuery:
         # S3 metrics are available in CloudWatch with different namespaces
         # BucketSizeBytes and NumberOfObjects are in AWS/S3 namespace
         # Request metrics are in AWS/S3 namespace as well
@@ -68,14 +60,11 @@ class AwsS3Bucket(AwsNode, HasMetrics):
                 }
             ]
 
-        return await self._get_cloudwatch_metric_for_accessible_regions(
-            Namespace="AWS/S3",
-            MetricName=metric_name,
-            Dimensions=dimensions,
-            StartTime=time_range_start,
-            EndTime=time_range_end,
-            Period=300,
-            Statistics=["Average", "Minimum", "Maximum"]
+        return CloudWatchMetricQuery(
+            namespace="AWS/S3",
+            metric_name=metric_name,
+            dimensions=dimensions,
+            statistics=["Average", "Minimum", "Maximum"]
             if metric_name not in ["BucketSizeBytes", "NumberOfObjects"]
             else ["Average"],
         )
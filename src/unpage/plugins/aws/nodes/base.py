@@ -1,18 +1,14 @@
-import asyncio
-from collections import defaultdict
-from datetime import datetime
-from typing import TYPE_CHECKING, Any
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, cast
 
 from aioboto3 import Session
 from pydantic import BaseModel, Field
 
-from unpage.knowledge import Node
-from unpage.models import Observation
-from unpage.plugins.aws.utils import (
-    ensure_aws_session,
-    list_accessible_regions_for_service,
-    swallow_boto_client_access_errors,
-)
+from unpage.knowledge import HasLogs, HasMetrics, Node
+from unpage.models import LogLine, Observation
+from unpage.plugins.aws.clients import AwsClientPool, get_session
+from unpage.plugins.aws.cloudwatch import CloudWatchMetricQuery, get_cloudwatch_metrics
+from unpage.plugins.aws.logs import iter_cloudwatch_log_events
 
 if TYPE_CHECKING:
     from pydantic import AwareDatetime
@@ -27,11 +23,13 @@ DEFAULT_AWS_ACCOUNT_NAME = "default"
 class AwsAccount(BaseModel):
     name: str | None = Field(default=DEFAULT_AWS_ACCOUNT_NAME)
     profile: str | None = Field(default=None)
+    role_arn: str | None = Field(default=None)
+    external_id: str | None = Field(default=None)
 
     @property
     def session(self) -> Session:
         if not hasattr(self, "_session"):
-            self._session = Session(profile_name=self.profile) if self.profile else Session()
+            self._session = get_session(self.profile, self.role_arn, self.external_id)
         return self._session
 
 
@@ -39,6 +37,17 @@ class AwsNode(Node):
     """A base class for all AWS nodes."""
 
     aws_account: AwsAccount = Field()
+    aws_region: str | None = Field(default=None)
+
+    # Set by the AwsPlugin the node belongs to (see AwsPlugin.bind_node).
+    _clients: AwsClientPool | None = None
+
+    @property
+    def clients(self) -> AwsClientPool:
+        """The client pool of the AwsPlugin the node belongs to."""
+        if self._clients is None:
+            raise RuntimeError(f"AWS node {self.nid} isn't bound to an AWS plugin")
+        return self._clients
 
     @property
     def session(self) -> Session:
@@ -46,63 +55,65 @@ class AwsNode(Node):
             self._session = self.aws_account.session
         return self._session
 
-    async def _get_cloudwatch_metric_for_accessible_regions(
+
+class HasCloudWatchMetrics(HasMetrics):
+    """Capability for AWS nodes whose metrics are retrieved from CloudWatch."""
+
+    def get_cloudwatch_metric_query(self, metric_name: str) -> CloudWatchMetricQuery:
+        """Return the CloudWatch metric and statistics to retrieve for a metric name."""
+        raise NotImplementedError
+
+    async def get_metric(
+        self,
+        metric_name: str,
+        time_range_start: "AwareDatetime",
+        time_range_end: "AwareDatetime",
+    ) -> list[Observation] | str:
+        return await self.get_metrics(time_range_start, time_range_end, [metric_name])
+
+    async def get_metrics(
         self,
-        **cloudwatch_params: Any,
-    ) -> list[Observation]:
-        await ensure_aws_session(self.session)
-        accessible_regions = await list_accessible_regions_for_service(self.session, "cloudwatch")
-
-        # We don't know which region a given resource is in, so check all regions
-        # in parallel.
-        observation_results = await asyncio.gather(
-            *(
-                self._get_cloudwatch_metric_for_region(region, **cloudwatch_params)
-                for region in accessible_regions
-            )
+        time_range_start: "AwareDatetime",
+        time_range_end: "AwareDatetime",
+        metric_names: list[str] | None = None,
+    ) -> list[Observation] | str:
+        """Retrieve all the requested metrics in as few GetMetricData calls as possible."""
+        metric_names = metric_names or await self.list_available_metrics()
+        return await get_cloudwatch_metrics(
+            cast("AwsNode", self).clients,
+            [
+                (
+                    cast("AwsNode", self),
+                    [self.get_cloudwatch_metric_query(m) for m in metric_names],
+                )
+            ],
+            time_range_start,
+            time_range_end,
         )
 
-        # Flatten into a list of observations
-        observations = []
-        [observations.extend(result) for result in observation_results]
-        return observations
 
-    async def _get_cloudwatch_metric_for_region(
+class HasCloudWatchLogs(HasLogs):
+    """Capability for AWS nodes whose logs are in CloudWatch Logs."""
+
+    def get_cloudwatch_log_group_names(self) -> list[str]:
+        """Return the names of the log groups the node's logs are in."""
+        raise NotImplementedError
+
+    async def iter_logs(
         self,
-        region: str,
-        **cloudwatch_params: Any,
-    ) -> list[Observation]:
-        metric_name = cloudwatch_params.get("MetricName", "UnknownMetric")
-        async with (
-            swallow_boto_client_access_errors(service_name="cloudwatch", region=region),
-            self.session.client("cloudwatch", region_name=region) as client,
+        time_range_start: "AwareDatetime",
+        time_range_end: "AwareDatetime",
+        filter_pattern: str | None = None,
+    ) -> AsyncIterator[LogLine]:
+        """Stream the node's log events, optionally matching a CloudWatch Logs filter pattern."""
+        node = cast("AwsNode", self)
+        async for line in iter_cloudwatch_log_events(
+            node.clients,
+            node.session,
+            node.aws_region,
+            self.get_cloudwatch_log_group_names(),
+            time_range_start,
+            time_range_end,
+            filter_pattern=filter_pattern,
         ):
-            result = await client.get_metric_statistics(**cloudwatch_params)
-            observations: list[Observation] = []
-            datapoints: list[dict[str, Any]] = result.get("Datapoints", [])
-            if datapoints:
-                series: defaultdict[str, dict[AwareDatetime, float]] = defaultdict(dict)
-
-                for point in datapoints:
-                    dt = point.get("Timestamp")
-                    if not isinstance(dt, datetime):
-                        raise ValueError(f"Timestamp is not a datetime: {dt}")
-
-                    # Each point can have multiple values - Average, Minimum,
-                    # Maximum, etc. Create a series for each.
-                    for key, value in point.items():
-                        if key not in ["Timestamp", "Unit"]:
-                            series[key][dt] = float(value)
-
-                # Now that we have collected the values for each series,
-                # convert them into Observations.
-                for key, data in series.items():
-                    observations.append(
-                        Observation(
-                            node_id=self.nid,
-                            observation_type=f"{key} {metric_name}",
-                            data=data,
-                        )
-                    )
-
-            return observations
+            yield line
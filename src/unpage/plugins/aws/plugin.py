@@ -1,18 +1,23 @@
 import warnings
-from collections.abc import AsyncGenerator
-from typing import Any, Literal
+from collections import Counter, defaultdict
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from typing import Any, Literal, get_args
 
 import anyio
 import boto3.session
 import rich
 from aioboto3 import Session
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import AwareDatetime, BaseModel, Field, ValidationError
 from pydantic_core import to_jsonable_python
 
 from unpage.config import PluginSettings
-from unpage.knowledge import Graph
+from unpage.knowledge import Graph, Node
+from unpage.models import LogLine, Observation
 from unpage.plugins import Plugin
 from unpage.plugins.aptible.nodes.aptible_aws_instance import AptibleAwsInstance
+from unpage.plugins.aws.clients import AwsClientPool, get_session
+from unpage.plugins.aws.cloudwatch import CloudWatchMetricQuery, get_cloudwatch_metrics
+from unpage.plugins.aws.inventory import iter_config_aggregator_resources
 from unpage.plugins.aws.nodes.aws_alb_target_group import AwsAlbTargetGroup
 from unpage.plugins.aws.nodes.aws_application_load_balancer import (
     AwsApplicationLoadBalancer,
@@ -22,7 +27,15 @@ from unpage.plugins.aws.nodes.aws_ebs_volume import AwsEbsVolume
 from unpage.plugins.aws.nodes.aws_ec2_instance import AwsEc2Instance
 from unpage.plugins.aws.nodes.aws_rds_database import AwsRdsDatabase
 from unpage.plugins.aws.nodes.aws_s3_bucket import AwsS3Bucket
-from unpage.plugins.aws.nodes.base import DEFAULT_AWS_ACCOUNT_NAME, AwsAccount
+from unpage.plugins.aws.nodes.base import (
+    DEFAULT_AWS_ACCOUNT_NAME,
+    AwsAccount,
+    AwsNode,
+    HasCloudWatchLogs,
+    HasCloudWatchMetrics,
+)
+from unpage.plugins.aws.status import get_db_instance_statuses, get_instance_statuses
+from unpage.plugins.aws.tagging import list_tagged_resources, matches_tag_filters
 from unpage.plugins.aws.utils import (
     ensure_aws_session,
     list_accessible_regions_for_service,
@@ -31,6 +44,46 @@ from unpage.plugins.aws.utils import (
 from unpage.plugins.mixins import KnowledgeGraphMixin, McpServerMixin, tool
 from unpage.utils import Choice, classproperty, confirm, print, select
 
+AwsResourceType = Literal[
+    "rds_databases",
+    "ec2_instances",
+    "classic_load_balancers",
+    "application_load_balancers",
+    "alb_target_groups",
+    "ebs_volumes",
+    "s3_buckets",
+]
+ALL_RESOURCE_TYPES: list[AwsResourceType] = list(get_args(AwsResourceType))
+
+# The resource types read from AWS Config, with their node class and the key of their node ID.
+CONFIG_RESOURCE_TYPES: dict[str, tuple[AwsResourceType, type[AwsNode], str]] = {
+    "AWS::EC2::Instance": ("ec2_instances", AwsEc2Instance, "InstanceId"),
+    "AWS::EC2::Volume": ("ebs_volumes", AwsEbsVolume, "VolumeId"),
+    "AWS::ElasticLoadBalancing::LoadBalancer": (
+        "classic_load_balancers",
+        AwsClassicLoadBalancer,
+        "LoadBalancerName",
+    ),
+    "AWS::ElasticLoadBalancingV2::LoadBalancer": (
+        "application_load_balancers",
+        AwsApplicationLoadBalancer,
+        "LoadBalancerArn",
+    ),
+    "AWS::RDS::DBInstance": ("rds_databases", AwsRdsDatabase, "DBInstanceArn"),
+    "AWS::S3::Bucket": ("s3_buckets", AwsS3Bucket, "Name"),
+}
+
+# The Resource Groups Tagging API type of each resource type, for tag filters.
+TAGGING_RESOURCE_TYPES: dict[AwsResourceType, str] = {
+    "rds_databases": "rds:db",
+    "ec2_instances": "ec2:instance",
+    "classic_load_balancers": "elasticloadbalancing:loadbalancer",
+    "application_load_balancers": "elasticloadbalancing:loadbalancer",
+    "alb_target_groups": "elasticloadbalancing:targetgroup",
+    "ebs_volumes": "ec2:volume",
+    "s3_buckets": "s3:bucket",
+}
+
 warnings.filterwarnings(
     "ignore",
     category=DeprecationWarning,
@@ -38,13 +91,49 @@ warnings.filterwarnings(
 )
 
 
+# The role AWS Organizations creates in member accounts for the management account.
+DEFAULT_ORGANIZATION_ROLE_NAME = "OrganizationAccountAccessRole"
+
+
+class AwsOrganizationSettings(BaseModel):
+    """Discover the accounts of an AWS Organization, and scan them by assuming a role in each."""
+
+    profile: str | None = Field(default=None)
+    role_name: str = Field(default=DEFAULT_ORGANIZATION_ROLE_NAME)
+    external_id: str | None = Field(default=None)
+    exclude_accounts: list[str] = Field(default_factory=list)
+
+
+class AwsConfigAggregatorSettings(BaseModel):
+    """Read the inventory from an AWS Config aggregator, instead of listing each resource type in each region."""
+
+    name: str
+    region: str = Field(default="us-east-1")
+    profile: str | None = Field(default=None)
+    role_arn: str | None = Field(default=None)
+
+    @property
+    def session(self) -> Session:
+        return get_session(self.profile, self.role_arn)
+
+
 class AwsPluginSettings(BaseModel):
     accounts: dict[str, AwsAccount] = Field(
         default_factory=lambda: {DEFAULT_AWS_ACCOUNT_NAME: AwsAccount()}
     )
+    organization: AwsOrganizationSettings | None = Field(default=None)
+    config_aggregator: AwsConfigAggregatorSettings | None = Field(default=None)
+    max_concurrent_accounts: int = Field(default=4, ge=1)
+    max_concurrent_regions: int = Field(default=32, ge=1)
+    regions: list[str] | None = Field(default=None)
+    resource_types: list[AwsResourceType] = Field(default_factory=lambda: list(ALL_RESOURCE_TYPES))
+    tag_filters: dict[str, list[str]] = Field(default_factory=dict)
 
     @property
     def account(self) -> AwsAccount:
+        if not self.accounts:
+            # Only organization accounts are scanned, so default to the organization's credentials.
+            return AwsAccount(profile=self.organization.profile if self.organization else None)
         return next(iter(self.accounts.values()))
 
 
@@ -56,35 +145,58 @@ class AwsPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
     ) -> None:
         super().__init__(*args, **kwargs)
         self.aws_settings = aws_settings if aws_settings else AwsPluginSettings()
+        # The long-lived AWS clients used by the plugin and its nodes, closed with the plugin.
+        self.clients = AwsClientPool()
+        self._accounts: list[AwsAccount] = []
+        self._tagged_resources: dict[tuple[Session, str], set[str]] = {}
+        self._tagged_resources_locks: defaultdict[tuple[Session, str], anyio.Lock] = defaultdict(
+            anyio.Lock
+        )
 
     def init_plugin(self) -> None:
         aws_accounts = self._settings.get("accounts")
-        if not aws_accounts:
-            self.aws_settings = AwsPluginSettings()
-            return
-        if not isinstance(aws_accounts, dict):
+        if aws_accounts and not isinstance(aws_accounts, dict):
             raise ValueError("aws accounts must be a dictionary in config.yaml")
-        if len(aws_accounts) != 1:
-            raise ValueError(
-                "More than one AWS account configured in config.yaml; we only support one AWS account at this time. Please let us know if you have more than one aws account."
-            )
-        for account_name, account_settings in aws_accounts.items():
+
+        accounts: dict[str, AwsAccount] = {}
+        for account_name, account_settings in (aws_accounts or {}).items():
             try:
-                self.aws_settings = AwsPluginSettings(
-                    accounts={
-                        account_name: AwsAccount(
-                            **{"name": account_name, **to_jsonable_python(account_settings)}
-                        )
-                    }
+                accounts[account_name] = AwsAccount(
+                    **{"name": account_name, **to_jsonable_python(account_settings)}
                 )
             except ValidationError as ex:
                 raise ValueError(
                     f"Invalid AWS account settings for aws account '{account_name}'. Review your config.yaml. {account_settings=}; error={ex!s}"
                 ) from ex
 
+        settings: dict[str, Any] = {
+            key: self._settings[key]
+            for key in (
+                "organization",
+                "config_aggregator",
+                "max_concurrent_accounts",
+                "max_concurrent_regions",
+                "regions",
+                "resource_types",
+                "tag_filters",
+            )
+            if self._settings.get(key) is not None
+        }
+        if accounts:
+            settings["accounts"] = accounts
+        elif settings.get("organization"):
+            # Only scan the accounts discovered from the organization.
+            settings["accounts"] = {}
+        try:
+            self.aws_settings = AwsPluginSettings(**settings)
+        except ValidationError as ex:
+            raise ValueError(
+                f"Invalid AWS plugin settings. Review your config.yaml. error={ex!s}"
+            ) from ex
+
     async def validate_plugin_config(self) -> None:
         await super().validate_plugin_config()
-        await ensure_aws_session(self.session)
+        await ensure_aws_session(self.clients, self.session)
 
     @classproperty
     def default_plugin_settings(cls) -> PluginSettings:
@@ -141,198 +253,524 @@ class AwsPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
             self._session = self.aws_settings.account.session
         return self._session
 
+    async def close(self) -> None:
+        await super().close()
+        await self.clients.close()
+
+    def bind_node(self, node: Node) -> None:
+        if isinstance(node, AwsNode):
+            node._clients = self.clients
+
+    def get_build_stats(self) -> dict[str, Any]:
+        account_names = {account.session: account.name for account in self._accounts}
+        rate_limits = {
+            f"{account_names.get(session, DEFAULT_AWS_ACCOUNT_NAME)} {service_name} {region}": (
+                limiter.stats().model_dump()
+            )
+            for (session, service_name, region), limiter in self.clients.rate_limiters.items()
+        }
+        return {"rate_limits": rate_limits} if rate_limits else {}
+
     async def populate_graph(self, graph: Graph) -> None:
-        await ensure_aws_session(self.session)
+        accounts = self._accounts = await self.list_accounts()
+        account_limiter = anyio.CapacityLimiter(self.aws_settings.max_concurrent_accounts)
+
+        # Log in to each profile before assuming roles with it, rather than in every account.
+        for profile in {account.profile for account in accounts if account.role_arn}:
+            await ensure_aws_session(self.clients, get_session(profile))
+
+        async def _populate_account_with_limit(account: AwsAccount) -> None:
+            async with account_limiter:
+                try:
+                    await self.populate_account(graph, account)
+                except Exception as e:
+                    if len(accounts) == 1:
+                        raise
+                    # Keep scanning the other accounts when one of them isn't accessible.
+                    print(f"Error populating AWS account {account.name}: {e!s}")
+
         async with anyio.create_task_group() as tg:
-            tg.start_soon(self.populate_rds_databases, graph)
-            tg.start_soon(self.populate_ec2_instances, graph)
-            tg.start_soon(self.populate_classic_load_balancers, graph)
-            tg.start_soon(self.populate_application_load_balancers, graph)
-            tg.start_soon(self.populate_alb_target_groups, graph)
-            tg.start_soon(self.populate_ebs_volumes, graph)
-            tg.start_soon(self.populate_s3_buckets, graph)
-
-    async def populate_rds_databases(self, graph: Graph) -> None:
+            if self.aws_settings.config_aggregator:
+                tg.start_soon(self.populate_from_config_aggregator, graph, accounts)
+            for account in accounts:
+                tg.start_soon(_populate_account_with_limit, account)
+
+    async def populate_account(self, graph: Graph, account: AwsAccount) -> None:
+        await ensure_aws_session(self.clients, account.session)
+        print(f"Populating resources for AWS account {account.name}")
+        populators: dict[AwsResourceType, Callable[[Graph, AwsAccount], Awaitable[None]]] = {
+            "rds_databases": self.populate_rds_databases,
+            "ec2_instances": self.populate_ec2_instances,
+            "classic_load_balancers": self.populate_classic_load_balancers,
+            "application_load_balancers": self.populate_application_load_balancers,
+            "alb_target_groups": self.populate_alb_target_groups,
+            "ebs_volumes": self.populate_ebs_volumes,
+            "s3_buckets": self.populate_s3_buckets,
+        }
         async with anyio.create_task_group() as tg:
-            for region in await list_accessible_regions_for_service(self.session, "rds"):
-                tg.start_soon(self._populate_rds_databases_in_region, graph, region)
+            for resource_type in self.aws_settings.resource_types:
+                # The other resource types are read from the Config aggregator.
+                if self.aws_settings.config_aggregator and resource_type != "alb_target_groups":
+                    continue
+                tg.start_soon(populators[resource_type], graph, account)
+
+    async def populate_from_config_aggregator(
+        self, graph: Graph, accounts: list[AwsAccount]
+    ) -> None:
+        """Populate every supported resource type, in every account and region, from AWS Config."""
+        aggregator = self.aws_settings.config_aggregator
+        if not aggregator:
+            return
+        await ensure_aws_session(self.clients, aggregator.session)
+        print(f"Populating resources from the {aggregator.name} AWS Config aggregator")
 
-    async def _populate_rds_databases_in_region(self, graph: Graph, region: str) -> None:
-        print(f"Populating RDS databases from {region}")
+        # Attach each resource to the configured account it belongs to, so that
+        # its metrics and status are retrieved with that account's credentials.
+        accounts_by_id: dict[str, AwsAccount] = {}
+
+        async def _get_account_id(account: AwsAccount) -> None:
+            try:
+                async with self.clients.client(account.session, "sts") as client:
+                    accounts_by_id[(await client.get_caller_identity())["Account"]] = account
+            except Exception as e:
+                print(f"Unable to get the ID of AWS account {account.name}: {e!s}")
+
+        async with anyio.create_task_group() as tg:
+            for account in accounts:
+                tg.start_soon(_get_account_id, account)
+
+        config_resource_types = [
+            config_resource_type
+            for config_resource_type, (resource_type, _, _) in CONFIG_RESOURCE_TYPES.items()
+            if resource_type in self.aws_settings.resource_types
+        ]
+        if not config_resource_types:
+            return
+
+        resource_counts: Counter[str] = Counter()
+        async for resource in iter_config_aggregator_resources(
+            self.clients,
+            aggregator.session,
+            aggregator.name,
+            aggregator.region,
+            config_resource_types,
+            regions=self.aws_settings.regions,
+        ):
+            _, node_class, id_key = CONFIG_RESOURCE_TYPES[resource.resource_type]
+            node_id = resource.configuration.get(id_key)
+            if not node_id or not matches_tag_filters(resource.tags, self.aws_settings.tag_filters):
+                continue
+            await graph.add_node(
+                node_class(
+                    node_id=node_id,
+                    raw_data=resource.configuration,
+                    _graph=graph,
+                    aws_account=accounts_by_id.get(
+                        resource.account_id,
+                        AwsAccount(
+                            name=resource.account_id,
+                            profile=aggregator.profile,
+                            role_arn=aggregator.role_arn,
+                        ),
+                    ),
+                    aws_region=resource.region,
+                )
+            )
+            resource_counts[resource.resource_type] += 1
+
+        for resource_type, count in sorted(resource_counts.items()):
+            print(f"Initialized {count} {resource_type} resources from AWS Config")
+
+    async def list_accounts(self) -> list[AwsAccount]:
+        """Return the configured accounts, and the accounts discovered from the organization."""
+        accounts = list(self.aws_settings.accounts.values())
+        organization = self.aws_settings.organization
+        if not organization:
+            return accounts
+
+        session = get_session(organization.profile)
+        await ensure_aws_session(self.clients, session)
+        async with self.clients.client(session, "sts") as client:
+            caller_account_id = (await client.get_caller_identity())["Account"]
+
+        configured = {(account.profile, account.role_arn) for account in accounts}
+        async with self.clients.client(session, "organizations") as client:
+            paginator = client.get_paginator("list_accounts")
+            async for page in paginator.paginate():
+                for org_account in page["Accounts"]:
+                    account_id = org_account["Id"]
+                    if org_account["Status"] != "ACTIVE" or account_id in (
+                        organization.exclude_accounts
+                    ):
+                        continue
+                    # The organization's own account is scanned with its credentials directly.
+                    role_arn = (
+                        None
+                        if account_id == caller_account_id
+                        else f"arn:aws:iam::{account_id}:role/{organization.role_name}"
+                    )
+                    if (organization.profile, role_arn) in configured:
+                        continue
+                    accounts.append(
+                        AwsAccount(
+                            name=org_account.get("Name") or account_id,
+                            profile=organization.profile,
+                            role_arn=role_arn,
+                            external_id=organization.external_id if role_arn else None,
+                        )
+                    )
+
+        print(f"Found {len(accounts)} AWS accounts to scan")
+        return accounts
+
+    async def _scan_region(
+        self,
+        populate: Callable[[Graph, AwsAccount, str], Awaitable[None]],
+        graph: Graph,
+        account: AwsAccount,
+        region: str,
+    ) -> None:
+        # Bound the number of regions scanned at once, across all of the accounts.
+        if not hasattr(self, "_region_limiter"):
+            self._region_limiter = anyio.CapacityLimiter(self.aws_settings.max_concurrent_regions)
+        async with self._region_limiter:
+            await populate(graph, account, region)
+
+    async def _list_regions(self, account: AwsAccount, service_name: str) -> list[str]:
+        """Return the regions to scan for a service, limited to the configured regions."""
+        return await list_accessible_regions_for_service(
+            self.clients, account.session, service_name, regions=self.aws_settings.regions
+        )
+
+    async def _get_tagged_resources(self, account: AwsAccount, region: str) -> set[str] | None:
+        """Return the resources in a region that match the tag filters, or None when there aren't any tag filters.
+
+        The resources of every selected type are listed with one set of
+        Resource Groups Tagging API calls per account and region.
+        """
+        tag_filters = self.aws_settings.tag_filters
+        if not tag_filters:
+            return None
+        key = (account.session, region)
+        async with self._tagged_resources_locks[key]:
+            if key not in self._tagged_resources:
+                self._tagged_resources[key] = await list_tagged_resources(
+                    self.clients,
+                    account.session,
+                    region,
+                    tag_filters,
+                    [TAGGING_RESOURCE_TYPES[t] for t in self.aws_settings.resource_types],
+                )
+            return self._tagged_resources[key]
+
+    async def populate_rds_databases(self, graph: Graph, account: AwsAccount) -> None:
+        async with anyio.create_task_group() as tg:
+            for region in await self._list_regions(account, "rds"):
+                tg.start_soon(
+                    self._scan_region,
+                    self._populate_rds_databases_in_region,
+                    graph,
+                    account,
+                    region,
+                )
+
+    async def _populate_rds_databases_in_region(
+        self, graph: Graph, account: AwsAccount, region: str
+    ) -> None:
+        print(f"Populating RDS databases from {account.name} in {region}")
+        tagged_resources = await self._get_tagged_resources(account, region)
 
         rds_database_count = 0
-        async for page in self._paginate("rds", "describe_db_instances", region):
+        async for page in self._paginate(account, "rds", "describe_db_instances", region):
             for instance in page["DBInstances"]:
+                if (
+                    tagged_resources is not None
+                    and instance["DBInstanceArn"] not in tagged_resources
+                ):
+                    continue
                 await graph.add_node(
                     AwsRdsDatabase(
                         node_id=instance["DBInstanceArn"],
                         raw_data=instance,
                         _graph=graph,
-                        aws_account=self.aws_settings.account,
+                        aws_account=account,
+                        aws_region=region,
                     )
                 )
                 rds_database_count += 1
 
-        print(f"Initialized {rds_database_count} RDS databases for {region}")
+        print(f"Initialized {rds_database_count} RDS databases for {account.name} in {region}")
 
-    async def populate_ec2_instances(self, graph: Graph) -> None:
+    async def populate_ec2_instances(self, graph: Graph, account: AwsAccount) -> None:
         async with anyio.create_task_group() as tg:
-            for region in await list_accessible_regions_for_service(self.session, "ec2"):
-                tg.start_soon(self._populate_ec2_instances_in_region, graph, region)
+            for region in await self._list_regions(account, "ec2"):
+                tg.start_soon(
+                    self._scan_region,
+                    self._populate_ec2_instances_in_region,
+                    graph,
+                    account,
+                    region,
+                )
 
-    async def _populate_ec2_instances_in_region(self, graph: Graph, region: str) -> None:
-        print(f"Populating EC2 instances from {region}")
+    async def _populate_ec2_instances_in_region(
+        self, graph: Graph, account: AwsAccount, region: str
+    ) -> None:
+        print(f"Populating EC2 instances from {account.name} in {region}")
+        tagged_resources = await self._get_tagged_resources(account, region)
 
         ec2_instance_count = 0
-        async for page in self._paginate("ec2", "describe_instances", region):
+        async for page in self._paginate(account, "ec2", "describe_instances", region):
             for reservation in page["Reservations"]:
                 for instance in reservation["Instances"]:
+                    if (
+                        tagged_resources is not None
+                        and instance["InstanceId"] not in tagged_resources
+                    ):
+                        continue
                     await graph.add_node(
                         AwsEc2Instance(
                             node_id=instance["InstanceId"],
                             raw_data=instance,
                             _graph=graph,
-                            aws_account=self.aws_settings.account,
+                            aws_account=account,
+                            aws_region=region,
                         )
                     )
                     ec2_instance_count += 1
 
-        print(f"Initialized {ec2_instance_count} EC2 instances for {region}")
+        print(f"Initialized {ec2_instance_count} EC2 instances for {account.name} in {region}")
 
-    async def populate_classic_load_balancers(self, graph: Graph) -> None:
+    async def populate_classic_load_balancers(self, graph: Graph, account: AwsAccount) -> None:
         async with anyio.create_task_group() as tg:
-            for region in await list_accessible_regions_for_service(self.session, "elb"):
-                tg.start_soon(self._populate_classic_load_balancers_in_region, graph, region)
+            for region in await self._list_regions(account, "elb"):
+                tg.start_soon(
+                    self._scan_region,
+                    self._populate_classic_load_balancers_in_region,
+                    graph,
+                    account,
+                    region,
+                )
 
-    async def _populate_classic_load_balancers_in_region(self, graph: Graph, region: str) -> None:
-        print(f"Populating classic load balancers from {region}")
+    async def _populate_classic_load_balancers_in_region(
+        self, graph: Graph, account: AwsAccount, region: str
+    ) -> None:
+        print(f"Populating classic load balancers from {account.name} in {region}")
+        tagged_resources = await self._get_tagged_resources(account, region)
 
         elb_count = 0
-        async for page in self._paginate("elb", "describe_load_balancers", region):
+        async for page in self._paginate(account, "elb", "describe_load_balancers", region):
             for balancer in page["LoadBalancerDescriptions"]:
+                if (
+                    tagged_resources is not None
+                    and balancer["LoadBalancerName"] not in tagged_resources
+                ):
+                    continue
                 await graph.add_node(
                     AwsClassicLoadBalancer(
                         node_id=balancer["LoadBalancerName"],
                         raw_data=balancer,
                         _graph=graph,
-                        aws_account=self.aws_settings.account,
+                        aws_account=account,
+                        aws_region=region,
                     )
                 )
                 elb_count += 1
 
-        print(f"Initialized {elb_count} classic load balancers for {region}")
+        print(f"Initialized {elb_count} classic load balancers for {account.name} in {region}")
 
-    async def populate_application_load_balancers(self, graph: Graph) -> None:
+    async def populate_application_load_balancers(self, graph: Graph, account: AwsAccount) -> None:
         async with anyio.create_task_group() as tg:
-            for region in await list_accessible_regions_for_service(self.session, "elbv2"):
-                tg.start_soon(self._populate_application_load_balancers_in_region, graph, region)
+            for region in await self._list_regions(account, "elbv2"):
+                tg.start_soon(
+                    self._scan_region,
+                    self._populate_application_load_balancers_in_region,
+                    graph,
+                    account,
+                    region,
+                )
 
     async def _populate_application_load_balancers_in_region(
-        self, graph: Graph, region: str
+        self, graph: Graph, account: AwsAccount, region: str
     ) -> None:
-        print(f"Populating application load balancers from {region}")
+        print(f"Populating application load balancers from {account.name} in {region}")
+        tagged_resources = await self._get_tagged_resources(account, region)
 
         alb_count = 0
-        async for page in self._paginate("elbv2", "describe_load_balancers", region):
+        async for page in self._paginate(account, "elbv2", "describe_load_balancers", region):
             for balancer in page["LoadBalancers"]:
+                if (
+                    tagged_resources is not None
+                    and balancer["LoadBalancerArn"] not in tagged_resources
+                ):
+                    continue
                 await graph.add_node(
                     AwsApplicationLoadBalancer(
                         node_id=balancer["LoadBalancerArn"],
                         raw_data=balancer,
                         _graph=graph,
-                        aws_account=self.aws_settings.account,
+                        aws_account=account,
+                        aws_region=region,
                     )
                 )
                 alb_count += 1
 
-        print(f"Initialized {alb_count} application load balancers for {region}")
+        print(f"Initialized {alb_count} application load balancers for {account.name} in {region}")
 
-    async def populate_alb_target_groups(self, graph: Graph) -> None:
+    async def populate_alb_target_groups(self, graph: Graph, account: AwsAccount) -> None:
         async with anyio.create_task_group() as tg:
-            for region in await list_accessible_regions_for_service(self.session, "elbv2"):
-                tg.start_soon(self._populate_alb_target_groups_in_region, graph, region)
+            for region in await self._list_regions(account, "elbv2"):
+                tg.start_soon(
+                    self._scan_region,
+                    self._populate_alb_target_groups_in_region,
+                    graph,
+                    account,
+                    region,
+                )
 
-    async def _populate_alb_target_groups_in_region(self, graph: Graph, region: str) -> None:
-        print(f"Populating ALB target groups from {region}")
+    async def _populate_alb_target_groups_in_region(
+        self, graph: Graph, account: AwsAccount, region: str
+    ) -> None:
+        print(f"Populating ALB target groups from {account.name} in {region}")
+        tagged_resources = await self._get_tagged_resources(account, region)
 
         alb_target_group_count = 0
-        async for page in self._paginate("elbv2", "describe_target_groups", region):
+        async for page in self._paginate(account, "elbv2", "describe_target_groups", region):
             for target_group in page["TargetGroups"]:
+                if (
+                    tagged_resources is not None
+                    and target_group["TargetGroupArn"] not in tagged_resources
+                ):
+                    continue
                 await graph.add_node(
                     AwsAlbTargetGroup(
                         node_id=target_group["TargetGroupArn"],
                         raw_data=target_group,
                         _graph=graph,
-                        aws_account=self.aws_settings.account,
+                        aws_account=account,
+                        aws_region=region,
                     )
                 )
                 alb_target_group_count += 1
 
-        print(f"Initialized {alb_target_group_count} ALB target groups for {region}")
+        print(
+            f"Initialized {alb_target_group_count} ALB target groups for {account.name} in {region}"
+        )
 
-    async def populate_ebs_volumes(self, graph: Graph) -> None:
+    async def populate_ebs_volumes(self, graph: Graph, account: AwsAccount) -> None:
         async with anyio.create_task_group() as tg:
-            for region in await list_accessible_regions_for_service(self.session, "ec2"):
-                tg.start_soon(self._populate_ebs_volumes_in_region, graph, region)
+            for region in await self._list_regions(account, "ec2"):
+                tg.start_soon(
+                    self._scan_region, self._populate_ebs_volumes_in_region, graph, account, region
+                )
 
-    async def _populate_ebs_volumes_in_region(self, graph: Graph, region: str) -> None:
-        print(f"Populating EBS volumes from {region}")
+    async def _populate_ebs_volumes_in_region(
+        self, graph: Graph, account: AwsAccount, region: str
+    ) -> None:
+        print(f"Populating EBS volumes from {account.name} in {region}")
+        tagged_resources = await self._get_tagged_resources(account, region)
 
         ebs_volume_count = 0
-        async for page in self._paginate("ec2", "describe_volumes", region):
+        async for page in self._paginate(account, "ec2", "describe_volumes", region):
             for volume in page["Volumes"]:
+                if tagged_resources is not None and volume["VolumeId"] not in tagged_resources:
+                    continue
                 await graph.add_node(
                     AwsEbsVolume(
                         node_id=volume["VolumeId"],
                         raw_data=volume,
                         _graph=graph,
-                        aws_account=self.aws_settings.account,
+                        aws_account=account,
+                        aws_region=region,
                     )
                 )
                 ebs_volume_count += 1
 
-        print(f"Initialized {ebs_volume_count} EBS volumes for {region}")
+        print(f"Initialized {ebs_volume_count} EBS volumes for {account.name} in {region}")
 
-    async def populate_s3_buckets(self, graph: Graph) -> None:
+    async def populate_s3_buckets(self, graph: Graph, account: AwsAccount) -> None:
         # S3 buckets are global resources, not regional like other AWS services
         # We only need to call list_buckets once, not per region
-        print("Populating S3 buckets")
+        print(f"Populating S3 buckets from {account.name}")
 
         s3_bucket_count = 0
         async with (
             swallow_boto_client_access_errors(service_name="s3", region="us-east-1"),
-            self.session.client("s3", region_name="us-east-1") as client,
+            self.clients.client(account.session, "s3", "us-east-1") as client,
         ):
             paginator = client.get_paginator("list_buckets")
             async for page in paginator.paginate():
                 for bucket in page["Buckets"]:
+                    region = await self._get_bucket_region(client, bucket)
+                    if region is None:
+                        # Without its region, the bucket can't be matched to the filters.
+                        if self.aws_settings.regions is not None or self.aws_settings.tag_filters:
+                            print(
+                                f"Skipping S3 bucket {bucket['Name']}, since its region is unknown"
+                            )
+                            continue
+                    else:
+                        if self.aws_settings.regions is not None and (
+                            region not in self.aws_settings.regions
+                        ):
+                            continue
+                        tagged_resources = await self._get_tagged_resources(account, region)
+                        if tagged_resources is not None and bucket["Name"] not in tagged_resources:
+                            continue
                     await graph.add_node(
                         AwsS3Bucket(
                             node_id=bucket["Name"],
                             raw_data=bucket,
                             _graph=graph,
-                            aws_account=self.aws_settings.account,
+                            aws_account=account,
+                            aws_region=region,
                         )
                     )
                     s3_bucket_count += 1
 
-        print(f"Initialized {s3_bucket_count} S3 buckets")
+        print(f"Initialized {s3_bucket_count} S3 buckets for {account.name}")
+
+    async def _get_bucket_region(self, client: Any, bucket: dict[str, Any]) -> str | None:  # noqa: ANN401
+        """Return the region of a bucket from ListBuckets, or else from GetBucketLocation."""
+        # ListBuckets includes each bucket's region in newer API versions.
+        if region := bucket.get("BucketRegion"):
+            return region
+        async with swallow_boto_client_access_errors(service_name="s3", region="us-east-1"):
+            response = await client.get_bucket_location(Bucket=bucket["Name"])
+            location = response.get("LocationConstraint")
+            # Buckets in us-east-1 have no location constraint, and EU is the old name of eu-west-1.
+            return {None: "us-east-1", "": "us-east-1", "EU": "eu-west-1"}.get(location, location)
+        return None
 
     @tool()
-    async def get_realtime_instance_status(self, instance_id: str, region: str) -> dict | str:
+    async def get_realtime_instance_status(
+        self, instance_id: str, region: str, account: str | None = None
+    ) -> dict | str:
         """
         Get real-time status information for an EC2 instance directly from AWS API.
 
         Args:
             instance_id: Optional AWS EC2 instance ID
             region: AWS region where the instance is located
+            account: Optional name of the configured AWS account the instance
+                is in. Defaults to the first configured account.
 
         Returns:
             dict containing current instance state and status details
         """
+        if account is None:
+            session = self.session
+        elif account in self.aws_settings.accounts:
+            session = self.aws_settings.accounts[account].session
+        else:
+            return f"No AWS account named '{account}' is configured"
+        return await self._get_instance_status(session, instance_id, region)
+
+    async def _get_instance_status(
+        self, session: Session, instance_id: str, region: str
+    ) -> dict | str:
         async with (
             swallow_boto_client_access_errors(service_name="ec2", region=region),
-            self.session.client("ec2", region_name=region) as client,
+            self.clients.client(session, "ec2", region) as client,
         ):
             try:
                 response = await client.describe_instance_status(InstanceIds=[instance_id])
@@ -353,12 +791,15 @@ class AwsPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         Returns:
             dict containing current instance state and status details
         """
-        node = await self.context.graph.get_node_safe(node_id)
+        node = await self.context.get_node(node_id)
         if not node:
             return f"Resource with node ID '{node_id}' not found"
         if isinstance(node, AwsEc2Instance):
-            return await self.get_realtime_instance_status(
-                node.raw_data["InstanceId"], node.raw_data["Placement"]["AvailabilityZone"][:-1]
+            # Use the credentials of the account the instance was found in.
+            return await self._get_instance_status(
+                node.session,
+                node.raw_data["InstanceId"],
+                node.aws_region or node.raw_data["Placement"]["AvailabilityZone"][:-1],
             )
         elif isinstance(node, AptibleAwsInstance) and "instance_id" in node.raw_data:
             return await self.get_realtime_instance_status(
@@ -367,15 +808,172 @@ class AwsPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         else:
             return f"Node {node_id} is not an EC2 instance or does not have an instance ID"
 
+    @tool()
+    async def get_realtime_status_for_nodes(self, node_ids: list[str]) -> dict[str, dict | str]:
+        """Get real-time status information for many EC2 instance and RDS database nodes at once.
+
+        Use this instead of getting the status of one instance at a time, such
+        as for all of the instances behind a load balancer. The nodes are
+        grouped by account and region, and each group is checked with as few
+        AWS API calls as possible.
+
+        Args:
+            node_ids: node IDs from the knowledge graph
+
+        Returns:
+            dict of node ID to the current status details, or an error message
+            for that node
+        """
+        results: dict[str, dict | str] = {}
+        instances: defaultdict[tuple[Session, str], dict[str, str]] = defaultdict(dict)
+        databases: defaultdict[tuple[Session, str], dict[str, str]] = defaultdict(dict)
+        for node_id in node_ids:
+            node = await self.context.get_node(node_id)
+            if not node:
+                results[node_id] = f"Resource with node ID '{node_id}' not found"
+            elif isinstance(node, AwsEc2Instance):
+                region = node.aws_region or node.raw_data["Placement"]["AvailabilityZone"][:-1]
+                instances[(node.session, region)][node.raw_data["InstanceId"]] = node_id
+            elif isinstance(node, AptibleAwsInstance) and "instance_id" in node.raw_data:
+                region = node.raw_data["availability_zone"][:-1]
+                instances[(self.session, region)][node.raw_data["instance_id"]] = node_id
+            elif isinstance(node, AwsRdsDatabase):
+                arn = node.raw_data["DBInstanceArn"]
+                region = node.aws_region or arn.split(":")[3]
+                databases[(node.session, region)][arn] = node_id
+            else:
+                results[node_id] = f"Node {node_id} is not an EC2 instance or RDS database"
+
+        async def _get_statuses(
+            get_statuses: Callable[
+                [AwsClientPool, Session, str, list[str]], Awaitable[dict[str, dict | str]]
+            ],
+            session: Session,
+            region: str,
+            node_ids_by_resource_id: dict[str, str],
+        ) -> None:
+            try:
+                statuses = await get_statuses(
+                    self.clients, session, region, list(node_ids_by_resource_id)
+                )
+            except Exception as e:
+                statuses = dict.fromkeys(node_ids_by_resource_id, f"Error retrieving status: {e!s}")
+            for resource_id, status in statuses.items():
+                results[node_ids_by_resource_id[resource_id]] = status
+
+        async with anyio.create_task_group() as tg:
+            for (session, region), node_ids_by_resource_id in instances.items():
+                tg.start_soon(
+                    _get_statuses, get_instance_statuses, session, region, node_ids_by_resource_id
+                )
+            for (session, region), node_ids_by_resource_id in databases.items():
+                tg.start_soon(
+                    _get_statuses,
+                    get_db_instance_statuses,
+                    session,
+                    region,
+                    node_ids_by_resource_id,
+                )
+
+        return {node_id: results[node_id] for node_id in node_ids if node_id in results}
+
+    @tool()
+    async def get_cloudwatch_logs_for_node(
+        self,
+        node_id: str,
+        time_range_start: AwareDatetime,
+        time_range_end: AwareDatetime,
+        filter_pattern: str | None = None,
+    ) -> list[LogLine] | str:
+        """Get log events from CloudWatch Logs for an AWS node, such as an RDS database.
+
+        Only a limited amount of log data is returned, so use a short time
+        range, or a filter pattern to find specific events.
+
+        Args:
+            node_id: node ID from the knowledge graph
+            time_range_start: The start of the time range to get logs for
+            time_range_end: The end of the time range to get logs for
+            filter_pattern: Optional CloudWatch Logs filter pattern, such as
+                "ERROR" or "?timeout ?deadlock"
+
+        Returns:
+            list of log lines, or an error message
+        """
+        node = await self.context.get_node(node_id)
+        if not node:
+            return f"Resource with node ID '{node_id}' not found"
+        if not isinstance(node, HasCloudWatchLogs):
+            return f"Node {node_id} does not support CloudWatch logs"
+        if not node.get_cloudwatch_log_group_names():
+            return f"Node {node_id} does not export any logs to CloudWatch"
+
+        logs = [
+            line
+            async for line in node.iter_logs(
+                time_range_start, time_range_end, filter_pattern=filter_pattern
+            )
+        ]
+        return logs or "No logs found. Try a longer time range or a different filter pattern."
+
+    @tool()
+    async def get_cloudwatch_metrics_for_nodes(
+        self,
+        node_ids: list[str],
+        time_range_start: AwareDatetime,
+        time_range_end: AwareDatetime,
+        metric_names: list[str] | None = None,
+    ) -> list[Observation] | str:
+        """Get CloudWatch metrics for several AWS nodes at once.
+
+        Use this instead of getting metrics one node at a time when looking at
+        a group of related resources, such as all of the instances behind a
+        load balancer. All of the metrics are retrieved in as few CloudWatch
+        requests as possible.
+
+        Args:
+            node_ids: node IDs from the knowledge graph
+            time_range_start: The start of the time range to get metrics for
+            time_range_end: The end of the time range to get metrics for
+            metric_names: The metrics to get. Each node only gets the metrics
+                that are available for its type. Defaults to all available metrics.
+
+        Returns:
+            list of observations, or an error message
+        """
+        node_queries: list[tuple[AwsNode, list[CloudWatchMetricQuery]]] = []
+        for node_id in node_ids:
+            node = await self.context.get_node(node_id)
+            if not node:
+                return f"Resource with node ID '{node_id}' not found"
+            if not isinstance(node, AwsNode) or not isinstance(node, HasCloudWatchMetrics):
+                return f"Node {node_id} does not support CloudWatch metrics"
+
+            available_metrics = await node.list_available_metrics()
+            node_metric_names = (
+                [m for m in metric_names if m in available_metrics]
+                if metric_names
+                else available_metrics
+            )
+            node_queries.append(
+                (node, [node.get_cloudwatch_metric_query(m) for m in node_metric_names])
+            )
+
+        observations = await get_cloudwatch_metrics(
+            self.clients, node_queries, time_range_start, time_range_end
+        )
+        return observations or "No metrics found. Try a longer time range."
+
     async def _paginate(
         self,
+        account: AwsAccount,
         service_name: Literal["ec2", "elb", "elbv2", "rds"],
         action: str,
         region: str,
     ) -> AsyncGenerator[dict, None]:
         async with (
             swallow_boto_client_access_errors(service_name=service_name, region=region),
-            self.session.client(service_name, region_name=region) as client,
+            self.clients.client(account.session, service_name, region) as client,
         ):
             paginator = client.get_paginator(action)
             async for page in paginator.paginate():
@@ -0,0 +1,176 @@
+import asyncio
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from aioboto3 import Session
+from pydantic import BaseModel
+
+# The rate each service and region starts at, in requests per second.
+DEFAULT_RATE = 20.0
+MIN_RATE = 1.0
+MAX_RATE = 200.0
+
+# Each second of successful requests raises the rate by about this much, and
+# each throttling response cuts it by this factor.
+ADDITIVE_INCREASE = 1.0
+MULTIPLICATIVE_DECREASE = 0.5
+
+# Requests that were already in flight are often throttled together, so only
+# cut the rate once for each burst of throttling responses.
+DECREASE_COOLDOWN_SECONDS = 1.0
+
+THROTTLING_ERROR_CODES = frozenset(
+    {
+        "BandwidthLimitExceeded",
+        "EC2ThrottledException",
+        "LimitExceededException",
+        "PriorRequestNotComplete",
+        "ProvisionedThroughputExceededException",
+        "RequestLimitExceeded",
+        "RequestThrottled",
+        "RequestThrottledException",
+        "SlowDown",
+        "ThrottledException",
+        "Throttling",
+        "ThrottlingException",
+        "TooManyRequestsException",
+    }
+)
+
+
+class RateLimiterStats(BaseModel):
+    """The state of an adaptive rate limiter, for build stats."""
+
+    rate: float
+    requests: int
+    throttled: int
+    waited_seconds: float
+
+
+class AdaptiveRateLimiter:
+    """A token bucket whose rate adapts to throttling, with additive increase and multiplicative decrease (AIMD).
+
+    The rate climbs slowly while requests succeed, and halves when AWS
+    throttles a request, so it settles just under the account's API quota.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        min_rate: float = MIN_RATE,
+        max_rate: float = MAX_RATE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._clock = clock
+        self._tokens = self._capacity
+        self._updated_at = clock()
+        self._decreased_at: float | None = None
+        # Locks are bound to the event loop they're first waited on, so each
+        # loop gets its own, and they all share the rate.
+        self._locks: defaultdict[asyncio.AbstractEventLoop, asyncio.Lock] = defaultdict(
+            asyncio.Lock
+        )
+        self.requests = 0
+        self.throttled = 0
+        self.waited_seconds = 0.0
+
+    @property
+    def _capacity(self) -> float:
+        # Allow bursts of up to a second of requests.
+        return max(1.0, self.rate)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """Wait until a request can be sent."""
+        # Waiters are served in order, since only one of them waits for a token at a time.
+        async with self._locks[asyncio.get_running_loop()]:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.requests += 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+                self.waited_seconds += wait
+                await asyncio.sleep(wait)
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + ADDITIVE_INCREASE / self.rate)
+
+    def on_throttle(self) -> None:
+        self.throttled += 1
+        now = self._clock()
+        if self._decreased_at is not None and now - self._decreased_at < DECREASE_COOLDOWN_SECONDS:
+            return
+        self._decreased_at = now
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * MULTIPLICATIVE_DECREASE)
+        # Stop any burst that's in progress.
+        self._tokens = min(self._tokens, 0.0)
+
+    def stats(self) -> RateLimiterStats:
+        return RateLimiterStats(
+            rate=round(self.rate, 2),
+            requests=self.requests,
+            throttled=self.throttled,
+            waited_seconds=round(self.waited_seconds, 2),
+        )
+
+
+class RateLimiters:
+    """An adaptive rate limiter for each set of credentials, service and region.
+
+    AWS API quotas apply to each account in each region, and differ by
+    service, so each combination adapts on its own.
+    """
+
+    def __init__(self) -> None:
+        self._limiters: dict[tuple[Session, str, str], AdaptiveRateLimiter] = {}
+
+    def get(self, session: Session, service_name: str, region_name: str) -> AdaptiveRateLimiter:
+        key = (session, service_name, region_name)
+        if key not in self._limiters:
+            self._limiters[key] = AdaptiveRateLimiter()
+        return self._limiters[key]
+
+    def register(self, client: Any, session: Session, service_name: str) -> None:  # noqa: ANN401
+        """Limit the rate of every request the client sends, including retries."""
+        limiter = self.get(session, service_name, client.meta.region_name or "global")
+
+        async def _before_send(**kwargs: Any) -> None:
+            await limiter.acquire()
+
+        def _response_received(
+            response_dict: dict[str, Any] | None = None,
+            parsed_response: dict[str, Any] | None = None,
+            **kwargs: Any,
+        ) -> None:
+            if is_throttling_response(response_dict, parsed_response):
+                limiter.on_throttle()
+            elif response_dict and response_dict.get("status_code", 500) < 400:
+                limiter.on_success()
+
+        client.meta.events.register("before-send", _before_send)
+        client.meta.events.register("response-received", _response_received)
+
+    def items(self) -> Iterator[tuple[tuple[Session, str, str], AdaptiveRateLimiter]]:
+        yield from self._limiters.items()
+
+
+def is_throttling_response(
+    response_dict: dict[str, Any] | None, parsed_response: dict[str, Any] | None
+) -> bool:
+    """Return whether an AWS response says the request was throttled."""
+    if response_dict and response_dict.get("status_code") == 429:
+        return True
+    error_code = (parsed_response or {}).get("Error", {}).get("Code")
+    return error_code in THROTTLING_ERROR_CODES
@@ -0,0 +1,82 @@
+import re
+
+from aioboto3 import Session
+from botocore.exceptions import ClientError
+
+from unpage.plugins.aws.clients import AwsClientPool
+
+# DescribeInstanceStatus accepts up to 100 instance IDs, and DescribeDBInstances
+# up to 100 values in a filter.
+MAX_IDS_PER_REQUEST = 100
+
+DB_INSTANCE_STATUS_KEYS = (
+    "DBInstanceIdentifier",
+    "DBInstanceStatus",
+    "DBInstanceClass",
+    "Engine",
+    "EngineVersion",
+    "MultiAZ",
+    "AvailabilityZone",
+    "SecondaryAvailabilityZone",
+    "PendingModifiedValues",
+)
+
+
+async def get_instance_statuses(
+    clients: AwsClientPool, session: Session, region: str, instance_ids: list[str]
+) -> dict[str, dict | str]:
+    """Get the status of many EC2 instances in a region, with up to 100 instances per request."""
+    statuses: dict[str, dict | str] = {}
+    async with clients.client(session, "ec2", region) as client:
+        for i in range(0, len(instance_ids), MAX_IDS_PER_REQUEST):
+            remaining = instance_ids[i : i + MAX_IDS_PER_REQUEST]
+            while remaining:
+                try:
+                    response = await client.describe_instance_status(
+                        InstanceIds=remaining, IncludeAllInstances=True
+                    )
+                except ClientError as e:
+                    if e.response.get("Error", {}).get("Code") != "InvalidInstanceID.NotFound":
+                        raise
+                    # The whole request fails if any instance doesn't exist, so
+                    # retry without the instances named in the error.
+                    missing = set(re.findall(r"i-[0-9a-f]+", str(e))) & set(remaining)
+                    if not missing:
+                        raise
+                    for instance_id in missing:
+                        statuses[instance_id] = (
+                            f"No instance found with ID '{instance_id}' in region '{region}'"
+                        )
+                    remaining = [id_ for id_ in remaining if id_ not in missing]
+                    continue
+                for status in response["InstanceStatuses"]:
+                    statuses[status["InstanceId"]] = status
+                break
+
+    for instance_id in instance_ids:
+        statuses.setdefault(
+            instance_id, f"No instance found with ID '{instance_id}' in region '{region}'"
+        )
+    return statuses
+
+
+async def get_db_instance_statuses(
+    clients: AwsClientPool, session: Session, region: str, db_instance_arns: list[str]
+) -> dict[str, dict | str]:
+    """Get the status of many RDS databases in a region, with up to 100 databases per request."""
+    statuses: dict[str, dict | str] = {}
+    async with clients.client(session, "rds", region) as client:
+        paginator = client.get_paginator("describe_db_instances")
+        for i in range(0, len(db_instance_arns), MAX_IDS_PER_REQUEST):
+            filters = [
+                {"Name": "db-instance-id", "Values": db_instance_arns[i : i + MAX_IDS_PER_REQUEST]}
+            ]
+            async for page in paginator.paginate(Filters=filters):
+                for instance in page["DBInstances"]:
+                    statuses[instance["DBInstanceArn"]] = {
+                        key: instance[key] for key in DB_INSTANCE_STATUS_KEYS if key in instance
+                    }
+
+    for arn in db_instance_arns:
+        statuses.setdefault(arn, f"No database found with ARN '{arn}' in region '{region}'")
+    return statuses
@@ -0,0 +1,54 @@
+from collections.abc import Iterable, Mapping
+
+from aioboto3 import Session
+
+from unpage.plugins.aws.clients import AwsClientPool
+from unpage.plugins.aws.utils import swallow_boto_client_access_errors
+
+# The most resources the Resource Groups Tagging API returns in each page.
+MAX_RESOURCES_PER_PAGE = 100
+
+
+def arn_resource_id(arn: str) -> str:
+    """Return the last part of an ARN, e.g. `i-0123` for an EC2 instance or the name of an S3 bucket."""
+    return arn.split(":", 5)[-1].rsplit("/", 1)[-1]
+
+
+def matches_tag_filters(tags: Mapping[str, str], tag_filters: Mapping[str, list[str]]) -> bool:
+    """Return whether tags match every tag filter, the same way the Resource Groups Tagging API does.
+
+    A filter with no values matches any value of the tag.
+    """
+    return all(
+        key in tags and (not values or tags[key] in values) for key, values in tag_filters.items()
+    )
+
+
+async def list_tagged_resources(
+    clients: AwsClientPool,
+    session: Session,
+    region: str,
+    tag_filters: Mapping[str, list[str]],
+    resource_types: Iterable[str],
+) -> set[str]:
+    """Return the ARNs and IDs of the resources in a region that match the tag filters.
+
+    The resources are filtered by AWS, so only the matches are returned. Each
+    resource is included by both its ARN and the last part of its ARN, since
+    some resources (e.g. EC2 instances) are identified by their ID.
+    """
+    resources: set[str] = set()
+    async with (
+        swallow_boto_client_access_errors(service_name="resourcegroupstaggingapi", region=region),
+        clients.client(session, "resourcegroupstaggingapi", region) as client,
+    ):
+        paginator = client.get_paginator("get_resources")
+        async for page in paginator.paginate(
+            TagFilters=[{"Key": key, "Values": values} for key, values in tag_filters.items()],
+            ResourceTypeFilters=sorted(set(resource_types)),
+            ResourcesPerPage=MAX_RESOURCES_PER_PAGE,
+        ):
+            for resource in page["ResourceTagMappingList"]:
+                arn = resource["ResourceARN"]
+                resources.update((arn, arn_resource_id(arn)))
+    return resources
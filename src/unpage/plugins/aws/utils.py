@@ -1,29 +1,116 @@
 import asyncio
 import logging
 import sys
-from collections.abc import AsyncIterator
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable
 from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
 
 from aioboto3 import Session
 from botocore.exceptions import ClientError, SSOTokenLoadError, TokenRetrievalError
 
+if TYPE_CHECKING:
+    from unpage.plugins.aws.clients import AwsClientPool
+
+# How long to remember whether a region is accessible (or not, e.g. opted out).
+REGION_ACCESS_CACHE_TTL_SECONDS = 3600.0
+
+# The errors that mean the credentials can't use a region, rather than that
+# the check failed (e.g. it was throttled), so they're safe to remember.
+REGION_INACCESSIBLE_ERROR_CODES = frozenset(
+    {
+        "AuthFailure",
+        "InvalidClientTokenId",
+        "OptInRequired",
+        "UnrecognizedClientException",
+    }
+)
+
+
+class RegionAccessCache:
+    """Remembers which regions the credentials of each AWS session can access.
+
+    Accessibility doesn't depend on the service, so one check per region is
+    shared by every service, by the graph build, and by MCP tool calls of the
+    plugin that owns the client pool.
+    Inaccessible regions (e.g. regions that aren't opted in) are cached too,
+    but other failures (e.g. throttling) aren't, so the region is checked
+    again next time.
+    """
+
+    def __init__(
+        self, clients: "AwsClientPool", ttl_seconds: float = REGION_ACCESS_CACHE_TTL_SECONDS
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._clients = clients
+        self._entries: dict[tuple[Session, str], tuple[bool, float]] = {}
+        # Locks are bound to the event loop they're first used on, so each loop gets its own.
+        self._locks: defaultdict[tuple[asyncio.AbstractEventLoop, Session, str], asyncio.Lock] = (
+            defaultdict(asyncio.Lock)
+        )
 
-async def list_accessible_regions_for_service(session: Session, service_name: str) -> list[str]:
-    """Return a list of regions that the current credentials can access."""
+    async def is_accessible(self, session: Session, region: str) -> bool:
+        """Return whether the session's credentials can access the region."""
+        # Sessions are shared per account (see get_session), so they identify the credentials.
+        key = (session, region)
+        if (accessible := self._get(key)) is not None:
+            return accessible
+
+        # Only check each region once, even when many callers ask at the same time.
+        async with self._locks[(asyncio.get_running_loop(), *key)]:
+            if (accessible := self._get(key)) is not None:
+                return accessible
+
+            try:
+                async with self._clients.client(session, "sts", region) as client:
+                    await client.get_caller_identity()
+                accessible = True
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") not in REGION_INACCESSIBLE_ERROR_CODES:
+                    # Skip the region this time, but check it again next time.
+                    return False
+                accessible = False
+
+            self._entries[key] = (accessible, time.monotonic() + self.ttl_seconds)
+            return accessible
+
+    def _get(self, key: tuple[Session, str]) -> bool | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        accessible, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        return accessible
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+async def list_accessible_regions_for_service(
+    clients: "AwsClientPool",
+    session: Session,
+    service_name: str,
+    regions: Iterable[str] | None = None,
+) -> list[str]:
+    """Return a list of regions that the current credentials can access.
+
+    When regions are given, only those regions are checked.
+    """
 
     async def _check_region(region: str) -> tuple[str, bool]:
-        """Attempt to call an API in the given region. Return True if accessible."""
-        try:
-            async with session.client("sts", region_name=region) as client:
-                await client.get_caller_identity()
-            return region, True
-        except ClientError:
-            return region, False
+        """Return True if the region is accessible."""
+        return region, await clients.region_access.is_accessible(session, region)
+
+    available_regions = await session.get_available_regions(service_name)
+    if regions is not None:
+        allowed_regions = set(regions)
+        available_regions = [region for region in available_regions if region in allowed_regions]
 
     # Now, check access to each region (concurrently)
-    results = await asyncio.gather(
-        *(_check_region(region) for region in await session.get_available_regions(service_name))
-    )
+    results = await asyncio.gather(*(_check_region(region) for region in available_regions))
 
     return [region for region, success in results if success]
 
@@ -91,8 +178,11 @@ async def run_sso_login(profile: str | None = None) -> None:
         print("SSO login successful")
 
 
-async def ensure_aws_session(session: Session) -> None:
-    async with hide_traceback_for_failed_sso_logins(), session.client("sts") as client:
+async def ensure_aws_session(clients: "AwsClientPool", session: Session) -> None:
+    async with (
+        hide_traceback_for_failed_sso_logins(),
+        clients.client(session, "sts") as client,
+    ):
         try:
             await client.get_caller_identity()
         except (SSOTokenLoadError, TokenRetrievalError):
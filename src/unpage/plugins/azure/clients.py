@@ -0,0 +1,150 @@
+"""Shared async Azure management clients, transports and credentials."""
+
+import asyncio
+from typing import Any, TypeVar
+
+import aiohttp
+from azure.core.credentials_async import AsyncTokenCredential
+from azure.core.pipeline import PipelineResponse
+from azure.core.pipeline.policies import AsyncRetryPolicy
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.identity.aio import DefaultAzureCredential
+
+# The most connections the shared session keeps open, across all Azure APIs.
+DEFAULT_CONNECTION_LIMIT = 100
+
+# How long idle connections are kept open for reuse.
+DEFAULT_KEEPALIVE_SECONDS = 60.0
+
+# How many times a throttled or failed request is retried, and the longest
+# backoff between retries when Azure doesn't say how long to wait.
+DEFAULT_RETRY_TOTAL = 6
+DEFAULT_RETRY_BACKOFF_MAX = 60
+
+ClientT = TypeVar("ClientT")
+
+_ClientKey = tuple[asyncio.AbstractEventLoop, type, int, tuple[Any, ...]]
+
+
+class ThrottlingRetryPolicy(AsyncRetryPolicy):
+    """Retry throttled requests after the delay that Azure asks for.
+
+    Azure Resource Manager sends Retry-After with its 429 responses, which
+    the SDK's retry policy already honors. Throttled requests are also
+    retried for POSTs, which are used for Resource Graph queries, and Resource
+    Graph's quota reset time is used when there's no Retry-After.
+    """
+
+    def _is_method_retryable(self, settings: Any, request: Any, response: Any = None) -> bool:  # noqa: ANN401
+        if response is not None and response.status_code == 429:
+            return True
+        return super()._is_method_retryable(settings, request, response=response)
+
+    def get_retry_after(self, response: PipelineResponse[Any, Any]) -> float | None:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None and response.http_response.status_code == 429:
+            # e.g. "00:00:03"
+            resets_after = response.http_response.headers.get("x-ms-user-quota-resets-after")
+            if resets_after:
+                try:
+                    hours, minutes, seconds = resets_after.split(":")
+                    retry_after = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+                except ValueError:
+                    pass
+        return retry_after
+
+
+class AzureClientPool:
+    """Long-lived async Azure management clients, reused for each credential, client type and subscription.
+
+    Every client sends its requests through one aiohttp session, so
+    connections to Azure Resource Manager are kept alive between requests and
+    shared between services. Sessions, credentials and clients are bound to
+    the event loop they were created on, so each loop gets its own.
+
+    Throttled requests are retried with the `ThrottlingRetryPolicy`.
+    """
+
+    def __init__(
+        self,
+        connection_limit: int = DEFAULT_CONNECTION_LIMIT,
+        keepalive_seconds: float = DEFAULT_KEEPALIVE_SECONDS,
+        retry_total: int = DEFAULT_RETRY_TOTAL,
+        retry_backoff_max: int = DEFAULT_RETRY_BACKOFF_MAX,
+    ) -> None:
+        self.connection_limit = connection_limit
+        self.keepalive_seconds = keepalive_seconds
+        self.retry_total = retry_total
+        self.retry_backoff_max = retry_backoff_max
+        self._sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._credentials: dict[asyncio.AbstractEventLoop, AsyncTokenCredential] = {}
+        self._clients: dict[_ClientKey, tuple[AsyncTokenCredential, Any]] = {}
+
+    def session(self) -> aiohttp.ClientSession:
+        """Return the shared session for the current event loop."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.connection_limit, keepalive_timeout=self.keepalive_seconds
+                )
+            )
+            self._sessions[loop] = session
+        return session
+
+    def credential(self) -> AsyncTokenCredential:
+        """Return the shared default credential for the current event loop.
+
+        The credential caches its access tokens, and refreshes them without
+        blocking the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if loop not in self._credentials:
+            self._credentials[loop] = DefaultAzureCredential()
+        return self._credentials[loop]
+
+    def get_client(
+        self,
+        client_class: type[ClientT],
+        credential: AsyncTokenCredential,
+        *args: Any,
+    ) -> ClientT:
+        """Return the shared client of a type for a credential, e.g. for a subscription ID.
+
+        Args:
+            client_class: An async management client class, e.g.
+                `azure.mgmt.compute.aio.ComputeManagementClient`
+            credential: The credential to authenticate the client's requests with
+            args: The client's other positional arguments, usually the subscription ID
+        """
+        loop = asyncio.get_running_loop()
+        key = (loop, client_class, id(credential), args)
+        if key not in self._clients:
+            # The transport uses the shared session, and doesn't close it with the client.
+            transport = AioHttpTransport(session=self.session(), session_owner=False)
+            retry_policy = ThrottlingRetryPolicy(
+                retry_total=self.retry_total, retry_backoff_max=self.retry_backoff_max
+            )
+            client = client_class(
+                credential,  # pyright: ignore[reportCallIssue]
+                *args,
+                transport=transport,
+                retry_policy=retry_policy,
+            )
+            # Keep a reference to the credential so its id isn't reused.
+            self._clients[key] = (credential, client)
+        return self._clients[key][1]
+
+    async def close(self) -> None:
+        """Close the clients, credential and session created on the current event loop."""
+        loop = asyncio.get_running_loop()
+        for key in [key for key in self._clients if key[0] is loop]:
+            _, client = self._clients.pop(key)
+            await client.close()
+        credential = self._credentials.pop(loop, None)
+        if credential:
+            await credential.close()
+        session = self._sessions.pop(loop, None)
+        if session:
+            await session.close()
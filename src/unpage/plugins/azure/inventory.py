@@ -0,0 +1,115 @@
+"""Bulk inventory from Azure Resource Graph."""
+
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+from azure.core import AsyncPipelineClient
+from azure.core.credentials_async import AsyncTokenCredential
+from azure.core.pipeline.policies import (
+    AsyncBearerTokenCredentialPolicy,
+    AsyncRetryPolicy,
+    UserAgentPolicy,
+)
+from azure.core.pipeline.transport import AsyncHttpTransport
+from azure.core.rest import HttpRequest
+
+from unpage.plugins.azure.clients import AzureClientPool
+
+ARM_ENDPOINT = "https://management.azure.com"
+ARM_SCOPE = "https://management.azure.com/.default"
+
+RESOURCE_GRAPH_API_VERSION = "2022-10-01"
+
+# The most rows Resource Graph returns in each page.
+MAX_ROWS_PER_PAGE = 1000
+
+
+class ResourceGraphClient:
+    """A client for Azure Resource Graph queries.
+
+    Requests are authenticated with the credential, and throttled requests
+    are retried after the delay Resource Graph asks for.
+    """
+
+    def __init__(
+        self,
+        credential: AsyncTokenCredential,
+        *,
+        transport: AsyncHttpTransport,
+        retry_policy: AsyncRetryPolicy | None = None,
+    ) -> None:
+        self._client = AsyncPipelineClient(
+            ARM_ENDPOINT,
+            policies=[
+                UserAgentPolicy(sdk_moniker="unpage"),
+                retry_policy or AsyncRetryPolicy(),
+                AsyncBearerTokenCredentialPolicy(credential, ARM_SCOPE),
+            ],
+            transport=transport,
+        )
+
+    async def resources(
+        self,
+        query: str,
+        subscriptions: Sequence[str] | None = None,
+        management_groups: Sequence[str] | None = None,
+        skip_token: str | None = None,
+    ) -> dict[str, Any]:
+        """Run a query, and return one page of its results."""
+        body: dict[str, Any] = {
+            "query": query,
+            "options": {"$top": MAX_ROWS_PER_PAGE, "resultFormat": "objectArray"},
+        }
+        if subscriptions:
+            body["subscriptions"] = list(subscriptions)
+        if management_groups:
+            body["managementGroups"] = list(management_groups)
+        if skip_token:
+            body["options"]["$skipToken"] = skip_token
+
+        request = HttpRequest(
+            "POST",
+            f"{ARM_ENDPOINT}/providers/Microsoft.ResourceGraph/resources",
+            params={"api-version": RESOURCE_GRAPH_API_VERSION},
+            json=body,
+        )
+        response = await self._client.send_request(request)
+        response.raise_for_status()
+        return response.json()
+
+    async def close(self) -> None:
+        await self._client.close()
+
+
+async def iter_resource_graph_resources(
+    clients: AzureClientPool,
+    credential: AsyncTokenCredential,
+    resource_type: str,
+    subscriptions: Sequence[str] | None = None,
+    management_groups: Sequence[str] | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield the resources of a type, across subscriptions or management groups, in ARM's JSON format.
+
+    Args:
+        clients: The client pool to create the Resource Graph client with
+        credential: The credential to query Resource Graph with
+        resource_type: The resource type, e.g. `Microsoft.Compute/virtualMachines`
+        subscriptions: The subscription IDs to query
+        management_groups: The management group IDs to query, instead of subscriptions
+    """
+    client = clients.get_client(ResourceGraphClient, credential)
+    # Ordering by ID keeps the pages stable while they're read.
+    query = f"Resources | where type =~ '{resource_type}' | order by id asc"
+    skip_token = None
+    while True:
+        page = await client.resources(
+            query,
+            subscriptions=subscriptions,
+            management_groups=management_groups,
+            skip_token=skip_token,
+        )
+        for resource in page.get("data", []):
+            yield resource
+        skip_token = page.get("$skipToken")
+        if not skip_token:
+            break
@@ -0,0 +1,278 @@
+"""Batched queries to Azure Monitor metrics."""
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from azure.core import AsyncPipelineClient
+from azure.core.credentials_async import AsyncTokenCredential
+from azure.core.pipeline.policies import (
+    AsyncBearerTokenCredentialPolicy,
+    AsyncRetryPolicy,
+    UserAgentPolicy,
+)
+from azure.core.pipeline.transport import AsyncHttpTransport
+from azure.core.rest import HttpRequest
+from azure.mgmt.monitor.aio import MonitorManagementClient
+from pydantic import AwareDatetime, BaseModel
+
+from unpage.models import Observation
+from unpage.plugins.azure.utils import normalize_location
+from unpage.utils import print
+
+if TYPE_CHECKING:
+    from unpage.plugins.azure.nodes.base import AzureNode
+
+METRICS_SCOPE = "https://metrics.monitor.azure.com/.default"
+
+METRICS_BATCH_API_VERSION = "2024-02-01"
+
+# The most resources metrics:getBatch accepts in each request.
+MAX_RESOURCES_PER_BATCH = 50
+
+# The metrics of each resource type, and the namespace of each metric. Every
+# resource of a type has the same metric definitions.
+_metric_definitions: dict[str, dict[str, str]] = {}
+
+# Only read the definitions of each type once, even when many callers ask at
+# the same time. Locks are bound to their event loop, so each loop gets its own.
+_metric_definitions_locks: defaultdict[tuple[asyncio.AbstractEventLoop, str], asyncio.Lock] = (
+    defaultdict(asyncio.Lock)
+)
+
+
+class AzureMonitorQuery(BaseModel):
+    """An Azure Monitor metric for a node, and how to aggregate it."""
+
+    metric_name: str
+    aggregation: str = "Average"
+    # An ISO 8601 duration
+    interval: str = "PT5M"
+
+
+class MetricsBatchClient:
+    """A client for the Azure Monitor metrics:getBatch API in one region."""
+
+    def __init__(
+        self,
+        credential: AsyncTokenCredential,
+        region: str,
+        *,
+        transport: AsyncHttpTransport,
+        retry_policy: AsyncRetryPolicy | None = None,
+    ) -> None:
+        self._endpoint = f"https://{region}.metrics.monitor.azure.com"
+        self._client = AsyncPipelineClient(
+            self._endpoint,
+            policies=[
+                UserAgentPolicy(sdk_moniker="unpage"),
+                retry_policy or AsyncRetryPolicy(),
+                AsyncBearerTokenCredentialPolicy(credential, METRICS_SCOPE),
+            ],
+            transport=transport,
+        )
+
+    async def get_batch(
+        self,
+        subscription_id: str,
+        resource_ids: Sequence[str],
+        metric_namespace: str,
+        metric_names: Sequence[str],
+        aggregation: str,
+        interval: str,
+        time_range_start: AwareDatetime,
+        time_range_end: AwareDatetime,
+    ) -> dict[str, Any]:
+        """Get the same metrics for up to 50 resources of one type."""
+        request = HttpRequest(
+            "POST",
+            f"{self._endpoint}/subscriptions/{subscription_id}/metrics:getBatch",
+            params={
+                "metricnamespace": metric_namespace,
+                "metricnames": ",".join(metric_names),
+                "aggregation": aggregation.lower(),
+                "interval": interval,
+                "starttime": time_range_start.isoformat(),
+                "endtime": time_range_end.isoformat(),
+                "api-version": METRICS_BATCH_API_VERSION,
+            },
+            json={"resourceids": list(resource_ids)},
+        )
+        response = await self._client.send_request(request)
+        response.raise_for_status()
+        return response.json()
+
+    async def close(self) -> None:
+        await self._client.close()
+
+
+def get_metric_namespace(node: "AzureNode") -> str:
+    """Return a node's default metric namespace, which is its full resource type."""
+    return f"{node.provider}/{node.resource_type}"
+
+
+async def get_metric_definitions(node: "AzureNode") -> dict[str, str] | None:
+    """Return the metrics of a node's resource type, and the namespace of each.
+
+    The definitions are read from the first node of each type, and cached.
+    Returns None if they couldn't be read.
+    """
+    resource_type = get_metric_namespace(node).lower()
+    if resource_type in _metric_definitions:
+        return _metric_definitions[resource_type]
+    if not node.credential or not node.subscription_id:
+        return None
+
+    async with _metric_definitions_locks[(asyncio.get_running_loop(), resource_type)]:
+        if resource_type not in _metric_definitions:
+            client = node.clients.get_client(
+                MonitorManagementClient, node.credential, node.subscription_id
+            )
+            try:
+                _metric_definitions[resource_type] = {
+                    definition.name.value: definition.namespace or resource_type
+                    async for definition in client.metric_definitions.list(
+                        resource_uri=node.resource_id
+                    )
+                    if definition.name and definition.name.value
+                }
+            except Exception as e:
+                print(
+                    f"Error retrieving the Azure Monitor metric definitions of {resource_type}: {e!s}"
+                )
+                return None
+    return _metric_definitions[resource_type]
+
+
+async def get_azure_monitor_metrics(
+    node_queries: Sequence[tuple["AzureNode", Sequence[AzureMonitorQuery]]],
+    time_range_start: AwareDatetime,
+    time_range_end: AwareDatetime,
+) -> list[Observation]:
+    """Retrieve metrics for many nodes with as few Azure Monitor requests as possible.
+
+    Nodes of the same type, in the same subscription and region, that need
+    the same metrics are sent to metrics:getBatch together, 50 at a time.
+    Metrics that aren't defined for a node's resource type are skipped.
+    Nodes without a region are queried one at a time.
+    """
+    groups: defaultdict[tuple[str, str, str, str, str, tuple[str, ...]], list[AzureNode]] = (
+        defaultdict(list)
+    )
+    fallback: list[tuple[AzureNode, AzureMonitorQuery]] = []
+    for node, queries in node_queries:
+        if not node.credential or not node.subscription_id:
+            continue
+        metric_names: defaultdict[tuple[str, str], list[str]] = defaultdict(list)
+        for query in queries:
+            if not node.location:
+                fallback.append((node, query))
+                continue
+            metric_names[(query.aggregation, query.interval)].append(query.metric_name)
+        for (aggregation, interval), names in metric_names.items():
+            key = (
+                node.subscription_id,
+                normalize_location(node.location),
+                get_metric_namespace(node).lower(),
+                aggregation,
+                interval,
+                tuple(sorted(set(names))),
+            )
+            groups[key].append(node)
+
+    results = await asyncio.gather(
+        *(
+            _get_batches(key, nodes, time_range_start, time_range_end)
+            for key, nodes in groups.items()
+        ),
+        *(
+            node._get_azure_monitor_metrics(
+                metric_names=[query.metric_name],
+                aggregation=query.aggregation,
+                start_time=time_range_start,
+                end_time=time_range_end,
+                interval=query.interval,
+            )
+            for node, query in fallback
+        ),
+    )
+    return [observation for result in results for observation in result]
+
+
+async def _get_batches(
+    key: tuple[str, str, str, str, str, tuple[str, ...]],
+    nodes: list["AzureNode"],
+    time_range_start: AwareDatetime,
+    time_range_end: AwareDatetime,
+) -> list[Observation]:
+    subscription_id, region, resource_type, aggregation, interval, metric_names = key
+
+    # Requests fail if any metric isn't defined, so skip those, and request
+    # metrics in other namespaces (e.g. guest metrics) separately.
+    metric_names_by_namespace: defaultdict[str, list[str]] = defaultdict(list)
+    definitions = await get_metric_definitions(nodes[0])
+    for metric_name in metric_names:
+        if definitions is None:
+            metric_names_by_namespace[get_metric_namespace(nodes[0])].append(metric_name)
+        elif metric_name in definitions:
+            metric_names_by_namespace[definitions[metric_name]].append(metric_name)
+
+    credential = nodes[0].credential
+    if not credential:
+        return []
+    client = nodes[0].clients.get_client(MetricsBatchClient, credential, region)
+    batches = [
+        (namespace, names, nodes[i : i + MAX_RESOURCES_PER_BATCH])
+        for namespace, names in metric_names_by_namespace.items()
+        for i in range(0, len(nodes), MAX_RESOURCES_PER_BATCH)
+    ]
+    responses = await asyncio.gather(
+        *(
+            client.get_batch(
+                subscription_id,
+                [node.resource_id for node in batch],
+                namespace,
+                names,
+                aggregation,
+                interval,
+                time_range_start,
+                time_range_end,
+            )
+            for namespace, names, batch in batches
+        ),
+        return_exceptions=True,
+    )
+
+    nodes_by_id = {node.resource_id.lower(): node for node in nodes}
+    observations: list[Observation] = []
+    for (namespace, _, _), response in zip(batches, responses, strict=True):
+        if isinstance(response, BaseException):
+            print(
+                f"Error retrieving Azure Monitor metrics for {resource_type} ({namespace}): {response!s}"
+            )
+            continue
+        for value in response.get("values", []):
+            node = nodes_by_id.get(value.get("resourceid", "").lower())
+            if node is None:
+                continue
+            for metric in value.get("value", []):
+                metric_name = metric.get("name", {}).get("value", "")
+                data_points: dict[datetime, float] = {}
+                for timeseries in metric.get("timeseries", []):
+                    for point in timeseries.get("data", []):
+                        point_value = point.get(aggregation.lower())
+                        if point.get("timeStamp") and point_value is not None:
+                            data_points[datetime.fromisoformat(point["timeStamp"])] = float(
+                                point_value
+                            )
+                if data_points:
+                    observations.append(
+                        Observation(
+                            node_id=node.nid,
+                            observation_type=f"{aggregation} {metric_name}",
+                            data=data_points,
+                        )
+                    )
+    return observations
@@ -1,14 +1,11 @@
 """Azure AKS Managed Cluster node implementation."""
 
-from pydantic import AwareDatetime
+from unpage.plugins.azure.monitoring import AzureMonitorQuery
 
-from unpage.knowledge import HasMetrics
-from unpage.models import Observation
+from .base import AzureNode, HasAzureMonitorMetrics
 
-from .base import AzureNode
 
-
-class AzureAksCluster(AzureNode, HasMetrics):
+class AzureAksCluster(AzureNode, HasAzureMonitorMetrics):
     """An Azure Kubernetes Service (AKS) Managed Cluster."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -108,22 +105,15 @@ class AzureAksCluster(AzureNode, HasMetrics):
             "cluster_autoscaler_unschedulable_pods_count",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: AwareDatetime,
-        time_range_end: AwareDatetime,
-    ) -> list[Observation] | str:
-        """Get specific metric data for this AKS cluster."""
+    def get_azure_monitor_query(self, metric_name: str) -> AzureMonitorQuery:
+        """Return the Azure Monitor query for a metric of this AKS cluster."""
         aggregation = "Average"
         if "bytes" in metric_name.lower() or "count" in metric_name.lower():
             aggregation = "Total"
 
-        return await self._get_azure_monitor_metrics(
-            metric_names=[metric_name],
+        return AzureMonitorQuery(
+            metric_name=metric_name,
             aggregation=aggregation,
-            start_time=time_range_start,
-            end_time=time_range_end,
             interval="PT5M",
         )
 
@@ -1,12 +1,9 @@
-from pydantic import AwareDatetime
+from unpage.plugins.azure.monitoring import AzureMonitorQuery
 
-from unpage.knowledge import HasMetrics
-from unpage.models import Observation
+from .base import AzureNode, HasAzureMonitorMetrics
 
-from .base import AzureNode
 
-
-class AzureCosmosDb(AzureNode, HasMetrics):
+class AzureCosmosDb(AzureNode, HasAzureMonitorMetrics):
     """An Azure Cosmos DB account."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -78,20 +75,13 @@ class AzureCosmosDb(AzureNode, HasMetrics):
             "SqlRequestCharges",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: AwareDatetime,
-        time_range_end: AwareDatetime,
-    ) -> list[Observation] | str:
-        """Get specific metric data for this Cosmos DB account."""
-        return await self._get_azure_monitor_metrics(
-            metric_names=[metric_name],
+    def get_azure_monitor_query(self, metric_name: str) -> AzureMonitorQuery:
+        """Return the Azure Monitor query for a metric of this Cosmos DB account."""
+        return AzureMonitorQuery(
+            metric_name=metric_name,
             aggregation="Total"
             if "Requests" in metric_name or "RequestUnits" in metric_name
             else "Average",
-            start_time=time_range_start,
-            end_time=time_range_end,
             interval="PT5M",  # 5 minute intervals
         )
 
@@ -1,12 +1,9 @@
-from pydantic import AwareDatetime
+from unpage.plugins.azure.monitoring import AzureMonitorQuery
 
-from unpage.knowledge import HasMetrics
-from unpage.models import Observation
+from .base import AzureNode, HasAzureMonitorMetrics
 
-from .base import AzureNode
 
-
-class AzureLoadBalancer(AzureNode, HasMetrics):
+class AzureLoadBalancer(AzureNode, HasAzureMonitorMetrics):
     """An Azure Load Balancer."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -83,23 +80,16 @@ class AzureLoadBalancer(AzureNode, HasMetrics):
             "UsedSnatPorts",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: AwareDatetime,
-        time_range_end: AwareDatetime,
-    ) -> list[Observation] | str:
-        """Get specific metric data for this Azure Load Balancer."""
+    def get_azure_monitor_query(self, metric_name: str) -> AzureMonitorQuery:
+        """Return the Azure Monitor query for a metric of this Azure Load Balancer."""
         # Use appropriate aggregation based on metric type
         aggregation = "Average"
         if metric_name in ["ByteCount", "PacketCount", "SYNCount"]:
             aggregation = "Total"
 
-        return await self._get_azure_monitor_metrics(
-            metric_names=[metric_name],
+        return AzureMonitorQuery(
+            metric_name=metric_name,
             aggregation=aggregation,
-            start_time=time_range_start,
-            end_time=time_range_end,
             interval="PT5M",  # 5 minute intervals
         )
 
@@ -1,14 +1,11 @@
 """Azure Managed Disk node implementation."""
 
-from pydantic import AwareDatetime
+from unpage.plugins.azure.monitoring import AzureMonitorQuery
 
-from unpage.knowledge import HasMetrics
-from unpage.models import Observation
+from .base import AzureNode, HasAzureMonitorMetrics
 
-from .base import AzureNode
 
-
-class AzureManagedDisk(AzureNode, HasMetrics):
+class AzureManagedDisk(AzureNode, HasAzureMonitorMetrics):
     """An Azure Managed Disk."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -65,22 +62,15 @@ class AzureManagedDisk(AzureNode, HasMetrics):
             "Used Disk Bandwidth Consumed Percentage",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: AwareDatetime,
-        time_range_end: AwareDatetime,
-    ) -> list[Observation] | str:
-        """Get specific metric data for this Managed Disk."""
+    def get_azure_monitor_query(self, metric_name: str) -> AzureMonitorQuery:
+        """Return the Azure Monitor query for a metric of this Managed Disk."""
         aggregation = "Average"
         if "Operations" in metric_name or "Bytes" in metric_name:
             aggregation = "Total"
 
-        return await self._get_azure_monitor_metrics(
-            metric_names=[metric_name],
+        return AzureMonitorQuery(
+            metric_name=metric_name,
             aggregation=aggregation,
-            start_time=time_range_start,
-            end_time=time_range_end,
             interval="PT5M",
         )
 
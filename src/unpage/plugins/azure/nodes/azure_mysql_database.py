@@ -1,13 +1,9 @@
-from pydantic import AwareDatetime
+from unpage.plugins.azure.monitoring import AzureMonitorQuery
 
-from unpage.knowledge import HasMetrics
-from unpage.models import Observation
-from unpage.plugins.azure.resource_id import parse_resource_id
+from .base import AzureNode, HasAzureMonitorMetrics
 
-from .base import AzureNode
 
-
-class AzureMySqlDatabase(AzureNode, HasMetrics):
+class AzureMySqlDatabase(AzureNode, HasAzureMonitorMetrics):
     """An Azure Database for MySQL database."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -68,31 +64,24 @@ class AzureMySqlDatabase(AzureNode, HasMetrics):
             "backup_storage_used",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: AwareDatetime,
-        time_range_end: AwareDatetime,
-    ) -> list[Observation] | str:
-        """Get specific metric data for this MySQL database."""
-        return await self._get_azure_monitor_metrics(
-            metric_names=[metric_name],
+    def get_azure_monitor_query(self, metric_name: str) -> AzureMonitorQuery:
+        """Return the Azure Monitor query for a metric of this MySQL database."""
+        return AzureMonitorQuery(
+            metric_name=metric_name,
             aggregation="Average",
-            start_time=time_range_start,
-            end_time=time_range_end,
             interval="PT5M",  # 5 minute intervals
         )
 
     @property
     def server_name(self) -> str:
         """Get the MySQL server name that hosts this database."""
-        parsed = parse_resource_id(self.resource_id)
+        parsed = self.parsed_resource_id
         return parsed.parent_resource or ""
 
     @property
     def server_id(self) -> str:
         """Get the MySQL server resource ID."""
-        parsed = parse_resource_id(self.resource_id)
+        parsed = self.parsed_resource_id
         if parsed.subscription_id and parsed.resource_group and parsed.parent_resource:
             return (
                 f"/subscriptions/{parsed.subscription_id}"
@@ -1,12 +1,9 @@
-from pydantic import AwareDatetime
+from unpage.plugins.azure.monitoring import AzureMonitorQuery
 
-from unpage.knowledge import HasMetrics
-from unpage.models import Observation
+from .base import AzureNode, HasAzureMonitorMetrics
 
-from .base import AzureNode
 
-
-class AzureStorageAccount(AzureNode, HasMetrics):
+class AzureStorageAccount(AzureNode, HasAzureMonitorMetrics):
     """An Azure Storage Account."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -89,13 +86,8 @@ class AzureStorageAccount(AzureNode, HasMetrics):
             "TableEntityCount",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: AwareDatetime,
-        time_range_end: AwareDatetime,
-    ) -> list[Observation] | str:
-        """Get specific metric data for this Azure Storage Account."""
+    def get_azure_monitor_query(self, metric_name: str) -> AzureMonitorQuery:
+        """Return the Azure Monitor query for a metric of this Azure Storage Account."""
         # Use appropriate aggregation based on metric type
         aggregation = "Average"
         if metric_name in ["Transactions", "Ingress", "Egress"]:
@@ -109,11 +101,9 @@ class AzureStorageAccount(AzureNode, HasMetrics):
         ]:
             aggregation = "Average"
 
-        return await self._get_azure_monitor_metrics(
-            metric_names=[metric_name],
+        return AzureMonitorQuery(
+            metric_name=metric_name,
             aggregation=aggregation,
-            start_time=time_range_start,
-            end_time=time_range_end,
             interval="PT1H",  # 1 hour intervals for storage metrics
         )
 
@@ -1,12 +1,9 @@
-from pydantic import AwareDatetime
+from unpage.plugins.azure.monitoring import AzureMonitorQuery
 
-from unpage.knowledge import HasMetrics
-from unpage.models import Observation
+from .base import AzureNode, HasAzureMonitorMetrics
 
-from .base import AzureNode
 
-
-class AzureVmInstance(AzureNode, HasMetrics):
+class AzureVmInstance(AzureNode, HasAzureMonitorMetrics):
     """An Azure Virtual Machine instance."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -89,18 +86,11 @@ class AzureVmInstance(AzureNode, HasMetrics):
             "Available Memory Bytes",  # Requires Azure Monitor Agent
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: AwareDatetime,
-        time_range_end: AwareDatetime,
-    ) -> list[Observation] | str:
-        """Get specific metric data for this Azure VM."""
-        return await self._get_azure_monitor_metrics(
-            metric_names=[metric_name],
+    def get_azure_monitor_query(self, metric_name: str) -> AzureMonitorQuery:
+        """Return the Azure Monitor query for a metric of this Azure VM."""
+        return AzureMonitorQuery(
+            metric_name=metric_name,
             aggregation="Average",
-            start_time=time_range_start,
-            end_time=time_range_end,
             interval="PT5M",  # 5 minute intervals
         )
 
@@ -1,14 +1,11 @@
 """Azure VM Scale Set node implementation."""
 
-from pydantic import AwareDatetime
+from unpage.plugins.azure.monitoring import AzureMonitorQuery
 
-from unpage.knowledge import HasMetrics
-from unpage.models import Observation
+from .base import AzureNode, HasAzureMonitorMetrics
 
-from .base import AzureNode
 
-
-class AzureVmScaleSet(AzureNode, HasMetrics):
+class AzureVmScaleSet(AzureNode, HasAzureMonitorMetrics):
     """An Azure VM Scale Set."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -91,23 +88,16 @@ class AzureVmScaleSet(AzureNode, HasMetrics):
             "CPU Credits Consumed",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: AwareDatetime,
-        time_range_end: AwareDatetime,
-    ) -> list[Observation] | str:
-        """Get specific metric data for this VM Scale Set."""
+    def get_azure_monitor_query(self, metric_name: str) -> AzureMonitorQuery:
+        """Return the Azure Monitor query for a metric of this VM Scale Set."""
         # Use appropriate aggregation based on metric type
         aggregation = "Average"
         if "Total" in metric_name or "Bytes" in metric_name:
             aggregation = "Total"
 
-        return await self._get_azure_monitor_metrics(
-            metric_names=[metric_name],
+        return AzureMonitorQuery(
+            metric_name=metric_name,
             aggregation=aggregation,
-            start_time=time_range_start,
-            end_time=time_range_end,
             interval="PT5M",  # 5 minute intervals
         )
 
@@ -142,7 +132,7 @@ class AzureVmScaleSet(AzureNode, HasMetrics):
         return self.raw_data.get("overprovision", True) if self.raw_data else True
 
 
-class AzureVmScaleSetInstance(AzureNode, HasMetrics):
+class AzureVmScaleSetInstance(AzureNode, HasAzureMonitorMetrics):
     """An Azure VM Scale Set Instance."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -201,22 +191,15 @@ class AzureVmScaleSetInstance(AzureNode, HasMetrics):
             "Disk Write Operations/Sec",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: AwareDatetime,
-        time_range_end: AwareDatetime,
-    ) -> list[Observation] | str:
-        """Get specific metric data for this VM Scale Set Instance."""
+    def get_azure_monitor_query(self, metric_name: str) -> AzureMonitorQuery:
+        """Return the Azure Monitor query for a metric of this VM Scale Set Instance."""
         aggregation = "Average"
         if "Total" in metric_name or "Bytes" in metric_name:
             aggregation = "Total"
 
-        return await self._get_azure_monitor_metrics(
-            metric_names=[metric_name],
+        return AzureMonitorQuery(
+            metric_name=metric_name,
             aggregation=aggregation,
-            start_time=time_range_start,
-            end_time=time_range_end,
             interval="PT5M",
         )
 
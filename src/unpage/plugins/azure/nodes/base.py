@@ -1,14 +1,21 @@
-import asyncio
-from datetime import UTC, datetime
-from typing import TYPE_CHECKING, ClassVar
+from datetime import UTC, datetime, timedelta
+from functools import cached_property
+from typing import TYPE_CHECKING, ClassVar, cast
 
-from azure.core.credentials import TokenCredential
-from azure.mgmt.monitor import MonitorManagementClient
+from azure.core.credentials_async import AsyncTokenCredential
+from azure.mgmt.monitor.aio import MonitorManagementClient
 from pydantic import BaseModel, Field
 
-from unpage.knowledge import Node
+from unpage.knowledge import HasMetrics, Node
 from unpage.models import Observation
-from unpage.plugins.azure.resource_id import parse_resource_id
+from unpage.plugins.azure.clients import AzureClientPool
+from unpage.plugins.azure.monitoring import (
+    AzureMonitorQuery,
+    get_azure_monitor_metrics,
+    get_metric_definitions,
+    get_metric_namespace,
+)
+from unpage.plugins.azure.resource_id import AzureResourceId, parse_resource_id
 from unpage.plugins.azure.utils import handle_azure_errors
 
 if TYPE_CHECKING:
@@ -37,7 +44,21 @@ class AzureNode(Node):
     model_config: ClassVar = {"arbitrary_types_allowed": True}
 
     azure_subscription: AzureSubscription = Field()
-    credential: TokenCredential | None = Field(default=None, exclude=True)
+    credential: AsyncTokenCredential | None = Field(default=None, exclude=True)
+    # Set by the AzurePlugin the node belongs to (see AzurePlugin.bind_node).
+    _clients: AzureClientPool | None = None
+
+    @property
+    def clients(self) -> AzureClientPool:
+        """The client pool of the AzurePlugin the node belongs to."""
+        if self._clients is None:
+            raise RuntimeError(f"Azure node {self.nid} isn't bound to an Azure plugin")
+        return self._clients
+
+    @cached_property
+    def parsed_resource_id(self) -> AzureResourceId:
+        """Get the parts of the resource ID, which are parsed once and cached."""
+        return parse_resource_id(self.resource_id)
 
     @property
     def resource_id(self) -> str:
@@ -52,28 +73,29 @@ class AzureNode(Node):
     @property
     def resource_group(self) -> str:
         """Get the resource group name from the resource ID."""
-        parsed = parse_resource_id(self.resource_id)
-        return parsed.resource_group or ""
+        return self.parsed_resource_id.resource_group or ""
 
     @property
     def subscription_id(self) -> str:
         """Get the subscription ID from the resource ID or subscription config."""
-        if self.resource_id:
-            parsed = parse_resource_id(self.resource_id)
-            if parsed.subscription_id:
-                return parsed.subscription_id
-        return self.azure_subscription.subscription_id or ""
+        return (
+            self.parsed_resource_id.subscription_id or self.azure_subscription.subscription_id or ""
+        )
 
     @property
     def location(self) -> str:
         """Get the Azure region/location for this resource."""
         return self.raw_data.get("location", "") if self.raw_data else ""
 
+    @property
+    def provider(self) -> str:
+        """Get the Azure resource provider, e.g. Microsoft.Compute."""
+        return self.parsed_resource_id.provider or ""
+
     @property
     def resource_type(self) -> str:
         """Get the Azure resource type."""
-        parsed = parse_resource_id(self.resource_id)
-        return parsed.resource_type or ""
+        return self.parsed_resource_id.resource_type or ""
 
     @property
     def tags(self) -> dict[str, str]:
@@ -143,21 +165,20 @@ class AzureNode(Node):
         if not end_time:
             end_time = datetime.now(UTC)
         if not start_time:
-            start_time = datetime.now(UTC).replace(hour=end_time.hour - 1)  # 1 hour ago
+            start_time = end_time - timedelta(hours=1)
 
         observations = []
 
         async with handle_azure_errors("Monitor", f"get metrics for {self.resource_id}"):
-            # Create monitor client
-            monitor_client = MonitorManagementClient(self.credential, self.subscription_id)
+            monitor_client = self.clients.get_client(
+                MonitorManagementClient, self.credential, self.subscription_id
+            )
 
             # Convert metric names to comma-separated string for API call
             metric_names_str = ",".join(metric_names)
 
             try:
-                # Get metrics using asyncio.to_thread for sync API
-                response = await asyncio.to_thread(
-                    monitor_client.metrics.list,
+                response = await monitor_client.metrics.list(
                     resource_uri=self.resource_id,
                     metricnames=metric_names_str,
                     aggregation=aggregation,
@@ -204,36 +225,51 @@ class AzureNode(Node):
         """
         Get available metric definitions for this resource from Azure Monitor.
 
+        The definitions are cached for each resource type.
+
         Returns:
             List of available metric names
         """
-        if not self.credential or not self.subscription_id:
-            return []
+        return list(await get_metric_definitions(self) or {})
 
-        metric_names = []
 
-        async with handle_azure_errors("Monitor", f"get metric definitions for {self.resource_id}"):
-            monitor_client = MonitorManagementClient(self.credential, self.subscription_id)
+class HasAzureMonitorMetrics(HasMetrics):
+    """Capability for Azure nodes whose metrics are retrieved from Azure Monitor."""
 
-            try:
-                # Get metric definitions using asyncio.to_thread for sync API
-                response = await asyncio.to_thread(
-                    monitor_client.metric_definitions.list,
-                    resource_uri=self.resource_id,
-                )
-
-                metric_names.extend(
-                    [
-                        metric_def.name.value
-                        for metric_def in response
-                        if metric_def.name and metric_def.name.value
-                    ]
-                )
-
-            except Exception as e:
-                import logging
+    def get_azure_monitor_query(self, metric_name: str) -> AzureMonitorQuery:
+        """Return the Azure Monitor query for a metric."""
+        raise NotImplementedError
 
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Failed to get metric definitions for {self.resource_id}: {e}")
+    async def get_metric(
+        self,
+        metric_name: str,
+        time_range_start: "AwareDatetime",
+        time_range_end: "AwareDatetime",
+    ) -> list[Observation] | str:
+        return await self.get_metrics(time_range_start, time_range_end, [metric_name])
 
-        return metric_names
+    async def get_metrics(
+        self,
+        time_range_start: "AwareDatetime",
+        time_range_end: "AwareDatetime",
+        metric_names: list[str] | None = None,
+    ) -> list[Observation] | str:
+        """Retrieve all the requested metrics with the Azure Monitor batch API.
+
+        Metrics that aren't defined for the node's resource type are skipped.
+        If none of them are defined, the metrics that are available are
+        returned instead.
+        """
+        node = cast("AzureNode", self)
+        metric_names = metric_names or await self.list_available_metrics()
+        definitions = await get_metric_definitions(node)
+        if definitions is not None and not any(m in definitions for m in metric_names):
+            return (
+                f"Metrics not available for {get_metric_namespace(node)}: {', '.join(metric_names)}. "
+                f"Available metrics: {', '.join(sorted(definitions))}"
+            )
+        return await get_azure_monitor_metrics(
+            [(node, [self.get_azure_monitor_query(m) for m in metric_names])],
+            time_range_start,
+            time_range_end,
+        )
@@ -1,22 +1,38 @@
 import asyncio
+import time
+from collections import Counter, defaultdict
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 import rich
-from azure.core.credentials import TokenCredential
-from azure.mgmt.compute import ComputeManagementClient
-from azure.mgmt.containerservice import ContainerServiceClient as ContainerServiceManagementClient
-from azure.mgmt.cosmosdb import CosmosDBManagementClient
-from azure.mgmt.network import NetworkManagementClient
-from azure.mgmt.rdbms.mysql import MySQLManagementClient
-from azure.mgmt.rdbms.postgresql import PostgreSQLManagementClient
-from azure.mgmt.sql import SqlManagementClient
-from azure.mgmt.storage import StorageManagementClient
-from pydantic import BaseModel, Field, ValidationError
+from azure.core.credentials_async import AsyncTokenCredential
+from azure.core.exceptions import ResourceNotFoundError
+from azure.mgmt.compute import models as compute_models
+from azure.mgmt.compute.aio import ComputeManagementClient
+from azure.mgmt.containerservice import models as containerservice_models
+from azure.mgmt.containerservice.aio import (
+    ContainerServiceClient as ContainerServiceManagementClient,
+)
+from azure.mgmt.cosmosdb import models as cosmosdb_models
+from azure.mgmt.cosmosdb.aio import CosmosDBManagementClient
+from azure.mgmt.network import models as network_models
+from azure.mgmt.network.aio import NetworkManagementClient
+from azure.mgmt.rdbms.mysql.aio import MySQLManagementClient
+from azure.mgmt.rdbms.postgresql.aio import PostgreSQLManagementClient
+from azure.mgmt.sql import models as sql_models
+from azure.mgmt.sql.aio import SqlManagementClient
+from azure.mgmt.storage import models as storage_models
+from azure.mgmt.storage.aio import StorageManagementClient
+from pydantic import AwareDatetime, BaseModel, Field, ValidationError
 from pydantic_core import to_jsonable_python
 
 from unpage.config import PluginSettings
-from unpage.knowledge import Graph
+from unpage.knowledge import Graph, Node
+from unpage.models import Observation
 from unpage.plugins import Plugin
+from unpage.plugins.azure.clients import AzureClientPool
+from unpage.plugins.azure.inventory import iter_resource_graph_resources
+from unpage.plugins.azure.monitoring import AzureMonitorQuery, get_azure_monitor_metrics
 from unpage.plugins.azure.nodes.azure_aks_cluster import AzureAksCluster
 from unpage.plugins.azure.nodes.azure_app_gateway import AzureAppGateway
 from unpage.plugins.azure.nodes.azure_cosmos_db import AzureCosmosDb
@@ -32,7 +48,13 @@ from unpage.plugins.azure.nodes.azure_storage_account import AzureStorageAccount
 from unpage.plugins.azure.nodes.azure_virtual_network import AzureSubnet, AzureVirtualNetwork
 from unpage.plugins.azure.nodes.azure_vm_instance import AzureVmInstance
 from unpage.plugins.azure.nodes.azure_vm_scale_set import AzureVmScaleSet, AzureVmScaleSetInstance
-from unpage.plugins.azure.nodes.base import DEFAULT_AZURE_SUBSCRIPTION_NAME, AzureSubscription
+from unpage.plugins.azure.nodes.base import (
+    DEFAULT_AZURE_SUBSCRIPTION_NAME,
+    AzureNode,
+    AzureSubscription,
+    HasAzureMonitorMetrics,
+)
+from unpage.plugins.azure.resource_id import parse_resource_id
 from unpage.plugins.azure.types import (
     AzureAksCluster as AzureAksClusterData,
 )
@@ -84,69 +106,193 @@ from unpage.plugins.azure.utils import (
 from unpage.plugins.mixins import KnowledgeGraphMixin, McpServerMixin, tool
 from unpage.utils import Choice, classproperty, print, select
 
+# The resource types read from Azure Resource Graph, with the SDK model their
+# ARM JSON is deserialized into, the function that converts the model into
+# the node's data, and the node class.
+RESOURCE_GRAPH_TYPES: dict[str, tuple[Any, Callable[[object], Any], type[AzureNode]]] = {
+    "Microsoft.Compute/virtualMachines": (
+        compute_models.VirtualMachine,
+        AzureVirtualMachine.from_sdk_object,
+        AzureVmInstance,
+    ),
+    "Microsoft.Compute/virtualMachineScaleSets": (
+        compute_models.VirtualMachineScaleSet,
+        AzureVmScaleSetData.from_sdk_object,
+        AzureVmScaleSet,
+    ),
+    "Microsoft.Compute/disks": (
+        compute_models.Disk,
+        AzureManagedDiskData.from_sdk_object,
+        AzureManagedDisk,
+    ),
+    "Microsoft.Sql/servers/databases": (
+        sql_models.Database,
+        AzureDatabase.from_sdk_object,
+        AzureSqlDatabase,
+    ),
+    "Microsoft.DocumentDB/databaseAccounts": (
+        cosmosdb_models.DatabaseAccountGetResults,
+        AzureCosmosAccount.from_sdk_object,
+        AzureCosmosDb,
+    ),
+    "Microsoft.Network/loadBalancers": (
+        network_models.LoadBalancer,
+        AzureLoadBalancerData.from_sdk_object,
+        AzureLoadBalancer,
+    ),
+    "Microsoft.Network/applicationGateways": (
+        network_models.ApplicationGateway,
+        AzureApplicationGatewayData.from_sdk_object,
+        AzureAppGateway,
+    ),
+    "Microsoft.Network/publicIPAddresses": (
+        network_models.PublicIPAddress,
+        AzurePublicIpAddressData.from_sdk_object,
+        AzurePublicIpAddress,
+    ),
+    "Microsoft.Network/virtualNetworks": (
+        network_models.VirtualNetwork,
+        AzureVirtualNetworkData.from_sdk_object,
+        AzureVirtualNetwork,
+    ),
+    "Microsoft.Network/networkSecurityGroups": (
+        network_models.NetworkSecurityGroup,
+        AzureNetworkSecurityGroupData.from_sdk_object,
+        AzureNetworkSecurityGroup,
+    ),
+    "Microsoft.Network/networkInterfaces": (
+        network_models.NetworkInterface,
+        AzureNetworkInterfaceData.from_sdk_object,
+        AzureNetworkInterface,
+    ),
+    "Microsoft.Storage/storageAccounts": (
+        storage_models.StorageAccount,
+        AzureStorageAccountData.from_sdk_object,
+        AzureStorageAccount,
+    ),
+    "Microsoft.ContainerService/managedClusters": (
+        containerservice_models.ManagedCluster,
+        AzureAksClusterData.from_sdk_object,
+        AzureAksCluster,
+    ),
+}
+
+# Resource Graph throttles each user to a few queries per second.
+MAX_CONCURRENT_RESOURCE_GRAPH_QUERIES = 4
+
+# Up to this many VMs in a subscription, the status of each VM is read on its
+# own, rather than listing the status of every VM in the subscription.
+MAX_VM_INSTANCE_VIEWS_PER_SUBSCRIPTION = 20
+
+
+class AzureResourceGraphSettings(BaseModel):
+    """Read resources from Azure Resource Graph, instead of listing each service."""
+
+    # The subscriptions to query. Defaults to the configured subscriptions.
+    subscriptions: list[str] | None = None
+    # Management groups to query instead of subscriptions.
+    management_groups: list[str] | None = None
+
 
 class AzurePluginSettings(BaseModel):
     subscriptions: dict[str, AzureSubscription] = Field(
         default_factory=lambda: {DEFAULT_AZURE_SUBSCRIPTION_NAME: AzureSubscription()}
     )
+    # Also scan every enabled subscription the credential can access.
+    all_subscriptions: bool = Field(default=False)
+    resource_graph: AzureResourceGraphSettings | None = None
+    max_concurrent_subscriptions: int = Field(default=4, ge=1)
+    # Bound the number of concurrent child listings in each subscription, e.g.
+    # the databases of each server, or the instances of each VM Scale Set.
+    # Azure Resource Manager throttles reads for each subscription.
+    max_concurrent_child_requests: int = Field(default=16, ge=1)
 
     @property
     def subscription(self) -> AzureSubscription:
+        """The first configured subscription, used by tools when no subscription is given."""
         return next(iter(self.subscriptions.values()))
 
 
 class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
     azure_settings: AzurePluginSettings
-    _credential: TokenCredential | None = None
 
     def __init__(
         self, *args: Any, azure_settings: AzurePluginSettings | None = None, **kwargs: Any
     ) -> None:
         super().__init__(*args, **kwargs)
         self.azure_settings = azure_settings if azure_settings else AzurePluginSettings()
+        # The long-lived Azure clients used by the plugin and its nodes, closed with the plugin.
+        self.clients = AzureClientPool()
 
     def init_plugin(self) -> None:
+        plugin_settings = {
+            key: self._settings[key]
+            for key in (
+                "all_subscriptions",
+                "resource_graph",
+                "max_concurrent_subscriptions",
+                "max_concurrent_child_requests",
+            )
+            if self._settings.get(key) is not None
+        }
+
         azure_subscriptions = self._settings.get("subscriptions")
         if not azure_subscriptions:
-            self.azure_settings = AzurePluginSettings()
+            try:
+                self.azure_settings = AzurePluginSettings(**plugin_settings)
+            except ValidationError as ex:
+                raise ValueError(
+                    f"Invalid Azure plugin settings. Review your config.yaml. error={ex!s}"
+                ) from ex
             return
         if not isinstance(azure_subscriptions, dict):
             raise ValueError("azure subscriptions must be a dictionary in config.yaml")
-        if len(azure_subscriptions) != 1:
-            raise ValueError(
-                "More than one Azure subscription configured in config.yaml; we only support one Azure subscription at this time. Please let us know if you need multiple subscription support."
-            )
+
+        subscriptions_config = {}
         for subscription_name, subscription_settings in azure_subscriptions.items():
             try:
-                self.azure_settings = AzurePluginSettings(
-                    subscriptions={
-                        subscription_name: AzureSubscription(
-                            **{
-                                "name": subscription_name,
-                                **to_jsonable_python(subscription_settings),
-                            }
-                        )
-                    }
+                subscriptions_config[subscription_name] = AzureSubscription(
+                    **{"name": subscription_name, **to_jsonable_python(subscription_settings)}
                 )
             except ValidationError as ex:
                 raise ValueError(
                     f"Invalid Azure subscription settings for subscription '{subscription_name}'. Review your config.yaml. {subscription_settings=}; error={ex!s}"
                 ) from ex
 
+        try:
+            self.azure_settings = AzurePluginSettings(
+                subscriptions=subscriptions_config, **plugin_settings
+            )
+        except ValidationError as ex:
+            raise ValueError(
+                f"Invalid Azure plugin settings. Review your config.yaml. error={ex!s}"
+            ) from ex
+
     async def validate_plugin_config(self) -> None:
         await super().validate_plugin_config()
         credential = await self._get_credential()
-        subscription_id = self.azure_settings.subscription.subscription_id
+        subscription_ids = [
+            subscription.subscription_id
+            for subscription in self.azure_settings.subscriptions.values()
+            if subscription.subscription_id
+        ]
 
-        if not subscription_id:
+        if not subscription_ids and not self.azure_settings.all_subscriptions:
             raise ValueError("Azure subscription ID is required")
 
         # Test connectivity
-        if not await test_azure_connectivity(credential, subscription_id):
-            raise ValueError(
-                f"Cannot access Azure subscription {subscription_id}. "
-                "Please check your authentication and permissions."
+        accessible = await asyncio.gather(
+            *(
+                test_azure_connectivity(self.clients, credential, subscription_id)
+                for subscription_id in subscription_ids
             )
+        )
+        for subscription_id, is_accessible in zip(subscription_ids, accessible, strict=True):
+            if not is_accessible:
+                raise ValueError(
+                    f"Cannot access Azure subscription {subscription_id}. "
+                    "Please check your authentication and permissions."
+                )
 
     @classproperty
     def default_plugin_settings(cls) -> PluginSettings:
@@ -163,8 +309,8 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         rich.print("")
 
         try:
-            credential = await get_default_credential()
-            subscriptions = await list_accessible_subscriptions(credential)
+            credential = await get_default_credential(self.clients)
+            subscriptions = await list_accessible_subscriptions(self.clients, credential)
         except Exception as e:
             rich.print(f"[red]Error: Failed to authenticate with Azure: {e!s}[/red]")
             rich.print(
@@ -236,7 +382,7 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         # Test the configuration
         try:
             test_successful = await test_azure_connectivity(
-                credential, selected_subscription["subscription_id"]
+                self.clients, credential, selected_subscription["subscription_id"]
             )
             if not test_successful:
                 rich.print(
@@ -249,11 +395,20 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
 
         return settings.model_dump()
 
-    async def _get_credential(self) -> TokenCredential:
-        """Get or create the Azure credential."""
-        if self._credential is None:
-            self._credential = await get_default_credential()
-        return self._credential
+    async def close(self) -> None:
+        await super().close()
+        await self.clients.close()
+
+    def bind_node(self, node: Node) -> None:
+        if isinstance(node, AzureNode):
+            node._clients = self.clients
+
+    async def _get_credential(self) -> AsyncTokenCredential:
+        """Get the plugin's Azure credential for the current event loop.
+
+        The credential caches its tokens, so only the first call requests one.
+        """
+        return await get_default_credential(self.clients)
 
     def _validate_subscription(self, subscription: AzureSubscription, operation: str) -> str:
         """Validate subscription has required ID and return it."""
@@ -262,9 +417,86 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
             raise ValueError(f"Subscription ID required for {operation}")
         return subscription.subscription_id
 
+    def _get_child_limiter(self, subscription: AzureSubscription) -> asyncio.Semaphore:
+        """Bound the number of concurrent child listings in a subscription, across all of the resource types."""
+        if not hasattr(self, "_child_limiters"):
+            self._child_limiters: dict[str | None, asyncio.Semaphore] = {}
+        if subscription.subscription_id not in self._child_limiters:
+            self._child_limiters[subscription.subscription_id] = asyncio.Semaphore(
+                self.azure_settings.max_concurrent_child_requests
+            )
+        return self._child_limiters[subscription.subscription_id]
+
+    async def _get_subscriptions(self, credential: AsyncTokenCredential) -> list[AzureSubscription]:
+        """Return the subscriptions to scan.
+
+        These are the configured subscriptions, and with all_subscriptions,
+        every other enabled subscription the credential can access.
+        """
+        subscriptions = list(self.azure_settings.subscriptions.values())
+        if not self.azure_settings.all_subscriptions:
+            return subscriptions
+
+        # Subscriptions without an ID can't be scanned alongside the others.
+        subscriptions = [
+            subscription for subscription in subscriptions if subscription.subscription_id
+        ]
+        configured = {subscription.subscription_id for subscription in subscriptions}
+        for accessible in await list_accessible_subscriptions(self.clients, credential):
+            if accessible["state"] == "Enabled" and accessible["subscription_id"] not in configured:
+                subscriptions.append(
+                    AzureSubscription(
+                        name=accessible["display_name"] or accessible["subscription_id"],
+                        subscription_id=accessible["subscription_id"],
+                        tenant_id=accessible["tenant_id"],
+                    )
+                )
+        return subscriptions
+
+    async def _for_each_subscription(
+        self,
+        subscriptions: list[AzureSubscription],
+        populate: Callable[[AzureSubscription], Awaitable[None]],
+    ) -> None:
+        """Populate the subscriptions concurrently, a few subscriptions at a time.
+
+        A subscription that fails is skipped, without cancelling the others.
+        """
+        subscription_limiter = asyncio.Semaphore(self.azure_settings.max_concurrent_subscriptions)
+
+        async def _populate_with_limit(subscription: AzureSubscription) -> None:
+            async with subscription_limiter:
+                try:
+                    await populate(subscription)
+                except Exception as e:
+                    print(
+                        f"Error populating Azure subscription {subscription.display_name} ({subscription.subscription_id}): {e!s}"
+                    )
+
+        async with asyncio.TaskGroup() as tg:
+            for subscription in subscriptions:
+                tg.create_task(_populate_with_limit(subscription))
+
     async def populate_graph(self, graph: Graph) -> None:
         credential = await self._get_credential()
-        subscription = self.azure_settings.subscription
+        if self.azure_settings.resource_graph:
+            await self.populate_from_resource_graph(graph, credential)
+            return
+
+        # Every subscription goes into the same graph, and shares the credential and clients' session.
+        subscriptions = await self._get_subscriptions(credential)
+        await self._for_each_subscription(
+            subscriptions,
+            lambda subscription: self.populate_subscription(graph, credential, subscription),
+        )
+
+    async def populate_subscription(
+        self, graph: Graph, credential: AsyncTokenCredential, subscription: AzureSubscription
+    ) -> None:
+        """Populate the knowledge graph with the resources of one Azure subscription."""
+        print(
+            f"Populating resources for Azure subscription: {subscription.display_name} ({subscription.subscription_id})"
+        )
 
         # Populate all resource types in parallel
         async with asyncio.TaskGroup() as tg:
@@ -285,7 +517,7 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
             tg.create_task(self.populate_aks_clusters(graph, credential, subscription))
 
     async def populate_vm_instances(
-        self, graph: Graph, credential: TokenCredential, subscription: AzureSubscription
+        self, graph: Graph, credential: AsyncTokenCredential, subscription: AzureSubscription
     ) -> None:
         print("Populating Azure VM instances")
         vm_count = 0
@@ -293,12 +525,9 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         subscription_id = self._validate_subscription(subscription, "VM instance population")
 
         async with handle_azure_errors("Compute", "populate VM instances"):
-            client = ComputeManagementClient(credential, subscription_id)
-
-            # Use asyncio.to_thread to make the sync call async
-            vm_list = await asyncio.to_thread(client.virtual_machines.list_all)
+            client = self.clients.get_client(ComputeManagementClient, credential, subscription_id)
 
-            for vm_obj in vm_list:
+            async for vm_obj in client.virtual_machines.list_all():
                 vm_data = AzureVirtualMachine.from_sdk_object(vm_obj)
                 if vm_data:
                     await graph.add_node(
@@ -315,134 +544,158 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         print(f"Initialized {vm_count} Azure VM instances")
 
     async def populate_sql_databases(
-        self, graph: Graph, credential: TokenCredential, subscription: AzureSubscription
+        self, graph: Graph, credential: AsyncTokenCredential, subscription: AzureSubscription
     ) -> None:
         print("Populating Azure SQL databases")
-        db_count = 0
+        started_at = time.monotonic()
+        db_counts: list[asyncio.Task[int]] = []
 
         subscription_id = self._validate_subscription(subscription, "SQL database population")
 
         async with handle_azure_errors("SQL", "populate SQL databases"):
-            client = SqlManagementClient(credential, subscription_id)
-
-            # Get all SQL servers first
-            servers = await asyncio.to_thread(client.servers.list)
-
-            for server_obj in servers:
-                server_data = AzureServer.from_sdk_object(server_obj)
-                if not server_data or not server_data.resource_group:
-                    continue
+            client = self.clients.get_client(SqlManagementClient, credential, subscription_id)
 
-                # Get databases for each server
-                databases = await asyncio.to_thread(
-                    client.databases.list_by_server,
-                    resource_group_name=server_data.resource_group,
-                    server_name=server_data.name,
-                )
+            servers = [
+                server_data
+                async for server_obj in client.servers.list()
+                if (server_data := AzureServer.from_sdk_object(server_obj))
+                and server_data.resource_group
+            ]
 
-                for db_obj in databases:
-                    db_data = AzureDatabase.from_sdk_object(db_obj)
-                    # Skip master database and ensure we have valid data
-                    if db_data and db_data.name.lower() != "master":
-                        await graph.add_node(
-                            AzureSqlDatabase(
-                                node_id=db_data.id,
-                                raw_data=db_data.raw_data or {},
-                                _graph=graph,
-                                azure_subscription=subscription,
-                                credential=credential,
-                            )
+            # List the databases of each server concurrently
+            async with asyncio.TaskGroup() as tg:
+                db_counts = [
+                    tg.create_task(
+                        self._populate_server_databases(
+                            graph, client, server_data, AzureSqlDatabase, credential, subscription
                         )
-                        db_count += 1
+                    )
+                    for server_data in servers
+                ]
 
-        print(f"Initialized {db_count} Azure SQL databases")
+        print(
+            f"Initialized {sum(task.result() for task in db_counts)} Azure SQL databases in {time.monotonic() - started_at:.1f}s"
+        )
 
     async def populate_postgresql_databases(
-        self, graph: Graph, credential: TokenCredential, subscription: AzureSubscription
+        self, graph: Graph, credential: AsyncTokenCredential, subscription: AzureSubscription
     ) -> None:
         print("Populating Azure PostgreSQL databases")
-        db_count = 0
+        started_at = time.monotonic()
+        db_counts: list[asyncio.Task[int]] = []
 
         subscription_id = self._validate_subscription(
             subscription, "PostgreSQL database population"
         )
 
         async with handle_azure_errors("PostgreSQL", "populate PostgreSQL databases"):
-            client = PostgreSQLManagementClient(credential, subscription_id)
-
-            # Get all PostgreSQL servers
-            servers = await asyncio.to_thread(client.servers.list)
-
-            for server_obj in servers:
-                server_data = AzureServer.from_sdk_object(server_obj)
-                if not server_data or not server_data.resource_group:
-                    continue
+            client = self.clients.get_client(
+                PostgreSQLManagementClient, credential, subscription_id
+            )
 
-                # Get databases for each server
-                databases = await asyncio.to_thread(
-                    client.databases.list_by_server,
-                    resource_group_name=server_data.resource_group,
-                    server_name=server_data.name,
-                )
+            servers = [
+                server_data
+                async for server_obj in client.servers.list()
+                if (server_data := AzureServer.from_sdk_object(server_obj))
+                and server_data.resource_group
+            ]
 
-                for db_obj in databases:
-                    db_data = AzureDatabase.from_sdk_object(db_obj)
-                    if db_data:
-                        await graph.add_node(
-                            AzurePostgreSqlDatabase(
-                                node_id=db_data.id,
-                                raw_data=db_data.raw_data or {},
-                                _graph=graph,
-                                azure_subscription=subscription,
-                                credential=credential,
-                            )
+            # List the databases of each server concurrently
+            async with asyncio.TaskGroup() as tg:
+                db_counts = [
+                    tg.create_task(
+                        self._populate_server_databases(
+                            graph,
+                            client,
+                            server_data,
+                            AzurePostgreSqlDatabase,
+                            credential,
+                            subscription,
                         )
-                        db_count += 1
+                    )
+                    for server_data in servers
+                ]
 
-        print(f"Initialized {db_count} Azure PostgreSQL databases")
+        print(
+            f"Initialized {sum(task.result() for task in db_counts)} Azure PostgreSQL databases in {time.monotonic() - started_at:.1f}s"
+        )
 
     async def populate_mysql_databases(
-        self, graph: Graph, credential: TokenCredential, subscription: AzureSubscription
+        self, graph: Graph, credential: AsyncTokenCredential, subscription: AzureSubscription
     ) -> None:
         print("Populating Azure MySQL databases")
-        db_count = 0
+        started_at = time.monotonic()
+        db_counts: list[asyncio.Task[int]] = []
 
         subscription_id = self._validate_subscription(subscription, "MySQL database population")
 
         async with handle_azure_errors("MySQL", "populate MySQL databases"):
-            client = MySQLManagementClient(credential, subscription_id)
+            client = self.clients.get_client(MySQLManagementClient, credential, subscription_id)
 
-            servers = await asyncio.to_thread(client.servers.list)
+            servers = [
+                server_data
+                async for server_obj in client.servers.list()
+                if (server_data := AzureServer.from_sdk_object(server_obj))
+                and server_data.resource_group
+            ]
+
+            # List the databases of each server concurrently
+            async with asyncio.TaskGroup() as tg:
+                db_counts = [
+                    tg.create_task(
+                        self._populate_server_databases(
+                            graph, client, server_data, AzureMySqlDatabase, credential, subscription
+                        )
+                    )
+                    for server_data in servers
+                ]
 
-            for server_obj in servers:
-                server_data = AzureServer.from_sdk_object(server_obj)
-                if not server_data or not server_data.resource_group:
-                    continue
+        print(
+            f"Initialized {sum(task.result() for task in db_counts)} Azure MySQL databases in {time.monotonic() - started_at:.1f}s"
+        )
 
-                databases = await asyncio.to_thread(
-                    client.databases.list_by_server,
-                    resource_group_name=server_data.resource_group,
+    async def _populate_server_databases(
+        self,
+        graph: Graph,
+        client: SqlManagementClient | PostgreSQLManagementClient | MySQLManagementClient,
+        server_data: AzureServer,
+        node_class: type[AzureSqlDatabase | AzurePostgreSqlDatabase | AzureMySqlDatabase],
+        credential: AsyncTokenCredential,
+        subscription: AzureSubscription,
+    ) -> int:
+        """Add the databases of a server, and return how many there are."""
+        db_count = 0
+        resource_group = server_data.resource_group
+        if not resource_group:
+            return 0
+        try:
+            async with self._get_child_limiter(subscription):
+                async for db_obj in client.databases.list_by_server(
+                    resource_group_name=resource_group,
                     server_name=server_data.name,
-                )
-
-                for db_obj in databases:
+                ):
                     db_data = AzureDatabase.from_sdk_object(db_obj)
-                    if db_data:
-                        await graph.add_node(
-                            AzureMySqlDatabase(
-                                node_id=db_data.id,
-                                raw_data=db_data.raw_data or {},
-                                _graph=graph,
-                                azure_subscription=subscription,
-                                credential=credential,
-                            )
+                    # Skip SQL's master database and ensure we have valid data
+                    if not db_data or (
+                        node_class is AzureSqlDatabase and db_data.name.lower() == "master"
+                    ):
+                        continue
+                    await graph.add_node(
+                        node_class(
+                            node_id=db_data.id,
+                            raw_data=db_data.raw_data or {},
+                            _graph=graph,
+                            azure_subscription=subscription,
+                            credential=credential,
                         )
-                        db_count += 1
-
-        print(f"Initialized {db_count} Azure MySQL databases")
+                    )
+                    db_count += 1
+        except Exception as e:
+            print(f"Error getting databases for {server_data.name}: {e}")
+        return db_count
 
     async def populate_cosmos_databases(
-        self, graph: Graph, credential: TokenCredential, subscription: AzureSubscription
+        self, graph: Graph, credential: AsyncTokenCredential, subscription: AzureSubscription
     ) -> None:
         print("Populating Azure Cosmos DB accounts")
         db_count = 0
@@ -450,11 +703,9 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         subscription_id = self._validate_subscription(subscription, "Cosmos DB population")
 
         async with handle_azure_errors("CosmosDB", "populate Cosmos DB accounts"):
-            client = CosmosDBManagementClient(credential, subscription_id)
-
-            accounts = await asyncio.to_thread(client.database_accounts.list)
+            client = self.clients.get_client(CosmosDBManagementClient, credential, subscription_id)
 
-            for account_obj in accounts:
+            async for account_obj in client.database_accounts.list():
                 account_data = AzureCosmosAccount.from_sdk_object(account_obj)
                 if account_data:
                     await graph.add_node(
@@ -471,7 +722,7 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         print(f"Initialized {db_count} Azure Cosmos DB accounts")
 
     async def populate_load_balancers(
-        self, graph: Graph, credential: TokenCredential, subscription: AzureSubscription
+        self, graph: Graph, credential: AsyncTokenCredential, subscription: AzureSubscription
     ) -> None:
         print("Populating Azure Load Balancers")
         lb_count = 0
@@ -479,11 +730,9 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         subscription_id = self._validate_subscription(subscription, "Load Balancer population")
 
         async with handle_azure_errors("Network", "populate Load Balancers"):
-            client = NetworkManagementClient(credential, subscription_id)
+            client = self.clients.get_client(NetworkManagementClient, credential, subscription_id)
 
-            load_balancers = await asyncio.to_thread(client.load_balancers.list_all)
-
-            for lb_obj in load_balancers:
+            async for lb_obj in client.load_balancers.list_all():
                 lb_data = AzureLoadBalancerData.from_sdk_object(lb_obj)
                 if lb_data:
                     await graph.add_node(
@@ -500,7 +749,7 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         print(f"Initialized {lb_count} Azure Load Balancers")
 
     async def populate_application_gateways(
-        self, graph: Graph, credential: TokenCredential, subscription: AzureSubscription
+        self, graph: Graph, credential: AsyncTokenCredential, subscription: AzureSubscription
     ) -> None:
         print("Populating Azure Application Gateways")
         ag_count = 0
@@ -510,11 +759,9 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         )
 
         async with handle_azure_errors("Network", "populate Application Gateways"):
-            client = NetworkManagementClient(credential, subscription_id)
-
-            app_gateways = await asyncio.to_thread(client.application_gateways.list_all)
+            client = self.clients.get_client(NetworkManagementClient, credential, subscription_id)
 
-            for ag_obj in app_gateways:
+            async for ag_obj in client.application_gateways.list_all():
                 ag_data = AzureApplicationGatewayData.from_sdk_object(ag_obj)
                 if ag_data:
                     await graph.add_node(
@@ -531,7 +778,7 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         print(f"Initialized {ag_count} Azure Application Gateways")
 
     async def populate_managed_disks(
-        self, graph: Graph, credential: TokenCredential, subscription: AzureSubscription
+        self, graph: Graph, credential: AsyncTokenCredential, subscription: AzureSubscription
     ) -> None:
         print("Populating Azure Managed Disks")
         disk_count = 0
@@ -539,11 +786,9 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         subscription_id = self._validate_subscription(subscription, "Managed Disk population")
 
         async with handle_azure_errors("Compute", "populate Managed Disks"):
-            client = ComputeManagementClient(credential, subscription_id)
+            client = self.clients.get_client(ComputeManagementClient, credential, subscription_id)
 
-            disks = await asyncio.to_thread(client.disks.list)
-
-            for disk_obj in disks:
+            async for disk_obj in client.disks.list():
                 disk_data = AzureManagedDiskData.from_sdk_object(disk_obj)
                 if disk_data:
                     await graph.add_node(
@@ -560,7 +805,7 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         print(f"Initialized {disk_count} Azure Managed Disks")
 
     async def populate_storage_accounts(
-        self, graph: Graph, credential: TokenCredential, subscription: AzureSubscription
+        self, graph: Graph, credential: AsyncTokenCredential, subscription: AzureSubscription
     ) -> None:
         print("Populating Azure Storage Accounts")
         storage_count = 0
@@ -568,11 +813,9 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         subscription_id = self._validate_subscription(subscription, "Storage Account population")
 
         async with handle_azure_errors("Storage", "populate Storage Accounts"):
-            client = StorageManagementClient(credential, subscription_id)
-
-            storage_accounts = await asyncio.to_thread(client.storage_accounts.list)
+            client = self.clients.get_client(StorageManagementClient, credential, subscription_id)
 
-            for storage_obj in storage_accounts:
+            async for storage_obj in client.storage_accounts.list():
                 storage_data = AzureStorageAccountData.from_sdk_object(storage_obj)
                 if storage_data:
                     await graph.add_node(
@@ -589,21 +832,21 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         print(f"Initialized {storage_count} Azure Storage Accounts")
 
     async def populate_vm_scale_sets(
-        self, graph: Graph, credential: TokenCredential, subscription: AzureSubscription
+        self, graph: Graph, credential: AsyncTokenCredential, subscription: AzureSubscription
     ) -> None:
         print("Populating Azure VM Scale Sets")
+        started_at = time.monotonic()
         vmss_count = 0
-        instance_count = 0
+        instance_counts: list[asyncio.Task[int]] = []
 
         subscription_id = self._validate_subscription(subscription, "VM Scale Set population")
 
         async with handle_azure_errors("Compute", "populate VM Scale Sets"):
-            client = ComputeManagementClient(credential, subscription_id)
+            client = self.clients.get_client(ComputeManagementClient, credential, subscription_id)
 
             # Get all VM Scale Sets
-            scale_sets = await asyncio.to_thread(client.virtual_machine_scale_sets.list_all)
-
-            for vmss_obj in scale_sets:
+            scale_sets: list[AzureVmScaleSetData] = []
+            async for vmss_obj in client.virtual_machine_scale_sets.list_all():
                 vmss_data = AzureVmScaleSetData.from_sdk_object(vmss_obj)
                 if vmss_data:
                     await graph.add_node(
@@ -616,39 +859,60 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
                         )
                     )
                     vmss_count += 1
+                    scale_sets.append(vmss_data)
+
+            # List the instances of each scale set concurrently
+            async with asyncio.TaskGroup() as tg:
+                instance_counts = [
+                    tg.create_task(
+                        self._populate_vm_scale_set_instances(
+                            graph, client, vmss_data, credential, subscription
+                        )
+                    )
+                    for vmss_data in scale_sets
+                ]
 
-                    # Get instances for each scale set
-                    resource_group = vmss_data.id.split("/")[4] if "/" in vmss_data.id else None
-                    if resource_group:
-                        try:
-                            instances = await asyncio.to_thread(
-                                client.virtual_machine_scale_set_vms.list,
-                                resource_group_name=resource_group,
-                                virtual_machine_scale_set_name=vmss_data.name,
-                            )
-
-                            for instance_obj in instances:
-                                instance_data = AzureVmScaleSetInstanceData.from_sdk_object(
-                                    instance_obj
-                                )
-                                if instance_data:
-                                    await graph.add_node(
-                                        AzureVmScaleSetInstance(
-                                            node_id=instance_data.id,
-                                            raw_data=instance_data.raw_data or {},
-                                            _graph=graph,
-                                            azure_subscription=subscription,
-                                            credential=credential,
-                                        )
-                                    )
-                                    instance_count += 1
-                        except Exception as e:
-                            print(f"Error getting instances for {vmss_data.name}: {e}")
+        print(
+            f"Initialized {vmss_count} Azure VM Scale Sets and {sum(task.result() for task in instance_counts)} instances in {time.monotonic() - started_at:.1f}s"
+        )
 
-        print(f"Initialized {vmss_count} Azure VM Scale Sets and {instance_count} instances")
+    async def _populate_vm_scale_set_instances(
+        self,
+        graph: Graph,
+        client: ComputeManagementClient,
+        vmss_data: AzureVmScaleSetData,
+        credential: AsyncTokenCredential,
+        subscription: AzureSubscription,
+    ) -> int:
+        """Add the instances of a VM Scale Set, and return how many there are."""
+        instance_count = 0
+        resource_group = vmss_data.id.split("/")[4] if "/" in vmss_data.id else None
+        if not resource_group:
+            return 0
+        try:
+            async with self._get_child_limiter(subscription):
+                async for instance_obj in client.virtual_machine_scale_set_vms.list(
+                    resource_group_name=resource_group,
+                    virtual_machine_scale_set_name=vmss_data.name,
+                ):
+                    instance_data = AzureVmScaleSetInstanceData.from_sdk_object(instance_obj)
+                    if instance_data:
+                        await graph.add_node(
+                            AzureVmScaleSetInstance(
+                                node_id=instance_data.id,
+                                raw_data=instance_data.raw_data or {},
+                                _graph=graph,
+                                azure_subscription=subscription,
+                                credential=credential,
+                            )
+                        )
+                        instance_count += 1
+        except Exception as e:
+            print(f"Error getting instances for {vmss_data.name}: {e}")
+        return instance_count
 
     async def populate_public_ips(
-        self, graph: Graph, credential: TokenCredential, subscription: AzureSubscription
+        self, graph: Graph, credential: AsyncTokenCredential, subscription: AzureSubscription
     ) -> None:
         print("Populating Azure Public IP Addresses")
         ip_count = 0
@@ -656,11 +920,9 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         subscription_id = self._validate_subscription(subscription, "Public IP population")
 
         async with handle_azure_errors("Network", "populate Public IP Addresses"):
-            client = NetworkManagementClient(credential, subscription_id)
-
-            public_ips = await asyncio.to_thread(client.public_ip_addresses.list_all)
+            client = self.clients.get_client(NetworkManagementClient, credential, subscription_id)
 
-            for ip_obj in public_ips:
+            async for ip_obj in client.public_ip_addresses.list_all():
                 ip_data = AzurePublicIpAddressData.from_sdk_object(ip_obj)
                 if ip_data:
                     await graph.add_node(
@@ -677,7 +939,7 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         print(f"Initialized {ip_count} Azure Public IP Addresses")
 
     async def populate_virtual_networks(
-        self, graph: Graph, credential: TokenCredential, subscription: AzureSubscription
+        self, graph: Graph, credential: AsyncTokenCredential, subscription: AzureSubscription
     ) -> None:
         print("Populating Azure Virtual Networks and Subnets")
         vnet_count = 0
@@ -686,11 +948,9 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         subscription_id = self._validate_subscription(subscription, "Virtual Network population")
 
         async with handle_azure_errors("Network", "populate Virtual Networks"):
-            client = NetworkManagementClient(credential, subscription_id)
+            client = self.clients.get_client(NetworkManagementClient, credential, subscription_id)
 
-            vnets = await asyncio.to_thread(client.virtual_networks.list_all)
-
-            for vnet_obj in vnets:
+            async for vnet_obj in client.virtual_networks.list_all():
                 vnet_data = AzureVirtualNetworkData.from_sdk_object(vnet_obj)
                 if vnet_data:
                     await graph.add_node(
@@ -708,13 +968,10 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
                     resource_group = vnet_data.id.split("/")[4] if "/" in vnet_data.id else None
                     if resource_group:
                         try:
-                            subnets = await asyncio.to_thread(
-                                client.subnets.list,
+                            async for subnet_obj in client.subnets.list(
                                 resource_group_name=resource_group,
                                 virtual_network_name=vnet_data.name,
-                            )
-
-                            for subnet_obj in subnets:
+                            ):
                                 subnet_data = AzureSubnetData.from_sdk_object(subnet_obj)
                                 if subnet_data:
                                     await graph.add_node(
@@ -733,7 +990,7 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         print(f"Initialized {vnet_count} Azure Virtual Networks and {subnet_count} Subnets")
 
     async def populate_network_security_groups(
-        self, graph: Graph, credential: TokenCredential, subscription: AzureSubscription
+        self, graph: Graph, credential: AsyncTokenCredential, subscription: AzureSubscription
     ) -> None:
         print("Populating Azure Network Security Groups")
         nsg_count = 0
@@ -741,11 +998,9 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         subscription_id = self._validate_subscription(subscription, "NSG population")
 
         async with handle_azure_errors("Network", "populate Network Security Groups"):
-            client = NetworkManagementClient(credential, subscription_id)
+            client = self.clients.get_client(NetworkManagementClient, credential, subscription_id)
 
-            nsgs = await asyncio.to_thread(client.network_security_groups.list_all)
-
-            for nsg_obj in nsgs:
+            async for nsg_obj in client.network_security_groups.list_all():
                 nsg_data = AzureNetworkSecurityGroupData.from_sdk_object(nsg_obj)
                 if nsg_data:
                     await graph.add_node(
@@ -762,7 +1017,7 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         print(f"Initialized {nsg_count} Azure Network Security Groups")
 
     async def populate_network_interfaces(
-        self, graph: Graph, credential: TokenCredential, subscription: AzureSubscription
+        self, graph: Graph, credential: AsyncTokenCredential, subscription: AzureSubscription
     ) -> None:
         print("Populating Azure Network Interfaces")
         nic_count = 0
@@ -770,11 +1025,9 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         subscription_id = self._validate_subscription(subscription, "Network Interface population")
 
         async with handle_azure_errors("Network", "populate Network Interfaces"):
-            client = NetworkManagementClient(credential, subscription_id)
-
-            nics = await asyncio.to_thread(client.network_interfaces.list_all)
+            client = self.clients.get_client(NetworkManagementClient, credential, subscription_id)
 
-            for nic_obj in nics:
+            async for nic_obj in client.network_interfaces.list_all():
                 nic_data = AzureNetworkInterfaceData.from_sdk_object(nic_obj)
                 if nic_data:
                     await graph.add_node(
@@ -791,7 +1044,7 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         print(f"Initialized {nic_count} Azure Network Interfaces")
 
     async def populate_aks_clusters(
-        self, graph: Graph, credential: TokenCredential, subscription: AzureSubscription
+        self, graph: Graph, credential: AsyncTokenCredential, subscription: AzureSubscription
     ) -> None:
         print("Populating Azure AKS Clusters")
         cluster_count = 0
@@ -799,11 +1052,11 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         subscription_id = self._validate_subscription(subscription, "AKS Cluster population")
 
         async with handle_azure_errors("ContainerService", "populate AKS Clusters"):
-            client = ContainerServiceManagementClient(credential, subscription_id)
-
-            clusters = await asyncio.to_thread(client.managed_clusters.list)
+            client = self.clients.get_client(
+                ContainerServiceManagementClient, credential, subscription_id
+            )
 
-            for cluster_obj in clusters:
+            async for cluster_obj in client.managed_clusters.list():
                 cluster_data = AzureAksClusterData.from_sdk_object(cluster_obj)
                 if cluster_data:
                     await graph.add_node(
@@ -819,64 +1072,253 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
 
         print(f"Initialized {cluster_count} Azure AKS Clusters")
 
+    async def populate_from_resource_graph(
+        self, graph: Graph, credential: AsyncTokenCredential
+    ) -> None:
+        """Populate every supported resource type, with one paged query per type, from Azure Resource Graph.
+
+        Resource Graph doesn't index VM Scale Set instances or PostgreSQL and
+        MySQL databases, so those are still listed from their services.
+        """
+        resource_graph = self.azure_settings.resource_graph
+        if not resource_graph:
+            return
+
+        # Attach each resource to the configured subscription it belongs to.
+        # Other subscriptions use the same credential.
+        subscriptions = {
+            subscription.subscription_id: subscription
+            for subscription in await self._get_subscriptions(credential)
+            if subscription.subscription_id
+        }
+        subscription_ids = resource_graph.subscriptions or (
+            None if resource_graph.management_groups else list(subscriptions)
+        )
+
+        def _get_subscription(subscription_id: str) -> AzureSubscription:
+            if subscription_id not in subscriptions:
+                subscriptions[subscription_id] = AzureSubscription(
+                    name=subscription_id, subscription_id=subscription_id
+                )
+            return subscriptions[subscription_id]
+
+        print("Populating Azure resources from Resource Graph")
+        resource_counts: Counter[str] = Counter()
+        scale_sets: list[tuple[AzureVmScaleSetData, AzureSubscription]] = []
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_RESOURCE_GRAPH_QUERIES)
+
+        async def _add_node(
+            node_class: type[AzureNode],
+            data: Any,  # noqa: ANN401
+            subscription: AzureSubscription,
+        ) -> None:
+            await graph.add_node(
+                node_class(
+                    node_id=data.id,
+                    raw_data=data.raw_data or {},
+                    _graph=graph,
+                    azure_subscription=subscription,
+                    credential=credential,
+                )
+            )
+
+        async def _populate_type(resource_type: str) -> None:
+            model, from_sdk_object, node_class = RESOURCE_GRAPH_TYPES[resource_type]
+            async with (
+                semaphore,
+                handle_azure_errors("ResourceGraph", f"query {resource_type}"),
+            ):
+                async for resource in iter_resource_graph_resources(
+                    self.clients,
+                    credential,
+                    resource_type,
+                    subscriptions=subscription_ids,
+                    management_groups=resource_graph.management_groups,
+                ):
+                    # Every resource should be in a subscription, but skip any that
+                    # aren't, since their subscription can't be scanned.
+                    if not resource.get("subscriptionId"):
+                        continue
+                    # Resource Graph returns types in lowercase.
+                    sdk_object = model.deserialize({**resource, "type": resource_type})
+                    data = from_sdk_object(sdk_object)
+                    if not data or (
+                        node_class is AzureSqlDatabase and data.name.lower() == "master"
+                    ):
+                        continue
+                    subscription = _get_subscription(resource["subscriptionId"])
+                    await _add_node(node_class, data, subscription)
+                    resource_counts[resource_type] += 1
+
+                    if node_class is AzureVirtualNetwork:
+                        # Subnets are part of their virtual network's properties.
+                        for subnet_obj in sdk_object.subnets or []:
+                            subnet_data = AzureSubnetData.from_sdk_object(subnet_obj)
+                            if subnet_data:
+                                await _add_node(AzureSubnet, subnet_data, subscription)
+                                resource_counts["Microsoft.Network/virtualNetworks/subnets"] += 1
+                    elif node_class is AzureVmScaleSet:
+                        scale_sets.append((data, subscription))
+
+        async with asyncio.TaskGroup() as tg:
+            for resource_type in RESOURCE_GRAPH_TYPES:
+                tg.create_task(_populate_type(resource_type))
+
+        for resource_type, count in sorted(resource_counts.items()):
+            print(f"Initialized {count} {resource_type} resources from Resource Graph")
+
+        async def _populate_unindexed(subscription: AzureSubscription) -> None:
+            client = self.clients.get_client(
+                ComputeManagementClient, credential, subscription.subscription_id
+            )
+            async with asyncio.TaskGroup() as tg:
+                for vmss_data, vmss_subscription in scale_sets:
+                    if vmss_subscription is subscription:
+                        instance_counts.append(
+                            tg.create_task(
+                                self._populate_vm_scale_set_instances(
+                                    graph, client, vmss_data, credential, subscription
+                                )
+                            )
+                        )
+                tg.create_task(self.populate_postgresql_databases(graph, credential, subscription))
+                tg.create_task(self.populate_mysql_databases(graph, credential, subscription))
+
+        # Every scanned subscription, and any others Resource Graph returned.
+        instance_counts: list[asyncio.Task[int]] = []
+        await self._for_each_subscription(list(subscriptions.values()), _populate_unindexed)
+        print(
+            f"Initialized {sum(task.result() for task in instance_counts)} Azure VM Scale Set instances"
+        )
+
     @tool()
-    async def get_realtime_vm_status(self, vm_name: str, resource_group: str) -> dict | str:
+    async def get_realtime_vm_status(
+        self, vm_name: str, resource_group: str, subscription_id: str | None = None
+    ) -> dict | str:
         """
         Get real-time status information for an Azure VM instance directly from Azure API.
 
         Args:
             vm_name: Azure VM name
             resource_group: Azure resource group name
+            subscription_id: Azure subscription ID (defaults to the first configured subscription)
 
         Returns:
             dict containing current VM power state and status details
         """
         try:
             credential = await self._get_credential()
-            subscription_id = self.azure_settings.subscription.subscription_id
+            subscription_id = subscription_id or self.azure_settings.subscription.subscription_id
             if not subscription_id:
                 return "Error: Azure subscription ID not configured"
 
-            client = ComputeManagementClient(credential, subscription_id)
+            client = self.clients.get_client(ComputeManagementClient, credential, subscription_id)
 
             # Get VM instance view
-            instance_view = await asyncio.to_thread(
-                client.virtual_machines.instance_view,
+            instance_view = await client.virtual_machines.instance_view(
                 resource_group_name=resource_group,
                 vm_name=vm_name,
             )
 
-            # Extract status information safely
-            statuses = getattr(instance_view, "statuses", [])
-            power_state = "Unknown"
-            provisioning_state = "Unknown"
-            status_list = []
+            return _summarize_vm_instance_view(vm_name, resource_group, instance_view)
 
-            for status in statuses:
-                code = getattr(status, "code", "")
-                display_status = getattr(status, "display_status", "")
+        except Exception as e:
+            return f"Error retrieving VM status: {e!s}"
 
-                if code.startswith("PowerState/"):
-                    power_state = display_status
-                elif code.startswith("ProvisioningState/"):
-                    provisioning_state = display_status
+    @tool()
+    async def get_realtime_vm_status_for_nodes(self, node_ids: list[str]) -> dict[str, dict | str]:
+        """
+        Get real-time status information for many Azure VM nodes at once.
 
-                status_list.append({"code": code, "display_status": display_status})
+        Use this instead of getting the status of one VM at a time, such as for
+        all of the VMs behind a load balancer. The VMs are grouped by
+        subscription. The status of a few VMs is read concurrently, and for
+        many VMs, the status of every VM in the subscription is listed with a
+        single paged request.
 
-            return {
-                "vm_name": vm_name,
-                "resource_group": resource_group,
-                "power_state": power_state,
-                "provisioning_state": provisioning_state,
-                "statuses": status_list,
-            }
+        Args:
+            node_ids: node IDs from the knowledge graph
 
-        except Exception as e:
-            return f"Error retrieving VM status: {e!s}"
+        Returns:
+            dict of node ID to the current VM power state and status details,
+            or an error message for that node
+        """
+        results: dict[str, dict | str] = {}
+        vms_by_subscription: defaultdict[str, dict[str, str]] = defaultdict(dict)
+        nodes: dict[str, AzureVmInstance] = {}
+        credentials: dict[str, AsyncTokenCredential] = {}
+        for node_id in node_ids:
+            node = await self.context.get_node(node_id)
+            if not node:
+                results[node_id] = f"Resource with node ID '{node_id}' not found"
+            elif not isinstance(node, AzureVmInstance) or not node.subscription_id:
+                results[node_id] = f"Node {node_id} is not an Azure VM"
+            else:
+                vms_by_subscription[node.subscription_id][node.resource_id.lower()] = node_id
+                nodes[node_id] = node
+                credentials[node.subscription_id] = node.credential or await self._get_credential()
+
+        async def _get_instance_view(
+            client: ComputeManagementClient, vm_id: str, node_id: str
+        ) -> None:
+            parsed = nodes[node_id].parsed_resource_id
+            try:
+                async with self._get_child_limiter(nodes[node_id].azure_subscription):
+                    instance_view = await client.virtual_machines.instance_view(
+                        resource_group_name=parsed.resource_group or "",
+                        vm_name=parsed.resource_name or "",
+                    )
+            except ResourceNotFoundError:
+                results[node_id] = f"No VM found with ID '{vm_id}'"
+                return
+            except Exception as e:
+                results[node_id] = f"Error retrieving VM status: {e!s}"
+                return
+            results[node_id] = _summarize_vm_instance_view(
+                parsed.resource_name or "", parsed.resource_group or "", instance_view
+            )
+
+        async def _get_statuses(subscription_id: str, node_ids_by_vm_id: dict[str, str]) -> None:
+            try:
+                client = self.clients.get_client(
+                    ComputeManagementClient, credentials[subscription_id], subscription_id
+                )
+                # Listing the status of every VM in a subscription is unbounded,
+                # so only do it when there are too many VMs to read one by one.
+                if len(node_ids_by_vm_id) <= MAX_VM_INSTANCE_VIEWS_PER_SUBSCRIPTION:
+                    async with asyncio.TaskGroup() as tg:
+                        for vm_id, node_id in node_ids_by_vm_id.items():
+                            tg.create_task(_get_instance_view(client, vm_id, node_id))
+                    return
+                vms = [vm async for vm in client.virtual_machines.list_all(status_only="true")]
+            except Exception as e:
+                for node_id in node_ids_by_vm_id.values():
+                    results[node_id] = f"Error retrieving VM status: {e!s}"
+                return
+
+            for vm in vms:
+                node_id = node_ids_by_vm_id.get((vm.id or "").lower())
+                if node_id:
+                    parsed = parse_resource_id(vm.id or "")
+                    results[node_id] = _summarize_vm_instance_view(
+                        vm.name or "", parsed.resource_group or "", vm.instance_view
+                    )
+            for vm_id, node_id in node_ids_by_vm_id.items():
+                results.setdefault(node_id, f"No VM found with ID '{vm_id}'")
+
+        async with asyncio.TaskGroup() as tg:
+            for subscription_id, node_ids_by_vm_id in vms_by_subscription.items():
+                tg.create_task(_get_statuses(subscription_id, node_ids_by_vm_id))
+
+        return {node_id: results[node_id] for node_id in node_ids if node_id in results}
 
     @tool()
     async def get_sql_database_status(
-        self, database_name: str, server_name: str, resource_group: str
+        self,
+        database_name: str,
+        server_name: str,
+        resource_group: str,
+        subscription_id: str | None = None,
     ) -> dict | str:
         """
         Get status information for an Azure SQL database.
@@ -885,21 +1327,21 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
             database_name: Azure SQL database name
             server_name: Azure SQL server name
             resource_group: Azure resource group name
+            subscription_id: Azure subscription ID (defaults to the first configured subscription)
 
         Returns:
             dict containing database status and configuration details
         """
         try:
             credential = await self._get_credential()
-            subscription_id = self.azure_settings.subscription.subscription_id
+            subscription_id = subscription_id or self.azure_settings.subscription.subscription_id
             if not subscription_id:
                 return "Error: Azure subscription ID not configured"
 
-            client = SqlManagementClient(credential, subscription_id)
+            client = self.clients.get_client(SqlManagementClient, credential, subscription_id)
 
             # Get database details
-            database_obj = await asyncio.to_thread(
-                client.databases.get,
+            database_obj = await client.databases.get(
                 resource_group_name=resource_group,
                 server_name=server_name,
                 database_name=database_name,
@@ -924,3 +1366,78 @@ class AzurePlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
 
         except Exception as e:
             return f"Error retrieving SQL database status: {e!s}"
+
+    @tool()
+    async def get_azure_monitor_metrics_for_nodes(
+        self,
+        node_ids: list[str],
+        time_range_start: AwareDatetime,
+        time_range_end: AwareDatetime,
+        metric_names: list[str] | None = None,
+    ) -> list[Observation] | str:
+        """Get Azure Monitor metrics for several Azure nodes at once.
+
+        Use this instead of getting metrics one node at a time when looking at
+        a group of related resources, such as all of the VMs behind a load
+        balancer. Nodes of the same type in the same subscription and region
+        are queried together, up to 50 at a time.
+
+        Args:
+            node_ids: node IDs from the knowledge graph
+            time_range_start: The start of the time range to get metrics for
+            time_range_end: The end of the time range to get metrics for
+            metric_names: The metrics to get. Each node only gets the metrics
+                that are available for its type. Defaults to all available metrics.
+
+        Returns:
+            list of observations, or an error message
+        """
+        node_queries: list[tuple[AzureNode, list[AzureMonitorQuery]]] = []
+        for node_id in node_ids:
+            node = await self.context.get_node(node_id)
+            if not node:
+                return f"Resource with node ID '{node_id}' not found"
+            if not isinstance(node, AzureNode) or not isinstance(node, HasAzureMonitorMetrics):
+                return f"Node {node_id} does not support Azure Monitor metrics"
+
+            available_metrics = await node.list_available_metrics()
+            node_metric_names = (
+                [m for m in metric_names if m in available_metrics]
+                if metric_names
+                else available_metrics
+            )
+            node_queries.append(
+                (node, [node.get_azure_monitor_query(m) for m in node_metric_names])
+            )
+
+        observations = await get_azure_monitor_metrics(
+            node_queries, time_range_start, time_range_end
+        )
+        return observations or "No metrics found. Try a longer time range."
+
+
+def _summarize_vm_instance_view(vm_name: str, resource_group: str, instance_view: Any) -> dict:  # noqa: ANN401
+    """Extract the power and provisioning state from a VM's instance view."""
+    statuses = getattr(instance_view, "statuses", None) or []
+    power_state = "Unknown"
+    provisioning_state = "Unknown"
+    status_list = []
+
+    for status in statuses:
+        code = getattr(status, "code", "") or ""
+        display_status = getattr(status, "display_status", "")
+
+        if code.startswith("PowerState/"):
+            power_state = display_status
+        elif code.startswith("ProvisioningState/"):
+            provisioning_state = display_status
+
+        status_list.append({"code": code, "display_status": display_status})
+
+    return {
+        "vm_name": vm_name,
+        "resource_group": resource_group,
+        "power_state": power_state,
+        "provisioning_state": provisioning_state,
+        "statuses": status_list,
+    }
@@ -2,22 +2,22 @@
 Azure SDK utilities and helpers for authentication, error handling, and common operations.
 """
 
-import asyncio
 import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from typing import Any
 
-from azure.core.credentials import TokenCredential
+from azure.core.credentials_async import AsyncTokenCredential
 from azure.core.exceptions import (
     ClientAuthenticationError,
     HttpResponseError,
     ResourceNotFoundError,
     ServiceRequestError,
 )
-from azure.identity import DefaultAzureCredential
-from azure.mgmt.resource import ResourceManagementClient
-from azure.mgmt.subscription import SubscriptionClient
+from azure.mgmt.resource.resources.aio import ResourceManagementClient
+from azure.mgmt.subscription.aio import SubscriptionClient
+
+from unpage.plugins.azure.clients import AzureClientPool
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +30,7 @@ class AzureAccessError(Exception):
     """Raised when Azure access is denied or resource is not found."""
 
 
-async def get_default_credential() -> TokenCredential:
+async def get_default_credential(clients: AzureClientPool) -> AsyncTokenCredential:
     """
     Get the default Azure credential.
 
@@ -41,27 +41,33 @@ async def get_default_credential() -> TokenCredential:
     4. Azure PowerShell
     5. Interactive browser (if enabled)
 
+    The credential is shared with every client of the pool created on the
+    current event loop.
+
     Returns:
-        Azure TokenCredential instance
+        Azure AsyncTokenCredential instance
 
     Raises:
         AzureAuthenticationError: If authentication fails
     """
     try:
-        credential = DefaultAzureCredential()
+        credential = clients.credential()
         # Test the credential by trying to get a token
-        await asyncio.to_thread(credential.get_token, "https://management.azure.com/.default")
+        await credential.get_token("https://management.azure.com/.default")
         return credential
     except Exception as e:
         raise AzureAuthenticationError(f"Azure authentication failed: {e!s}") from e
 
 
-async def list_accessible_subscriptions(credential: TokenCredential) -> list[dict[str, Any]]:
+async def list_accessible_subscriptions(
+    clients: AzureClientPool, credential: AsyncTokenCredential
+) -> list[dict[str, Any]]:
     """
     List all Azure subscriptions accessible with the given credential.
 
     Args:
-        credential: Azure TokenCredential
+        clients: The client pool to create the client with
+        credential: Azure AsyncTokenCredential
 
     Returns:
         List of subscription dictionaries with id, name, state, etc.
@@ -70,13 +76,10 @@ async def list_accessible_subscriptions(credential: TokenCredential) -> list[dic
         AzureAccessError: If unable to list subscriptions
     """
     try:
-        client = SubscriptionClient(credential)
-
-        # Use asyncio.to_thread to make the sync call async
-        subscription_list = await asyncio.to_thread(client.subscriptions.list)
+        client = clients.get_client(SubscriptionClient, credential)
 
         subscriptions = []
-        for subscription in subscription_list:
+        async for subscription in client.subscriptions.list():
             # Handle state which might be an enum or a string depending on Azure SDK version
             state = "Unknown"
             if subscription.state:
@@ -102,13 +105,14 @@ async def list_accessible_subscriptions(credential: TokenCredential) -> list[dic
 
 
 async def list_accessible_resource_groups(
-    credential: TokenCredential, subscription_id: str
+    clients: AzureClientPool, credential: AsyncTokenCredential, subscription_id: str
 ) -> list[str]:
     """
     List all resource groups in a subscription.
 
     Args:
-        credential: Azure TokenCredential
+        clients: The client pool to create the client with
+        credential: Azure AsyncTokenCredential
         subscription_id: Azure subscription ID
 
     Returns:
@@ -118,12 +122,9 @@ async def list_accessible_resource_groups(
         AzureAccessError: If unable to list resource groups
     """
     try:
-        client = ResourceManagementClient(credential, subscription_id)
-
-        # Use asyncio.to_thread to make the sync call async
-        rg_list = await asyncio.to_thread(client.resource_groups.list)
+        client = clients.get_client(ResourceManagementClient, credential, subscription_id)
 
-        return [rg.name for rg in rg_list if rg.name]
+        return [rg.name async for rg in client.resource_groups.list() if rg.name]
 
     except (ClientAuthenticationError, ServiceRequestError, HttpResponseError) as e:
         raise AzureAccessError(
@@ -209,12 +210,15 @@ def get_resource_tags_dict(azure_resource: object) -> dict[str, str]:
         return {}
 
 
-async def test_azure_connectivity(credential: TokenCredential, subscription_id: str) -> bool:
+async def test_azure_connectivity(
+    clients: AzureClientPool, credential: AsyncTokenCredential, subscription_id: str
+) -> bool:
     """
     Test Azure connectivity and permissions.
 
     Args:
-        credential: Azure TokenCredential
+        clients: The client pool to create the client with
+        credential: Azure AsyncTokenCredential
         subscription_id: Azure subscription ID to test
 
     Returns:
@@ -222,7 +226,7 @@ async def test_azure_connectivity(credential: TokenCredential, subscription_id:
     """
     try:
         # Try to list resource groups as a basic connectivity test
-        await list_accessible_resource_groups(credential, subscription_id)
+        await list_accessible_resource_groups(clients, credential, subscription_id)
         return True
     except AzureAccessError:
         return False
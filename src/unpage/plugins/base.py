@@ -5,6 +5,7 @@ from unpage.config import Config, PluginConfig, PluginSettings
 from unpage.utils import classproperty
 
 if TYPE_CHECKING:
+    from unpage.knowledge import Node
     from unpage.mcp import Context
 
 REGISTRY: dict[str, type["Plugin"]] = {}
@@ -56,6 +57,17 @@ class Plugin(PluginProtocol):
         """
         pass
 
+    async def close(self) -> None:
+        """Release any resources held by the plugin, such as pooled clients and connections."""
+        pass
+
+    def bind_node(self, node: "Node") -> None:
+        """Give one of the plugin's nodes what it needs to call the plugin's APIs, such as pooled clients.
+
+        This is called for nodes loaded from a graph file, which the plugin didn't create.
+        """
+        pass
+
     async def interactive_configure(self) -> PluginSettings:
         """Interactive wizard for configuring the settings of this plugin. Return final PluginSettings here. Caller is responsible for updating the associated PluginConfig.
 
@@ -106,6 +118,12 @@ class PluginManager:
                     config.enabled = False
         return enabled_plugins
 
+    def bind_node(self, node: "Node") -> None:
+        """Bind a node to the enabled plugin it came from, if there is one."""
+        config = self._config.plugins.get(node.node_source)
+        if config and config.enabled:
+            self.get_plugin(node.node_source, config).bind_node(node)
+
     def get_plugins_with_capability(
         self,
         capability: type[HasPluginCapability],
@@ -0,0 +1,138 @@
+"""Shared HTTP sessions and cached credentials for GCP API requests."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from anyio import to_thread
+from google.auth.transport import requests as google_requests
+
+if TYPE_CHECKING:
+    from google.auth.credentials import Credentials
+
+# Refresh access tokens this long before they expire, so that a request never
+# starts with a token that expires while it's in flight.
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# The most connections the shared session keeps open, across all GCP APIs.
+DEFAULT_CONNECTION_LIMIT = 100
+
+# How long idle connections are kept open for reuse.
+DEFAULT_KEEPALIVE_SECONDS = 60.0
+
+
+class GcpCredentialProvider:
+    """Provides the auth headers for a set of GCP credentials, without blocking the event loop.
+
+    Refreshing google-auth credentials is a blocking HTTP request, so it runs
+    in a worker thread. Only one refresh runs at a time, and every caller
+    waiting for it uses the new token. The headers are cached until the token
+    changes.
+    """
+
+    def __init__(self, credentials: "Credentials") -> None:
+        self.credentials = credentials
+        self._lock = asyncio.Lock()
+        self._headers: dict[str, str] = {}
+        self._headers_token: str | None = None
+
+    def _needs_refresh(self) -> bool:
+        if not self.credentials.token:
+            return True
+        expiry = self.credentials.expiry
+        if expiry is None:
+            return not self.credentials.valid
+        # google-auth expiry times are naive datetimes in UTC.
+        return expiry - TOKEN_REFRESH_MARGIN <= datetime.now(UTC).replace(tzinfo=None)
+
+    async def refresh(self, force: bool = False) -> None:
+        """Refresh the credentials if they expire soon (or if forced)."""
+        if not force and not self._needs_refresh():
+            return
+        token = self.credentials.token
+        async with self._lock:
+            # Another caller may have refreshed the credentials while we waited.
+            if self.credentials.token != token or (not force and not self._needs_refresh()):
+                return
+            await to_thread.run_sync(self.credentials.refresh, google_requests.Request())
+
+    async def get_headers(self) -> dict[str, str]:
+        """Return the headers that authenticate a request, refreshing the credentials if needed."""
+        await self.refresh()
+        if self._headers_token != self.credentials.token:
+            headers: dict[str, str] = {}
+            # Adds the bearer token, and the quota project if there is one.
+            self.credentials.apply(headers)
+            self._headers = headers
+            self._headers_token = self.credentials.token
+        return self._headers
+
+
+class GcpClientPool:
+    """A long-lived aiohttp session, and credential providers, shared by a plugin's GCP requests.
+
+    Reusing one session keeps connections to the Google APIs alive between
+    requests, instead of a new connection pool (and TLS handshake) for each
+    one. Sessions are bound to the event loop they were created on, so each
+    loop gets its own session.
+    """
+
+    def __init__(
+        self,
+        connection_limit: int = DEFAULT_CONNECTION_LIMIT,
+        keepalive_seconds: float = DEFAULT_KEEPALIVE_SECONDS,
+    ) -> None:
+        self.connection_limit = connection_limit
+        self.keepalive_seconds = keepalive_seconds
+        self._sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._providers: dict[int, tuple[Credentials, GcpCredentialProvider]] = {}
+
+    def session(self) -> aiohttp.ClientSession:
+        """Return the shared session for the current event loop."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.connection_limit, keepalive_timeout=self.keepalive_seconds
+                )
+            )
+            self._sessions[loop] = session
+        return session
+
+    def credentials(self, credentials: "Credentials") -> GcpCredentialProvider:
+        """Return the shared provider for a set of credentials."""
+        key = id(credentials)
+        if key not in self._providers:
+            # Keep a reference to the credentials so their id isn't reused.
+            self._providers[key] = (credentials, GcpCredentialProvider(credentials))
+        return self._providers[key][1]
+
+    async def get_headers(self, credentials: "Credentials") -> dict[str, str]:
+        """Return the auth headers for a set of credentials."""
+        return await self.credentials(credentials).get_headers()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        credentials: "Credentials",
+        params: dict | None = None,
+        json_data: dict | None = None,
+    ) -> Any:  # noqa: ANN401
+        """Make an authenticated request with the shared session, and return the JSON response."""
+        headers = await self.get_headers(credentials)
+        async with self.session().request(
+            method, url, headers=headers, params=params, json=json_data
+        ) as response:
+            if response.status >= 400:
+                error_text = await response.text()
+                raise Exception(f"GCP API error ({response.status}): {error_text}")
+            return await response.json()
+
+    async def close(self) -> None:
+        """Close the session created on the current event loop."""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session:
+            await session.close()
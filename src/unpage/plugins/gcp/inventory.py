@@ -0,0 +1,96 @@
+"""Bulk inventory from Cloud Asset Inventory."""
+
+import re
+from collections.abc import AsyncIterator, Iterable
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlencode
+
+from pydantic import BaseModel
+
+from unpage.plugins.gcp.utils import paginate_gcp_api_pages
+
+if TYPE_CHECKING:
+    from google.auth.credentials import Credentials
+
+    from unpage.plugins.gcp.clients import GcpClientPool
+
+# The most assets Cloud Asset Inventory returns in each page.
+MAX_ASSETS_PER_PAGE = 1000
+
+_PROJECT_IN_NAME = re.compile(r"/projects/([^/]+)/")
+# A region (e.g. us-central1) or a zone (e.g. us-central1-a), with the region as the group.
+_REGION_OR_ZONE = re.compile(r"^([a-z]+-[a-z]+\d+)(?:-[a-z])?$")
+
+
+class AssetResource(BaseModel):
+    """A resource from Cloud Asset Inventory, with its data in the format of the service's REST API."""
+
+    name: str
+    asset_type: str
+    project_id: str | None
+    location: str | None
+    data: dict[str, Any]
+
+    @property
+    def region(self) -> str | None:
+        """The region of the resource, e.g. `us-central1` for a resource in `us-central1-a`.
+
+        Global and multi-region resources (e.g. in `global`, `us` or `nam4`) have no region.
+        """
+        match = _REGION_OR_ZONE.match((self.location or "").lower())
+        return match.group(1) if match else None
+
+
+def get_asset_project_id(asset: dict[str, Any]) -> str | None:
+    """Return the ID of the project an asset belongs to.
+
+    Most asset names include the project ID (e.g.
+    `//compute.googleapis.com/projects/my-project/zones/...`). Otherwise (e.g.
+    for storage buckets), the project number from the asset's parent is used,
+    which the GCP APIs accept in place of the ID.
+    """
+    if match := _PROJECT_IN_NAME.search(asset.get("name", "")):
+        return match.group(1)
+    parent = asset.get("resource", {}).get("parent", "")
+    if "/projects/" in parent:
+        return parent.rsplit("/", 1)[-1]
+    return None
+
+
+async def iter_asset_inventory_resources(
+    clients: "GcpClientPool",
+    credentials: "Credentials",
+    scope: str,
+    asset_types: Iterable[str],
+) -> AsyncIterator[AssetResource]:
+    """Yield the current resources of the given types in an organization, folder or project.
+
+    Args:
+        clients: The client pool to make the requests with
+        credentials: GCP credentials
+        scope: The scope to list the assets of, e.g. `organizations/123`,
+            `folders/456` or `projects/my-project`
+        asset_types: The asset types to list, e.g. `compute.googleapis.com/Instance`
+    """
+    query = urlencode(
+        [("contentType", "RESOURCE"), *(("assetTypes", asset_type) for asset_type in asset_types)]
+    )
+    url = f"https://cloudasset.googleapis.com/v1/{scope}/assets?{query}"
+    async for page in paginate_gcp_api_pages(
+        clients,
+        url,
+        credentials,
+        max_results_per_page=MAX_ASSETS_PER_PAGE,
+        page_size_param="pageSize",
+    ):
+        for asset in page.get("assets", []):
+            resource = asset.get("resource", {})
+            if not resource.get("data"):
+                continue
+            yield AssetResource(
+                name=asset["name"],
+                asset_type=asset["assetType"],
+                project_id=get_asset_project_id(asset),
+                location=resource.get("location"),
+                data=resource["data"],
+            )
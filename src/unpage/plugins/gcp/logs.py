@@ -0,0 +1,147 @@
+"""Streaming reads from Cloud Logging."""
+
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Literal
+
+from pydantic import AwareDatetime, BaseModel
+
+from unpage.models import LogLine
+
+if TYPE_CHECKING:
+    from google.auth.credentials import Credentials
+
+    from unpage.plugins.gcp.clients import GcpClientPool
+
+# Stop reading logs after this many bytes or lines of messages, which keeps
+# the results a reasonable size for an LLM, and bounds the number of pages
+# that are read.
+DEFAULT_MAX_LOG_BYTES = 256 * 1024
+DEFAULT_MAX_LOG_LINES = 1000
+
+# The most entries Cloud Logging returns in each page.
+MAX_ENTRIES_PER_PAGE = 1000
+
+LogSeverity = Literal[
+    "DEFAULT", "DEBUG", "INFO", "NOTICE", "WARNING", "ERROR", "CRITICAL", "ALERT", "EMERGENCY"
+]
+
+
+class CloudLoggingCursor(BaseModel):
+    """Where a read of Cloud Logging stopped, so that it can be resumed.
+
+    Reads resume from the page that was being read when a budget ran out,
+    skipping the entries of that page that were already returned. The cursor
+    is only valid for a read with the same filter and time range.
+    """
+
+    page_token: str | None = None
+    skip: int = 0
+    done: bool = False
+
+    def encode(self) -> str:
+        """Encode the cursor as a string, e.g. to return it from a tool."""
+        return f"{self.skip}:{self.page_token or ''}"
+
+    @classmethod
+    def decode(cls, cursor: str) -> "CloudLoggingCursor":
+        """Decode a cursor that was encoded with `encode`."""
+        skip, _, page_token = cursor.partition(":")
+        return cls(page_token=page_token or None, skip=int(skip))
+
+
+class CloudLoggingPage(BaseModel):
+    """Log lines read from Cloud Logging, and the cursor to read more of them, if there are more."""
+
+    logs: list[LogLine]
+    cursor: str | None
+
+
+def format_log_entry(entry: dict[str, Any]) -> str:
+    """Format a log entry's severity and payload as a log line."""
+    payload = entry.get("textPayload") or str(
+        entry.get("jsonPayload") or entry.get("protoPayload") or {}
+    )
+    return f"[{entry.get('severity', 'DEFAULT')}] {payload}"
+
+
+def build_cloud_logging_filter(
+    resource_filter: str,
+    time_range_start: AwareDatetime,
+    time_range_end: AwareDatetime,
+    min_severity: LogSeverity | None = None,
+    filter_str: str | None = None,
+) -> str:
+    """Combine a node's resource filter with the time range, severity and an extra filter."""
+    filters = [
+        f"({resource_filter})",
+        f'timestamp>="{time_range_start.isoformat()}"',
+        f'timestamp<="{time_range_end.isoformat()}"',
+    ]
+    if min_severity:
+        filters.append(f"severity>={min_severity}")
+    if filter_str:
+        filters.append(f"({filter_str})")
+    return " AND ".join(filters)
+
+
+async def iter_cloud_logging_entries(
+    clients: "GcpClientPool",
+    credentials: "Credentials",
+    project_id: str,
+    filter_str: str,
+    max_bytes: int = DEFAULT_MAX_LOG_BYTES,
+    max_lines: int = DEFAULT_MAX_LOG_LINES,
+    cursor: CloudLoggingCursor | None = None,
+) -> AsyncIterator[LogLine]:
+    """Stream the log entries of a project that match a filter, newest first, one page at a time.
+
+    Reading stops once max_bytes or max_lines of messages have been yielded.
+    The first entry is always yielded, truncated to max_bytes if it's longer,
+    so that reading with a cursor always moves on. When a cursor is given,
+    reading resumes from it, and it's updated as entries are yielded:
+    afterwards, `cursor.done` is false if there are more entries to read from
+    where it points.
+    """
+    cursor = cursor or CloudLoggingCursor()
+    remaining_bytes = max_bytes
+    remaining_lines = max_lines
+    yielded = False
+    url = "https://logging.googleapis.com/v2/entries:list"
+
+    while not cursor.done and remaining_lines > 0:
+        body: dict[str, Any] = {
+            "resourceNames": [f"projects/{project_id}"],
+            "filter": filter_str,
+            "orderBy": "timestamp desc",
+            # Don't read much more of the page than the budget allows.
+            "pageSize": min(cursor.skip + remaining_lines, MAX_ENTRIES_PER_PAGE),
+        }
+        if cursor.page_token:
+            body["pageToken"] = cursor.page_token
+        result = await clients.request("POST", url, credentials, json_data=body)
+
+        for entry in result.get("entries", [])[cursor.skip :]:
+            if not entry.get("timestamp"):
+                cursor.skip += 1
+                continue
+            if remaining_lines <= 0:
+                return
+            message = format_log_entry(entry)
+            size = len(message.encode())
+            if size > remaining_bytes:
+                if yielded:
+                    return
+                # Truncate the first entry, rather than never reading past it.
+                message = message.encode()[:remaining_bytes].decode(errors="ignore")
+                size = remaining_bytes
+            remaining_bytes -= size
+            remaining_lines -= 1
+            yielded = True
+            cursor.skip += 1
+            yield LogLine(time=datetime.fromisoformat(entry["timestamp"]), log=message)
+
+        # Cloud Logging can return empty pages with a token while it searches.
+        cursor.page_token = result.get("nextPageToken")
+        cursor.skip = 0
+        cursor.done = not cursor.page_token
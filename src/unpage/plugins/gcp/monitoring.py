@@ -0,0 +1,212 @@
+"""Aligned, batched queries to Cloud Monitoring."""
+
+import asyncio
+import math
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from pydantic import AwareDatetime, BaseModel
+
+from unpage.models import Observation
+from unpage.plugins.gcp.utils import paginate_gcp_api
+from unpage.utils import print
+
+if TYPE_CHECKING:
+    from google.auth.credentials import Credentials
+
+    from unpage.plugins.gcp.clients import GcpClientPool
+    from unpage.plugins.gcp.nodes.base import GcpNode
+
+
+# Keep each series at or under this many points, which also keeps the results
+# a reasonable size for an LLM.
+MAX_POINTS_PER_SERIES = 1440
+
+MIN_ALIGNMENT_PERIOD_SECONDS = 60
+
+# Filters can match up to 100 values of a label with one_of().
+MAX_NODES_PER_FILTER = 100
+
+MAX_TIME_SERIES_PER_PAGE = 1000
+
+# The aligner and cross-series reducer for each kind of metric, which turn
+# each node's series into one series with a point per alignment period.
+_GAUGE_AGGREGATION = ("ALIGN_MEAN", "REDUCE_MEAN")
+_BOOL_AGGREGATION = ("ALIGN_FRACTION_TRUE", "REDUCE_MEAN")
+_COUNTER_AGGREGATION = ("ALIGN_RATE", "REDUCE_SUM")
+_DISTRIBUTION_AGGREGATION = ("ALIGN_PERCENTILE_99", "REDUCE_MAX")
+
+_metric_descriptors: dict[str, tuple[str, str]] = {}
+
+
+class CloudMonitoringQuery(BaseModel):
+    """A Cloud Monitoring metric for a node, and the resource labels that identify the node."""
+
+    metric_type: str
+    resource_type: str
+    resource_labels: dict[str, str]
+
+
+def choose_alignment_period(time_range_start: AwareDatetime, time_range_end: AwareDatetime) -> int:
+    """Choose an alignment period, in seconds, that keeps each series under the point limit."""
+    range_seconds = max((time_range_end - time_range_start).total_seconds(), 0)
+    period = max(MIN_ALIGNMENT_PERIOD_SECONDS, math.ceil(range_seconds / MAX_POINTS_PER_SERIES))
+    return math.ceil(period / 60) * 60
+
+
+async def get_metric_aggregation(
+    clients: "GcpClientPool", credentials: "Credentials", project_id: str, metric_type: str
+) -> tuple[str, str]:
+    """Return the aligner and cross-series reducer for a metric, from its kind and value type."""
+    if metric_type not in _metric_descriptors:
+        url = f"https://monitoring.googleapis.com/v3/projects/{project_id}/metricDescriptors/{metric_type}"
+        try:
+            descriptor = await clients.request("GET", url, credentials)
+        except Exception as e:
+            print(f"Error retrieving the Cloud Monitoring descriptor of {metric_type}: {e!s}")
+            return _GAUGE_AGGREGATION
+        _metric_descriptors[metric_type] = (
+            descriptor.get("metricKind", "GAUGE"),
+            descriptor.get("valueType", "DOUBLE"),
+        )
+
+    metric_kind, value_type = _metric_descriptors[metric_type]
+    if value_type == "DISTRIBUTION":
+        return _DISTRIBUTION_AGGREGATION
+    if metric_kind in ("DELTA", "CUMULATIVE"):
+        return _COUNTER_AGGREGATION
+    if value_type == "BOOL":
+        return _BOOL_AGGREGATION
+    return _GAUGE_AGGREGATION
+
+
+def _label_filter(key: str, values: set[str]) -> str:
+    if len(values) == 1:
+        return f'resource.labels.{key}="{next(iter(values))}"'
+    quoted = ", ".join(f'"{value}"' for value in sorted(values))
+    return f"resource.labels.{key}=one_of({quoted})"
+
+
+async def get_cloud_monitoring_metrics(
+    clients: "GcpClientPool",
+    node_queries: Sequence[tuple["GcpNode", Sequence[CloudMonitoringQuery]]],
+    time_range_start: AwareDatetime,
+    time_range_end: AwareDatetime,
+) -> list[Observation]:
+    """Retrieve metrics for many nodes with as few timeSeries.list calls as possible.
+
+    Queries for the same metric and resource type in the same project are
+    sent as one filter (matching up to 100 nodes), and each node's series are
+    aligned and reduced by Cloud Monitoring into a single series.
+    """
+    period = choose_alignment_period(time_range_start, time_range_end)
+
+    groups: defaultdict[
+        tuple[str, str, str, tuple[str, ...]], list[tuple[GcpNode, CloudMonitoringQuery]]
+    ] = defaultdict(list)
+    for node, queries in node_queries:
+        for query in queries:
+            key = (node.project_id, query.metric_type, query.resource_type)
+            groups[(*key, tuple(sorted(query.resource_labels)))].append((node, query))
+
+    batches = [
+        queries[i : i + MAX_NODES_PER_FILTER]
+        for queries in groups.values()
+        for i in range(0, len(queries), MAX_NODES_PER_FILTER)
+    ]
+    results = await asyncio.gather(
+        *(
+            _list_time_series(clients, batch, period, time_range_start, time_range_end)
+            for batch in batches
+        ),
+        return_exceptions=True,
+    )
+
+    observations: list[Observation] = []
+    for batch, result in zip(batches, results, strict=True):
+        if isinstance(result, BaseException):
+            print(f"Error retrieving Cloud Monitoring metric {batch[0][1].metric_type}: {result!s}")
+            continue
+        observations.extend(result)
+    return observations
+
+
+async def _list_time_series(
+    clients: "GcpClientPool",
+    queries: list[tuple["GcpNode", CloudMonitoringQuery]],
+    period: int,
+    time_range_start: AwareDatetime,
+    time_range_end: AwareDatetime,
+) -> list[Observation]:
+    first_node, first_query = queries[0]
+    project_id = first_node.project_id
+    credentials = first_node.gcp_project.credentials
+    label_keys = sorted(first_query.resource_labels)
+
+    label_values: defaultdict[str, set[str]] = defaultdict(set)
+    nodes_by_labels: dict[tuple[str, ...], GcpNode] = {}
+    for node, query in queries:
+        for key in label_keys:
+            label_values[key].add(query.resource_labels[key])
+        nodes_by_labels[tuple(query.resource_labels[key] for key in label_keys)] = node
+
+    filter_str = " AND ".join(
+        [
+            f'metric.type="{first_query.metric_type}"',
+            f'resource.type="{first_query.resource_type}"',
+            *(_label_filter(key, label_values[key]) for key in label_keys),
+        ]
+    )
+    aligner, reducer = await get_metric_aggregation(
+        clients, credentials, project_id, first_query.metric_type
+    )
+    params = {
+        "filter": filter_str,
+        "interval.startTime": time_range_start.isoformat(),
+        "interval.endTime": time_range_end.isoformat(),
+        "aggregation.alignmentPeriod": f"{period}s",
+        "aggregation.perSeriesAligner": aligner,
+        "aggregation.crossSeriesReducer": reducer,
+        # Reduce each node's series (e.g. one per response code) into one.
+        "aggregation.groupByFields": [f"resource.label.{key}" for key in label_keys],
+    }
+
+    observations: list[Observation] = []
+    metric_name = first_query.metric_type.split("/")[-1]
+    url = f"https://monitoring.googleapis.com/v3/projects/{project_id}/timeSeries"
+    async for time_series in paginate_gcp_api(
+        clients,
+        url,
+        credentials,
+        params=params,
+        items_key="timeSeries",
+        max_results_per_page=MAX_TIME_SERIES_PER_PAGE,
+        page_size_param="pageSize",
+    ):
+        labels = time_series.get("resource", {}).get("labels", {})
+        node = nodes_by_labels.get(tuple(labels.get(key, "") for key in label_keys))
+        if node is None:
+            continue
+
+        data_points: dict[datetime, float] = {}
+        for point in time_series.get("points", []):
+            timestamp_str = point.get("interval", {}).get("endTime")
+            value = point.get("value", {})
+            if not timestamp_str:
+                continue
+            if "doubleValue" in value:
+                data_points[datetime.fromisoformat(timestamp_str)] = float(value["doubleValue"])
+            elif "int64Value" in value:
+                data_points[datetime.fromisoformat(timestamp_str)] = int(value["int64Value"])
+            elif "boolValue" in value:
+                data_points[datetime.fromisoformat(timestamp_str)] = (
+                    1.0 if value["boolValue"] else 0.0
+                )
+
+        if data_points:
+            observations.append(
+                Observation(node_id=node.nid, observation_type=metric_name, data=data_points)
+            )
+    return observations
@@ -1,16 +1,22 @@
 """Base classes for GCP nodes."""
 
-from datetime import datetime
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
 
-import aiohttp
 from google.auth import default, load_credentials_from_file
-from google.auth.transport import requests
 from pydantic import BaseModel, Field
 
-from unpage.knowledge import Node
-from unpage.models import Observation
+from unpage.knowledge import HasLogs, HasMetrics, Node
+from unpage.models import LogLine, Observation
+from unpage.plugins.gcp.clients import GcpClientPool
+from unpage.plugins.gcp.logs import (
+    CloudLoggingCursor,
+    LogSeverity,
+    build_cloud_logging_filter,
+    iter_cloud_logging_entries,
+)
+from unpage.plugins.gcp.monitoring import CloudMonitoringQuery, get_cloud_monitoring_metrics
 
 if TYPE_CHECKING:
     from google.auth.credentials import Credentials
@@ -56,6 +62,15 @@ class GcpNode(Node):
     """Base class for all GCP nodes."""
 
     gcp_project: GcpProject = Field()
+    # Set by the GcpPlugin the node belongs to (see GcpPlugin.bind_node).
+    _clients: GcpClientPool | None = None
+
+    @property
+    def clients(self) -> GcpClientPool:
+        """The client pool of the GcpPlugin the node belongs to."""
+        if self._clients is None:
+            raise RuntimeError(f"GCP node {self.nid} isn't bound to a GCP plugin")
+        return self._clients
 
     @property
     def project_id(self) -> str:
@@ -64,14 +79,8 @@ class GcpNode(Node):
 
     async def _get_access_token(self) -> str:
         """Get an access token for API calls."""
-        credentials = self.gcp_project.credentials
-
-        # Refresh the credentials if needed
-        if not credentials.valid:
-            request = requests.Request()
-            credentials.refresh(request)
-
-        return credentials.token or ""
+        await self.clients.credentials(self.gcp_project.credentials).refresh()
+        return self.gcp_project.credentials.token or ""
 
     async def _make_api_request(
         self,
@@ -81,147 +90,82 @@ class GcpNode(Node):
         json_data: dict | None = None,
     ) -> dict:
         """Make an authenticated API request to GCP."""
-        token = await self._get_access_token()
-
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        }
-
-        async with (
-            aiohttp.ClientSession() as session,
-            session.request(
-                method,
-                url,
-                headers=headers,
-                params=params,
-                json=json_data,
-            ) as response,
-        ):
-            if response.status >= 400:
-                error_text = await response.text()
-                raise Exception(f"GCP API error ({response.status}): {error_text}")
-            return await response.json()
+        return await self.clients.request(
+            method, url, self.gcp_project.credentials, params=params, json_data=json_data
+        )
+
 
-    async def _get_cloud_monitoring_metrics(
+class HasCloudMonitoringMetrics(HasMetrics):
+    """Capability for GCP nodes whose metrics are retrieved from Cloud Monitoring."""
+
+    def get_cloud_monitoring_query(self, metric_name: str) -> CloudMonitoringQuery | str:
+        """Return the Cloud Monitoring query for a metric, or why the metric isn't available."""
+        raise NotImplementedError
+
+    async def get_metric(
         self,
-        metric_type: str,
-        resource_type: str,
-        resource_labels: dict,
-        start_time: "AwareDatetime",
-        end_time: "AwareDatetime",
-    ) -> list[Observation]:
-        """Get metrics from Cloud Monitoring (Stackdriver)."""
-        project = self.project_id
-
-        # Format timestamps for the API
-        start_str = start_time.isoformat()
-        end_str = end_time.isoformat()
-
-        # Build the filter for the specific resource
-        filter_parts = [
-            f'metric.type="{metric_type}"',
-            f'resource.type="{resource_type}"',
-        ]
-        for key, value in resource_labels.items():
-            filter_parts.append(f'resource.labels.{key}="{value}"')
-
-        filter_str = " AND ".join(filter_parts)
-
-        url = f"https://monitoring.googleapis.com/v3/projects/{project}/timeSeries"
-        params = {
-            "filter": filter_str,
-            "interval.startTime": start_str,
-            "interval.endTime": end_str,
-        }
-
-        try:
-            result = await self._make_api_request(url, params=params)
-            observations = []
-
-            for time_series in result.get("timeSeries", []):
-                points = time_series.get("points", [])
-
-                if not points:
-                    continue
-
-                # Extract the metric name
-                metric_name = metric_type.split("/")[-1]
-
-                # Group points by value type (GAUGE, DELTA, CUMULATIVE)
-                data_points = {}
-                for point in points:
-                    interval = point.get("interval", {})
-                    value = point.get("value", {})
-
-                    # Get the timestamp
-                    timestamp_str = interval.get("endTime")
-                    if not timestamp_str:
-                        continue
-
-                    # Parse timestamp
-                    timestamp = datetime.fromisoformat(timestamp_str)
-
-                    # Extract the numeric value
-                    numeric_value = None
-                    if "doubleValue" in value:
-                        numeric_value = float(value["doubleValue"])
-                    elif "int64Value" in value:
-                        numeric_value = int(value["int64Value"])
-                    elif "boolValue" in value:
-                        numeric_value = 1.0 if value["boolValue"] else 0.0
-
-                    if numeric_value is not None:
-                        data_points[timestamp] = numeric_value
-
-                if data_points:
-                    observations.append(
-                        Observation(
-                            node_id=self.nid,
-                            observation_type=metric_name,
-                            data=data_points,
-                        )
-                    )
-
-            return observations
-
-        except Exception:
-            # Return empty list on error (similar to AWS plugin behavior)
-            return []
-
-    async def _get_cloud_logging_logs(
+        metric_name: str,
+        time_range_start: "AwareDatetime",
+        time_range_end: "AwareDatetime",
+    ) -> list[Observation] | str:
+        return await self.get_metrics(time_range_start, time_range_end, [metric_name])
+
+    async def get_metrics(
         self,
-        start_time: "AwareDatetime",
-        end_time: "AwareDatetime",
+        time_range_start: "AwareDatetime",
+        time_range_end: "AwareDatetime",
+        metric_names: list[str] | None = None,
+    ) -> list[Observation] | str:
+        """Retrieve all the requested metrics, aligned and reduced by Cloud Monitoring.
+
+        Metrics that aren't available are skipped. If none of them are
+        available, the reasons why are returned instead.
+        """
+        metric_names = metric_names or await self.list_available_metrics()
+        queries: list[CloudMonitoringQuery] = []
+        unavailable: list[str] = []
+        for metric_name in metric_names:
+            query = self.get_cloud_monitoring_query(metric_name)
+            if isinstance(query, str):
+                unavailable.append(query)
+            else:
+                queries.append(query)
+        if not queries:
+            return "\n".join(unavailable)
+        node = cast("GcpNode", self)
+        return await get_cloud_monitoring_metrics(
+            node.clients, [(node, queries)], time_range_start, time_range_end
+        )
+
+
+class HasCloudLoggingLogs(HasLogs):
+    """Capability for GCP nodes whose logs are in Cloud Logging."""
+
+    def get_cloud_logging_filter(self) -> str:
+        """Return the Cloud Logging filter that matches the node's log entries."""
+        raise NotImplementedError
+
+    async def iter_logs(
+        self,
+        time_range_start: "AwareDatetime",
+        time_range_end: "AwareDatetime",
+        min_severity: LogSeverity | None = None,
         filter_str: str | None = None,
-        max_entries: int = 100,
-    ) -> list[dict]:
-        """Get logs from Cloud Logging."""
-        project = self.project_id
-
-        # Build the filter
-        filters = []
-        if filter_str:
-            filters.append(filter_str)
-
-        # Add time range
-        start_str = start_time.isoformat()
-        end_str = end_time.isoformat()
-        filters.append(f'timestamp>="{start_str}"')
-        filters.append(f'timestamp<="{end_str}"')
-
-        final_filter = " AND ".join(filters) if filters else ""
-
-        url = "https://logging.googleapis.com/v2/entries:list"
-        body = {
-            "resourceNames": [f"projects/{project}"],
-            "filter": final_filter,
-            "pageSize": min(max_entries, 1000),  # API max is 1000
-            "orderBy": "timestamp desc",
-        }
-
-        try:
-            result = await self._make_api_request(url, method="POST", json_data=body)
-            return result.get("entries", [])
-        except Exception:
-            return []
+        cursor: CloudLoggingCursor | None = None,
+    ) -> AsyncIterator[LogLine]:
+        """Stream the node's log entries, newest first, optionally filtered by severity or a Logging query."""
+        node = cast("GcpNode", self)
+        async for line in iter_cloud_logging_entries(
+            node.clients,
+            node.gcp_project.credentials,
+            node.project_id,
+            build_cloud_logging_filter(
+                self.get_cloud_logging_filter(),
+                time_range_start,
+                time_range_end,
+                min_severity=min_severity,
+                filter_str=filter_str,
+            ),
+            cursor=cursor,
+        ):
+            yield line
@@ -1,16 +1,14 @@
 """Google Cloud Functions node."""
 
-from typing import TYPE_CHECKING
+from unpage.plugins.gcp.monitoring import CloudMonitoringQuery
+from unpage.plugins.gcp.nodes.base import (
+    GcpNode,
+    HasCloudLoggingLogs,
+    HasCloudMonitoringMetrics,
+)
 
-from unpage.knowledge import HasLogs, HasMetrics
-from unpage.models import LogLine, Observation
-from unpage.plugins.gcp.nodes.base import GcpNode
 
-if TYPE_CHECKING:
-    from pydantic import AwareDatetime
-
-
-class GcpCloudFunction(GcpNode, HasMetrics, HasLogs):
+class GcpCloudFunction(GcpNode, HasCloudMonitoringMetrics, HasCloudLoggingLogs):
     """A Google Cloud Function (1st or 2nd generation)."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -84,13 +82,8 @@ class GcpCloudFunction(GcpNode, HasMetrics, HasLogs):
                 "cloudfunctions.googleapis.com/function/network_egress",
             ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: "AwareDatetime",
-        time_range_end: "AwareDatetime",
-    ) -> list[Observation] | str:
-        """Get metrics from Cloud Monitoring for this function."""
+    def get_cloud_monitoring_query(self, metric_name: str) -> CloudMonitoringQuery | str:
+        """Return the Cloud Monitoring query for a metric of this function."""
 
         # Extract function name from the full path
         function_name = self.raw_data.get("name", "").split("/")[-1]
@@ -115,20 +108,14 @@ class GcpCloudFunction(GcpNode, HasMetrics, HasLogs):
             "cloudfunctions.googleapis.com" if not is_v2 else "cloudfunctionsv2.googleapis.com"
         )
 
-        return await self._get_cloud_monitoring_metrics(
+        return CloudMonitoringQuery(
             metric_type=metric_name,
             resource_type=resource_type,
             resource_labels=resource_labels,
-            start_time=time_range_start,
-            end_time=time_range_end,
         )
 
-    async def get_logs(
-        self,
-        time_range_start: "AwareDatetime",
-        time_range_end: "AwareDatetime",
-    ) -> list[LogLine]:
-        """Get logs from Cloud Logging for this function."""
+    def get_cloud_logging_filter(self) -> str:
+        """Return the Cloud Logging filter for the log entries of this function."""
 
         function_name = self.raw_data.get("name", "").split("/")[-1]
 
@@ -145,24 +132,7 @@ class GcpCloudFunction(GcpNode, HasMetrics, HasLogs):
                 f'AND resource.labels.function_name="{function_name}"'
             )
 
-        logs = await self._get_cloud_logging_logs(
-            start_time=time_range_start,
-            end_time=time_range_end,
-            filter_str=filter_str,
-            max_entries=100,
-        )
-
-        # Format logs as LogLine objects
-        from datetime import datetime
-
-        return [
-            LogLine(
-                time=datetime.fromisoformat(entry.get("timestamp", "")),
-                log=f"[{entry.get('severity', 'INFO')}] {entry.get('textPayload') or str(entry.get('jsonPayload', {}))}",
-            )
-            for entry in logs
-            if entry.get("timestamp")
-        ]
+        return filter_str
 
     @property
     def display_name(self) -> str:
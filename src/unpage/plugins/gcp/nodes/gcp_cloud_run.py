@@ -1,16 +1,14 @@
 """Google Cloud Run service node."""
 
-from typing import TYPE_CHECKING
+from unpage.plugins.gcp.monitoring import CloudMonitoringQuery
+from unpage.plugins.gcp.nodes.base import (
+    GcpNode,
+    HasCloudLoggingLogs,
+    HasCloudMonitoringMetrics,
+)
 
-from unpage.knowledge import HasLogs, HasMetrics
-from unpage.models import LogLine, Observation
-from unpage.plugins.gcp.nodes.base import GcpNode
 
-if TYPE_CHECKING:
-    from pydantic import AwareDatetime
-
-
-class GcpCloudRunService(GcpNode, HasMetrics, HasLogs):
+class GcpCloudRunService(GcpNode, HasCloudMonitoringMetrics, HasCloudLoggingLogs):
     """A Google Cloud Run service."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -81,13 +79,8 @@ class GcpCloudRunService(GcpNode, HasMetrics, HasLogs):
             "run.googleapis.com/container/billable_instance_time",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: "AwareDatetime",
-        time_range_end: "AwareDatetime",
-    ) -> list[Observation] | str:
-        """Get metrics from Cloud Monitoring for this service."""
+    def get_cloud_monitoring_query(self, metric_name: str) -> CloudMonitoringQuery | str:
+        """Return the Cloud Monitoring query for a metric of this service."""
 
         metadata = self.raw_data.get("metadata", {})
         service_name = metadata.get("name", "")
@@ -111,20 +104,14 @@ class GcpCloudRunService(GcpNode, HasMetrics, HasLogs):
         if latest_revision:
             resource_labels["revision_name"] = latest_revision
 
-        return await self._get_cloud_monitoring_metrics(
+        return CloudMonitoringQuery(
             metric_type=metric_name,
             resource_type="cloud_run_revision",
             resource_labels=resource_labels,
-            start_time=time_range_start,
-            end_time=time_range_end,
         )
 
-    async def get_logs(
-        self,
-        time_range_start: "AwareDatetime",
-        time_range_end: "AwareDatetime",
-    ) -> list[LogLine]:
-        """Get logs from Cloud Logging for this service."""
+    def get_cloud_logging_filter(self) -> str:
+        """Return the Cloud Logging filter for the log entries of this service."""
 
         metadata = self.raw_data.get("metadata", {})
         service_name = metadata.get("name", "")
@@ -134,24 +121,7 @@ class GcpCloudRunService(GcpNode, HasMetrics, HasLogs):
             f'resource.type="cloud_run_revision" AND resource.labels.service_name="{service_name}"'
         )
 
-        logs = await self._get_cloud_logging_logs(
-            start_time=time_range_start,
-            end_time=time_range_end,
-            filter_str=filter_str,
-            max_entries=100,
-        )
-
-        # Format logs as LogLine objects
-        from datetime import datetime
-
-        return [
-            LogLine(
-                time=datetime.fromisoformat(entry.get("timestamp", "")),
-                log=f"[{entry.get('severity', 'INFO')}] {entry.get('textPayload') or str(entry.get('jsonPayload', {}))}",
-            )
-            for entry in logs
-            if entry.get("timestamp")
-        ]
+        return filter_str
 
     @property
     def display_name(self) -> str:
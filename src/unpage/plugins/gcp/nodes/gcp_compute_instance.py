@@ -1,16 +1,14 @@
 """Google Compute Engine instance node."""
 
-from typing import TYPE_CHECKING
+from unpage.plugins.gcp.monitoring import CloudMonitoringQuery
+from unpage.plugins.gcp.nodes.base import (
+    GcpNode,
+    HasCloudLoggingLogs,
+    HasCloudMonitoringMetrics,
+)
 
-from unpage.knowledge import HasLogs, HasMetrics
-from unpage.models import LogLine, Observation
-from unpage.plugins.gcp.nodes.base import GcpNode
 
-if TYPE_CHECKING:
-    from pydantic import AwareDatetime
-
-
-class GcpComputeInstance(GcpNode, HasMetrics, HasLogs):
+class GcpComputeInstance(GcpNode, HasCloudMonitoringMetrics, HasCloudLoggingLogs):
     """A Google Compute Engine VM instance."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -78,13 +76,8 @@ class GcpComputeInstance(GcpNode, HasMetrics, HasLogs):
             "compute.googleapis.com/instance/memory/balloon/ram_size",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: "AwareDatetime",
-        time_range_end: "AwareDatetime",
-    ) -> list[Observation] | str:
-        """Get metrics from Cloud Monitoring for this instance."""
+    def get_cloud_monitoring_query(self, metric_name: str) -> CloudMonitoringQuery | str:
+        """Return the Cloud Monitoring query for a metric of this instance."""
 
         # Extract zone from the instance data
         zone_url = self.raw_data.get("zone", "")
@@ -97,44 +90,21 @@ class GcpComputeInstance(GcpNode, HasMetrics, HasLogs):
             "project_id": self.project_id,
         }
 
-        return await self._get_cloud_monitoring_metrics(
+        return CloudMonitoringQuery(
             metric_type=metric_name,
             resource_type="gce_instance",
             resource_labels=resource_labels,
-            start_time=time_range_start,
-            end_time=time_range_end,
         )
 
-    async def get_logs(
-        self,
-        time_range_start: "AwareDatetime",
-        time_range_end: "AwareDatetime",
-    ) -> list[LogLine]:
-        """Get logs from Cloud Logging for this instance."""
+    def get_cloud_logging_filter(self) -> str:
+        """Return the Cloud Logging filter for the log entries of this instance."""
 
         instance_id = self.raw_data.get("id", "")
 
         # Build filter for this specific instance
         filter_str = f'resource.type="gce_instance" AND resource.labels.instance_id="{instance_id}"'
 
-        logs = await self._get_cloud_logging_logs(
-            start_time=time_range_start,
-            end_time=time_range_end,
-            filter_str=filter_str,
-            max_entries=100,
-        )
-
-        # Format logs as LogLine objects
-        from datetime import datetime
-
-        return [
-            LogLine(
-                time=datetime.fromisoformat(entry.get("timestamp", "")),
-                log=f"[{entry.get('severity', 'INFO')}] {entry.get('textPayload') or str(entry.get('jsonPayload', {}))}",
-            )
-            for entry in logs
-            if entry.get("timestamp")
-        ]
+        return filter_str
 
     @property
     def display_name(self) -> str:
@@ -1,16 +1,14 @@
 """Google Kubernetes Engine (GKE) cluster node."""
 
-from typing import TYPE_CHECKING
+from unpage.plugins.gcp.monitoring import CloudMonitoringQuery
+from unpage.plugins.gcp.nodes.base import (
+    GcpNode,
+    HasCloudLoggingLogs,
+    HasCloudMonitoringMetrics,
+)
 
-from unpage.knowledge import HasLogs, HasMetrics
-from unpage.models import LogLine, Observation
-from unpage.plugins.gcp.nodes.base import GcpNode
 
-if TYPE_CHECKING:
-    from pydantic import AwareDatetime
-
-
-class GcpGkeCluster(GcpNode, HasMetrics, HasLogs):
+class GcpGkeCluster(GcpNode, HasCloudMonitoringMetrics, HasCloudLoggingLogs):
     """A Google Kubernetes Engine cluster."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -74,13 +72,8 @@ class GcpGkeCluster(GcpNode, HasMetrics, HasLogs):
             "kubernetes.io/container/restart_count",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: "AwareDatetime",
-        time_range_end: "AwareDatetime",
-    ) -> list[Observation] | str:
-        """Get metrics from Cloud Monitoring for this cluster."""
+    def get_cloud_monitoring_query(self, metric_name: str) -> CloudMonitoringQuery | str:
+        """Return the Cloud Monitoring query for a metric of this cluster."""
 
         # Build resource labels
         resource_labels = {
@@ -101,20 +94,14 @@ class GcpGkeCluster(GcpNode, HasMetrics, HasLogs):
         else:
             resource_type = "k8s_cluster"
 
-        return await self._get_cloud_monitoring_metrics(
+        return CloudMonitoringQuery(
             metric_type=metric_name,
             resource_type=resource_type,
             resource_labels=resource_labels,
-            start_time=time_range_start,
-            end_time=time_range_end,
         )
 
-    async def get_logs(
-        self,
-        time_range_start: "AwareDatetime",
-        time_range_end: "AwareDatetime",
-    ) -> list[LogLine]:
-        """Get logs from Cloud Logging for this cluster."""
+    def get_cloud_logging_filter(self) -> str:
+        """Return the Cloud Logging filter for the log entries of this cluster."""
 
         cluster_name = self.raw_data.get("name", "")
         location = self.raw_data.get("location", "")
@@ -126,24 +113,7 @@ class GcpGkeCluster(GcpNode, HasMetrics, HasLogs):
             f'AND resource.labels.location="{location}"'
         )
 
-        logs = await self._get_cloud_logging_logs(
-            start_time=time_range_start,
-            end_time=time_range_end,
-            filter_str=filter_str,
-            max_entries=100,
-        )
-
-        # Format logs as LogLine objects
-        from datetime import datetime
-
-        return [
-            LogLine(
-                time=datetime.fromisoformat(entry.get("timestamp", "")),
-                log=f"[{entry.get('severity', 'INFO')}] {entry.get('textPayload') or str(entry.get('jsonPayload', {}))}",
-            )
-            for entry in logs
-            if entry.get("timestamp")
-        ]
+        return filter_str
 
     @property
     def display_name(self) -> str:
@@ -188,7 +158,7 @@ class GcpGkeCluster(GcpNode, HasMetrics, HasLogs):
         return private_cluster.get("enablePrivateNodes", False)
 
 
-class GcpGkeNodePool(GcpNode, HasMetrics):
+class GcpGkeNodePool(GcpNode, HasCloudMonitoringMetrics):
     """A GKE cluster node pool."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -233,13 +203,8 @@ class GcpGkeNodePool(GcpNode, HasMetrics):
             "kubernetes.io/node/memory/used_bytes",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: "AwareDatetime",
-        time_range_end: "AwareDatetime",
-    ) -> list[Observation] | str:
-        """Get metrics from Cloud Monitoring for this node pool."""
+    def get_cloud_monitoring_query(self, metric_name: str) -> CloudMonitoringQuery | str:
+        """Return the Cloud Monitoring query for a metric of this node pool."""
 
         resource_labels = {
             "node_name": self.raw_data.get("name", ""),
@@ -248,12 +213,10 @@ class GcpGkeNodePool(GcpNode, HasMetrics):
             "project_id": self.project_id,
         }
 
-        return await self._get_cloud_monitoring_metrics(
+        return CloudMonitoringQuery(
             metric_type=metric_name,
             resource_type="k8s_node",
             resource_labels=resource_labels,
-            start_time=time_range_start,
-            end_time=time_range_end,
         )
 
     @property
@@ -1,17 +1,12 @@
 """Google Cloud Load Balancer nodes."""
 
 import json
-from typing import TYPE_CHECKING
 
-from unpage.knowledge import HasMetrics
-from unpage.models import Observation
-from unpage.plugins.gcp.nodes.base import GcpNode
+from unpage.plugins.gcp.monitoring import CloudMonitoringQuery
+from unpage.plugins.gcp.nodes.base import GcpNode, HasCloudMonitoringMetrics
 
-if TYPE_CHECKING:
-    from pydantic import AwareDatetime
 
-
-class GcpLoadBalancer(GcpNode, HasMetrics):
+class GcpLoadBalancer(GcpNode, HasCloudMonitoringMetrics):
     """A Google Cloud Load Balancer (HTTP/HTTPS)."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -66,13 +61,8 @@ class GcpLoadBalancer(GcpNode, HasMetrics):
             "loadbalancing.googleapis.com/https/backend_response_bytes_count",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: "AwareDatetime",
-        time_range_end: "AwareDatetime",
-    ) -> list[Observation] | str:
-        """Get metrics from Cloud Monitoring for this load balancer."""
+    def get_cloud_monitoring_query(self, metric_name: str) -> CloudMonitoringQuery | str:
+        """Return the Cloud Monitoring query for a metric of this load balancer."""
 
         # Build resource labels
         resource_labels = {
@@ -82,12 +72,10 @@ class GcpLoadBalancer(GcpNode, HasMetrics):
             "target_proxy_name": self.raw_data.get("name", ""),
         }
 
-        return await self._get_cloud_monitoring_metrics(
+        return CloudMonitoringQuery(
             metric_type=metric_name,
             resource_type="https_lb_rule",
             resource_labels=resource_labels,
-            start_time=time_range_start,
-            end_time=time_range_end,
         )
 
     @property
@@ -101,7 +89,7 @@ class GcpLoadBalancer(GcpNode, HasMetrics):
         return self.raw_data.get("kind", "").replace("compute#", "")
 
 
-class GcpBackendService(GcpNode, HasMetrics):
+class GcpBackendService(GcpNode, HasCloudMonitoringMetrics):
     """A Google Cloud Backend Service."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -148,25 +136,18 @@ class GcpBackendService(GcpNode, HasMetrics):
             "loadbalancing.googleapis.com/https/backend_latencies",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: "AwareDatetime",
-        time_range_end: "AwareDatetime",
-    ) -> list[Observation] | str:
-        """Get metrics from Cloud Monitoring for this backend service."""
+    def get_cloud_monitoring_query(self, metric_name: str) -> CloudMonitoringQuery | str:
+        """Return the Cloud Monitoring query for a metric of this backend service."""
 
         resource_labels = {
             "backend_service_name": self.raw_data.get("name", ""),
             "project_id": self.project_id,
         }
 
-        return await self._get_cloud_monitoring_metrics(
+        return CloudMonitoringQuery(
             metric_type=metric_name,
             resource_type="https_backend_service",
             resource_labels=resource_labels,
-            start_time=time_range_start,
-            end_time=time_range_end,
         )
 
     @property
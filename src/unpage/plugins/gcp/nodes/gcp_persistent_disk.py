@@ -1,16 +1,10 @@
 """Google Compute Engine Persistent Disk node."""
 
-from typing import TYPE_CHECKING
+from unpage.plugins.gcp.monitoring import CloudMonitoringQuery
+from unpage.plugins.gcp.nodes.base import GcpNode, HasCloudMonitoringMetrics
 
-from unpage.knowledge import HasMetrics
-from unpage.models import Observation
-from unpage.plugins.gcp.nodes.base import GcpNode
 
-if TYPE_CHECKING:
-    from pydantic import AwareDatetime
-
-
-class GcpPersistentDisk(GcpNode, HasMetrics):
+class GcpPersistentDisk(GcpNode, HasCloudMonitoringMetrics):
     """A Google Compute Engine Persistent Disk."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -63,13 +57,8 @@ class GcpPersistentDisk(GcpNode, HasMetrics):
             "compute.googleapis.com/instance/disk/throttled_write_bytes_count",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: "AwareDatetime",
-        time_range_end: "AwareDatetime",
-    ) -> list[Observation] | str:
-        """Get metrics from Cloud Monitoring for this disk."""
+    def get_cloud_monitoring_query(self, metric_name: str) -> CloudMonitoringQuery | str:
+        """Return the Cloud Monitoring query for a metric of this disk."""
 
         # Extract zone from the disk data
         zone_url = self.raw_data.get("zone", "")
@@ -96,12 +85,10 @@ class GcpPersistentDisk(GcpNode, HasMetrics):
             "device_name": disk_name,
         }
 
-        return await self._get_cloud_monitoring_metrics(
+        return CloudMonitoringQuery(
             metric_type=metric_name,
             resource_type="gce_instance",  # Disk metrics are reported through instance
             resource_labels=resource_labels,
-            start_time=time_range_start,
-            end_time=time_range_end,
         )
 
     @property
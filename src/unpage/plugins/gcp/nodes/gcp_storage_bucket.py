@@ -1,16 +1,13 @@
 """Google Cloud Storage bucket node."""
 
-from typing import TYPE_CHECKING
+from typing import Any
 
-from unpage.knowledge import HasMetrics
-from unpage.models import Observation
-from unpage.plugins.gcp.nodes.base import GcpNode
+from unpage.plugins.gcp.monitoring import CloudMonitoringQuery
+from unpage.plugins.gcp.nodes.base import GcpNode, HasCloudMonitoringMetrics
+from unpage.utils import print
 
-if TYPE_CHECKING:
-    from pydantic import AwareDatetime
 
-
-class GcpStorageBucket(GcpNode, HasMetrics):
+class GcpStorageBucket(GcpNode, HasCloudMonitoringMetrics):
     """A Google Cloud Storage bucket."""
 
     async def get_identifiers(self) -> list[str | None]:
@@ -41,6 +38,22 @@ class GcpStorageBucket(GcpNode, HasMetrics):
 
         return refs
 
+    async def fetch_details(self) -> None:
+        """Fetch the bucket's IAM policy, which isn't included when listing buckets."""
+        bucket_name = self.raw_data.get("name", "")
+        self.raw_data["iamPolicy"] = await self._make_api_request(
+            f"https://storage.googleapis.com/storage/v1/b/{bucket_name}/iam"
+        )
+
+    async def get_details(self) -> dict[str, Any]:
+        """Return the bucket's details, fetching its IAM policy if it wasn't fetched with the graph."""
+        if "iamPolicy" not in self.raw_data:
+            try:
+                await self.fetch_details()
+            except Exception as ex:
+                print(f"Failed to fetch details for storage bucket '{self.display_name}': {ex}")
+        return self.raw_data
+
     async def list_available_metrics(self) -> list[str]:
         """List available Cloud Monitoring metrics for this bucket."""
         return [
@@ -54,13 +67,8 @@ class GcpStorageBucket(GcpNode, HasMetrics):
             "storage.googleapis.com/authz/object_specific_acl_mutation_count",
         ]
 
-    async def get_metric(
-        self,
-        metric_name: str,
-        time_range_start: "AwareDatetime",
-        time_range_end: "AwareDatetime",
-    ) -> list[Observation] | str:
-        """Get metrics from Cloud Monitoring for this bucket."""
+    def get_cloud_monitoring_query(self, metric_name: str) -> CloudMonitoringQuery | str:
+        """Return the Cloud Monitoring query for a metric of this bucket."""
 
         bucket_name = self.raw_data.get("name", "")
 
@@ -71,12 +79,10 @@ class GcpStorageBucket(GcpNode, HasMetrics):
             "project_id": self.project_id,
         }
 
-        return await self._get_cloud_monitoring_metrics(
+        return CloudMonitoringQuery(
             metric_type=metric_name,
             resource_type="gcs_bucket",
             resource_labels=resource_labels,
-            start_time=time_range_start,
-            end_time=time_range_end,
         )
 
     @property
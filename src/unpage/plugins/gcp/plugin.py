@@ -1,17 +1,29 @@
 """Google Cloud Platform plugin for Unpage."""
 
+from collections import Counter
 from typing import TYPE_CHECKING, Any
 
 import anyio
 import questionary
 import rich
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import AwareDatetime, BaseModel, Field, ValidationError
 from pydantic_core import to_jsonable_python
 
 from unpage.config import PluginSettings
-from unpage.knowledge import Graph
+from unpage.knowledge import Graph, Node
+from unpage.models import Observation
 from unpage.plugins import Plugin
-from unpage.plugins.gcp.nodes.base import DEFAULT_GCP_PROJECT_NAME, GcpProject
+from unpage.plugins.gcp.clients import GcpClientPool
+from unpage.plugins.gcp.inventory import iter_asset_inventory_resources
+from unpage.plugins.gcp.logs import CloudLoggingCursor, CloudLoggingPage, LogSeverity
+from unpage.plugins.gcp.monitoring import CloudMonitoringQuery, get_cloud_monitoring_metrics
+from unpage.plugins.gcp.nodes.base import (
+    DEFAULT_GCP_PROJECT_NAME,
+    GcpNode,
+    GcpProject,
+    HasCloudLoggingLogs,
+    HasCloudMonitoringMetrics,
+)
 
 # Import node classes
 from unpage.plugins.gcp.nodes.gcp_cloud_function import GcpCloudFunction
@@ -30,24 +42,56 @@ from unpage.plugins.gcp.utils import (
     ensure_gcp_credentials,
     get_available_auth_methods,
     get_gcloud_default_project,
-    list_accessible_regions_for_service,
     list_gcp_projects,
+    paginate_gcp_aggregated_api,
     paginate_gcp_api,
     swallow_gcp_api_errors,
 )
-from unpage.plugins.mixins import KnowledgeGraphMixin, McpServerMixin
+from unpage.plugins.mixins import KnowledgeGraphMixin, McpServerMixin, tool
 from unpage.utils import Choice, classproperty, confirm, print, select
 
 if TYPE_CHECKING:
     from google.auth.credentials import Credentials
 
 
+# The resource types read from Cloud Asset Inventory, with their node class and node ID prefix.
+ASSET_TYPES: dict[str, tuple[type[GcpNode], str]] = {
+    "compute.googleapis.com/Instance": (GcpComputeInstance, "gcp:compute:instance"),
+    "compute.googleapis.com/Disk": (GcpPersistentDisk, "gcp:compute:disk"),
+    "compute.googleapis.com/UrlMap": (GcpLoadBalancer, "gcp:lb:urlmap"),
+    "compute.googleapis.com/BackendService": (GcpBackendService, "gcp:backend:service"),
+    "compute.googleapis.com/TargetPool": (GcpTargetPool, "gcp:lb:targetpool"),
+    "sqladmin.googleapis.com/Instance": (GcpCloudSqlInstance, "gcp:sql:instance"),
+    "storage.googleapis.com/Bucket": (GcpStorageBucket, "gcp:storage:bucket"),
+    "container.googleapis.com/Cluster": (GcpGkeCluster, "gcp:gke:cluster"),
+    "cloudfunctions.googleapis.com/CloudFunction": (GcpCloudFunction, "gcp:function:v1"),
+    "cloudfunctions.googleapis.com/Function": (GcpCloudFunction, "gcp:function:v2"),
+    "run.googleapis.com/Service": (GcpCloudRunService, "gcp:run:service"),
+}
+
+
+class GcpAssetInventorySettings(BaseModel):
+    """Read the inventory from Cloud Asset Inventory, instead of listing each service in each project."""
+
+    # The organization, folder or project to read, e.g. "organizations/123456789012"
+    scope: str
+    # The configured project whose credentials are used. Defaults to the first project.
+    project: str | None = Field(default=None)
+
+
 class GcpPluginSettings(BaseModel):
     """Settings for the GCP plugin."""
 
     projects: dict[str, GcpProject] = Field(
         default_factory=lambda: {DEFAULT_GCP_PROJECT_NAME: GcpProject()}
     )
+    asset_inventory: GcpAssetInventorySettings | None = Field(default=None)
+    max_concurrent_projects: int = Field(default=4, ge=1)
+    # Fetch the IAM policy of each storage bucket while building the graph,
+    # rather than when the bucket's details are first requested. This takes a
+    # request for each bucket.
+    fetch_storage_bucket_details: bool = Field(default=False)
+    max_concurrent_detail_requests: int = Field(default=16, ge=1)
 
     @property
     def project(self) -> GcpProject:
@@ -68,12 +112,32 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
     ) -> None:
         super().__init__(*args, **kwargs)
         self.gcp_settings = gcp_settings if gcp_settings else GcpPluginSettings()
+        # The HTTP session and credentials used by the plugin and its nodes, closed with the plugin.
+        self.clients = GcpClientPool()
 
     def init_plugin(self) -> None:
         """Initialize plugin from configuration."""
+        try:
+            settings = GcpPluginSettings(
+                **{
+                    key: self._settings[key]
+                    for key in (
+                        "asset_inventory",
+                        "max_concurrent_projects",
+                        "fetch_storage_bucket_details",
+                        "max_concurrent_detail_requests",
+                    )
+                    if self._settings.get(key) is not None
+                },
+            )
+        except ValidationError as ex:
+            raise ValueError(
+                f"Invalid GCP plugin settings. Review your config.yaml. error={ex!s}"
+            ) from ex
+
         gcp_projects = self._settings.get("projects")
         if not gcp_projects:
-            self.gcp_settings = GcpPluginSettings()
+            self.gcp_settings = settings
             return
 
         if not isinstance(gcp_projects, dict):
@@ -91,7 +155,8 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
                     f"Review your config.yaml. {project_settings=}; error={ex!s}"
                 ) from ex
 
-        self.gcp_settings = GcpPluginSettings(projects=projects_config)
+        settings.projects = projects_config
+        self.gcp_settings = settings
 
     async def validate_plugin_config(self) -> None:
         """Validate the plugin configuration."""
@@ -101,7 +166,7 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         for project_name, project in self.gcp_settings.projects.items():
             try:
                 credentials = project.credentials
-                if not await ensure_gcp_credentials(credentials):
+                if not await ensure_gcp_credentials(self.clients, credentials):
                     raise ValueError(f"Invalid credentials for project '{project_name}'")
             except Exception as e:
                 raise ValueError(f"Failed to validate project '{project_name}': {e}") from e
@@ -121,6 +186,9 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         )
         rich.print("")
 
+        # Keep the configured settings other than the projects, which are chosen below.
+        settings = self.gcp_settings.model_copy(update={"projects": GcpPluginSettings().projects})
+
         # Detect available auth methods
         available_auth_methods = get_available_auth_methods()
 
@@ -154,7 +222,7 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
             ).unsafe_ask_async()
             if not service_account_key_path:
                 rich.print("[red]Service account key path is required for this auth method[/red]")
-                return GcpPluginSettings().model_dump()
+                return settings.model_dump()
 
         # Create a temporary project config to get credentials
         temp_project = GcpProject(
@@ -166,12 +234,12 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
             credentials = temp_project.get_credentials()
         except Exception as e:
             rich.print(f"[red]Failed to load credentials: {e}[/red]")
-            return GcpPluginSettings().model_dump()
+            return settings.model_dump()
 
         # List available projects
         rich.print("\n> Discovering GCP projects...")
         try:
-            available_projects = await list_gcp_projects(credentials)
+            available_projects = await list_gcp_projects(self.clients, credentials)
         except Exception as e:
             rich.print(f"[red]Failed to list GCP projects: {e}[/red]")
             available_projects = []
@@ -262,157 +330,119 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
                 service_account_key_path=service_account_key_path,
             )
 
-        settings = GcpPluginSettings(projects=projects_config)
+        settings.projects = projects_config
         return settings.model_dump()
 
+    async def close(self) -> None:
+        await super().close()
+        await self.clients.close()
+
+    def bind_node(self, node: Node) -> None:
+        if isinstance(node, GcpNode):
+            node._clients = self.clients
+
     async def populate_graph(self, graph: Graph) -> None:
         """Populate the knowledge graph with GCP resources."""
+        if self.gcp_settings.asset_inventory:
+            await self.populate_from_asset_inventory(graph)
+            return
 
-        # Process each configured project
-        for project_name, project_config in self.gcp_settings.projects.items():
-            print(
-                f"Populating resources for GCP project: {project_name} ({project_config.project_id})"
-            )
+        project_limiter = anyio.CapacityLimiter(self.gcp_settings.max_concurrent_projects)
 
-            # Ensure credentials are valid
-            credentials = project_config.credentials
-            if not await ensure_gcp_credentials(credentials):
-                print(f"[red]Failed to authenticate for project {project_name}[/red]")
-                continue
+        async def _populate_project_with_limit(project_name: str, project: GcpProject) -> None:
+            async with project_limiter:
+                await self.populate_project(graph, project_name, project)
+
+        # Process the configured projects concurrently
+        async with anyio.create_task_group() as tg:
+            for project_name, project_config in self.gcp_settings.projects.items():
+                tg.start_soon(_populate_project_with_limit, project_name, project_config)
+
+    async def populate_project(self, graph: Graph, project_name: str, project: GcpProject) -> None:
+        """Populate the knowledge graph with the resources of one GCP project."""
+        print(f"Populating resources for GCP project: {project_name} ({project.project_id})")
+
+        # Ensure credentials are valid
+        credentials = project.credentials
+        if not await ensure_gcp_credentials(self.clients, credentials):
+            print(f"[red]Failed to authenticate for project {project_name}[/red]")
+            return
 
-            # Create tasks for different resource types
-            async with anyio.create_task_group() as tg:
-                # Core compute and storage
-                tg.start_soon(self.populate_compute_instances, graph, project_config)
-                tg.start_soon(self.populate_persistent_disks, graph, project_config)
-                tg.start_soon(self.populate_cloud_sql_instances, graph, project_config)
-                tg.start_soon(self.populate_storage_buckets, graph, project_config)
+        # Create tasks for different resource types
+        async with anyio.create_task_group() as tg:
+            # Core compute and storage
+            tg.start_soon(self.populate_compute_instances, graph, project)
+            tg.start_soon(self.populate_persistent_disks, graph, project)
+            tg.start_soon(self.populate_cloud_sql_instances, graph, project)
+            tg.start_soon(self.populate_storage_buckets, graph, project)
 
-                # Load balancing
-                tg.start_soon(self.populate_load_balancers, graph, project_config)
-                tg.start_soon(self.populate_backend_services, graph, project_config)
-                tg.start_soon(self.populate_target_pools, graph, project_config)
+            # Load balancing
+            tg.start_soon(self.populate_load_balancers, graph, project)
+            tg.start_soon(self.populate_backend_services, graph, project)
+            tg.start_soon(self.populate_target_pools, graph, project)
 
-                # GCP-specific services
-                tg.start_soon(self.populate_gke_clusters, graph, project_config)
-                tg.start_soon(self.populate_cloud_functions, graph, project_config)
-                tg.start_soon(self.populate_cloud_run_services, graph, project_config)
+            # GCP-specific services
+            tg.start_soon(self.populate_gke_clusters, graph, project)
+            tg.start_soon(self.populate_cloud_functions, graph, project)
+            tg.start_soon(self.populate_cloud_run_services, graph, project)
 
     async def populate_compute_instances(self, graph: Graph, project: GcpProject) -> None:
-        """Populate Compute Engine instances."""
+        """Populate Compute Engine instances from every zone, with one aggregated list."""
         project_id = project.project_id
         if not project_id:
             print(f"No project ID configured for {project.name}")
             return
 
-        credentials = project.credentials
-
-        # Get regions to scan
-        regions = project.regions
-        if not regions:
-            # Get all available regions for compute
-            regions = await list_accessible_regions_for_service(project_id, "compute", credentials)
-
-        # Process each region
-        for region in regions:
-            await self._populate_compute_instances_in_region(graph, project, region)
-
-    async def _populate_compute_instances_in_region(
-        self, graph: Graph, project: GcpProject, region: str
-    ) -> None:
-        """Populate Compute Engine instances in a specific region."""
-        project_id = project.project_id
-        print(f"Populating Compute Engine instances from {region}")
+        print(f"Populating Compute Engine instances for project {project_id}")
 
         instance_count = 0
-
-        # List all zones in the region
-        zones_url = (
-            f"https://compute.googleapis.com/compute/v1/projects/{project_id}/regions/{region}"
+        url = (
+            f"https://compute.googleapis.com/compute/v1/projects/{project_id}/aggregated/instances"
         )
 
-        try:
-            zones_data = await self._make_api_request(zones_url, project.credentials)
-            zones = [z.split("/")[-1] for z in zones_data.get("zones", [])]
-        except Exception:
-            # If we can't list zones, try common zone patterns
-            zones = [f"{region}-a", f"{region}-b", f"{region}-c"]
-
-        # Get instances from each zone
-        for zone in zones:
-            url = f"https://compute.googleapis.com/compute/v1/projects/{project_id}/zones/{zone}/instances"
-
-            async with swallow_gcp_api_errors("compute", zone):
-                async for instance in paginate_gcp_api(url, project.credentials):
-                    await graph.add_node(
-                        GcpComputeInstance(
-                            node_id=f"gcp:compute:instance:{instance['id']}",
-                            raw_data=instance,
-                            _graph=graph,
-                            gcp_project=project,
-                        )
+        async with swallow_gcp_api_errors("compute", None):
+            async for _, instance in paginate_gcp_aggregated_api(
+                self.clients, url, project.credentials, "instances", regions=project.regions
+            ):
+                await graph.add_node(
+                    GcpComputeInstance(
+                        node_id=f"gcp:compute:instance:{instance['id']}",
+                        raw_data=instance,
+                        _graph=graph,
+                        gcp_project=project,
                     )
-                    instance_count += 1
+                )
+                instance_count += 1
 
-        print(f"Initialized {instance_count} Compute Engine instances for {region}")
+        print(f"Initialized {instance_count} Compute Engine instances")
 
     async def populate_persistent_disks(self, graph: Graph, project: GcpProject) -> None:
-        """Populate Persistent Disks."""
+        """Populate Persistent Disks from every zone and region, with one aggregated list."""
         project_id = project.project_id
         if not project_id:
             print(f"No project ID configured for {project.name}")
             return
 
-        credentials = project.credentials
-
-        # Get regions to scan
-        regions = project.regions
-        if not regions:
-            # Get all available regions for compute
-            regions = await list_accessible_regions_for_service(project_id, "compute", credentials)
-
-        # Process each region
-        for region in regions:
-            await self._populate_persistent_disks_in_region(graph, project, region)
-
-    async def _populate_persistent_disks_in_region(
-        self, graph: Graph, project: GcpProject, region: str
-    ) -> None:
-        """Populate Persistent Disks in a specific region."""
-        project_id = project.project_id
-        print(f"Populating Persistent Disks from {region}")
+        print(f"Populating Persistent Disks for project {project_id}")
 
         disk_count = 0
+        url = f"https://compute.googleapis.com/compute/v1/projects/{project_id}/aggregated/disks"
 
-        # List all zones in the region (similar to instances)
-        zones_url = (
-            f"https://compute.googleapis.com/compute/v1/projects/{project_id}/regions/{region}"
-        )
-
-        try:
-            zones_data = await self._make_api_request(zones_url, project.credentials)
-            zones = [z.split("/")[-1] for z in zones_data.get("zones", [])]
-        except Exception:
-            # If we can't list zones, try common zone patterns
-            zones = [f"{region}-a", f"{region}-b", f"{region}-c"]
-
-        # Get disks from each zone
-        for zone in zones:
-            url = f"https://compute.googleapis.com/compute/v1/projects/{project_id}/zones/{zone}/disks"
-
-            async with swallow_gcp_api_errors("compute", zone):
-                async for disk in paginate_gcp_api(url, project.credentials):
-                    await graph.add_node(
-                        GcpPersistentDisk(
-                            node_id=f"gcp:compute:disk:{disk['id']}",
-                            raw_data=disk,
-                            _graph=graph,
-                            gcp_project=project,
-                        )
+        async with swallow_gcp_api_errors("compute", None):
+            async for _, disk in paginate_gcp_aggregated_api(
+                self.clients, url, project.credentials, "disks", regions=project.regions
+            ):
+                await graph.add_node(
+                    GcpPersistentDisk(
+                        node_id=f"gcp:compute:disk:{disk['id']}",
+                        raw_data=disk,
+                        _graph=graph,
+                        gcp_project=project,
                     )
-                    disk_count += 1
+                )
+                disk_count += 1
 
-        print(f"Initialized {disk_count} Persistent Disks for {region}")
+        print(f"Initialized {disk_count} Persistent Disks")
 
     async def populate_cloud_sql_instances(self, graph: Graph, project: GcpProject) -> None:
         """Populate Cloud SQL instances."""
@@ -427,7 +457,7 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         url = f"https://sqladmin.googleapis.com/v1/projects/{project_id}/instances"
 
         async with swallow_gcp_api_errors("sqladmin", None):
-            async for instance in paginate_gcp_api(url, project.credentials):
+            async for instance in paginate_gcp_api(self.clients, url, project.credentials):
                 await graph.add_node(
                     GcpCloudSqlInstance(
                         node_id=f"gcp:sql:instance:{project_id}:{instance['name']}",
@@ -450,36 +480,52 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         print(f"Populating Cloud Storage buckets for project {project_id}")
 
         bucket_count = 0
-        url = f"https://storage.googleapis.com/storage/v1/b?project={project_id}"
-
-        async with swallow_gcp_api_errors("storage", None):
-            async for bucket in paginate_gcp_api(url, project.credentials, items_key="items"):
-                # Get additional bucket details if needed
-                bucket_name = bucket.get("name")
-                if bucket_name:
-                    # Optionally fetch detailed bucket info
-                    detail_url = f"https://storage.googleapis.com/storage/v1/b/{bucket_name}"
+        # The full projection includes the ACLs, as well as the lifecycle, versioning, etc.
+        url = f"https://storage.googleapis.com/storage/v1/b?project={project_id}&projection=full"
+        fetch_details = self.gcp_settings.fetch_storage_bucket_details
+
+        async def _add_bucket(bucket: GcpStorageBucket) -> None:
+            if fetch_details:
+                self.bind_node(bucket)
+                # The IAM policy needs a request for each bucket, so fetch them concurrently.
+                async with self._detail_limiter:
                     try:
-                        detailed_bucket = await self._make_api_request(
-                            detail_url, project.credentials
-                        )
-                        bucket.update(detailed_bucket)
+                        await bucket.fetch_details()
                     except Exception as ex:
-                        print(f"Failed to fetch storage bucket '{bucket}': {ex}")
-                        pass
+                        print(f"Failed to fetch storage bucket '{bucket.display_name}': {ex}")
+            await graph.add_node(bucket)
 
-                await graph.add_node(
+        # The task group is outside of swallow_gcp_api_errors, since it wraps
+        # errors in an ExceptionGroup. _add_bucket handles its own errors.
+        async with (
+            anyio.create_task_group() as tg,
+            swallow_gcp_api_errors("storage", None),
+        ):
+            async for bucket in paginate_gcp_api(
+                self.clients, url, project.credentials, items_key="items"
+            ):
+                tg.start_soon(
+                    _add_bucket,
                     GcpStorageBucket(
                         node_id=f"gcp:storage:bucket:{bucket.get('id', bucket.get('name'))}",
                         raw_data=bucket,
                         _graph=graph,
                         gcp_project=project,
-                    )
+                    ),
                 )
                 bucket_count += 1
 
         print(f"Initialized {bucket_count} Cloud Storage buckets")
 
+    @property
+    def _detail_limiter(self) -> anyio.CapacityLimiter:
+        """Bound the number of per-resource detail requests, across all of the projects."""
+        if not hasattr(self, "_detail_limiter_instance"):
+            self._detail_limiter_instance = anyio.CapacityLimiter(
+                self.gcp_settings.max_concurrent_detail_requests
+            )
+        return self._detail_limiter_instance
+
     async def populate_load_balancers(self, graph: Graph, project: GcpProject) -> None:
         """Populate HTTP(S) Load Balancers."""
         project_id = project.project_id
@@ -490,11 +536,13 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         print(f"Populating Load Balancers for project {project_id}")
 
         lb_count = 0
-        # Global load balancers (URL maps as proxy for load balancers)
-        url = f"https://compute.googleapis.com/compute/v1/projects/{project_id}/global/urlMaps"
+        # Global and regional load balancers (URL maps as proxy for load balancers)
+        url = f"https://compute.googleapis.com/compute/v1/projects/{project_id}/aggregated/urlMaps"
 
         async with swallow_gcp_api_errors("compute", None):
-            async for url_map in paginate_gcp_api(url, project.credentials):
+            async for _, url_map in paginate_gcp_aggregated_api(
+                self.clients, url, project.credentials, "urlMaps", regions=project.regions
+            ):
                 await graph.add_node(
                     GcpLoadBalancer(
                         node_id=f"gcp:lb:urlmap:{url_map['id']}",
@@ -517,11 +565,13 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
         print(f"Populating Backend Services for project {project_id}")
 
         service_count = 0
-        # Global backend services
-        url = f"https://compute.googleapis.com/compute/v1/projects/{project_id}/global/backendServices"
+        # Global and regional backend services
+        url = f"https://compute.googleapis.com/compute/v1/projects/{project_id}/aggregated/backendServices"
 
         async with swallow_gcp_api_errors("compute", None):
-            async for service in paginate_gcp_api(url, project.credentials):
+            async for _, service in paginate_gcp_aggregated_api(
+                self.clients, url, project.credentials, "backendServices", regions=project.regions
+            ):
                 await graph.add_node(
                     GcpBackendService(
                         node_id=f"gcp:backend:service:{service['id']}",
@@ -532,27 +582,6 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
                 )
                 service_count += 1
 
-        # Regional backend services
-        regions = project.regions
-        if not regions:
-            regions = await list_accessible_regions_for_service(
-                project_id, "compute", project.credentials
-            )
-
-        for region in regions:
-            regional_url = f"https://compute.googleapis.com/compute/v1/projects/{project_id}/regions/{region}/backendServices"
-            async with swallow_gcp_api_errors("compute", region):
-                async for service in paginate_gcp_api(regional_url, project.credentials):
-                    await graph.add_node(
-                        GcpBackendService(
-                            node_id=f"gcp:backend:service:{service['id']}",
-                            raw_data=service,
-                            _graph=graph,
-                            gcp_project=project,
-                        )
-                    )
-                    service_count += 1
-
         print(f"Initialized {service_count} Backend Services")
 
     async def populate_target_pools(self, graph: Graph, project: GcpProject) -> None:
@@ -566,25 +595,21 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
 
         pool_count = 0
         # Target pools are regional
-        regions = project.regions
-        if not regions:
-            regions = await list_accessible_regions_for_service(
-                project_id, "compute", project.credentials
-            )
+        url = f"https://compute.googleapis.com/compute/v1/projects/{project_id}/aggregated/targetPools"
 
-        for region in regions:
-            url = f"https://compute.googleapis.com/compute/v1/projects/{project_id}/regions/{region}/targetPools"
-            async with swallow_gcp_api_errors("compute", region):
-                async for pool in paginate_gcp_api(url, project.credentials):
-                    await graph.add_node(
-                        GcpTargetPool(
-                            node_id=f"gcp:lb:targetpool:{pool['id']}",
-                            raw_data=pool,
-                            _graph=graph,
-                            gcp_project=project,
-                        )
+        async with swallow_gcp_api_errors("compute", None):
+            async for _, pool in paginate_gcp_aggregated_api(
+                self.clients, url, project.credentials, "targetPools", regions=project.regions
+            ):
+                await graph.add_node(
+                    GcpTargetPool(
+                        node_id=f"gcp:lb:targetpool:{pool['id']}",
+                        raw_data=pool,
+                        _graph=graph,
+                        gcp_project=project,
                     )
-                    pool_count += 1
+                )
+                pool_count += 1
 
         print(f"Initialized {pool_count} Target Pools")
 
@@ -609,34 +634,113 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
             clusters = response.get("clusters", [])
 
             for cluster in clusters:
-                # Add the cluster
+                node_pool_count += await self._add_gke_cluster(graph, project, project_id, cluster)
+                cluster_count += 1
+
+        print(f"Initialized {cluster_count} GKE clusters with {node_pool_count} node pools")
+
+    async def _add_gke_cluster(
+        self, graph: Graph, project: GcpProject, project_id: str, cluster: dict
+    ) -> int:
+        """Add a GKE cluster and its node pools, and return the number of node pools."""
+        await graph.add_node(
+            GcpGkeCluster(
+                node_id=f"gcp:gke:cluster:{project_id}:{cluster['name']}",
+                raw_data=cluster,
+                _graph=graph,
+                gcp_project=project,
+            )
+        )
+
+        node_pool_count = 0
+        for node_pool in cluster.get("nodePools", []):
+            # Add cluster info to node pool data
+            node_pool["cluster_name"] = cluster["name"]
+            node_pool["location"] = cluster.get("location", "")
+
+            await graph.add_node(
+                GcpGkeNodePool(
+                    node_id=f"gcp:gke:nodepool:{project_id}:{cluster['name']}:{node_pool['name']}",
+                    raw_data=node_pool,
+                    _graph=graph,
+                    gcp_project=project,
+                )
+            )
+            node_pool_count += 1
+        return node_pool_count
+
+    async def populate_from_asset_inventory(self, graph: Graph) -> None:
+        """Populate every supported resource type, in every project of the scope, from Cloud Asset Inventory."""
+        inventory = self.gcp_settings.asset_inventory
+        if not inventory:
+            return
+
+        credentials_project = (
+            self.gcp_settings.projects[inventory.project]
+            if inventory.project
+            else self.gcp_settings.project
+        )
+        credentials = credentials_project.credentials
+        if not await ensure_gcp_credentials(self.clients, credentials):
+            print(f"[red]Failed to authenticate for Cloud Asset Inventory {inventory.scope}[/red]")
+            return
+        print(f"Populating resources from Cloud Asset Inventory for {inventory.scope}")
+
+        # Attach each resource to the configured project it belongs to, so that its
+        # metrics and logs use that project's settings. Other projects use the
+        # credentials the inventory was read with.
+        projects = {
+            project.project_id: project
+            for project in self.gcp_settings.projects.values()
+            if project.project_id
+        }
+
+        resource_counts: Counter[str] = Counter()
+        async for resource in iter_asset_inventory_resources(
+            self.clients, credentials, inventory.scope, ASSET_TYPES
+        ):
+            project_id = resource.project_id or credentials_project.project_id or ""
+            if project_id not in projects:
+                projects[project_id] = credentials_project.model_copy(
+                    update={"name": project_id, "project_id": project_id, "regions": None}
+                )
+            project = projects[project_id]
+            # Global and multi-region resources are kept, as they are with aggregatedList.
+            region = resource.region
+            if project.regions and region is not None and region not in project.regions:
+                continue
+
+            data = resource.data
+            if resource.asset_type == "container.googleapis.com/Cluster":
+                await self._add_gke_cluster(graph, project, project_id, data)
+            else:
+                node_class, node_id_prefix = ASSET_TYPES[resource.asset_type]
+                node_id = self._get_asset_node_id(resource.asset_type, project_id, data)
                 await graph.add_node(
-                    GcpGkeCluster(
-                        node_id=f"gcp:gke:cluster:{project_id}:{cluster['name']}",
-                        raw_data=cluster,
+                    node_class(
+                        node_id=f"{node_id_prefix}:{node_id}",
+                        raw_data=data,
                         _graph=graph,
                         gcp_project=project,
                     )
                 )
-                cluster_count += 1
-
-                # Add node pools
-                for node_pool in cluster.get("nodePools", []):
-                    # Add cluster info to node pool data
-                    node_pool["cluster_name"] = cluster["name"]
-                    node_pool["location"] = cluster.get("location", "")
-
-                    await graph.add_node(
-                        GcpGkeNodePool(
-                            node_id=f"gcp:gke:nodepool:{project_id}:{cluster['name']}:{node_pool['name']}",
-                            raw_data=node_pool,
-                            _graph=graph,
-                            gcp_project=project,
-                        )
-                    )
-                    node_pool_count += 1
-
-        print(f"Initialized {cluster_count} GKE clusters with {node_pool_count} node pools")
+            resource_counts[resource.asset_type] += 1
+
+        for asset_type, count in sorted(resource_counts.items()):
+            print(f"Initialized {count} {asset_type} resources from Cloud Asset Inventory")
+
+    def _get_asset_node_id(self, asset_type: str, project_id: str, data: dict) -> str:
+        """Return the node ID of an asset, in the same format as when it's listed from its service."""
+        if asset_type == "sqladmin.googleapis.com/Instance":
+            return f"{project_id}:{data['name']}"
+        if asset_type == "storage.googleapis.com/Bucket":
+            return data.get("id") or data["name"]
+        if asset_type == "run.googleapis.com/Service":
+            # Cloud Asset Inventory records Cloud Run services in the v1 (Knative) format.
+            return data.get("metadata", {}).get("name") or data["name"].split("/")[-1]
+        if asset_type.startswith("cloudfunctions.googleapis.com/"):
+            return data["name"].split("/")[-1]
+        return data["id"]
 
     async def populate_cloud_functions(self, graph: Graph, project: GcpProject) -> None:
         """Populate Cloud Functions (v1 and v2)."""
@@ -656,7 +760,11 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
 
         async with swallow_gcp_api_errors("cloudfunctions", None):
             async for function in paginate_gcp_api(
-                v2_url, project.credentials, items_key="functions", page_size_param="pageSize"
+                self.clients,
+                v2_url,
+                project.credentials,
+                items_key="functions",
+                page_size_param="pageSize",
             ):
                 await graph.add_node(
                     GcpCloudFunction(
@@ -675,7 +783,11 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
 
         async with swallow_gcp_api_errors("cloudfunctions", None):
             async for function in paginate_gcp_api(
-                v1_url, project.credentials, items_key="functions", page_size_param="pageSize"
+                self.clients,
+                v1_url,
+                project.credentials,
+                items_key="functions",
+                page_size_param="pageSize",
             ):
                 # Skip if we already have this function from v2
                 function_name = function["name"].split("/")[-1]
@@ -711,7 +823,11 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
 
         async with swallow_gcp_api_errors("run", None):
             async for service in paginate_gcp_api(
-                url, project.credentials, items_key="services", page_size_param="pageSize"
+                self.clients,
+                url,
+                project.credentials,
+                items_key="services",
+                page_size_param="pageSize",
             ):
                 await graph.add_node(
                     GcpCloudRunService(
@@ -725,24 +841,106 @@ class GcpPlugin(Plugin, KnowledgeGraphMixin, McpServerMixin):
 
         print(f"Initialized {service_count} Cloud Run services")
 
-    async def _make_api_request(self, url: str, credentials: "Credentials") -> dict:
-        """Make an API request with the given credentials."""
-        if not credentials.valid:
-            from google.auth.transport import requests as google_requests
-
-            request = google_requests.Request()
-            credentials.refresh(request)
+    @tool()
+    async def get_cloud_monitoring_metrics_for_nodes(
+        self,
+        node_ids: list[str],
+        time_range_start: AwareDatetime,
+        time_range_end: AwareDatetime,
+        metric_names: list[str] | None = None,
+    ) -> list[Observation] | str:
+        """Get Cloud Monitoring metrics for several GCP nodes at once.
+
+        Use this instead of getting metrics one node at a time when looking at
+        a group of related resources, such as all of the instances in a GKE
+        node pool. Nodes with the same metric are queried together, and each
+        node gets one aligned series per metric.
+
+        Args:
+            node_ids: node IDs from the knowledge graph
+            time_range_start: The start of the time range to get metrics for
+            time_range_end: The end of the time range to get metrics for
+            metric_names: The metrics to get. Each node only gets the metrics
+                that are available for its type. Defaults to all available metrics.
+
+        Returns:
+            list of observations, or an error message
+        """
+        node_queries: list[tuple[GcpNode, list[CloudMonitoringQuery]]] = []
+        for node_id in node_ids:
+            node = await self.context.get_node(node_id)
+            if not node:
+                return f"Resource with node ID '{node_id}' not found"
+            if not isinstance(node, GcpNode) or not isinstance(node, HasCloudMonitoringMetrics):
+                return f"Node {node_id} does not support Cloud Monitoring metrics"
+
+            available_metrics = await node.list_available_metrics()
+            node_metric_names = (
+                [m for m in metric_names if m in available_metrics]
+                if metric_names
+                else available_metrics
+            )
+            queries = [node.get_cloud_monitoring_query(m) for m in node_metric_names]
+            # Skip the metrics the node can't have, e.g. for an unattached disk.
+            node_queries.append((node, [q for q in queries if not isinstance(q, str)]))
 
-        token = credentials.token
-        headers = {"Authorization": f"Bearer {token}"}
+        observations = await get_cloud_monitoring_metrics(
+            self.clients, node_queries, time_range_start, time_range_end
+        )
+        return observations or "No metrics found. Try a longer time range."
 
-        import aiohttp
+    @tool()
+    async def get_cloud_logging_logs_for_node(
+        self,
+        node_id: str,
+        time_range_start: AwareDatetime,
+        time_range_end: AwareDatetime,
+        min_severity: LogSeverity | None = None,
+        log_filter: str | None = None,
+        cursor: str | None = None,
+    ) -> CloudLoggingPage | str:
+        """Get log entries from Cloud Logging for a GCP node, such as a Cloud Run service.
+
+        Entries are returned newest first, and only a limited amount of log
+        data is returned at once. If there are more entries, the result
+        includes a cursor: call this tool again with the same arguments and
+        that cursor to read the next entries.
+
+        Args:
+            node_id: node ID from the knowledge graph
+            time_range_start: The start of the time range to get logs for
+            time_range_end: The end of the time range to get logs for
+            min_severity: Optional minimum severity of the entries, such as "WARNING" or "ERROR"
+            log_filter: Optional Cloud Logging query to narrow the entries, such as
+                'textPayload:"timeout"'
+            cursor: The cursor from a previous call, to continue reading from
+
+        Returns:
+            the log lines and a cursor to read more, or an error message
+        """
+        node = await self.context.get_node(node_id)
+        if not node:
+            return f"Resource with node ID '{node_id}' not found"
+        if not isinstance(node, HasCloudLoggingLogs):
+            return f"Node {node_id} does not support Cloud Logging logs"
+
+        logging_cursor = CloudLoggingCursor.decode(cursor) if cursor else CloudLoggingCursor()
+        logs = [
+            line
+            async for line in node.iter_logs(
+                time_range_start,
+                time_range_end,
+                min_severity=min_severity,
+                filter_str=log_filter,
+                cursor=logging_cursor,
+            )
+        ]
+        if not logs and logging_cursor.done:
+            return "No logs found. Try a longer time range or a different filter."
+        return CloudLoggingPage(
+            logs=logs, cursor=None if logging_cursor.done else logging_cursor.encode()
+        )
 
-        async with (
-            aiohttp.ClientSession() as session,
-            session.get(url, headers=headers) as response,
-        ):
-            if response.status >= 400:
-                error_text = await response.text()
-                raise Exception(f"GCP API error ({response.status}): {error_text}")
-            return await response.json()
+    async def _make_api_request(self, url: str, credentials: "Credentials") -> dict:
+        """Make an API request with the given credentials."""
+        return await self.clients.request("GET", url, credentials)
@@ -9,24 +9,19 @@ from typing import TYPE_CHECKING
 
 import aiohttp
 from google.auth import default, exceptions
-from google.auth.transport import requests as google_requests
 
 if TYPE_CHECKING:
     from google.auth.credentials import Credentials
 
+    from unpage.plugins.gcp.clients import GcpClientPool
+
 
 async def list_accessible_regions_for_service(
-    project_id: str, service: str, credentials: "Credentials"
+    clients: "GcpClientPool", project_id: str, service: str, credentials: "Credentials"
 ) -> list[str]:
     """Return a list of regions available for a given GCP service."""
 
-    # Get access token
-    if not credentials.valid:
-        request = google_requests.Request()
-        credentials.refresh(request)
-
-    token = credentials.token
-    headers = {"Authorization": f"Bearer {token}"}
+    headers = await clients.get_headers(credentials)
 
     # Map service names to their region list endpoints
     region_endpoints = {
@@ -43,10 +38,7 @@ async def list_accessible_regions_for_service(
         return []
 
     try:
-        async with (
-            aiohttp.ClientSession() as session,
-            session.get(endpoint, headers=headers) as response,
-        ):
+        async with clients.session().get(endpoint, headers=headers) as response:
             if response.status == 200:
                 data = await response.json()
 
@@ -67,48 +59,44 @@ async def list_accessible_regions_for_service(
         return []
 
 
-async def list_gcp_projects(credentials: "Credentials") -> list[dict[str, str]]:
+async def list_gcp_projects(
+    clients: "GcpClientPool", credentials: "Credentials"
+) -> list[dict[str, str]]:
     """List all GCP projects accessible with the given credentials."""
 
-    # Get access token
-    if not credentials.valid:
-        request = google_requests.Request()
-        credentials.refresh(request)
-
-    token = credentials.token
-    headers = {"Authorization": f"Bearer {token}"}
+    headers = await clients.get_headers(credentials)
 
     url = "https://cloudresourcemanager.googleapis.com/v1/projects"
     projects = []
 
     try:
-        async with aiohttp.ClientSession() as session:
-            page_token = None
-            while True:
-                params = {"pageSize": 100}
-                if page_token:
-                    params["pageToken"] = page_token
-
-                async with session.get(url, headers=headers, params=params) as response:
-                    if response.status != 200:
-                        print(f"Failed to list projects: {response.status}")
-                        break
-
-                    data = await response.json()
-
-                    projects.extend(
-                        {
-                            "projectId": project.get("projectId", ""),
-                            "name": project.get("name", ""),
-                            "projectNumber": project.get("projectNumber", ""),
-                        }
-                        for project in data.get("projects", [])
-                        if project.get("lifecycleState") == "ACTIVE"
-                    )
-
-                    page_token = data.get("nextPageToken")
-                    if not page_token:
-                        break
+        session = clients.session()
+        page_token = None
+        while True:
+            params = {"pageSize": 100}
+            if page_token:
+                params["pageToken"] = page_token
+
+            async with session.get(url, headers=headers, params=params) as response:
+                if response.status != 200:
+                    print(f"Failed to list projects: {response.status}")
+                    break
+
+                data = await response.json()
+
+                projects.extend(
+                    {
+                        "projectId": project.get("projectId", ""),
+                        "name": project.get("name", ""),
+                        "projectNumber": project.get("projectNumber", ""),
+                    }
+                    for project in data.get("projects", [])
+                    if project.get("lifecycleState") == "ACTIVE"
+                )
+
+                page_token = data.get("nextPageToken")
+                if not page_token:
+                    break
 
     except Exception as e:
         print(f"Error listing GCP projects: {e}", file=sys.stderr)
@@ -144,12 +132,10 @@ async def swallow_gcp_api_errors(
         raise
 
 
-async def ensure_gcp_credentials(credentials: "Credentials") -> bool:
+async def ensure_gcp_credentials(clients: "GcpClientPool", credentials: "Credentials") -> bool:
     """Ensure GCP credentials are valid and refresh if needed."""
     try:
-        if not credentials.valid:
-            request = google_requests.Request()
-            credentials.refresh(request)
+        await clients.credentials(credentials).refresh()
         return True
     except Exception as e:
         print(f"Failed to validate GCP credentials: {e}", file=sys.stderr)
@@ -195,6 +181,7 @@ def get_available_auth_methods() -> list[str]:
 
 
 async def paginate_gcp_api(
+    clients: "GcpClientPool",
     url: str,
     credentials: "Credentials",
     params: dict | None = None,
@@ -205,6 +192,7 @@ async def paginate_gcp_api(
     """Paginate through GCP API results.
 
     Args:
+        clients: The client pool to make the requests with
         url: The API endpoint URL
         credentials: GCP credentials
         params: Additional query parameters
@@ -212,38 +200,81 @@ async def paginate_gcp_api(
         max_results_per_page: Maximum results per page
         page_size_param: The parameter name for page size (e.g., "maxResults" or "pageSize")
     """
+    async for page in paginate_gcp_api_pages(
+        clients, url, credentials, params, max_results_per_page, page_size_param
+    ):
+        for item in page.get(items_key, []):
+            yield item
 
-    # Get access token
-    if not credentials.valid:
-        request = google_requests.Request()
-        credentials.refresh(request)
-
-    token = credentials.token
-    headers = {"Authorization": f"Bearer {token}"}
-
-    if params is None:
-        params = {}
 
+async def paginate_gcp_api_pages(
+    clients: "GcpClientPool",
+    url: str,
+    credentials: "Credentials",
+    params: dict | None = None,
+    max_results_per_page: int = 100,
+    page_size_param: str = "maxResults",
+) -> AsyncIterator[dict]:
+    """Paginate through GCP API responses, yielding each page as it's returned."""
+    params = dict(params or {})
     params[page_size_param] = max_results_per_page
     page_token = None
 
-    async with aiohttp.ClientSession() as session:
-        while True:
-            if page_token:
-                params["pageToken"] = page_token
+    while True:
+        if page_token:
+            params["pageToken"] = page_token
 
-            async with session.get(url, headers=headers, params=params) as response:
-                if response.status >= 400:
-                    error_text = await response.text()
-                    raise Exception(f"GCP API error ({response.status}): {error_text}")
+        data = await clients.request("GET", url, credentials, params=params)
+        yield data
 
-                data = await response.json()
+        # Check for next page
+        page_token = data.get("nextPageToken")
+        if not page_token:
+            break
 
-                # Yield items from this page
-                for item in data.get(items_key, []):
-                    yield item
 
-                # Check for next page
-                page_token = data.get("nextPageToken")
-                if not page_token:
-                    break
+async def paginate_gcp_aggregated_api(
+    clients: "GcpClientPool",
+    url: str,
+    credentials: "Credentials",
+    items_key: str,
+    regions: list[str] | None = None,
+    max_results_per_page: int = 500,
+) -> AsyncIterator[tuple[str | None, dict]]:
+    """Paginate through a Compute Engine `aggregatedList` call, with each item's region.
+
+    One paginated call returns the resources from every zone and region of a
+    project, instead of one call per zone or region. Global resources have no
+    region. When regions are given, only global resources and the resources
+    in those regions are yielded.
+
+    Args:
+        clients: The client pool to make the requests with
+        url: The aggregated API endpoint URL, e.g. `.../projects/{project}/aggregated/instances`
+        credentials: GCP credentials
+        items_key: The key in each scope containing the items list, e.g. "instances"
+        regions: Optional regions to limit the results to
+        max_results_per_page: Maximum results per page
+    """
+    # Return the results from the zones and regions that are available, rather
+    # than failing the whole call when one of them is unreachable.
+    params = {"returnPartialSuccess": "true"}
+    async for page in paginate_gcp_api_pages(
+        clients, url, credentials, params, max_results_per_page
+    ):
+        for scope, scoped_list in page.get("items", {}).items():
+            region = get_region_from_scope(scope)
+            if regions and region is not None and region not in regions:
+                continue
+            for item in scoped_list.get(items_key, []):
+                yield region, item
+
+
+def get_region_from_scope(scope: str) -> str | None:
+    """Return the region of an `aggregatedList` scope, e.g. `us-central1` for `zones/us-central1-a`."""
+    kind, _, name = scope.partition("/")
+    if kind == "zones":
+        return name.rsplit("-", 1)[0]
+    if kind == "regions":
+        return name
+    return None
@@ -63,10 +63,10 @@ class GraphPlugin(Plugin, McpServerMixin):
     @tool()
     async def get_resource_details(self, node_id: str) -> dict[str, Any] | str:
         """Get the full details of a resource from its node ID."""
-        node = await self.graph.get_node_safe(node_id)
+        node = await self.context.get_node(node_id)
         if not node:
             return f"Resource with node ID '{node_id}' not found"
-        return node.raw_data
+        return await node.get_details()
 
     @tool()
     async def get_resource_topology(self) -> str:
@@ -1,4 +1,7 @@
 import asyncio
+import time
+import traceback
+from collections.abc import Awaitable, Callable
 from typing import TYPE_CHECKING, Any
 
 import anyio
@@ -39,6 +42,11 @@ class KubernetesPluginSettings(BaseModel):
     contexts: list[KubernetesContext] = Field(default_factory=list)
     include_all_contexts: bool = False
     kubeconfig_path: str | None = None  # Global kubeconfig path
+    max_concurrent_contexts: int = Field(default=4, ge=1)
+    # How long to wait for a cluster to respond before skipping it, and how
+    # long to spend listing the resources of each cluster.
+    connect_timeout_seconds: float = Field(default=30.0, gt=0)
+    context_timeout_seconds: float = Field(default=300.0, gt=0)
 
 
 class KubernetesPlugin(Plugin, KnowledgeGraphMixin):
@@ -81,6 +89,15 @@ class KubernetesPlugin(Plugin, KnowledgeGraphMixin):
             contexts=contexts,
             include_all_contexts=settings.get("include_all_contexts", False),
             kubeconfig_path=settings.get("kubeconfig_path"),
+            **{
+                key: settings[key]
+                for key in (
+                    "max_concurrent_contexts",
+                    "connect_timeout_seconds",
+                    "context_timeout_seconds",
+                )
+                if key in settings
+            },
         )
 
     @classproperty
@@ -162,41 +179,69 @@ class KubernetesPlugin(Plugin, KnowledgeGraphMixin):
         await kr8s.asyncio.version()
 
     async def populate_graph(self, graph: Graph) -> None:
-        """Populate the graph with Kubernetes resources from configured contexts."""
+        """Populate the graph with Kubernetes resources from configured contexts.
+
+        Contexts are populated concurrently, and each is skipped if its
+        cluster can't be reached or takes too long to list, so one slow
+        cluster doesn't hold up the others.
+        """
         print("Populating Kubernetes graph")
 
         # Determine which contexts to use
         contexts_to_use = await self._get_contexts_to_use()
 
-        if not contexts_to_use:
-            # Fallback to current context if no configuration
-            print("Using current Kubernetes context")
-            try:
-                # Create API client for default context
-                api = await kr8s.asyncio.api()
-                await api.version()
-                await self._populate_context(graph, api, "")
-            except Exception as e:
-                print(f"Warning: Could not connect to default context: {e}")
-        else:
-            # Populate from each configured context
+        context_limiter = anyio.CapacityLimiter(self.kubernetes_settings.max_concurrent_contexts)
+
+        async def _populate_context_with_limit(context: str | None) -> None:
+            async with context_limiter:
+                await self.populate_context(graph, context)
+
+        async with anyio.create_task_group() as tg:
+            if not contexts_to_use:
+                # Fallback to current context if no configuration
+                print("Using current Kubernetes context")
+                tg.start_soon(_populate_context_with_limit, None)
             for context in contexts_to_use:
-                print(f"Populating from Kubernetes context: {context}")
-                try:
-                    # Create API client for specific context
+                tg.start_soon(_populate_context_with_limit, context)
+
+    async def populate_context(self, graph: Graph, context: str | None) -> None:
+        """Populate the graph with the resources of one context, or of the current context if None."""
+        name = context or "default"
+        settings = self.kubernetes_settings
+        if context:
+            print(f"Populating from Kubernetes context: {context}")
+        try:
+            with anyio.fail_after(settings.connect_timeout_seconds):
+                # Create API client for the context
+                if context:
                     api = await kr8s.asyncio.api(
-                        context=context,
-                        kubeconfig=self.kubernetes_settings.kubeconfig_path,
+                        context=context, kubeconfig=settings.kubeconfig_path
                     )
-                    # Verify connection
-                    await api.version()
-                    # Populate with context prefix
-                    await self._populate_context(graph, api, f"{context}:")
-                except Exception as e:
-                    import traceback
+                else:
+                    api = await kr8s.asyncio.api()
+                # Verify connection
+                await api.version()
+        except TimeoutError:
+            print(
+                f"Warning: Could not connect to context '{name}' within {settings.connect_timeout_seconds}s"
+            )
+            return
+        except Exception as e:
+            print(f"Warning: Could not connect to context '{name}': {e}")
+            print(f"Traceback: {traceback.format_exc()}")
+            return
 
-                    print(f"Warning: Could not connect to context '{context}': {e}")
-                    print(f"Traceback: {traceback.format_exc()}")
+        start = time.perf_counter()
+        with anyio.move_on_after(settings.context_timeout_seconds) as scope:
+            # Populate with context prefix
+            await self._populate_context(graph, api, f"{context}:" if context else "", name)
+        if scope.cancelled_caught:
+            print(
+                f"Warning: Stopped populating context '{name}' after {settings.context_timeout_seconds}s;"
+                " some of its resources are missing"
+            )
+        else:
+            print(f"Populated Kubernetes context '{name}' in {time.perf_counter() - start:.1f}s")
 
     async def _get_contexts_to_use(self) -> list[str]:
         """Get the list of contexts to use based on configuration."""
@@ -219,18 +264,34 @@ class KubernetesPlugin(Plugin, KnowledgeGraphMixin):
             # No configuration, use default behavior
             return []
 
-    async def _populate_context(self, graph: Graph, api: "Api", context_prefix: str) -> None:
+    async def _populate_context(
+        self, graph: Graph, api: "Api", context_prefix: str, context_name: str
+    ) -> None:
         """Populate resources from a specific context."""
+        populators = [
+            self._populate_namespaces,
+            self._populate_pods,
+            self._populate_services,
+            self._populate_deployments,
+            self._populate_replicasets,
+            self._populate_statefulsets,
+            self._populate_jobs,
+            self._populate_cronjobs,
+            self._populate_nodes,
+        ]
+
+        async def _populate_kind(
+            populate: Callable[[Graph, "Api", str], Awaitable[None]],
+        ) -> None:
+            try:
+                await populate(graph, api, context_prefix)
+            except Exception as e:
+                # e.g. a kind that isn't served, or that we can't list
+                print(f"Warning: {populate.__name__} failed for context '{context_name}': {e}")
+
         async with anyio.create_task_group() as tg:
-            tg.start_soon(self._populate_namespaces, graph, api, context_prefix)
-            tg.start_soon(self._populate_pods, graph, api, context_prefix)
-            tg.start_soon(self._populate_services, graph, api, context_prefix)
-            tg.start_soon(self._populate_deployments, graph, api, context_prefix)
-            tg.start_soon(self._populate_replicasets, graph, api, context_prefix)
-            tg.start_soon(self._populate_statefulsets, graph, api, context_prefix)
-            tg.start_soon(self._populate_jobs, graph, api, context_prefix)
-            tg.start_soon(self._populate_cronjobs, graph, api, context_prefix)
-            tg.start_soon(self._populate_nodes, graph, api, context_prefix)
+            for populate in populators:
+                tg.start_soon(_populate_kind, populate)
 
     async def _populate_namespaces(self, graph: Graph, api: "Api", context_prefix: str) -> None:
         async for namespace in api.get("namespaces"):
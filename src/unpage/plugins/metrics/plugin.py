@@ -28,7 +28,7 @@ class MetricsPlugin(Plugin, McpServerMixin):
     @tool()
     async def list_available_metrics_for_node(self, node_id: str) -> list[str] | str:
         """List the available metrics for a node."""
-        node = await self.context.graph.get_node_safe(node_id)
+        node = await self.context.get_node(node_id)
         if not node:
             return f"Resource with node ID '{node_id}' not found"
 
@@ -54,7 +54,7 @@ class MetricsPlugin(Plugin, McpServerMixin):
 
         Metric names should be provided as a JSON array of strings.
         """
-        node = await self.context.graph.get_node_safe(node_id)
+        node = await self.context.get_node(node_id)
         if not node:
             return f"Resource with node ID '{node_id}' not found"
 
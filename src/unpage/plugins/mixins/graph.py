@@ -1,3 +1,5 @@
+from typing import Any
+
 from unpage.knowledge import Graph
 from unpage.plugins import PluginCapability
 
@@ -8,3 +10,10 @@ class KnowledgeGraphMixin(PluginCapability):
     async def populate_graph(self, graph: Graph) -> None:
         """Initialize the graph with nodes and edges from the plugin."""
         raise NotImplementedError
+
+    def get_build_stats(self) -> dict[str, Any]:
+        """Return statistics about the graph build in progress, such as the state of rate limiters.
+
+        The statistics are published with the build's progress, and shown by `unpage graph status`.
+        """
+        return {}
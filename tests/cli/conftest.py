@@ -70,6 +70,7 @@ def mock_config_manager(isolated_config_dir, monkeypatch):
     monkeypatch.setattr("unpage.cli.graph.status.manager", test_manager)
     monkeypatch.setattr("unpage.cli.graph.stop.manager", test_manager)
     monkeypatch.setattr("unpage.cli.graph.logs.manager", test_manager)
+    monkeypatch.setattr("unpage.cli.graph.merge.manager", test_manager)
     # Graph background operations (CRITICAL for file path isolation)
     monkeypatch.setattr("unpage.cli.graph._background.manager", test_manager)
 
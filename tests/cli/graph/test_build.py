@@ -1,5 +1,7 @@
 """Tests for the graph build CLI command."""
 
+import json
+from collections import Counter
 from unittest.mock import patch, AsyncMock, MagicMock
 
 
@@ -38,6 +40,8 @@ def test_build_graph_success(
     mock_graph_instance = AsyncMock()
     mock_graph_instance.infer_edges.return_value = None
     mock_graph_instance.save.return_value = None
+    mock_graph_instance.source_node_counts = Counter({"test-plugin": 1})
+    mock_graph_instance.pending_edge_inference = 0
 
     # Create proper async iterators for counting
     async def mock_iter_edges():
@@ -61,6 +65,9 @@ def test_build_graph_success(
     mock_plugin = AsyncMock()
     mock_plugin.name = "test-plugin"
     mock_plugin.populate_graph.return_value = None
+    mock_plugin.get_build_stats = MagicMock(
+        return_value={"rate_limits": {"default ec2 us-east-1": {"rate": 10.0, "throttled": 1}}}
+    )
     mock_plugin_manager_instance = MagicMock()
     mock_plugin_manager_instance.get_plugins_with_capability.return_value = [mock_plugin]
     mock_plugin_manager.return_value = mock_plugin_manager_instance
@@ -85,6 +92,57 @@ def test_build_graph_success(
     mock_graph_instance.infer_edges.assert_called_once()
     mock_graph_instance.save.assert_called_once()
 
+    # Verify the final progress was published for `unpage graph status`
+    progress = json.loads(
+        (
+            mock_config_manager.get_active_profile_directory() / "graph_build_progress.json"
+        ).read_text()
+    )
+    assert progress["phase"] == "finished"
+    assert progress["plugins"] == {"test-plugin": "finished"}
+    assert progress["nodes_by_source"] == {"test-plugin": 1}
+    assert progress["plugin_stats"] == {
+        "test-plugin": {"rate_limits": {"default ec2 us-east-1": {"rate": 10.0, "throttled": 1}}}
+    }
+
+
+@patch("unpage.cli.graph.build.telemetry.send_event")
+@patch("unpage.cli.graph.build.create_pid_file")
+@patch("unpage.cli.graph.build.cleanup_pid_file")
+@patch("unpage.cli.graph.build.check_and_create_lock")
+@patch("unpage.cli.graph.build.PluginManager")
+def test_build_graph_closes_plugins_on_failure(
+    mock_plugin_manager,
+    mock_check_lock,
+    mock_cleanup_pid,
+    mock_create_pid,
+    mock_send_event,
+    unpage,
+    mock_config_manager,
+):
+    """Test that plugins are closed when populating the graph fails.
+
+    Should:
+    - Close every plugin, so their pooled clients aren't leaked
+    - Exit with a non-zero code
+    """
+    mock_send_event.return_value = None
+    mock_check_lock.return_value = True
+
+    mock_plugin = AsyncMock()
+    mock_plugin.name = "test-plugin"
+    mock_plugin.populate_graph.side_effect = RuntimeError("population failed")
+    mock_plugin.get_build_stats = MagicMock(return_value={})
+    mock_plugin_manager_instance = MagicMock()
+    mock_plugin_manager_instance.get_plugins_with_capability.return_value = [mock_plugin]
+    mock_plugin_manager_instance.__iter__.return_value = iter([mock_plugin])
+    mock_plugin_manager.return_value = mock_plugin_manager_instance
+
+    stdout, stderr, exit_code = unpage("graph build")
+
+    assert exit_code != 0
+    mock_plugin.close.assert_awaited_once()
+
 
 @patch("unpage.cli.graph.build.telemetry.send_event")
 @patch("unpage.cli.graph.build.check_and_create_lock")
@@ -204,6 +262,8 @@ def test_build_graph_with_interval(
     mock_graph_instance = AsyncMock()
     mock_graph_instance.infer_edges.return_value = None
     mock_graph_instance.save.return_value = None
+    mock_graph_instance.source_node_counts = Counter({"test-plugin": 1})
+    mock_graph_instance.pending_edge_inference = 0
 
     # Create proper async iterators for counting (empty for interval test)
     async def mock_iter_edges():
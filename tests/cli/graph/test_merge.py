@@ -0,0 +1,103 @@
+"""Tests for the graph merge CLI command."""
+
+import asyncio
+import json
+
+from unpage.knowledge import Graph
+from unpage.plugins.aws.nodes.aws_ebs_volume import AwsEbsVolume
+from unpage.plugins.aws.nodes.aws_ec2_instance import AwsEc2Instance
+from unpage.plugins.aws.nodes.base import AwsAccount
+
+
+def _write_shard(path, *node_factories):
+    async def _build():
+        graph = Graph()
+        for factory in node_factories:
+            await graph.add_node(factory(graph))
+        await graph.infer_edges()
+        await graph.save(path)
+
+    asyncio.run(_build())
+
+
+def _ec2_instance(instance_id, volume_id, **extra):
+    return lambda graph: AwsEc2Instance(
+        node_id=instance_id,
+        raw_data={
+            "InstanceId": instance_id,
+            "SecurityGroups": [],
+            "BlockDeviceMappings": [{"Ebs": {"VolumeId": volume_id}}],
+            **extra,
+        },
+        aws_account=AwsAccount(),
+        _graph=graph,
+    )
+
+
+def _ebs_volume(volume_id):
+    return lambda graph: AwsEbsVolume(
+        node_id=volume_id,
+        raw_data={"VolumeId": volume_id},
+        aws_account=AwsAccount(),
+        _graph=graph,
+    )
+
+
+def test_merge_infers_edges_across_shards(unpage, tmp_path):
+    """Test merging shards whose nodes reference each other.
+
+    Should:
+    - Union the nodes of all shards
+    - Infer edges that cross shard boundaries
+    - Union the identifier mappings
+    """
+    _write_shard(tmp_path / "a.json", _ec2_instance("i-1", "vol-1"))
+    _write_shard(tmp_path / "b.json", _ebs_volume("vol-1"))
+    output = tmp_path / "merged.json"
+
+    stdout, _, exit_code = unpage(
+        f"graph merge {tmp_path / 'a.json'} {tmp_path / 'b.json'} -o {output}"
+    )
+
+    assert exit_code == 0
+    assert "Merged 2 graphs into 2 nodes and 1 edges" in stdout
+
+    merged = json.loads(output.read_text())
+    assert {node["id"] for node in merged["nodes"]} == {
+        "aws:aws_ec2_instance:i-1",
+        "aws:aws_ebs_volume:vol-1",
+    }
+    assert [(e["source"], e["target"], e["relationship_type"]) for e in merged["edges"]] == [
+        ("aws:aws_ec2_instance:i-1", "aws:aws_ebs_volume:vol-1", "has_volume")
+    ]
+    assert merged["_identifier_mapping"]["vol-1"] == ["aws:aws_ebs_volume:vol-1"]
+
+
+def test_merge_conflict_policies(unpage, tmp_path):
+    """Test each conflict policy when the same node appears in two shards."""
+    _write_shard(tmp_path / "a.json", _ec2_instance("i-1", "vol-1", Shard="a"))
+    _write_shard(tmp_path / "b.json", _ec2_instance("i-1", "vol-1", Shard="b"))
+    inputs = f"{tmp_path / 'a.json'} {tmp_path / 'b.json'}"
+
+    for policy, expected_shard in (("keep_first", "a"), ("keep_last", "b")):
+        output = tmp_path / f"{policy}.json"
+        _, _, exit_code = unpage(f"graph merge {inputs} -o {output} --on-conflict {policy}")
+        assert exit_code == 0
+        merged = json.loads(output.read_text())
+        assert len(merged["nodes"]) == 1
+        assert merged["nodes"][0]["data"]["raw_data"]["Shard"] == expected_shard
+
+    stdout, _, exit_code = unpage(
+        f"graph merge {inputs} -o {tmp_path / 'error.json'} --on-conflict error"
+    )
+    assert exit_code == 1
+    assert "Unable to merge graphs" in stdout
+    assert not (tmp_path / "error.json").exists()
+
+
+def test_merge_missing_input(unpage, tmp_path):
+    """Test merging a graph file that doesn't exist."""
+    stdout, stderr, exit_code = unpage(f"graph merge {tmp_path / 'missing.json'}")
+
+    assert "Graph file not found" in stdout
+    assert exit_code == 1
@@ -1,5 +1,7 @@
 """Tests for the graph status CLI command."""
 
+import json
+import time
 from unittest.mock import patch, MagicMock
 
 
@@ -121,3 +123,62 @@ def test_status_corrupted_pid_file(
     assert exit_code == 1
 
     # Cleanup is internal behavior - main thing is correct error handling
+
+
+@patch("unpage.cli.graph.status.telemetry.send_event")
+@patch("unpage.cli.graph.status.is_process_running")
+def test_status_build_progress(
+    mock_is_running, mock_send_event, unpage, mock_config_manager, running_graph_build, test_profile
+):
+    """Test status command shows the live progress published by the build.
+
+    Should:
+    - Read the progress file written by the running build
+    - Display the phase, per-plugin node counts, throughput, pending work, ETA and plugin stats
+    """
+    mock_send_event.return_value = None
+    mock_is_running.return_value = True
+
+    pid = int(running_graph_build["pid_file"].read_text().strip())
+    now = time.time()
+    (test_profile / "graph_build_progress.json").write_text(
+        json.dumps(
+            {
+                "pid": pid,
+                "phase": "populating",
+                "started_at": now - 90,
+                "phase_started_at": now - 60,
+                "updated_at": now,
+                "plugins": {"aws": "running", "kubernetes": "finished"},
+                "nodes_by_source": {"aws": 1000, "kubernetes": 200},
+                "node_count": 1200,
+                "nodes_per_second": 20.0,
+                "pending": 1,
+                "eta_seconds": 125,
+                "plugin_stats": {
+                    "aws": {
+                        "rate_limits": {
+                            "production ec2 us-east-1": {
+                                "rate": 12.5,
+                                "requests": 300,
+                                "throttled": 4,
+                            }
+                        }
+                    }
+                },
+            }
+        )
+    )
+
+    stdout, stderr, exit_code = unpage("graph status")
+
+    assert exit_code == 0
+    assert f"Graph build running (PID: {pid})" in stdout
+    assert "Phase: populating (for 1m 0s, build running for 1m 30s)" in stdout
+    assert "Nodes: 1200 (20.0 nodes/s)" in stdout
+    assert "  aws: 1000 (running)" in stdout
+    assert "  kubernetes: 200 (finished)" in stdout
+    assert "Pending: 1 plugins" in stdout
+    assert "ETA: 2m 5s" in stdout
+    assert "aws rate limits:" in stdout
+    assert "  production ec2 us-east-1: rate=12.5 requests=300 throttled=4" in stdout
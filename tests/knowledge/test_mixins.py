@@ -0,0 +1,46 @@
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+
+import pytest
+from pydantic import AwareDatetime
+
+from unpage.knowledge.nodes.mixins import HasLogs
+from unpage.models import LogLine
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+END = datetime(2025, 1, 2, tzinfo=UTC)
+LINES = [LogLine(time=START, log="first"), LogLine(time=END, log="second")]
+
+
+class GetLogsNode(HasLogs):
+    async def get_logs(
+        self, time_range_start: AwareDatetime, time_range_end: AwareDatetime
+    ) -> list[LogLine]:
+        return LINES
+
+
+class IterLogsNode(HasLogs):
+    async def iter_logs(
+        self, time_range_start: AwareDatetime, time_range_end: AwareDatetime
+    ) -> AsyncIterator[LogLine]:
+        for line in LINES:
+            yield line
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("node_class", [GetLogsNode, IterLogsNode])
+async def test_logs_default_to_the_implemented_method(node_class: type[HasLogs]) -> None:
+    node = node_class()
+
+    assert await node.get_logs(START, END) == LINES
+    assert [line async for line in node.iter_logs(START, END)] == LINES
+
+
+@pytest.mark.asyncio
+async def test_logs_are_not_implemented_by_default() -> None:
+    node = HasLogs()
+
+    with pytest.raises(NotImplementedError):
+        await node.get_logs(START, END)
+    with pytest.raises(NotImplementedError):
+        [line async for line in node.iter_logs(START, END)]
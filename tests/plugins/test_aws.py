@@ -0,0 +1,847 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from botocore.exceptions import ClientError
+from botocore.hooks import HierarchicalEmitter
+
+from unpage.knowledge import Graph
+from unpage.plugins.aws.clients import AwsClientPool, _assume_role_session
+from unpage.plugins.aws.cloudwatch import choose_period
+from unpage.plugins.aws.inventory import to_describe_format
+from unpage.plugins.aws.logs import iter_cloudwatch_log_events
+from unpage.plugins.aws.nodes.aws_ec2_instance import AwsEc2Instance
+from unpage.plugins.aws.nodes.aws_rds_database import AwsRdsDatabase
+from unpage.plugins.aws.nodes.base import AwsAccount
+from unpage.plugins.aws.plugin import (
+    AwsConfigAggregatorSettings,
+    AwsOrganizationSettings,
+    AwsPlugin,
+    AwsPluginSettings,
+)
+from unpage.plugins.aws.ratelimit import AdaptiveRateLimiter
+from unpage.plugins.aws.utils import list_accessible_regions_for_service
+
+
+class FakeSession:
+    """A stand-in for an aioboto3 Session that records the clients it creates."""
+
+    def __init__(
+        self,
+        regions: list[str],
+        opted_out: set[str] = frozenset(),
+        throttled: set[str] = frozenset(),
+        pages: dict[tuple[str, str], list[dict]] | None = None,
+        account_id: str = "123456789012",
+    ) -> None:
+        self.profile_name = "test"
+        self.account_id = account_id
+        self.instances: dict[str, str] = {}
+        self.bucket_locations: dict[str, str | None] = {}
+        self.log_events: dict[str, list[list[dict]]] = {}
+        self.regions = regions
+        self.opted_out = opted_out
+        self.throttled = throttled
+        self.pages = pages or {}
+        self.client_calls: list[tuple[str, str]] = []
+        self.requests: list[dict] = []
+        self.identity_checks: list[str | None] = []
+        self.assumed_roles: list[str] = []
+
+    async def get_available_regions(self, service_name: str) -> list[str]:
+        return self.regions
+
+    @asynccontextmanager
+    async def client(self, service_name: str, region_name: str | None = None, config=None):
+        self.client_calls.append((service_name, region_name))
+        yield FakeClient(self, service_name, region_name)
+
+
+class FakeClient:
+    def __init__(self, session: FakeSession, service_name: str, region_name: str | None) -> None:
+        self.session = session
+        self.service_name = service_name
+        self.region_name = region_name
+        self.meta = SimpleNamespace(region_name=region_name, events=HierarchicalEmitter())
+
+    def get_paginator(self, action: str) -> "FakePaginator":
+        return FakePaginator(self.session.pages.get((self.service_name, action), []))
+
+    async def assume_role(self, **params) -> dict:
+        self.session.assumed_roles.append(params["RoleArn"])
+        return {
+            "Credentials": {
+                "AccessKeyId": "AKIAASSUMED",
+                "SecretAccessKey": "secret",
+                "SessionToken": "token",
+                "Expiration": datetime.now(UTC) + timedelta(hours=1),
+            }
+        }
+
+    async def get_metric_data(self, **params) -> dict:
+        self.session.requests.append(params)
+        return {
+            "MetricDataResults": [
+                {
+                    "Id": query["Id"],
+                    "Timestamps": [datetime(2025, 1, 1, tzinfo=UTC)],
+                    "Values": [1.0],
+                }
+                for query in params["MetricDataQueries"]
+            ]
+        }
+
+    async def describe_instance_status(self, InstanceIds: list[str], **params) -> dict:
+        self.session.requests.append({"InstanceIds": InstanceIds, **params})
+        missing = [i for i in InstanceIds if i not in self.session.instances]
+        if missing:
+            raise ClientError(
+                {
+                    "Error": {
+                        "Code": "InvalidInstanceID.NotFound",
+                        "Message": f"The instance IDs '{', '.join(missing)}' do not exist",
+                    }
+                },
+                "DescribeInstanceStatus",
+            )
+        return {
+            "InstanceStatuses": [
+                {"InstanceId": i, "InstanceState": {"Name": self.session.instances[i]}}
+                for i in InstanceIds
+            ]
+        }
+
+    async def get_bucket_location(self, Bucket: str) -> dict:
+        if Bucket not in self.session.bucket_locations:
+            raise ClientError(
+                {"Error": {"Code": "AccessDenied", "Message": "Access Denied"}},
+                "GetBucketLocation",
+            )
+        return {"LocationConstraint": self.session.bucket_locations[Bucket]}
+
+    async def filter_log_events(self, logGroupName: str, **params) -> dict:
+        self.session.requests.append({"logGroupName": logGroupName, **params})
+        if logGroupName not in self.session.log_events:
+            raise ClientError(
+                {"Error": {"Code": "ResourceNotFoundException", "Message": "not found"}},
+                "FilterLogEvents",
+            )
+        pages = self.session.log_events[logGroupName]
+        page = int(params.get("nextToken", 0))
+        response: dict = {"events": pages[page]}
+        if page + 1 < len(pages):
+            response["nextToken"] = str(page + 1)
+        return response
+
+    async def get_caller_identity(self) -> dict:
+        self.session.identity_checks.append(self.region_name)
+        await asyncio.sleep(0)
+        if self.region_name in self.session.opted_out:
+            raise ClientError(
+                {"Error": {"Code": "InvalidClientTokenId", "Message": "opted out"}},
+                "GetCallerIdentity",
+            )
+        if self.region_name in self.session.throttled:
+            raise ClientError(
+                {"Error": {"Code": "Throttling", "Message": "Rate exceeded"}},
+                "GetCallerIdentity",
+            )
+        return {"Account": self.session.account_id}
+
+
+class FakePaginator:
+    def __init__(self, pages: list[dict]) -> None:
+        self.pages = pages
+
+    async def paginate(self, **params):
+        for page in self.pages:
+            yield page
+
+
+@pytest.fixture
+def clients() -> AwsClientPool:
+    return AwsClientPool()
+
+
+@pytest.mark.asyncio
+async def test_accessible_regions_are_cached_across_services(clients: AwsClientPool) -> None:
+    session = FakeSession(["us-east-1", "us-west-2", "ap-east-1"], opted_out={"ap-east-1"})
+
+    for service_name in ("ec2", "rds", "elbv2", "cloudwatch"):
+        regions = await list_accessible_regions_for_service(clients, session, service_name)
+        assert regions == ["us-east-1", "us-west-2"]
+
+    # One STS call per region, including the opted out one.
+    assert sorted(session.identity_checks) == ["ap-east-1", "us-east-1", "us-west-2"]
+
+
+@pytest.mark.asyncio
+async def test_accessible_regions_expire(clients: AwsClientPool) -> None:
+    clients.region_access.ttl_seconds = 0
+    session = FakeSession(["us-east-1"])
+
+    await list_accessible_regions_for_service(clients, session, "ec2")
+    await list_accessible_regions_for_service(clients, session, "ec2")
+
+    assert session.identity_checks == ["us-east-1", "us-east-1"]
+
+
+@pytest.mark.asyncio
+async def test_throttled_regions_are_not_cached(clients: AwsClientPool) -> None:
+    session = FakeSession(["us-east-1", "us-west-2"], throttled={"us-west-2"})
+
+    assert await list_accessible_regions_for_service(clients, session, "ec2") == ["us-east-1"]
+    session.throttled = set()
+    assert await list_accessible_regions_for_service(clients, session, "ec2") == [
+        "us-east-1",
+        "us-west-2",
+    ]
+
+    # The throttled region is checked again, and the accessible one isn't.
+    assert sorted(session.identity_checks) == ["us-east-1", "us-west-2", "us-west-2"]
+
+
+def test_accessible_regions_are_checked_on_each_event_loop() -> None:
+    region_access_cache = AwsClientPool().region_access
+    region_access_cache.ttl_seconds = 0
+    session = FakeSession(["us-east-1"])
+
+    async def _check_concurrently() -> list[bool]:
+        # Waiting on a lock binds it to the running loop.
+        return await asyncio.gather(
+            region_access_cache.is_accessible(session, "us-east-1"),
+            region_access_cache.is_accessible(session, "us-east-1"),
+        )
+
+    for _ in range(2):
+        assert asyncio.run(_check_concurrently()) == [True, True]
+
+
+@pytest.mark.asyncio
+async def test_cloudwatch_metrics_only_query_the_node_region(clients: AwsClientPool) -> None:
+    session = FakeSession(["us-east-1", "us-west-2", "eu-west-1"])
+    account = AwsAccount()
+    account._session = session
+    node = AwsEc2Instance(
+        node_id="i-1",
+        raw_data={"InstanceId": "i-1"},
+        aws_account=account,
+        aws_region="us-west-2",
+        _graph=Graph(),
+    )
+    node._clients = clients
+
+    observations = await node.get_metric(
+        "CPUUtilization", datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 1, 2, tzinfo=UTC)
+    )
+
+    assert [o.observation_type for o in observations] == [
+        "Average CPUUtilization",
+        "Minimum CPUUtilization",
+        "Maximum CPUUtilization",
+    ]
+    assert ("cloudwatch", "us-west-2") in session.client_calls
+    assert not [call for call in session.client_calls if call[1] in ("us-east-1", "eu-west-1")]
+
+
+@pytest.mark.asyncio
+async def test_cloudwatch_metrics_are_batched(clients: AwsClientPool) -> None:
+    session = FakeSession(["us-east-1"])
+    account = AwsAccount()
+    account._session = session
+    node = AwsEc2Instance(
+        node_id="i-1",
+        raw_data={"InstanceId": "i-1"},
+        aws_account=account,
+        aws_region="us-east-1",
+        _graph=Graph(),
+    )
+    node._clients = clients
+
+    observations = await node.get_metrics(
+        datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 1, 2, tzinfo=UTC)
+    )
+
+    # Six metrics with three statistics each, all in one request.
+    assert len(observations) == 18
+    assert len(session.requests) == 1
+    assert len(session.requests[0]["MetricDataQueries"]) == 18
+
+
+def test_choose_period() -> None:
+    now = datetime(2025, 6, 1, tzinfo=UTC)
+    day = timedelta(days=1)
+
+    # Short ranges use the default 5 minute period.
+    assert choose_period(now - timedelta(hours=1), now, now=now) == 300
+    # Long ranges use a longer period to stay under 1,440 datapoints.
+    assert choose_period(now - 30 * day, now, now=now) == 1800
+    # Data older than 63 days is only available with an hourly period.
+    assert choose_period(now - 90 * day, now - 89 * day, now=now) == 3600
+
+
+@pytest.mark.asyncio
+async def test_client_pool_reuses_clients() -> None:
+    pool = AwsClientPool()
+    session = FakeSession(["us-east-1", "us-west-2"])
+
+    for _ in range(3):
+        async with pool.client(session, "ec2", "us-east-1") as client:
+            assert client is await pool.get_client(session, "ec2", "us-east-1")
+    await pool.get_client(session, "ec2", "us-west-2")
+    await pool.get_client(session, "rds", "us-west-2")
+
+    assert session.client_calls == [
+        ("ec2", "us-east-1"),
+        ("ec2", "us-west-2"),
+        ("rds", "us-west-2"),
+    ]
+
+    # Closing the pool drops its clients, so new ones are created afterwards.
+    await pool.close()
+    await pool.get_client(session, "ec2", "us-east-1")
+    assert len(session.client_calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_each_plugin_closes_only_its_own_clients() -> None:
+    session = FakeSession(["us-east-1"])
+    first, second = AwsPlugin(), AwsPlugin()
+    first_client = await first.clients.get_client(session, "ec2", "us-east-1")
+    second_client = await second.clients.get_client(session, "ec2", "us-east-1")
+    assert first_client is not second_client
+
+    await first.close()
+
+    # The other plugin's client is still open, so it's reused rather than recreated.
+    assert await second.clients.get_client(session, "ec2", "us-east-1") is second_client
+    assert await first.clients.get_client(session, "ec2", "us-east-1") is not first_client
+
+    # Nodes use the pool of the plugin they're bound to.
+    node = AwsEc2Instance(
+        node_id="i-1", raw_data={"InstanceId": "i-1"}, aws_account=AwsAccount(), _graph=Graph()
+    )
+    with pytest.raises(RuntimeError, match="isn't bound"):
+        node.clients  # noqa: B018
+    second.bind_node(node)
+    assert node.clients is second.clients
+
+
+def test_multiple_accounts_are_configured() -> None:
+    plugin = AwsPlugin(
+        accounts={
+            "production": {"profile": "production"},
+            "staging": {"role_arn": "arn:aws:iam::222222222222:role/Unpage"},
+        },
+        max_concurrent_accounts=2,
+    )
+    plugin.init_plugin()
+
+    assert list(plugin.aws_settings.accounts) == ["production", "staging"]
+    assert plugin.aws_settings.accounts["staging"].role_arn == (
+        "arn:aws:iam::222222222222:role/Unpage"
+    )
+    assert plugin.aws_settings.max_concurrent_accounts == 2
+
+
+@pytest.mark.asyncio
+async def test_populate_graph_scans_every_account() -> None:
+    def account(name: str, instance_id: str | None) -> AwsAccount:
+        pages = (
+            {
+                ("ec2", "describe_instances"): [
+                    {"Reservations": [{"Instances": [{"InstanceId": instance_id}]}]}
+                ]
+            }
+            if instance_id
+            else {}
+        )
+        account = AwsAccount(name=name)
+        account._session = FakeSession(["us-east-1"], pages=pages)
+        return account
+
+    broken = AwsAccount(name="broken")
+    broken._session = FakeSession(["us-east-1"], opted_out={None})
+    plugin = AwsPlugin(
+        aws_settings=AwsPluginSettings(
+            accounts={
+                "production": account("production", "i-1"),
+                "staging": account("staging", "i-2"),
+                "broken": broken,
+            }
+        )
+    )
+    graph = Graph()
+
+    await plugin.populate_graph(graph)
+
+    nodes = {node.node_id: node async for node in graph.iter_nodes()}
+    assert set(nodes) == {"i-1", "i-2"}
+    assert nodes["i-1"].aws_account.name == "production"
+    assert nodes["i-2"].aws_account.name == "staging"
+
+
+@pytest.mark.asyncio
+async def test_populate_graph_is_limited_to_regions_resource_types_and_tags() -> None:
+    db_arn = "arn:aws:rds:us-west-2:123456789012:db:main"
+    session = FakeSession(
+        ["us-east-1", "us-west-2", "eu-west-1"],
+        pages={
+            ("ec2", "describe_instances"): [
+                {"Reservations": [{"Instances": [{"InstanceId": "i-1"}, {"InstanceId": "i-2"}]}]}
+            ],
+            ("rds", "describe_db_instances"): [
+                {
+                    "DBInstances": [
+                        {
+                            "DBInstanceArn": db_arn,
+                            "DBInstanceIdentifier": "main",
+                            "Endpoint": {"Address": "main.rds.amazonaws.com"},
+                        },
+                        {"DBInstanceArn": "arn:aws:rds:us-west-2:123456789012:db:scratch"},
+                    ]
+                }
+            ],
+            ("resourcegroupstaggingapi", "get_resources"): [
+                {
+                    "ResourceTagMappingList": [
+                        {"ResourceARN": "arn:aws:ec2:us-west-2:123456789012:instance/i-1"},
+                        {"ResourceARN": db_arn},
+                    ]
+                }
+            ],
+        },
+    )
+    account = AwsAccount()
+    account._session = session
+    plugin = AwsPlugin(
+        aws_settings=AwsPluginSettings(
+            accounts={"default": account},
+            regions=["us-west-2"],
+            resource_types=["ec2_instances", "rds_databases"],
+            tag_filters={"team": ["payments"]},
+        )
+    )
+    graph = Graph()
+
+    await plugin.populate_graph(graph)
+
+    assert {node.node_id async for node in graph.iter_nodes()} == {"i-1", db_arn}
+    # Only the allowed region is checked and scanned, and tags are listed once.
+    assert sorted(r for r in session.identity_checks if r) == ["us-west-2"]
+    assert {service for service, region in session.client_calls if region} == {
+        "sts",
+        "ec2",
+        "rds",
+        "resourcegroupstaggingapi",
+    }
+    assert session.client_calls.count(("resourcegroupstaggingapi", "us-west-2")) == 1
+
+
+@pytest.mark.asyncio
+async def test_organization_accounts_are_discovered(monkeypatch: pytest.MonkeyPatch) -> None:
+    session = FakeSession(
+        ["us-east-1"],
+        pages={
+            ("organizations", "list_accounts"): [
+                {
+                    "Accounts": [
+                        {"Id": "123456789012", "Name": "management", "Status": "ACTIVE"},
+                        {"Id": "222222222222", "Name": "staging", "Status": "ACTIVE"},
+                        {"Id": "333333333333", "Name": "sandbox", "Status": "ACTIVE"},
+                        {"Id": "444444444444", "Name": "closed", "Status": "SUSPENDED"},
+                    ]
+                }
+            ]
+        },
+    )
+    monkeypatch.setattr("unpage.plugins.aws.plugin.get_session", lambda profile: session)
+    plugin = AwsPlugin(
+        aws_settings=AwsPluginSettings(
+            accounts={},
+            organization=AwsOrganizationSettings(
+                profile="management", exclude_accounts=["333333333333"]
+            ),
+        )
+    )
+
+    accounts = await plugin.list_accounts()
+
+    assert [(a.name, a.profile, a.role_arn) for a in accounts] == [
+        ("management", "management", None),
+        (
+            "staging",
+            "management",
+            "arn:aws:iam::222222222222:role/OrganizationAccountAccessRole",
+        ),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_assumed_role_credentials_are_cached() -> None:
+    source = FakeSession(["us-east-1"])
+    session = _assume_role_session(source, "arn:aws:iam::222222222222:role/Unpage")
+
+    credentials = await session._session.get_credentials()
+    for _ in range(3):
+        frozen = await credentials.get_frozen_credentials()
+
+    assert frozen.access_key == "AKIAASSUMED"
+    assert source.assumed_roles == ["arn:aws:iam::222222222222:role/Unpage"]
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_adapts_to_throttling(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 0.0
+
+    async def sleep(seconds: float) -> None:
+        nonlocal now
+        now += seconds
+
+    monkeypatch.setattr("unpage.plugins.aws.ratelimit.asyncio.sleep", sleep)
+    limiter = AdaptiveRateLimiter(rate=10.0, clock=lambda: now)
+
+    # A burst of up to a second of requests is sent right away, then requests are paced.
+    for _ in range(12):
+        await limiter.acquire()
+    assert now == pytest.approx(0.2)
+
+    # Throttling halves the rate, but only once for requests that were throttled together.
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.rate == 5.0
+    assert limiter.throttled == 2
+
+    # Successful requests slowly raise the rate again.
+    for _ in range(5):
+        limiter.on_success()
+    assert 5.9 < limiter.rate < 6.0
+
+    # No more than the minimum rate.
+    now += 10
+    for _ in range(10):
+        limiter.on_throttle()
+        now += 1
+    assert limiter.rate == limiter.min_rate
+
+
+def test_rate_limiter_is_used_on_each_event_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 0.0
+    real_sleep = asyncio.sleep
+
+    async def sleep(seconds: float) -> None:
+        nonlocal now
+        now += seconds
+        await real_sleep(0)
+
+    monkeypatch.setattr("unpage.plugins.aws.ratelimit.asyncio.sleep", sleep)
+    limiter = AdaptiveRateLimiter(rate=1.0, clock=lambda: now)
+
+    async def _acquire_concurrently() -> None:
+        # Waiting on a lock binds it to the running loop.
+        await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+
+    for _ in range(2):
+        asyncio.run(_acquire_concurrently())
+    assert limiter.requests == 6
+
+
+@pytest.mark.asyncio
+async def test_client_pool_limits_each_service_and_region() -> None:
+    pool = AwsClientPool()
+    session = FakeSession(["us-east-1"])
+
+    ec2 = await pool.get_client(session, "ec2", "us-east-1")
+    await pool.get_client(session, "rds", "us-east-1")
+    ec2.meta.events.emit(
+        "response-received.ec2.DescribeInstances",
+        response_dict={"status_code": 503},
+        parsed_response={"Error": {"Code": "RequestLimitExceeded"}},
+    )
+
+    stats = {key[1:]: limiter.stats() for key, limiter in pool.rate_limiters.items()}
+    assert stats[("ec2", "us-east-1")].throttled == 1
+    assert stats[("ec2", "us-east-1")].rate == 10.0
+    assert stats[("rds", "us-east-1")].throttled == 0
+
+
+def test_config_configuration_is_converted_to_describe_format() -> None:
+    assert to_describe_format(
+        {
+            "dBInstanceArn": "arn:aws:rds:us-east-1:123456789012:db:main",
+            "endpoint": {"address": "main.rds.amazonaws.com"},
+            "vpcSecurityGroups": [{"vpcSecurityGroupId": "sg-1"}],
+        }
+    ) == {
+        "DBInstanceArn": "arn:aws:rds:us-east-1:123456789012:db:main",
+        "Endpoint": {"Address": "main.rds.amazonaws.com"},
+        "VpcSecurityGroups": [{"VpcSecurityGroupId": "sg-1"}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_populate_graph_from_config_aggregator(monkeypatch: pytest.MonkeyPatch) -> None:
+    aggregator_session = FakeSession(
+        ["us-east-1"],
+        pages={
+            ("config", "select_aggregate_resource_config"): [
+                {
+                    "Results": [
+                        json.dumps(
+                            {
+                                "accountId": "111111111111",
+                                "awsRegion": "eu-west-1",
+                                "resourceType": "AWS::EC2::Instance",
+                                "configuration": {
+                                    "instanceId": "i-1",
+                                    "privateIpAddress": "10.0.0.1",
+                                    "securityGroups": [{"groupId": "sg-1"}],
+                                    "blockDeviceMappings": [{"ebs": {"volumeId": "vol-1"}}],
+                                },
+                            }
+                        ),
+                        json.dumps(
+                            {
+                                "accountId": "999999999999",
+                                "awsRegion": "us-east-1",
+                                "resourceType": "AWS::S3::Bucket",
+                                "configuration": {"name": "logs"},
+                            }
+                        ),
+                    ]
+                }
+            ]
+        },
+    )
+    monkeypatch.setattr("unpage.plugins.aws.plugin.get_session", lambda *args: aggregator_session)
+    production = AwsAccount(name="production")
+    production._session = FakeSession(["eu-west-1"], account_id="111111111111")
+    plugin = AwsPlugin(
+        aws_settings=AwsPluginSettings(
+            accounts={"production": production},
+            config_aggregator=AwsConfigAggregatorSettings(name="organization"),
+        )
+    )
+    graph = Graph()
+
+    await plugin.populate_graph(graph)
+
+    instance = await graph.get_node("aws:aws_ec2_instance:i-1")
+    assert isinstance(instance, AwsEc2Instance)
+    assert instance.raw_data["PrivateIpAddress"] == "10.0.0.1"
+    assert instance.aws_account.name == "production"
+    assert instance.aws_region == "eu-west-1"
+    bucket = await graph.get_node("aws:aws_s3_bucket:logs")
+    assert bucket.aws_account.name == "999999999999"
+
+    # Only the resource types that aren't read from AWS Config are listed in each region.
+    assert ("ec2", "eu-west-1") not in production._session.client_calls
+    assert ("elbv2", "eu-west-1") in production._session.client_calls
+
+
+@pytest.mark.asyncio
+async def test_s3_bucket_regions_are_looked_up_when_missing() -> None:
+    session = FakeSession(
+        ["us-east-1"],
+        pages={
+            ("s3", "list_buckets"): [
+                {
+                    "Buckets": [
+                        {"Name": "listed", "BucketRegion": "us-west-2"},
+                        {"Name": "virginia"},
+                        {"Name": "oregon"},
+                        {"Name": "ireland"},
+                        {"Name": "denied"},
+                    ]
+                }
+            ]
+        },
+    )
+    session.bucket_locations = {"virginia": None, "oregon": "us-west-2", "ireland": "EU"}
+    account = AwsAccount()
+    account._session = session
+
+    async def populate(**settings: Any) -> dict[str, str | None]:
+        plugin = AwsPlugin(
+            aws_settings=AwsPluginSettings(accounts={"default": account}, **settings)
+        )
+        graph = Graph()
+        await plugin.populate_s3_buckets(graph, account)
+        return {node.node_id: node.aws_region async for node in graph.iter_nodes()}
+
+    # Buckets without a region in ListBuckets are still matched to the regions.
+    assert await populate(regions=["us-east-1", "us-west-2"]) == {
+        "listed": "us-west-2",
+        "virginia": "us-east-1",
+        "oregon": "us-west-2",
+    }
+    # Without filters, a bucket whose region can't be looked up is still added.
+    assert await populate() == {
+        "listed": "us-west-2",
+        "virginia": "us-east-1",
+        "oregon": "us-west-2",
+        "ireland": "eu-west-1",
+        "denied": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_realtime_status_for_nodes_is_batched() -> None:
+    db_arn = "arn:aws:rds:us-west-2:123456789012:db:main"
+    session = FakeSession(
+        ["us-east-1", "us-west-2"],
+        pages={
+            ("rds", "describe_db_instances"): [
+                {
+                    "DBInstances": [
+                        {
+                            "DBInstanceArn": db_arn,
+                            "DBInstanceIdentifier": "main",
+                            "DBInstanceStatus": "available",
+                            "Endpoint": {"Address": "main.rds.amazonaws.com"},
+                        }
+                    ]
+                }
+            ]
+        },
+    )
+    session.instances = {"i-1": "running", "i-2": "stopped", "i-3": "running"}
+    account = AwsAccount()
+    account._session = session
+    graph = Graph()
+    for instance_id, region in [
+        ("i-1", "us-east-1"),
+        ("i-2", "us-east-1"),
+        ("i-4", "us-east-1"),
+        ("i-3", "us-west-2"),
+    ]:
+        await graph.add_node(
+            AwsEc2Instance(
+                node_id=instance_id,
+                raw_data={"InstanceId": instance_id},
+                aws_account=account,
+                aws_region=region,
+                _graph=graph,
+            )
+        )
+    await graph.add_node(
+        AwsRdsDatabase(
+            node_id=db_arn,
+            raw_data={
+                "DBInstanceArn": db_arn,
+                "DBInstanceIdentifier": "main",
+                "Endpoint": {"Address": "main.rds.amazonaws.com"},
+            },
+            aws_account=account,
+            _graph=graph,
+        )
+    )
+    plugin = AwsPlugin()
+    plugin.context = SimpleNamespace(get_node=graph.get_node_safe)
+
+    statuses = await plugin.get_realtime_status_for_nodes(
+        [
+            "aws:aws_ec2_instance:i-1",
+            "aws:aws_ec2_instance:i-2",
+            "aws:aws_ec2_instance:i-3",
+            "aws:aws_ec2_instance:i-4",
+            f"aws:aws_rds_database:{db_arn}",
+            "missing",
+        ]
+    )
+
+    assert statuses["aws:aws_ec2_instance:i-1"]["InstanceState"]["Name"] == "running"
+    assert statuses["aws:aws_ec2_instance:i-2"]["InstanceState"]["Name"] == "stopped"
+    assert statuses["aws:aws_ec2_instance:i-3"]["InstanceState"]["Name"] == "running"
+    assert "No instance found" in statuses["aws:aws_ec2_instance:i-4"]
+    assert statuses[f"aws:aws_rds_database:{db_arn}"]["DBInstanceStatus"] == "available"
+    assert statuses["missing"] == "Resource with node ID 'missing' not found"
+
+    # One request per region, plus a retry without the instance that doesn't exist.
+    assert sorted(r["InstanceIds"] for r in session.requests) == [
+        ["i-1", "i-2"],
+        ["i-1", "i-2", "i-4"],
+        ["i-3"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rds_logs_are_streamed_from_cloudwatch(clients: AwsClientPool) -> None:
+    def events(*messages: str) -> list[dict]:
+        return [
+            {"timestamp": 1735689600000 + i, "message": f"{m}\n"} for i, m in enumerate(messages)
+        ]
+
+    session = FakeSession(["us-east-1"])
+    session.log_events = {
+        "/aws/rds/instance/main/error": [events("first", "second"), events("third")],
+        "/aws/rds/instance/main/slowquery": [events("slow")],
+    }
+    account = AwsAccount()
+    account._session = session
+    node = AwsRdsDatabase(
+        node_id="arn:aws:rds:us-east-1:123456789012:db:main",
+        raw_data={
+            "DBInstanceArn": "arn:aws:rds:us-east-1:123456789012:db:main",
+            "DBInstanceIdentifier": "main",
+            "Endpoint": {"Address": "main.rds.amazonaws.com"},
+            "EnabledCloudwatchLogsExports": ["audit", "error", "slowquery"],
+        },
+        aws_account=account,
+        aws_region="us-east-1",
+        _graph=Graph(),
+    )
+    node._clients = clients
+    start, end = datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 1, 2, tzinfo=UTC)
+
+    # The audit log group doesn't exist, so it's skipped.
+    logs = await node.get_logs(start, end)
+    assert [line.log for line in logs] == ["first", "second", "third", "slow"]
+    assert logs[0].time == datetime(2025, 1, 1, tzinfo=UTC)
+
+    # Reading stops when the byte budget runs out, without reading the remaining pages.
+    session.requests.clear()
+    lines = [
+        line.log
+        async for line in iter_cloudwatch_log_events(
+            clients,
+            session,
+            "us-east-1",
+            node.get_cloudwatch_log_group_names(),
+            start,
+            end,
+            max_bytes=10,
+        )
+    ]
+    assert lines == ["first"]
+    assert [r["logGroupName"] for r in session.requests] == [
+        "/aws/rds/instance/main/audit",
+        "/aws/rds/instance/main/error",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cloudwatch_log_reads_stop_after_max_requests(clients: AwsClientPool) -> None:
+    session = FakeSession(["us-east-1"])
+    # FilterLogEvents can return many empty pages while it searches.
+    session.log_events = {"/aws/rds/instance/main/error": [[] for _ in range(100)]}
+    start, end = datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 1, 2, tzinfo=UTC)
+
+    lines = [
+        line
+        async for line in iter_cloudwatch_log_events(
+            clients,
+            session,
+            "us-east-1",
+            ["/aws/rds/instance/main/error"],
+            start,
+            end,
+            max_requests=5,
+        )
+    ]
+    assert lines == []
+    assert len(session.requests) == 5
@@ -0,0 +1,883 @@
+import asyncio
+import re
+from collections import defaultdict
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from azure.core import AsyncPipelineClient
+from azure.core.credentials import AccessToken
+from azure.core.credentials_async import AsyncTokenCredential
+from azure.core.pipeline.transport import AioHttpTransport, AsyncHttpTransport
+from azure.core.rest import HttpRequest
+from azure.core.rest._http_response_impl_async import AsyncHttpResponseImpl
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azure.mgmt.compute import models as compute_models
+from azure.mgmt.sql import models as sql_models
+
+from unpage.knowledge import Graph
+from unpage.plugins.azure.clients import AzureClientPool, ThrottlingRetryPolicy
+from unpage.plugins.azure import monitoring, plugin as azure_plugin
+from unpage.plugins.azure.monitoring import AzureMonitorQuery, get_azure_monitor_metrics
+from unpage.plugins.azure.nodes.azure_mysql_database import AzureMySqlDatabase
+from unpage.plugins.azure.nodes.azure_postgresql_database import AzurePostgreSqlDatabase
+from unpage.plugins.azure.nodes.azure_sql_database import AzureSqlDatabase
+from unpage.plugins.azure.nodes.azure_vm_instance import AzureVmInstance
+from unpage.plugins.azure.nodes.base import AzureNode, AzureSubscription
+from unpage.plugins.azure.plugin import (
+    AzurePlugin,
+    AzurePluginSettings,
+    AzureResourceGraphSettings,
+)
+from unpage.plugins.azure.resource_id import parse_resource_id
+
+
+class FakeCredential(AsyncTokenCredential):
+    """A credential that never requests a token."""
+
+    async def get_token(self, *scopes, **kwargs) -> AccessToken:
+        return AccessToken("token", 2**31)
+
+    async def close(self) -> None:
+        pass
+
+
+class FakeManagementClient:
+    """A stand-in for an async Azure management client."""
+
+    def __init__(self, credential, *args, transport, retry_policy) -> None:
+        self.credential = credential
+        self.args = args
+        self.transport = transport
+        self.retry_policy = retry_policy
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+        await self.transport.close()
+
+
+class FakeTransport(AsyncHttpTransport):
+    """A transport that returns canned responses, and records how long the retry policy sleeps."""
+
+    def __init__(self, responses: list[tuple[int, dict[str, str]]]) -> None:
+        self.responses = responses
+        self.requests: list[HttpRequest] = []
+        self.slept: list[float] = []
+
+    async def __aenter__(self) -> "FakeTransport":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+    async def open(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def sleep(self, duration: float) -> None:
+        self.slept.append(duration)
+
+    async def send(self, request: HttpRequest, **kwargs) -> AsyncHttpResponseImpl:
+        self.requests.append(request)
+        status_code, headers = self.responses[len(self.requests) - 1]
+        return AsyncHttpResponseImpl(
+            request=request,
+            internal_response=SimpleNamespace(),
+            block_size=1,
+            status_code=status_code,
+            reason="",
+            content_type=None,
+            headers=headers,
+            stream_download_generator=None,
+        )
+
+
+class FakeAzureClients:
+    """A stand-in for the Azure client pool, with canned results for each subscription.
+
+    Results are keyed by subscription ID and operation, e.g.
+    `("sub-1", "servers.list")`, and child listings by their parent's name,
+    e.g. `("sub-1", "databases.list_by_server/server-1")`. A result that's an
+    exception is raised instead. Getting a resource without a result raises
+    ResourceNotFoundError.
+    """
+
+    def __init__(self) -> None:
+        self.results: dict[tuple[str, str], Any] = {}
+        self.resource_graph_pages: dict[str, list[list[dict]]] = {}
+        self.resource_graph_requests: list[dict] = []
+        self.calls: list[tuple[str, tuple]] = []
+        self.listed: list[tuple[str, str]] = []
+        self.metric_batches: list[dict] = []
+        self.delay = 0.0
+        self.active: defaultdict[str, int] = defaultdict(int)
+        self.peak: defaultdict[str, int] = defaultdict(int)
+
+    def get_client(self, client_class: type, credential: object, *args: Any) -> "FakeClient":
+        self.calls.append((client_class.__name__, args))
+        return FakeClient(self, args[0] if args else "")
+
+    async def _wait(self, subscription_id: str) -> None:
+        self.active[subscription_id] += 1
+        self.peak[subscription_id] = max(self.peak[subscription_id], self.active[subscription_id])
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active[subscription_id] -= 1
+
+    async def list(self, subscription_id: str, operation: str, **kwargs: Any):
+        parent = kwargs.get("server_name") or kwargs.get("virtual_machine_scale_set_name")
+        key = (subscription_id, f"{operation}/{parent}" if parent else operation)
+        self.listed.append(key)
+        await self._wait(subscription_id)
+        result = self.results.get(key, [])
+        if isinstance(result, Exception):
+            raise result
+        for item in result:
+            yield item
+
+    async def get(self, subscription_id: str, operation: str, **kwargs: Any) -> Any:
+        key = (subscription_id, f"{operation}/{kwargs['vm_name']}")
+        self.listed.append(key)
+        await self._wait(subscription_id)
+        if key not in self.results:
+            raise ResourceNotFoundError(f"{kwargs['vm_name']} not found")
+        result = self.results[key]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class FakeClient:
+    def __init__(self, clients: FakeAzureClients, subscription_id: str) -> None:
+        self.clients = clients
+        self.subscription_id = subscription_id
+
+    def __getattr__(self, operation_group: str) -> SimpleNamespace:
+        def _operation(method: str):
+            return lambda **kwargs: self.clients.list(
+                self.subscription_id, f"{operation_group}.{method}", **kwargs
+            )
+
+        return SimpleNamespace(
+            **{method: _operation(method) for method in ("list", "list_all", "list_by_server")},
+            instance_view=lambda **kwargs: self.clients.get(
+                self.subscription_id, f"{operation_group}.instance_view", **kwargs
+            ),
+        )
+
+    async def get_batch(
+        self,
+        subscription_id: str,
+        resource_ids,
+        metric_namespace: str,
+        metric_names,
+        aggregation: str,
+        interval: str,
+        time_range_start,
+        time_range_end,
+    ) -> dict:
+        # The metrics client is pooled by region, rather than subscription.
+        self.clients.metric_batches.append(
+            {
+                "region": self.subscription_id,
+                "subscription_id": subscription_id,
+                "resource_ids": list(resource_ids),
+                "namespace": metric_namespace,
+                "metric_names": list(metric_names),
+                "aggregation": aggregation,
+                "interval": interval,
+            }
+        )
+        return {
+            "values": [
+                {
+                    "resourceid": resource_id,
+                    "value": [
+                        {
+                            "name": {"value": metric_name},
+                            "timeseries": [
+                                {
+                                    "data": [
+                                        {
+                                            "timeStamp": "2025-01-01T00:00:00Z",
+                                            aggregation.lower(): 1.0,
+                                        }
+                                    ]
+                                }
+                            ],
+                        }
+                        for metric_name in metric_names
+                    ],
+                }
+                for resource_id in resource_ids
+            ]
+        }
+
+    async def resources(
+        self, query: str, subscriptions=None, management_groups=None, skip_token=None
+    ) -> dict:
+        self.clients.resource_graph_requests.append(
+            {"query": query, "subscriptions": subscriptions, "skip_token": skip_token}
+        )
+        match = re.search(r"type =~ '([^']+)'", query)
+        assert match
+        pages = self.clients.resource_graph_pages.get(match.group(1), [[]])
+        page = int(skip_token or 0)
+        response: dict = {"data": pages[page]}
+        if page + 1 < len(pages):
+            response["$skipToken"] = str(page + 1)
+        return response
+
+
+@pytest.fixture
+def azure_clients(monkeypatch: pytest.MonkeyPatch) -> FakeAzureClients:
+    clients = FakeAzureClients()
+    monkeypatch.setattr(
+        AzureClientPool, "get_client", lambda self, *args: clients.get_client(*args)
+    )
+    return clients
+
+
+def arm_resource(subscription_id: str | None, resource_type: str, name: str, **extra: Any) -> dict:
+    """Return a resource in ARM's JSON format, as Resource Graph returns it."""
+    resource = {
+        "id": f"/subscriptions/{subscription_id}/resourceGroups/rg/providers/{resource_type}/{name}",
+        "name": name.split("/")[-1],
+        "type": resource_type.lower(),
+        "location": "eastus",
+        **extra,
+    }
+    if subscription_id:
+        resource["subscriptionId"] = subscription_id
+    return resource
+
+
+@pytest.fixture
+def metric_definitions(
+    monkeypatch: pytest.MonkeyPatch, azure_clients: FakeAzureClients
+) -> FakeAzureClients:
+    """Define the VM metrics, with a guest metric in its own namespace."""
+    monkeypatch.setattr(monitoring, "_metric_definitions", {})
+    for subscription_id in ("sub-1", "sub-2"):
+        azure_clients.results[(subscription_id, "metric_definitions.list")] = [
+            SimpleNamespace(name=SimpleNamespace(value=name), namespace=namespace)
+            for name, namespace in (
+                ("Percentage CPU", "Microsoft.Compute/virtualMachines"),
+                ("Network In Total", "Microsoft.Compute/virtualMachines"),
+                ("Available Memory Bytes", "azure.vm.linux.guestmetrics"),
+            )
+        ]
+    return azure_clients
+
+
+def make_vm(subscription_id: str, name: str, location: str | None = "eastus") -> AzureVmInstance:
+    raw_data = arm_resource(subscription_id, "Microsoft.Compute/virtualMachines", name)
+    raw_data["location"] = location
+    vm = AzureVmInstance(
+        node_id=raw_data["id"],
+        raw_data=raw_data,
+        _graph=Graph(),
+        azure_subscription=AzureSubscription(subscription_id=subscription_id),
+        credential=FakeCredential(),
+    )
+    vm._clients = AzureClientPool()
+    return vm
+
+
+def make_plugin(*subscription_ids: str, **settings: Any) -> AzurePlugin:
+    return AzurePlugin(
+        azure_settings=AzurePluginSettings(
+            subscriptions={
+                subscription_id: AzureSubscription(
+                    name=subscription_id, subscription_id=subscription_id
+                )
+                for subscription_id in subscription_ids
+            },
+            **settings,
+        )
+    )
+
+
+async def _send_with_retries(transport: FakeTransport, method: str) -> int:
+    client = AsyncPipelineClient(
+        "https://management.azure.com", policies=[ThrottlingRetryPolicy()], transport=transport
+    )
+    response = await client.send_request(HttpRequest(method, "https://management.azure.com/q"))
+    return response.status_code
+
+
+def test_client_pool_reuses_clients_for_each_credential_and_subscription() -> None:
+    pool = AzureClientPool()
+    credential, other_credential = FakeCredential(), FakeCredential()
+
+    async def _get_clients() -> list[FakeManagementClient]:
+        clients = [
+            pool.get_client(FakeManagementClient, credential, "sub-1"),
+            pool.get_client(FakeManagementClient, credential, "sub-1"),
+            pool.get_client(FakeManagementClient, credential, "sub-2"),
+            pool.get_client(FakeManagementClient, other_credential, "sub-1"),
+        ]
+        await pool.close()
+        return clients
+
+    clients = asyncio.run(_get_clients())
+    assert clients[0] is clients[1]
+    assert len({id(client) for client in clients}) == 3
+    assert [client.args for client in clients] == [("sub-1",), ("sub-1",), ("sub-2",), ("sub-1",)]
+    assert all(isinstance(client.retry_policy, ThrottlingRetryPolicy) for client in clients)
+
+    # Each event loop gets its own clients.
+    assert asyncio.run(_get_clients())[0] is not clients[0]
+
+
+@pytest.mark.asyncio
+async def test_client_pool_shares_one_session_and_closes_it_with_the_clients() -> None:
+    pool = AzureClientPool()
+    credential = FakeCredential()
+    first = pool.get_client(FakeManagementClient, credential, "sub-1")
+    second = pool.get_client(FakeManagementClient, credential, "sub-2")
+
+    assert isinstance(first.transport, AioHttpTransport)
+    session = pool.session()
+    assert first.transport.session is session
+    assert second.transport.session is session
+
+    # Closing a client doesn't close the shared session.
+    await first.close()
+    assert not session.closed
+
+    await pool.close()
+    assert second.closed
+    assert session.closed
+    # New clients are created, with a new session, after the pool is closed.
+    assert pool.get_client(FakeManagementClient, credential, "sub-2") is not second
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_client_pool_only_closes_the_clients_of_the_current_event_loop() -> None:
+    pool = AzureClientPool()
+    credential = FakeCredential()
+    other_loop_client = FakeManagementClient(credential, transport=None, retry_policy=None)
+    pool._clients[(object(), FakeManagementClient, id(credential), ())] = (  # type: ignore[index]
+        credential,
+        other_loop_client,
+    )
+    client = pool.get_client(FakeManagementClient, credential, "sub-1")
+
+    await pool.close()
+
+    assert client.closed
+    assert not other_loop_client.closed
+    assert len(pool._clients) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("headers", "expected_sleep"),
+    [
+        ({"Retry-After": "3"}, 3.0),
+        # Resource Graph's quota reset time is used when there's no Retry-After.
+        ({"x-ms-user-quota-resets-after": "00:01:02"}, 62.0),
+    ],
+)
+async def test_throttled_requests_are_retried_after_the_requested_delay(
+    headers: dict[str, str], expected_sleep: float
+) -> None:
+    transport = FakeTransport([(429, headers), (200, {})])
+
+    # POSTs aren't retried by default, but throttled ones are.
+    assert await _send_with_retries(transport, "POST") == 200
+    assert len(transport.requests) == 2
+    assert transport.slept == [expected_sleep]
+
+
+@pytest.mark.asyncio
+async def test_malformed_quota_reset_times_fall_back_to_backoff() -> None:
+    transport = FakeTransport([(429, {"x-ms-user-quota-resets-after": "soon"}), (200, {})])
+
+    assert await _send_with_retries(transport, "POST") == 200
+    # The first retry doesn't back off.
+    assert transport.slept == []
+
+
+@pytest.mark.asyncio
+async def test_populate_graph_from_resource_graph(azure_clients: FakeAzureClients) -> None:
+    azure_clients.resource_graph_pages = {
+        "Microsoft.Compute/virtualMachines": [
+            [arm_resource("sub-1", "Microsoft.Compute/virtualMachines", "vm-1")],
+            [
+                # A subscription that isn't configured
+                arm_resource("sub-2", "Microsoft.Compute/virtualMachines", "vm-2"),
+                arm_resource(None, "Microsoft.Compute/virtualMachines", "vm-3"),
+            ],
+        ],
+        "Microsoft.Sql/servers/databases": [
+            [
+                arm_resource("sub-1", "Microsoft.Sql/servers", "server-1/databases/master"),
+                arm_resource("sub-1", "Microsoft.Sql/servers", "server-1/databases/app"),
+            ]
+        ],
+        "Microsoft.Network/virtualNetworks": [
+            [
+                arm_resource(
+                    "sub-1",
+                    "Microsoft.Network/virtualNetworks",
+                    "vnet-1",
+                    properties={
+                        "subnets": [
+                            {
+                                "id": "/subscriptions/sub-1/resourceGroups/rg/providers/Microsoft.Network/virtualNetworks/vnet-1/subnets/default",
+                                "name": "default",
+                                "properties": {"addressPrefix": "10.0.0.0/24"},
+                            }
+                        ]
+                    },
+                )
+            ]
+        ],
+    }
+    plugin = make_plugin("sub-1", resource_graph=AzureResourceGraphSettings())
+    graph = Graph()
+
+    await plugin.populate_from_resource_graph(graph, FakeCredential())
+
+    nodes = {node.node_id.split("/")[-1]: node async for node in graph.iter_nodes()}
+    assert sorted(nodes) == ["app", "default", "vm-1", "vm-2", "vnet-1"]
+    # The types are deserialized in their canonical case.
+    assert nodes["vm-1"].raw_data["type"] == "Microsoft.Compute/virtualMachines"
+    assert nodes["vm-2"].azure_subscription.subscription_id == "sub-2"
+
+    # Each type is read one page at a time, from the configured subscriptions.
+    vm_requests = [
+        request
+        for request in azure_clients.resource_graph_requests
+        if "Microsoft.Compute/virtualMachines'" in request["query"]
+    ]
+    assert [request["skip_token"] for request in vm_requests] == [None, "1"]
+    assert vm_requests[0]["subscriptions"] == ["sub-1"]
+
+    # Resources that aren't indexed are listed from every subscription that was returned.
+    assert {
+        args
+        for name, args in azure_clients.calls
+        if name in ("PostgreSQLManagementClient", "MySQLManagementClient")
+    } == {("sub-1",), ("sub-2",)}
+    assert all(args != ("",) for _, args in azure_clients.calls)
+
+
+@pytest.mark.asyncio
+async def test_child_listings_are_bounded_for_each_subscription(
+    azure_clients: FakeAzureClients,
+) -> None:
+    azure_clients.delay = 0.01
+    for subscription_id in ("sub-1", "sub-2"):
+        azure_clients.results[(subscription_id, "servers.list")] = [
+            sql_models.Server.deserialize(
+                arm_resource(subscription_id, "Microsoft.Sql/servers", f"server-{i}")
+            )
+            for i in range(10)
+        ]
+        for i in range(10):
+            azure_clients.results[(subscription_id, f"databases.list_by_server/server-{i}")] = [
+                sql_models.Database.deserialize(
+                    arm_resource(
+                        subscription_id, "Microsoft.Sql/servers", f"server-{i}/databases/{name}"
+                    )
+                )
+                for name in ("master", "app")
+            ]
+    # One server's databases can't be listed, which doesn't stop the others.
+    azure_clients.results[("sub-2", "databases.list_by_server/server-3")] = HttpResponseError(
+        "Internal error"
+    )
+    plugin = make_plugin("sub-1", "sub-2", max_concurrent_child_requests=3)
+    graph = Graph()
+
+    await asyncio.gather(
+        *(
+            plugin.populate_sql_databases(graph, FakeCredential(), subscription)
+            for subscription in plugin.azure_settings.subscriptions.values()
+        )
+    )
+
+    databases = [node.node_id async for node in graph.iter_nodes()]
+    assert len(databases) == 19
+    assert not any(node_id.endswith("/master") for node_id in databases)
+    assert azure_clients.peak == {"sub-1": 3, "sub-2": 3}
+
+
+@pytest.mark.asyncio
+async def test_vm_scale_set_instances_are_listed_concurrently(
+    azure_clients: FakeAzureClients,
+) -> None:
+    azure_clients.delay = 0.01
+    azure_clients.results[("sub-1", "virtual_machine_scale_sets.list_all")] = [
+        compute_models.VirtualMachineScaleSet.deserialize(
+            arm_resource("sub-1", "Microsoft.Compute/virtualMachineScaleSets", f"vmss-{i}")
+        )
+        for i in range(4)
+    ]
+    for i in range(4):
+        azure_clients.results[("sub-1", f"virtual_machine_scale_set_vms.list/vmss-{i}")] = [
+            compute_models.VirtualMachineScaleSetVM.deserialize(
+                arm_resource(
+                    "sub-1",
+                    "Microsoft.Compute/virtualMachineScaleSets",
+                    f"vmss-{i}/virtualMachines/{instance}",
+                )
+            )
+            for instance in range(2)
+        ]
+    azure_clients.results[("sub-1", "virtual_machine_scale_set_vms.list/vmss-0")] = (
+        HttpResponseError("Internal error")
+    )
+    plugin = make_plugin("sub-1", max_concurrent_child_requests=2)
+    graph = Graph()
+
+    await plugin.populate_vm_scale_sets(graph, FakeCredential(), plugin.azure_settings.subscription)
+
+    node_types = [node.node_type async for node in graph.iter_nodes()]
+    assert node_types.count("azure_vm_scale_set") == 4
+    assert node_types.count("azure_vm_scale_set_instance") == 6
+    assert azure_clients.peak["sub-1"] == 2
+
+
+@pytest.mark.asyncio
+async def test_populate_graph_scans_every_subscription(
+    monkeypatch: pytest.MonkeyPatch, azure_clients: FakeAzureClients
+) -> None:
+    azure_clients.results[("", "subscriptions.list")] = [
+        SimpleNamespace(
+            subscription_id=subscription_id,
+            display_name=subscription_id,
+            state=state,
+            tenant_id="t",
+        )
+        for subscription_id, state in (
+            ("sub-1", "Enabled"),
+            ("sub-2", "Enabled"),
+            ("sub-3", "Enabled"),
+            ("sub-4", "Disabled"),
+        )
+    ]
+    for subscription_id in ("sub-1", "sub-2", "sub-3"):
+        azure_clients.results[(subscription_id, "virtual_machines.list_all")] = [
+            compute_models.VirtualMachine.deserialize(
+                arm_resource(subscription_id, "Microsoft.Compute/virtualMachines", "vm")
+            )
+        ]
+    plugin = make_plugin("sub-1", all_subscriptions=True, max_concurrent_subscriptions=2)
+    monkeypatch.setattr(plugin, "_get_credential", AsyncMock(return_value=FakeCredential()))
+
+    # One subscription fails, which doesn't stop the others.
+    populate_load_balancers = plugin.populate_load_balancers
+
+    async def _fail_in_sub_2(graph, credential, subscription) -> None:
+        if subscription.subscription_id == "sub-2":
+            raise RuntimeError("Unexpected error")
+        await populate_load_balancers(graph, credential, subscription)
+
+    monkeypatch.setattr(plugin, "populate_load_balancers", _fail_in_sub_2)
+    graph = Graph()
+
+    await plugin.populate_graph(graph)
+
+    vm_subscriptions = [
+        node.azure_subscription.subscription_id
+        async for node in graph.iter_nodes()
+        if node.node_type == "azure_vm_instance"
+    ]
+    assert sorted(vm_subscriptions) == ["sub-1", "sub-3"]
+    # The configured subscription is only scanned once, and disabled ones aren't scanned.
+    vm_listings = [
+        subscription_id
+        for subscription_id, operation in azure_clients.listed
+        if operation == "virtual_machines.list_all"
+    ]
+    assert vm_listings.count("sub-1") == 1
+    assert "sub-4" not in vm_listings
+
+
+@pytest.mark.asyncio
+async def test_realtime_vm_status_for_nodes_is_grouped_by_subscription(
+    monkeypatch: pytest.MonkeyPatch, azure_clients: FakeAzureClients
+) -> None:
+    monkeypatch.setattr(azure_plugin, "MAX_VM_INSTANCE_VIEWS_PER_SUBSCRIPTION", 2)
+    running = SimpleNamespace(
+        statuses=[SimpleNamespace(code="PowerState/running", display_status="VM running")]
+    )
+    graph = Graph()
+    vms = {
+        name: make_vm(subscription_id, name)
+        for subscription_id, names in (
+            ("sub-1", ["vm-1", "vm-2"]),
+            ("sub-2", ["vm-3", "vm-4", "vm-5"]),
+            ("sub-3", ["vm-6", "vm-7", "vm-8"]),
+        )
+        for name in names
+    }
+    for vm in vms.values():
+        await graph.add_node(vm)
+    # A few VMs are read one by one, and vm-2 doesn't exist.
+    azure_clients.results[("sub-1", "virtual_machines.instance_view/vm-1")] = running
+    # Many VMs are read by listing the subscription's VMs, and vm-5 doesn't exist.
+    azure_clients.results[("sub-2", "virtual_machines.list_all")] = [
+        SimpleNamespace(id=vms[name].resource_id, name=name, instance_view=running)
+        for name in ("vm-3", "vm-4")
+    ]
+    azure_clients.results[("sub-3", "virtual_machines.list_all")] = HttpResponseError("Forbidden")
+    plugin = make_plugin("sub-1")
+    plugin.context = SimpleNamespace(get_node=graph.get_node_safe)
+
+    statuses = await plugin.get_realtime_vm_status_for_nodes(
+        [vm.nid for vm in vms.values()] + ["missing"]
+    )
+
+    assert {name: statuses[vm.nid] for name, vm in vms.items()} == {
+        "vm-1": {
+            "vm_name": "vm-1",
+            "resource_group": "rg",
+            "power_state": "VM running",
+            "provisioning_state": "Unknown",
+            "statuses": [{"code": "PowerState/running", "display_status": "VM running"}],
+        },
+        "vm-2": f"No VM found with ID '{vms['vm-2'].resource_id.lower()}'",
+        "vm-3": statuses[vms["vm-1"].nid] | {"vm_name": "vm-3"},
+        "vm-4": statuses[vms["vm-1"].nid] | {"vm_name": "vm-4"},
+        "vm-5": f"No VM found with ID '{vms['vm-5'].resource_id.lower()}'",
+        "vm-6": "Error retrieving VM status: Forbidden",
+        "vm-7": "Error retrieving VM status: Forbidden",
+        "vm-8": "Error retrieving VM status: Forbidden",
+    }
+    assert statuses["missing"] == "Resource with node ID 'missing' not found"
+    assert sorted(azure_clients.listed) == [
+        ("sub-1", "virtual_machines.instance_view/vm-1"),
+        ("sub-1", "virtual_machines.instance_view/vm-2"),
+        ("sub-2", "virtual_machines.list_all"),
+        ("sub-3", "virtual_machines.list_all"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_azure_monitor_metrics_are_batched(metric_definitions: FakeAzureClients) -> None:
+    start, end = datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 1, 1, 1, tzinfo=UTC)
+    cpu = AzureMonitorQuery(metric_name="Percentage CPU")
+    node_queries = [
+        *((make_vm("sub-1", f"east-{i}"), [cpu]) for i in range(60)),
+        (make_vm("sub-1", "west", location="westus"), [cpu]),
+        (make_vm("sub-2", "other-subscription"), [cpu]),
+        (
+            make_vm("sub-1", "maximum"),
+            [AzureMonitorQuery(metric_name="Percentage CPU", aggregation="Maximum")],
+        ),
+        (
+            make_vm("sub-1", "many-metrics"),
+            [
+                cpu,
+                AzureMonitorQuery(metric_name="Available Memory Bytes"),
+                AzureMonitorQuery(metric_name="Undefined Metric"),
+            ],
+        ),
+    ]
+
+    observations = await get_azure_monitor_metrics(node_queries, start, end)
+
+    # The sizes of the batches for each subscription, region, namespace, aggregation and metrics.
+    batches: defaultdict[tuple, list[int]] = defaultdict(list)
+    for batch in metric_definitions.metric_batches:
+        key = (
+            batch["subscription_id"],
+            batch["region"],
+            batch["namespace"],
+            batch["aggregation"],
+            *batch["metric_names"],
+        )
+        batches[key].append(len(batch["resource_ids"]))
+    vm_namespace = "Microsoft.Compute/virtualMachines"
+    guest_namespace = "azure.vm.linux.guestmetrics"
+    assert {key: sorted(sizes) for key, sizes in batches.items()} == {
+        ("sub-1", "eastus", vm_namespace, "Average", "Percentage CPU"): [1, 10, 50],
+        ("sub-1", "eastus", vm_namespace, "Maximum", "Percentage CPU"): [1],
+        ("sub-1", "westus", vm_namespace, "Average", "Percentage CPU"): [1],
+        ("sub-2", "eastus", vm_namespace, "Average", "Percentage CPU"): [1],
+        # Metrics in other namespaces are requested separately, and undefined metrics are skipped.
+        ("sub-1", "eastus", guest_namespace, "Average", "Available Memory Bytes"): [1],
+    }
+    assert len(observations) == 65
+    # The definitions are only read once for the resource type.
+    assert metric_definitions.listed.count(("sub-1", "metric_definitions.list")) == 1
+
+
+@pytest.mark.asyncio
+async def test_azure_monitor_metrics_without_a_location_are_queried_for_each_node(
+    monkeypatch: pytest.MonkeyPatch, metric_definitions: FakeAzureClients
+) -> None:
+    get_metrics = AsyncMock(return_value=[])
+    monkeypatch.setattr(AzureVmInstance, "_get_azure_monitor_metrics", get_metrics)
+    start, end = datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 1, 1, 1, tzinfo=UTC)
+
+    await get_azure_monitor_metrics(
+        [
+            (
+                make_vm("sub-1", "nowhere", location=None),
+                [AzureMonitorQuery(metric_name="Percentage CPU")],
+            )
+        ],
+        start,
+        end,
+    )
+
+    assert metric_definitions.metric_batches == []
+    get_metrics.assert_awaited_once_with(
+        metric_names=["Percentage CPU"],
+        aggregation="Average",
+        start_time=start,
+        end_time=end,
+        interval="PT5M",
+    )
+
+
+@pytest.mark.asyncio
+async def test_azure_monitor_metric_definitions_are_read_once(
+    metric_definitions: FakeAzureClients,
+) -> None:
+    metric_definitions.delay = 0.01
+
+    results = await asyncio.gather(
+        *(monitoring.get_metric_definitions(make_vm("sub-1", f"vm-{i}")) for i in range(5))
+    )
+
+    assert all(result and "Percentage CPU" in result for result in results)
+    assert metric_definitions.listed.count(("sub-1", "metric_definitions.list")) == 1
+
+
+@pytest.mark.asyncio
+async def test_undefined_azure_monitor_metrics_explain_what_is_available(
+    metric_definitions: FakeAzureClients,
+) -> None:
+    start, end = datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 1, 1, 1, tzinfo=UTC)
+
+    result = await make_vm("sub-1", "vm").get_metric("Undefined Metric", start, end)
+
+    assert result == (
+        "Metrics not available for Microsoft.Compute/virtualMachines: Undefined Metric. "
+        "Available metrics: Available Memory Bytes, Network In Total, Percentage CPU"
+    )
+    assert metric_definitions.metric_batches == []
+
+
+RESOURCE_GROUP_ID = "/subscriptions/sub-1/resourceGroups/rg-1"
+
+
+@pytest.mark.parametrize(
+    ("node_class", "resource_id"),
+    [
+        (AzureVmInstance, f"{RESOURCE_GROUP_ID}/providers/Microsoft.Compute/virtualMachines/vm-1"),
+        (
+            AzureVmInstance,
+            f"{RESOURCE_GROUP_ID}/providers/Microsoft.Compute/virtualMachineScaleSets/vmss-1"
+            "/virtualMachines/0",
+        ),
+        (
+            AzureVmInstance,
+            f"{RESOURCE_GROUP_ID}/providers/Microsoft.Network/virtualNetworks/vnet-1/subnets/default",
+        ),
+        (
+            AzureVmInstance,
+            "/SUBSCRIPTIONS/sub-1/RESOURCEGROUPS/rg-1/PROVIDERS/Microsoft.Web/sites/app-1",
+        ),
+        (AzureVmInstance, RESOURCE_GROUP_ID),
+        (AzureVmInstance, "/subscriptions/sub-1"),
+        (AzureVmInstance, "not-a-resource-id"),
+        (AzureVmInstance, ""),
+        (
+            AzureSqlDatabase,
+            f"{RESOURCE_GROUP_ID}/providers/Microsoft.Sql/servers/sql-1/databases/db-1",
+        ),
+        (
+            AzurePostgreSqlDatabase,
+            f"{RESOURCE_GROUP_ID}/providers/Microsoft.DBforPostgreSQL/servers/pg-1/databases/db-1",
+        ),
+        (
+            AzureMySqlDatabase,
+            f"{RESOURCE_GROUP_ID}/providers/Microsoft.DBforMySQL/servers/mysql-1/databases/db-1",
+        ),
+        (AzureSqlDatabase, "/providers/Microsoft.Sql/servers/sql-1/databases/db-1"),
+    ],
+)
+def test_resource_id_parts_match_parse_resource_id(
+    node_class: type[AzureNode], resource_id: str
+) -> None:
+    node = node_class(
+        node_id=resource_id or "empty",
+        raw_data={"id": resource_id} if resource_id else {},
+        _graph=Graph(),
+        azure_subscription=AzureSubscription(subscription_id="configured-sub"),
+    )
+    parsed = parse_resource_id(resource_id)
+
+    assert node.parsed_resource_id == parsed
+    assert node.parsed_resource_id is node.parsed_resource_id
+    assert node.resource_group == (parsed.resource_group or "")
+    assert node.subscription_id == (parsed.subscription_id or "configured-sub")
+    assert node.provider == (parsed.provider or "")
+    assert node.resource_type == (parsed.resource_type or "")
+    if isinstance(node, AzureSqlDatabase | AzurePostgreSqlDatabase | AzureMySqlDatabase):
+        assert node.server_name == (parsed.parent_resource or "")
+        if parsed.subscription_id and parsed.resource_group and parsed.parent_resource:
+            assert node.server_id == (
+                f"/subscriptions/{parsed.subscription_id}/resourceGroups/{parsed.resource_group}"
+                f"/providers/{parsed.provider}/servers/{parsed.parent_resource}"
+            )
+        else:
+            assert node.server_id == ""
+
+
+@pytest.mark.parametrize(
+    ("node_class", "resource_id", "server_name", "server_id"),
+    [
+        (
+            AzureSqlDatabase,
+            f"{RESOURCE_GROUP_ID}/providers/Microsoft.Sql/servers/sql-1/databases/db-1",
+            "sql-1",
+            f"{RESOURCE_GROUP_ID}/providers/Microsoft.Sql/servers/sql-1",
+        ),
+        (
+            AzurePostgreSqlDatabase,
+            f"{RESOURCE_GROUP_ID}/providers/Microsoft.DBforPostgreSQL/servers/pg-1/databases/db-1",
+            "pg-1",
+            f"{RESOURCE_GROUP_ID}/providers/Microsoft.DBforPostgreSQL/servers/pg-1",
+        ),
+        (
+            AzureMySqlDatabase,
+            f"{RESOURCE_GROUP_ID}/providers/Microsoft.DBforMySQL/servers/mysql-1/databases/db-1",
+            "mysql-1",
+            f"{RESOURCE_GROUP_ID}/providers/Microsoft.DBforMySQL/servers/mysql-1",
+        ),
+    ],
+)
+def test_database_nodes_read_their_server_from_the_resource_id(
+    node_class: type[AzureSqlDatabase | AzurePostgreSqlDatabase | AzureMySqlDatabase],
+    resource_id: str,
+    server_name: str,
+    server_id: str,
+) -> None:
+    node = node_class(
+        node_id=resource_id,
+        raw_data={"id": resource_id},
+        _graph=Graph(),
+        azure_subscription=AzureSubscription(subscription_id="sub-1"),
+    )
+
+    assert node.resource_group == "rg-1"
+    assert node.subscription_id == "sub-1"
+    assert node.resource_type == "servers/databases"
+    assert node.server_name == server_name
+    assert node.server_id == server_id
@@ -0,0 +1,168 @@
+import asyncio
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from typing import Any
+
+import kr8s.asyncio
+import pytest
+
+from unpage.knowledge import Graph
+from unpage.plugins.kubernetes.plugin import (
+    KubernetesContext,
+    KubernetesPlugin,
+    KubernetesPluginSettings,
+)
+
+KINDS = [
+    "namespaces",
+    "pods",
+    "services",
+    "deployments",
+    "replicasets",
+    "statefulsets",
+    "jobs",
+    "cronjobs",
+    "nodes",
+]
+
+
+class FakeResource:
+    """A stand-in for a kr8s API object."""
+
+    def __init__(self, name: str) -> None:
+        self.metadata = SimpleNamespace(name=name)
+
+    def to_dict(self) -> dict:
+        return {"metadata": {"name": self.metadata.name}}
+
+
+class FakeCluster:
+    """A cluster whose connection or lists can hang or fail."""
+
+    def __init__(
+        self,
+        *,
+        hangs_on_connect: bool = False,
+        hanging_kinds: set[str] | None = None,
+        failing_kinds: set[str] | None = None,
+    ) -> None:
+        self.hangs_on_connect = hangs_on_connect
+        self.hanging_kinds = hanging_kinds or set()
+        self.failing_kinds = failing_kinds or set()
+
+
+class FakeApi:
+    """A stand-in for a kr8s API client, connected to a fake cluster."""
+
+    def __init__(self, clusters: "FakeClusters", cluster: FakeCluster) -> None:
+        self.clusters = clusters
+        self.cluster = cluster
+
+    async def version(self) -> dict:
+        if self.cluster.hangs_on_connect:
+            await asyncio.sleep(100)
+        return {}
+
+    async def get(self, kind: str) -> AsyncIterator[FakeResource]:
+        self.clusters.active += 1
+        self.clusters.peak = max(self.clusters.peak, self.clusters.active)
+        try:
+            if kind in self.cluster.hanging_kinds:
+                await asyncio.sleep(100)
+            if kind in self.cluster.failing_kinds:
+                raise RuntimeError(f"the server could not find the requested resource ({kind})")
+            await asyncio.sleep(0.01)
+        finally:
+            self.clusters.active -= 1
+        yield FakeResource(f"{kind}-1")
+
+
+class FakeClusters:
+    """The fake clusters that kr8s connects to, keyed by context name."""
+
+    def __init__(self) -> None:
+        self.clusters: dict[str | None, FakeCluster] = {}
+        self.active = 0
+        self.peak = 0
+
+    async def api(self, context: str | None = None, **kwargs: Any) -> FakeApi:
+        return FakeApi(self, self.clusters[context])
+
+
+@pytest.fixture
+def clusters(monkeypatch: pytest.MonkeyPatch) -> FakeClusters:
+    clusters = FakeClusters()
+    monkeypatch.setattr(kr8s.asyncio, "api", clusters.api)
+    return clusters
+
+
+def make_plugin(*contexts: str, **settings: Any) -> KubernetesPlugin:
+    return KubernetesPlugin(
+        kubernetes_settings=KubernetesPluginSettings(
+            contexts=[KubernetesContext(name=context) for context in contexts],
+            **settings,
+        )
+    )
+
+
+async def populate(plugin: KubernetesPlugin) -> set[str]:
+    graph = Graph()
+    await plugin.populate_graph(graph)
+    return {node.node_id async for node in graph.iter_nodes()}
+
+
+def node_ids(context: str, kinds: list[str]) -> set[str]:
+    return {f"{context}:{kind}-1" for kind in kinds}
+
+
+@pytest.mark.asyncio
+async def test_unreachable_contexts_are_skipped(clusters: FakeClusters) -> None:
+    clusters.clusters["up"] = FakeCluster()
+    clusters.clusters["down"] = FakeCluster(hangs_on_connect=True)
+    plugin = make_plugin("up", "down", connect_timeout_seconds=0.1)
+
+    assert await asyncio.wait_for(populate(plugin), timeout=5) == node_ids("up", KINDS)
+
+
+@pytest.mark.asyncio
+async def test_slow_contexts_keep_what_they_already_listed(clusters: FakeClusters) -> None:
+    clusters.clusters["fast"] = FakeCluster()
+    clusters.clusters["slow"] = FakeCluster(hanging_kinds={"pods", "jobs"})
+    plugin = make_plugin("fast", "slow", context_timeout_seconds=0.2)
+
+    assert await asyncio.wait_for(populate(plugin), timeout=5) == node_ids(
+        "fast", KINDS
+    ) | node_ids("slow", [kind for kind in KINDS if kind not in {"pods", "jobs"}])
+
+
+@pytest.mark.asyncio
+async def test_kinds_that_fail_to_list_are_skipped(clusters: FakeClusters) -> None:
+    clusters.clusters["prod"] = FakeCluster(failing_kinds={"cronjobs"})
+
+    assert await populate(make_plugin("prod")) == node_ids(
+        "prod", [kind for kind in KINDS if kind != "cronjobs"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_contexts_are_populated_concurrently_up_to_the_limit(
+    clusters: FakeClusters,
+) -> None:
+    contexts = [f"cluster-{i}" for i in range(5)]
+    for context in contexts:
+        clusters.clusters[context] = FakeCluster()
+
+    nodes = await populate(make_plugin(*contexts, max_concurrent_contexts=2))
+
+    assert nodes == set().union(*(node_ids(context, KINDS) for context in contexts))
+    # Every kind of two clusters is listed at once, but no more.
+    assert clusters.peak == 2 * len(KINDS)
+
+
+@pytest.mark.asyncio
+async def test_current_context_is_used_without_configured_contexts(
+    clusters: FakeClusters,
+) -> None:
+    clusters.clusters[None] = FakeCluster()
+
+    assert await populate(make_plugin()) == {f"{kind}-1" for kind in KINDS}
@@ -1,11 +1,18 @@
 """Basic tests for the GCP plugin."""
 
-from unittest.mock import MagicMock
+import threading
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
 
+import aiohttp
+import anyio
 import pytest
 
 from unpage.knowledge import Graph
 from unpage.plugins.gcp import GcpPlugin, GcpPluginSettings
+from unpage.plugins.gcp.plugin import GcpAssetInventorySettings
+from unpage.plugins.gcp.clients import GcpClientPool, GcpCredentialProvider
+from unpage.plugins.gcp.logs import CloudLoggingCursor, iter_cloud_logging_entries
 from unpage.plugins.gcp.nodes.base import GcpProject
 from unpage.plugins.gcp.nodes.gcp_cloud_function import GcpCloudFunction
 from unpage.plugins.gcp.nodes.gcp_cloud_run import GcpCloudRunService
@@ -60,6 +67,524 @@ class TestGcpPlugin:
         assert "test-project" in plugin.gcp_settings.projects
         assert plugin.gcp_settings.projects["test-project"].project_id == "test-project-123"
 
+    @pytest.mark.parametrize("projects", [None, {"test": {"project_id": "test-project-123"}}])
+    def test_init_plugin_keeps_settings_with_or_without_projects(self, projects) -> None:
+        """Test that the plugin's other settings are read whether or not projects are configured."""
+        plugin = GcpPlugin(
+            projects=projects,
+            max_concurrent_projects=2,
+            fetch_storage_bucket_details=True,
+            asset_inventory={"scope": "organizations/123"},
+        )
+        plugin.init_plugin()
+
+        assert plugin.gcp_settings.max_concurrent_projects == 2
+        assert plugin.gcp_settings.fetch_storage_bucket_details is True
+        assert plugin.gcp_settings.asset_inventory is not None
+        if projects:
+            assert plugin.gcp_settings.projects["test"].project_id == "test-project-123"
+        else:
+            assert list(plugin.gcp_settings.projects) == ["default"]
+
+    @pytest.mark.asyncio
+    async def test_compute_instances_use_aggregated_list(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that instances from every zone are listed with one aggregated call."""
+        requested_urls = []
+
+        async def fake_paginate_gcp_api_pages(
+            clients: GcpClientPool, url: str, *args: object, **kwargs: object
+        ):
+            requested_urls.append(url)
+            yield {
+                "items": {
+                    "zones/us-central1-a": {"instances": [{"id": "1", "name": "a"}]},
+                    "zones/us-central1-b": {"instances": [{"id": "2", "name": "b"}]},
+                    "zones/europe-west1-b": {"instances": [{"id": "3", "name": "c"}]},
+                    "zones/asia-east1-a": {"warning": {"code": "NO_RESULTS_ON_PAGE"}},
+                },
+                "nextPageToken": "next",
+            }
+            yield {"items": {"zones/us-central1-c": {"instances": [{"id": "4", "name": "d"}]}}}
+
+        monkeypatch.setattr(
+            "unpage.plugins.gcp.utils.paginate_gcp_api_pages", fake_paginate_gcp_api_pages
+        )
+        project = GcpProject(name="test", project_id="test-123", regions=["us-central1"])
+        project._credentials = MagicMock()
+        plugin = GcpPlugin(gcp_settings=GcpPluginSettings(projects={"test": project}))
+        graph = Graph()
+
+        await plugin.populate_compute_instances(graph, project)
+
+        assert {node.node_id async for node in graph.iter_nodes()} == {
+            "gcp:compute:instance:1",
+            "gcp:compute:instance:2",
+            "gcp:compute:instance:4",
+        }
+        assert requested_urls == [
+            "https://compute.googleapis.com/compute/v1/projects/test-123/aggregated/instances"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_populate_graph_from_asset_inventory(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that every resource type is read from one Cloud Asset Inventory stream."""
+        requested_urls = []
+
+        async def fake_paginate_gcp_api_pages(
+            clients: GcpClientPool, url: str, *args: object, **kwargs: object
+        ):
+            requested_urls.append(url)
+            yield {
+                "assets": [
+                    {
+                        "name": "//compute.googleapis.com/projects/prod-123/zones/us-central1-a/instances/web",
+                        "assetType": "compute.googleapis.com/Instance",
+                        "resource": {
+                            "location": "us-central1-a",
+                            "data": {"id": "111", "name": "web", "zone": "zones/us-central1-a"},
+                        },
+                    },
+                    {
+                        "name": "//storage.googleapis.com/logs-bucket",
+                        "assetType": "storage.googleapis.com/Bucket",
+                        "resource": {
+                            "parent": "//cloudresourcemanager.googleapis.com/projects/987654321",
+                            "location": "us",
+                            "data": {"id": "logs-bucket", "name": "logs-bucket"},
+                        },
+                    },
+                ],
+                "nextPageToken": "next",
+            }
+            yield {
+                "assets": [
+                    {
+                        "name": "//container.googleapis.com/projects/prod-123/locations/us-central1/clusters/main",
+                        "assetType": "container.googleapis.com/Cluster",
+                        "resource": {
+                            "location": "us-central1",
+                            "data": {"name": "main", "nodePools": [{"name": "default-pool"}]},
+                        },
+                    },
+                ]
+            }
+
+        monkeypatch.setattr(
+            "unpage.plugins.gcp.inventory.paginate_gcp_api_pages", fake_paginate_gcp_api_pages
+        )
+        monkeypatch.setattr(
+            "unpage.plugins.gcp.plugin.ensure_gcp_credentials", AsyncMock(return_value=True)
+        )
+        project = GcpProject(name="prod", project_id="prod-123")
+        project._credentials = MagicMock()
+        plugin = GcpPlugin(
+            gcp_settings=GcpPluginSettings(
+                projects={"prod": project},
+                asset_inventory=GcpAssetInventorySettings(scope="organizations/42"),
+            )
+        )
+        graph = Graph()
+
+        await plugin.populate_graph(graph)
+
+        nodes = {node.node_id: node async for node in graph.iter_nodes()}
+        assert set(nodes) == {
+            "gcp:compute:instance:111",
+            "gcp:storage:bucket:logs-bucket",
+            "gcp:gke:cluster:prod-123:main",
+            "gcp:gke:nodepool:prod-123:main:default-pool",
+        }
+        assert nodes["gcp:compute:instance:111"].gcp_project is project
+        assert nodes["gcp:storage:bucket:logs-bucket"].gcp_project.project_id == "987654321"
+        assert len(requested_urls) == 1
+        assert requested_urls[0].startswith(
+            "https://cloudasset.googleapis.com/v1/organizations/42/assets?contentType=RESOURCE"
+        )
+
+    @pytest.mark.asyncio
+    async def test_asset_inventory_keeps_global_and_multi_region_resources(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the region filter only skips regional and zonal resources in other regions."""
+
+        def asset(asset_type: str, name: str, location: str) -> dict:
+            return {
+                "name": f"//{asset_type.split('/')[0]}/projects/prod-123/{name}",
+                "assetType": asset_type,
+                "resource": {"location": location, "data": {"id": name, "name": name}},
+            }
+
+        async def fake_paginate_gcp_api_pages(
+            clients: GcpClientPool, url: str, *args: object, **kwargs: object
+        ):
+            yield {
+                "assets": [
+                    asset("compute.googleapis.com/Instance", "zonal", "us-central1-a"),
+                    asset("compute.googleapis.com/Instance", "other-zone", "europe-west1-b"),
+                    asset("compute.googleapis.com/BackendService", "regional", "us-central1"),
+                    asset("compute.googleapis.com/BackendService", "other-region", "europe-west1"),
+                    asset("compute.googleapis.com/UrlMap", "global", "global"),
+                    asset("storage.googleapis.com/Bucket", "multi-region", "US"),
+                    asset("storage.googleapis.com/Bucket", "dual-region", "NAM4"),
+                    asset("storage.googleapis.com/Bucket", "regional-bucket", "US-CENTRAL1"),
+                    asset("storage.googleapis.com/Bucket", "other-bucket", "EUROPE-WEST1"),
+                ]
+            }
+
+        monkeypatch.setattr(
+            "unpage.plugins.gcp.inventory.paginate_gcp_api_pages", fake_paginate_gcp_api_pages
+        )
+        monkeypatch.setattr(
+            "unpage.plugins.gcp.plugin.ensure_gcp_credentials", AsyncMock(return_value=True)
+        )
+        project = GcpProject(name="prod", project_id="prod-123", regions=["us-central1"])
+        project._credentials = MagicMock()
+        plugin = GcpPlugin(
+            gcp_settings=GcpPluginSettings(
+                projects={"prod": project},
+                asset_inventory=GcpAssetInventorySettings(scope="projects/prod-123"),
+            )
+        )
+        graph = Graph()
+
+        await plugin.populate_graph(graph)
+
+        assert {node.raw_data["name"] async for node in graph.iter_nodes()} == {
+            "zonal",
+            "regional",
+            "global",
+            "multi-region",
+            "dual-region",
+            "regional-bucket",
+        }
+
+    @pytest.mark.parametrize("fetch_details", [True, False])
+    @pytest.mark.asyncio
+    async def test_storage_bucket_details(
+        self, monkeypatch: pytest.MonkeyPatch, fetch_details: bool
+    ) -> None:
+        """Test that bucket IAM policies are fetched while building, or when first needed."""
+        requests = []
+
+        async def fake_request(method: str, url: str, *args: object, **kwargs: object) -> dict:
+            requests.append(url)
+            if url.endswith("/iam"):
+                return {"bindings": [{"role": "roles/storage.objectViewer"}]}
+            return {"items": [{"id": f"bucket-{i}", "name": f"bucket-{i}"} for i in range(3)]}
+
+        project = GcpProject(name="test", project_id="test-123")
+        project._credentials = MagicMock()
+        plugin = GcpPlugin(
+            gcp_settings=GcpPluginSettings(
+                projects={"test": project}, fetch_storage_bucket_details=fetch_details
+            )
+        )
+        monkeypatch.setattr(plugin.clients, "request", fake_request)
+        graph = Graph()
+
+        await plugin.populate_storage_buckets(graph, project)
+
+        assert "projection=full" in requests[0]
+        assert len(requests) == (4 if fetch_details else 1)
+        bucket = await graph.get_node("gcp:gcp_storage_bucket:gcp:storage:bucket:bucket-0")
+        plugin.bind_node(bucket)
+        details = await bucket.get_details()
+        assert details["iamPolicy"]["bindings"][0]["role"] == "roles/storage.objectViewer"
+        # The IAM policy is only fetched once.
+        await bucket.get_details()
+        assert len(requests) == (4 if fetch_details else 2)
+
+    @pytest.mark.asyncio
+    async def test_storage_bucket_listing_errors_are_swallowed(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a 403 while listing buckets skips the rest of them, rather than failing the build."""
+
+        async def fake_request(method: str, url: str, *args: object, **kwargs: object) -> dict:
+            if "pageToken" in str(kwargs.get("params")):
+                raise aiohttp.ClientResponseError(MagicMock(), (), status=403, message="Forbidden")
+            return {"items": [{"id": "bucket-0", "name": "bucket-0"}], "nextPageToken": "2"}
+
+        project = GcpProject(name="test", project_id="test-123")
+        project._credentials = MagicMock()
+        plugin = GcpPlugin(gcp_settings=GcpPluginSettings(projects={"test": project}))
+        monkeypatch.setattr(plugin.clients, "request", fake_request)
+        graph = Graph()
+
+        await plugin.populate_storage_buckets(graph, project)
+
+        assert await graph.get_node("gcp:gcp_storage_bucket:gcp:storage:bucket:bucket-0")
+
+    @pytest.mark.asyncio
+    async def test_cloud_monitoring_metrics_for_nodes(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a metric is retrieved for many nodes with one aligned, paginated query."""
+        requests = []
+
+        async def fake_request(
+            method: str, url: str, *args: object, params: dict | None = None, **kwargs: object
+        ) -> dict:
+            requests.append((url, dict(params or {})))
+            if "/metricDescriptors/" in url:
+                return {"metricKind": "CUMULATIVE", "valueType": "INT64"}
+            if (params or {}).get("pageToken") is None:
+                series = [("1", 10)]
+                page = {"nextPageToken": "next"}
+            else:
+                series = [("2", 20)]
+                page = {}
+            page["timeSeries"] = [
+                {
+                    "resource": {
+                        "labels": {
+                            "instance_id": instance_id,
+                            "zone": "us-central1-a",
+                            "project_id": "test-123",
+                        }
+                    },
+                    "points": [
+                        {
+                            "interval": {"endTime": "2025-01-01T00:05:00Z"},
+                            "value": {"doubleValue": value},
+                        }
+                    ],
+                }
+                for instance_id, value in series
+            ]
+            return page
+
+        project = GcpProject(name="test", project_id="test-123")
+        project._credentials = MagicMock()
+        plugin = GcpPlugin(gcp_settings=GcpPluginSettings(projects={"test": project}))
+        monkeypatch.setattr(plugin.clients, "request", fake_request)
+        plugin.context = MagicMock()
+        graph = Graph()
+        for instance_id in ("1", "2"):
+            await graph.add_node(
+                GcpComputeInstance(
+                    node_id=f"gcp:compute:instance:{instance_id}",
+                    raw_data={
+                        "id": instance_id,
+                        "zone": "https://www.googleapis.com/compute/v1/projects/test-123/zones/us-central1-a",
+                    },
+                    _graph=graph,
+                    gcp_project=project,
+                )
+            )
+        plugin.context.get_node = graph.get_node_safe
+        nids = [node.nid async for node in graph.iter_nodes()]
+        end = datetime(2025, 1, 8, tzinfo=UTC)
+
+        observations = await plugin.get_cloud_monitoring_metrics_for_nodes(
+            nids,
+            end - timedelta(days=7),
+            end,
+            metric_names=["compute.googleapis.com/instance/network/sent_bytes_count"],
+        )
+
+        assert not isinstance(observations, str)
+        assert {o.node_id: list(o.data.values()) for o in observations} == {
+            nids[0]: [10.0],
+            nids[1]: [20.0],
+        }
+        time_series_requests = [params for url, params in requests if url.endswith("/timeSeries")]
+        assert len(time_series_requests) == 2
+        params = time_series_requests[0]
+        assert 'resource.labels.instance_id=one_of("1", "2")' in params["filter"]
+        assert params["aggregation.perSeriesAligner"] == "ALIGN_RATE"
+        assert params["aggregation.crossSeriesReducer"] == "REDUCE_SUM"
+        # A week at no more than 1,440 points per series is a point every 7 minutes.
+        assert params["aggregation.alignmentPeriod"] == "420s"
+
+    @pytest.mark.asyncio
+    async def test_unavailable_metrics_are_skipped(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the metrics that are available are returned, even if some aren't."""
+        retrieved = []
+
+        async def fake_get_cloud_monitoring_metrics(clients, node_queries, start, end) -> list:
+            retrieved.extend(query.metric_type for _, queries in node_queries for query in queries)
+            return []
+
+        monkeypatch.setattr(
+            "unpage.plugins.gcp.nodes.base.get_cloud_monitoring_metrics",
+            fake_get_cloud_monitoring_metrics,
+        )
+        project = GcpProject(name="test", project_id="test-123")
+        disk = GcpPersistentDisk(
+            node_id="gcp:compute:disk:1",
+            raw_data={"id": "1", "name": "disk-1"},
+            _graph=Graph(),
+            gcp_project=project,
+        )
+        disk._clients = GcpClientPool()
+        end = datetime(2025, 1, 8, tzinfo=UTC)
+
+        # The disk isn't attached to an instance, so none of its metrics are available.
+        result = await disk.get_metrics(end - timedelta(hours=1), end, ["disk/read_bytes_count"])
+        assert result == "Disk is not attached to any instance, metrics not available"
+        assert retrieved == []
+
+        disk.raw_data["users"] = ["projects/test-123/zones/us-central1-a/instances/vm-1"]
+        original = GcpPersistentDisk.get_cloud_monitoring_query
+        monkeypatch.setattr(
+            GcpPersistentDisk,
+            "get_cloud_monitoring_query",
+            lambda self, metric_name: (
+                "Unknown metric" if metric_name == "unknown" else original(self, metric_name)
+            ),
+        )
+        result = await disk.get_metrics(
+            end - timedelta(hours=1), end, ["unknown", "disk/read_bytes_count"]
+        )
+        assert result == []
+        assert len(retrieved) == 1
+
+    @pytest.mark.asyncio
+    async def test_cloud_logging_reads_are_paginated_and_resumable(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that log entries are streamed across pages, and reads resume from a cursor."""
+        bodies = []
+
+        async def fake_request(
+            method: str, url: str, *args: object, json_data: dict, **kwargs: object
+        ) -> dict:
+            bodies.append(json_data)
+            if json_data.get("pageToken") is None:
+                return {
+                    "entries": [
+                        {"timestamp": f"2025-01-01T00:0{i}:00.123456789Z", "textPayload": f"a{i}"}
+                        for i in (5, 4, 3)
+                    ],
+                    "nextPageToken": "page-2",
+                }
+            return {
+                "entries": [
+                    {"timestamp": f"2025-01-01T00:0{i}:00Z", "jsonPayload": {"n": i}}
+                    for i in (2, 1)
+                ]
+            }
+
+        clients = GcpClientPool()
+        monkeypatch.setattr(clients, "request", fake_request)
+        project = GcpProject(name="test", project_id="test-123")
+        project._credentials = MagicMock()
+        node = GcpCloudRunService(
+            node_id="gcp:run:service:api",
+            raw_data={"metadata": {"name": "api"}},
+            _graph=MagicMock(spec=Graph),
+            gcp_project=project,
+        )
+        node._clients = clients
+        end = datetime(2025, 1, 1, 1, tzinfo=UTC)
+
+        cursor = CloudLoggingCursor()
+        first = [
+            line.log
+            async for line in iter_cloud_logging_entries(
+                clients, project.credentials, "test-123", "filter", max_lines=2, cursor=cursor
+            )
+        ]
+        assert first == ["[DEFAULT] a5", "[DEFAULT] a4"]
+        assert not cursor.done
+        assert bodies[0]["pageSize"] == 2
+
+        cursor = CloudLoggingCursor.decode(cursor.encode())
+        rest = [
+            line.log
+            async for line in iter_cloud_logging_entries(
+                clients, project.credentials, "test-123", "filter", cursor=cursor
+            )
+        ]
+        assert rest == ["[DEFAULT] a3", "[DEFAULT] {'n': 2}", "[DEFAULT] {'n': 1}"]
+        assert cursor.done
+
+        bodies.clear()
+        logs = [
+            line
+            async for line in node.iter_logs(end - timedelta(hours=1), end, min_severity="ERROR")
+        ]
+        assert len(logs) == 5
+        assert len(bodies) == 2
+        assert 'resource.labels.service_name="api"' in bodies[0]["filter"]
+        assert "severity>=ERROR" in bodies[0]["filter"]
+
+    @pytest.mark.asyncio
+    async def test_cloud_logging_reads_always_move_on(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that an entry larger than the byte budget is truncated, rather than read forever."""
+        clients = GcpClientPool()
+        entries = [
+            {"timestamp": "2025-01-01T00:03:00Z", "textPayload": "x" * 100},
+            {"timestamp": "2025-01-01T00:02:00Z", "textPayload": "b"},
+            {"timestamp": "2025-01-01T00:01:00Z", "textPayload": "y" * 100},
+        ]
+        monkeypatch.setattr(clients, "request", AsyncMock(return_value={"entries": entries}))
+        cursor = CloudLoggingCursor()
+
+        async def read() -> list[str]:
+            return [
+                line.log
+                async for line in iter_cloud_logging_entries(
+                    clients, MagicMock(), "test-123", "filter", max_bytes=20, cursor=cursor
+                )
+            ]
+
+        assert await read() == ["[DEFAULT] xxxxxxxxxx"]
+        assert cursor.skip == 1
+        # Entries after the first are only read while they fit in the budget.
+        assert await read() == ["[DEFAULT] b"]
+        assert cursor.skip == 2
+        assert await read() == ["[DEFAULT] yyyyyyyyyy"]
+        assert cursor.done
+
+    @pytest.mark.asyncio
+    async def test_credentials_are_refreshed_once_off_the_event_loop(self) -> None:
+        """Test that concurrent requests share one credential refresh, in a worker thread."""
+
+        class FakeCredentials:
+            def __init__(self) -> None:
+                self.token: str | None = None
+                self.expiry: datetime | None = None
+                self.refresh_threads: list[threading.Thread] = []
+
+            @property
+            def valid(self) -> bool:
+                return self.token is not None
+
+            def refresh(self, request: object) -> None:
+                self.refresh_threads.append(threading.current_thread())
+                self.token = f"token-{len(self.refresh_threads)}"
+                self.expiry = datetime.now(UTC).replace(tzinfo=None) + timedelta(hours=1)
+
+            def apply(self, headers: dict[str, str]) -> None:
+                headers["authorization"] = f"Bearer {self.token}"
+
+        credentials = FakeCredentials()
+        provider = GcpCredentialProvider(credentials)  # type: ignore[arg-type]
+        results = []
+
+        async def get_headers() -> None:
+            results.append(await provider.get_headers())
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(10):
+                tg.start_soon(get_headers)
+
+        assert results == [{"authorization": "Bearer token-1"}] * 10
+        assert len(credentials.refresh_threads) == 1
+        assert credentials.refresh_threads[0] is not threading.main_thread()
+
+        # Tokens are refreshed shortly before they expire.
+        credentials.expiry = datetime.now(UTC).replace(tzinfo=None) + timedelta(minutes=1)
+        assert await provider.get_headers() == {"authorization": "Bearer token-2"}
+
     @pytest.mark.asyncio
     async def test_compute_instance_node(self) -> None:
         """Test GCP Compute Instance node."""
@@ -0,0 +1,63 @@
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastmcp import Client
+
+from unpage import mcp
+from unpage.config import Config
+from unpage.knowledge import Graph
+from unpage.mcp import Context, build_mcp_server
+from unpage.plugins import PluginManager
+
+
+def make_plugins() -> tuple[MagicMock, AsyncMock]:
+    plugin = AsyncMock()
+    plugins = MagicMock(spec=PluginManager)
+    plugins.__iter__.side_effect = lambda: iter([plugin])
+    plugins.get_plugins_with_capability.return_value = []
+    return plugins, plugin
+
+
+def make_context(plugins: MagicMock) -> Context:
+    return Context(
+        profile="test",
+        config=Config(profile="test", file_path=Path("/tmp/test")),
+        plugins=plugins,
+        graph=Graph(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_ending_a_session_leaves_the_plugins_open_for_other_sessions() -> None:
+    plugins, plugin = make_plugins()
+    server = await build_mcp_server(make_context(plugins))
+
+    async with Client(server) as first:
+        async with Client(server) as second:
+            await second.ping()
+        plugin.close.assert_not_awaited()
+        await first.ping()
+
+    plugin.close.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_plugins_are_closed_when_the_server_stops() -> None:
+    plugins, plugin = make_plugins()
+
+    with (
+        patch.object(mcp.signal, "signal"),
+        patch.object(mcp.manager, "get_active_profile_config"),
+        patch.object(mcp.manager, "get_active_profile", return_value="test"),
+        patch.object(mcp.manager, "get_active_profile_directory", return_value=Path("/tmp")),
+        patch.object(mcp, "PluginManager", return_value=plugins),
+        patch.object(mcp, "Context", return_value=make_context(plugins)),
+        patch.object(mcp.FastMCP, "run_stdio_async") as run_stdio,
+        patch.object(mcp.FastMCP, "run_http_async") as run_http,
+    ):
+        await mcp.start()
+
+    run_stdio.assert_awaited_once()
+    run_http.assert_awaited_once()
+    plugin.close.assert_awaited_once()